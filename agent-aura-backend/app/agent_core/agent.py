@@ -8,8 +8,9 @@ Implements the Think-Act-Observe loop with Glass Box trajectory streaming.
 
 import json
 import asyncio
+import inspect
 import os
-from typing import AsyncGenerator, Dict, List, Optional, Any
+from typing import AsyncGenerator, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
@@ -33,8 +34,15 @@ from app.agent_core.tools import (
     get_student_progress_timeline,
     export_progress_visualization_data,
     fetch_lms_data,
-    predict_risk_trends
+    predict_risk_trends,
+    predict_cohort_risk_trends,
+    export_progress_visualization_batch,
+    query_notifications
 )
+from app.agent_core.executor import ExecutionKind, tool_executor
+from app.agent_core.function_calling import build_function_declarations, coerce_arguments, extract_json_object
+from app.agent_core.model_manager import model_manager
+from app.agent_core.prompts import compile_agent_prompt
 
 
 # ============================================================================
@@ -70,6 +78,7 @@ class StreamObservation:
     type: str = "observation"
     content: str = ""
     success: bool = True
+    cached: bool = False
     timestamp: str = ""
     
     def to_dict(self) -> dict:
@@ -91,56 +100,93 @@ class StreamFinalResponse:
 # Tool Registry
 # ============================================================================
 
+# "execution" selects the pool a tool runs on: CPU-bound tools must be pure
+# (no module state) because they run in worker processes; constant lookups
+# run inline since any pool hand-off costs more than the work.
+# "max_concurrency" caps simultaneous calls of a tool across sessions.
+# "pure" results may be memoized for the rest of the Agent session;
+# "writes" tools invalidate that memo when they run.
+# Parameter schemas are derived from the function signatures.
 TOOL_REGISTRY = {
     "get_student_data": {
         "function": get_student_data,
         "description": "Retrieve comprehensive student profile data",
-        "parameters": ["student_id", "data_source"]
+        "execution": ExecutionKind.IO,
+        "max_concurrency": 4,
+        "pure": True
     },
     "analyze_student_risk": {
         "function": analyze_student_risk,
         "description": "Calculate risk score and categorize risk level",
-        "parameters": ["student_id"]
+        "execution": ExecutionKind.CPU,
+        "pure": True
     },
     "generate_intervention_plan": {
         "function": generate_intervention_plan,
         "description": "Create personalized intervention strategy",
-        "parameters": ["risk_level"]
+        "execution": ExecutionKind.INLINE,
+        "pure": True
     },
     "predict_intervention_success": {
         "function": predict_intervention_success,
         "description": "Forecast intervention success probability",
-        "parameters": ["risk_level"]
+        "execution": ExecutionKind.INLINE,
+        "pure": True
     },
     "generate_alert_email": {
         "function": generate_alert_email,
         "description": "Generate automated notification for stakeholders",
-        "parameters": ["student_id"]
+        "execution": ExecutionKind.IO,
+        "writes": True
     },
     "track_student_progress": {
         "function": track_student_progress,
         "description": "Record student progress over time",
-        "parameters": ["student_id", "risk_level", "risk_score", "student_name", "notes"]
+        "execution": ExecutionKind.IO,
+        "max_concurrency": 1,
+        "writes": True
     },
     "get_student_progress_timeline": {
         "function": get_student_progress_timeline,
         "description": "Retrieve historical progress timeline",
-        "parameters": ["student_id"]
+        "execution": ExecutionKind.IO,
+        "pure": True
     },
     "export_progress_visualization_data": {
         "function": export_progress_visualization_data,
         "description": "Export progress data for visualization",
-        "parameters": ["student_id", "format"]
+        "execution": ExecutionKind.IO,
+        "pure": True
     },
     "fetch_lms_data": {
         "function": fetch_lms_data,
         "description": "Fetch live student data from LMS",
-        "parameters": ["student_id", "platform"]
+        "execution": ExecutionKind.IO,
+        "max_concurrency": 2
     },
     "predict_risk_trends": {
         "function": predict_risk_trends,
         "description": "Predict future risk trends based on history",
-        "parameters": ["student_id"]
+        "execution": ExecutionKind.IO,
+        "pure": True
+    },
+    "predict_cohort_risk_trends": {
+        "function": predict_cohort_risk_trends,
+        "description": "Forecast risk trends for all tracked students and rank those getting worse",
+        "execution": ExecutionKind.IO,
+        "pure": True
+    },
+    "export_progress_visualization_batch": {
+        "function": export_progress_visualization_batch,
+        "description": "Export downsampled chart data for several students at once",
+        "execution": ExecutionKind.IO,
+        "pure": True
+    },
+    "query_notifications": {
+        "function": query_notifications,
+        "description": "Look up generated notifications by student, grade, status or risk level",
+        "execution": ExecutionKind.IO,
+        "pure": True
     }
 }
 
@@ -157,18 +203,33 @@ class Agent:
     the agentic problem-solving process with full transparency.
     """
     
-    def __init__(self, tools: Optional[List[str]] = None):
+    def __init__(
+        self,
+        tools: Optional[List[str]] = None,
+        model_id: Optional[str] = None,
+        native_function_calling: Optional[bool] = None
+    ):
         """
         Initialize the Agent.
         
         Args:
             tools: List of tool names to enable (default: all tools)
+            model_id: ModelManager model ID for native function calling (default: manager default)
+            native_function_calling: Use provider function calling instead of
+                JSON-in-text replies (default: AGENT_FUNCTION_CALLING env, on)
         """
         self.tools = tools or list(TOOL_REGISTRY.keys())
+        self.tool_declarations = build_function_declarations(tuple(self.tools))
+        self.model_id = model_id
+        if native_function_calling is None:
+            native_function_calling = os.getenv("AGENT_FUNCTION_CALLING", "true").lower() == "true"
+        self.native_function_calling = native_function_calling
         self.max_iterations = 10
         self.session_history = []
         self.model = None
         self._gemini_initialized = False
+        # Session-scoped memo of pure tool results: (tool, normalized args) -> result
+        self._tool_cache: Dict[Tuple[str, str], Any] = {}
         
     def _initialize_gemini(self):
         """Initialize Gemini API lazily when first needed."""
@@ -201,6 +262,8 @@ class Agent:
         """
         Context Engineering: Prepare the system prompt with tools and history.
         
+        The static part comes first so provider-side prompt caching can reuse it.
+        
         Args:
             goal: User's goal/query
             session_history: Previous conversation history
@@ -208,41 +271,19 @@ class Agent:
         Returns:
             Formatted context string
         """
-        # System prompt
-        system_prompt = """You are Agent Aura, an AI agent specialized in K-12 student intervention analysis.
-
-Your mission is to help identify at-risk students, generate interventions, and track outcomes.
-
-You think step-by-step and use tools to accomplish your goals. For each step:
-1. THINK about what you need to do next
-2. ACT by calling a tool if needed
-3. OBSERVE the result and continue
-
-Available Tools:
-"""
+        # Static prefix (system prompt + tools), compiled once per tool set
+        prompt = compile_agent_prompt(self.tool_declarations, self.native_function_calling)
         
-        # Add tool definitions
-        for tool_name in self.tools:
-            tool_info = TOOL_REGISTRY[tool_name]
-            system_prompt += f"\n- {tool_name}: {tool_info['description']}"
-            system_prompt += f"\n  Parameters: {', '.join(tool_info['parameters'])}"
-        
-        system_prompt += "\n\nWhen you need to use a tool, respond in this format:"
-        system_prompt += '\n{\n  "thought": "Your reasoning here",\n  "action": "tool_name",\n  "arguments": {...}\n}'
-        
-        system_prompt += "\n\nWhen you have the final answer, respond in this format:"
-        system_prompt += '\n{\n  "thought": "Summary of findings",\n  "final_response": "Your detailed response"\n}'
-        
-        # Add conversation history
-        context = f"{system_prompt}\n\n=== Conversation History ===\n"
+        # Dynamic suffix: conversation history and current goal
+        suffix = []
         for item in session_history[-5:]:  # Last 5 turns
-            context += f"\nUser: {item.get('user', '')}"
-            context += f"\nAgent: {item.get('agent', '')}"
+            suffix.append(f"\nUser: {item.get('user', '')}")
+            suffix.append(f"\nAgent: {item.get('agent', '')}")
         
         # Add current goal
-        context += f"\n\n=== Current Request ===\nUser: {goal}\n"
+        suffix.append(f"\n\n=== Current Request ===\nUser: {goal}\n")
         
-        return context
+        return prompt.render("".join(suffix))
     
     def _parse_llm_response(self, response: str) -> dict:
         """
@@ -257,17 +298,138 @@ Available Tools:
         try:
             # Try to parse as JSON
             parsed = json.loads(response.strip())
-            return parsed
         except json.JSONDecodeError:
-            # If not JSON, treat as a thought
+            # Tolerate code fences and prose around the JSON object
+            parsed = extract_json_object(response)
+        
+        if isinstance(parsed, dict):
+            return parsed
+        
+        # If not JSON, treat as a thought
+        return {
+            "thought": response,
+            "final_response": response
+        }
+    
+    def _parse_tool_reply(self, reply: dict) -> dict:
+        """
+        Convert a native function-calling reply into the step format.
+        
+        Args:
+            reply: {"text": str, "tool_calls": [{"name": ..., "arguments": ...}]}
+            
+        Returns:
+            Parsed dictionary with thought and actions or final response
+        """
+        text = (reply.get("text") or "").strip()
+        tool_calls = reply.get("tool_calls") or []
+        
+        if tool_calls:
             return {
-                "thought": response,
-                "final_response": response
+                "thought": text or f"Calling {', '.join(call['name'] for call in tool_calls)}",
+                "actions": [
+                    {"action": call["name"], "arguments": call.get("arguments") or {}}
+                    for call in tool_calls
+                ]
             }
+        
+        # No native calls: the model may still have answered with a JSON step
+        return self._parse_llm_response(text)
+    
+    def _extract_actions(self, parsed: dict) -> List[dict]:
+        """
+        Normalize a parsed LLM step into a list of tool calls.
+        
+        Accepts both the single-call format ("action" + "arguments") and
+        the multi-call format ("actions": [{"action": ..., "arguments": ...}]).
+        
+        Args:
+            parsed: Parsed LLM response
+            
+        Returns:
+            List of {"action": str, "arguments": dict} entries (may be empty)
+        """
+        calls = parsed.get("actions")
+        if isinstance(calls, list):
+            return [
+                {"action": call["action"], "arguments": call.get("arguments") or {}}
+                for call in calls
+                if isinstance(call, dict) and call.get("action")
+            ]
+        
+        if "action" in parsed and "arguments" in parsed:
+            return [{"action": parsed["action"], "arguments": parsed["arguments"] or {}}]
+        
+        return []
     
-    def _execute_tool(self, tool_name: str, arguments: dict) -> Any:
+    def _cache_key(self, tool_name: str, arguments: dict) -> Optional[Tuple[str, str]]:
         """
-        Execute a tool with given arguments.
+        Build the memo key for a pure tool call.
+        
+        Arguments are bound to the tool signature with defaults applied, so
+        {"student_id": "S001"} and {"student_id": "S001", "data_source": None}
+        share one entry.
+        
+        Returns:
+            (tool_name, normalized JSON arguments), or None if not cacheable
+        """
+        tool_info = TOOL_REGISTRY.get(tool_name)
+        if not tool_info or not tool_info.get("pure"):
+            return None
+        try:
+            bound = inspect.signature(tool_info["function"]).bind(**arguments)
+            bound.apply_defaults()
+            return tool_name, json.dumps(bound.arguments, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+    
+    def clear_tool_cache(self):
+        """Forget memoized tool results for this session."""
+        self._tool_cache.clear()
+    
+    async def _execute_tools(self, calls: List[dict]) -> List[Tuple[Any, bool]]:
+        """
+        Execute independent tool calls concurrently off the event loop.
+        
+        Pure tool results are served from the session memo when possible.
+        A step containing a writing tool neither reads nor fills the memo,
+        and clears it afterwards.
+        
+        Args:
+            calls: Tool calls as returned by _extract_actions
+            
+        Returns:
+            (result, cached) pairs, in the same order as the calls
+        """
+        writes = any(TOOL_REGISTRY.get(call["action"], {}).get("writes") for call in calls)
+        keys = [None if writes else self._cache_key(call["action"], call["arguments"]) for call in calls]
+        
+        pending = [
+            (i, self._execute_tool(call["action"], call["arguments"]))
+            for i, (call, key) in enumerate(zip(calls, keys))
+            if key is None or key not in self._tool_cache
+        ]
+        results = await asyncio.gather(*[coro for _, coro in pending])
+        fresh = dict(zip([i for i, _ in pending], results))
+        
+        outcomes = []
+        for i, key in enumerate(keys):
+            if i in fresh:
+                result = fresh[i]
+                if key is not None and not (isinstance(result, dict) and "error" in result):
+                    self._tool_cache[key] = result
+                outcomes.append((result, False))
+            else:
+                outcomes.append((self._tool_cache[key], True))
+        
+        if writes:
+            self.clear_tool_cache()
+        
+        return outcomes
+    
+    async def _execute_tool(self, tool_name: str, arguments: dict) -> Any:
+        """
+        Execute a tool with given arguments on the bounded tool executor.
         
         Args:
             tool_name: Name of the tool to execute
@@ -279,11 +441,17 @@ Available Tools:
         if tool_name not in TOOL_REGISTRY:
             return {"error": f"Tool '{tool_name}' not found"}
         
-        tool_func = TOOL_REGISTRY[tool_name]["function"]
+        tool_info = TOOL_REGISTRY[tool_name]
         
         try:
             # Call the tool
-            result = tool_func(**arguments)
+            result = await tool_executor.run(
+                tool_name,
+                tool_info["function"],
+                coerce_arguments(tool_info["function"], arguments),
+                kind=tool_info.get("execution", ExecutionKind.IO),
+                max_concurrency=tool_info.get("max_concurrency")
+            )
             return result
         except Exception:
             return {"error": "An error occurred while executing the tool."}
@@ -336,32 +504,34 @@ Available Tools:
                 ).to_dict()
                 break
             
-            # ACT: Execute tool if requested
-            if "action" in thought_content and "arguments" in thought_content:
-                tool_name = thought_content["action"]
-                arguments = thought_content["arguments"]
-                
-                yield StreamAction(
-                    tool_name=tool_name,
-                    arguments=arguments,
-                    timestamp=datetime.utcnow().isoformat()
-                ).to_dict()
+            # ACT: Execute all requested tools in one step
+            calls = self._extract_actions(thought_content)
+            if calls:
+                for call in calls:
+                    yield StreamAction(
+                        tool_name=call["action"],
+                        arguments=call["arguments"],
+                        timestamp=datetime.utcnow().isoformat()
+                    ).to_dict()
                 
                 await asyncio.sleep(0.1)
                 
-                # Execute the tool
-                observation = self._execute_tool(tool_name, arguments)
-                observation_str = json.dumps(observation, indent=2)
-                
-                # OBSERVE: Return tool result
-                yield StreamObservation(
-                    content=observation_str,
-                    success="error" not in observation,
-                    timestamp=datetime.utcnow().isoformat()
-                ).to_dict()
+                # Execute the tools (independent calls run concurrently)
+                observations = await self._execute_tools(calls)
                 
-                # Update context with observation
-                conversation_context += f"\n\nTool Result: {observation_str}\n"
+                for call, (observation, cached) in zip(calls, observations):
+                    observation_str = json.dumps(observation, indent=2)
+                    
+                    # OBSERVE: Return tool result (memoized results are annotated)
+                    yield StreamObservation(
+                        content=observation_str,
+                        success=not (isinstance(observation, dict) and "error" in observation),
+                        cached=cached,
+                        timestamp=datetime.utcnow().isoformat()
+                    ).to_dict()
+                    
+                    # Update context with observation
+                    conversation_context += f"\n\nTool Result ({call['action']}): {observation_str}\n"
                 
                 await asyncio.sleep(0.1)
             else:
@@ -372,9 +542,19 @@ Available Tools:
                 ).to_dict()
                 break
     
+    async def _call_gemini(self, context: str) -> str:
+        """Text reply of the directly configured Gemini model."""
+        # Initialize Gemini if not already done
+        self._initialize_gemini()
+        response = await asyncio.to_thread(self.model.generate_content, context)
+        return response.text
+    
     async def _simulate_llm_call(self, context: str) -> dict:
         """
-        Call Gemini API to generate next reasoning step.
+        Call the LLM to generate next reasoning step.
+        
+        Uses native function calling through the ModelManager when enabled,
+        otherwise asks Gemini for a JSON step in plain text.
         
         Args:
             context: Prepared context string with tools and history
@@ -383,17 +563,20 @@ Available Tools:
             Parsed LLM response with thought/action/final_response
         """
         try:
-            # Initialize Gemini if not already done
-            self._initialize_gemini()
+            if self.native_function_calling:
+                reply = await model_manager.generate_with_tools(
+                    context,
+                    self.tool_declarations,
+                    self.model_id
+                )
+                return self._parse_tool_reply(reply)
             
-            # Call Gemini API
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                context
+            # Call Gemini API (recorded or replayed when a cassette is active)
+            response_text = await model_manager.cassette.call(
+                "agent", os.getenv("ORCHESTRATOR_MODEL", "gemini-3-pro-preview"), context,
+                lambda: self._call_gemini(context)
             )
-            
-            # Extract text from response
-            response_text = response.text.strip()
+            response_text = response_text.strip()
             
             # Parse the response
             return self._parse_llm_response(response_text)
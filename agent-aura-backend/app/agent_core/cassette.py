@@ -0,0 +1,222 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+LLM record/replay cassettes for Agent Aura.
+In record mode every model call is appended to an NDJSON file as a
+prompt -> response pair with its latency; in replay mode the same prompts
+are answered from the file, with the recorded latencies or none, so
+orchestrator and agent runs can be benchmarked reproducibly and without a
+provider.
+"""
+
+import asyncio
+import copy
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+CASSETTE_VERSION = 2
+MODES = ("record", "replay")
+REPLAY_LATENCIES = ("original", "none")
+
+# Tool observations echoed into agent prompts carry the time of the run and
+# ids/counts of durable stores that grow between runs; they are masked
+_VOLATILE = [
+    # ISO timestamps
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?"), "<timestamp>"),
+    # Compact timestamps (e.g. in email ids: EMAIL-S001-20250630120000)
+    (re.compile(r"(?<!\d)\d{14}(?!\d)"), "<timestamp>"),
+    # Long dates (e.g. the assessment date of an email: June 30, 2025)
+    (re.compile(
+        r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)"
+        r" \d{1,2}, \d{4}\b"
+    ), "<date>"),
+    # Outbox state and progress store entry counts
+    (re.compile(
+        r'"(outbox_id|delivery_status|attempts|last_error|total_entries|total_records|days_tracked)": '
+        r'(?:"[^"]*"|[^,\s}]+)'
+    ), r'"\1": "<volatile>"'),
+    # Repeat alerts return the earlier notification marked as deduplicated
+    (re.compile(r',\s*"deduplicated": true'), ""),
+]
+
+
+class CassetteMiss(KeyError):
+    """A replayed prompt that was never recorded."""
+
+
+def prompt_key(kind: str, model: str, prompt: str, extra: str = "") -> str:
+    """
+    Key of a model call, stable across runs.
+
+    Timestamps, outbox ids and durable entry counts in the prompt are masked,
+    so the observations of replayed tool calls still match the recording.
+
+    Args:
+        kind: Call type (e.g. "generate_content")
+        model: Model ID
+        prompt: Prompt text
+        extra: Anything else the reply depends on (e.g. the declared tools)
+    """
+    normalized = prompt
+    for pattern, replacement in _VOLATILE:
+        normalized = pattern.sub(replacement, normalized)
+    return hashlib.sha256("\x1f".join((kind, model or "", extra, normalized)).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Records model calls to an NDJSON file or replays them from it.
+
+    The file holds a header line and one line per call; recording appends
+    one line per call from a worker thread. A "{pid}" in the path is
+    replaced by the process id when recording, so API workers record to
+    their own files, and replay then reads every matching file.
+
+    Identical prompts recorded more than once are replayed in recording
+    order, wrapping around, so repeated benchmark rounds keep matching.
+    Failed calls are not recorded.
+    """
+
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None, latency: str = "original"):
+        """
+        Initialize the cassette.
+
+        Args:
+            path: Cassette file (may contain "{pid}", see the class docstring);
+                recording starts the file over
+            mode: "record", "replay" or None (pass calls through)
+            latency: On replay, "original" sleeps for the recorded latency, "none" answers at once
+        """
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(f"Unknown replay latency: {latency}")
+        if mode is not None and not path:
+            raise ValueError("A cassette file is required to record or replay")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.entries: List[dict] = []
+        self._by_key: Dict[str, List[dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        if mode == "record":
+            self.path = path.replace("{pid}", str(os.getpid()))
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": CASSETTE_VERSION, "created_at": datetime.now().isoformat()}) + "\n")
+        elif mode == "replay":
+            self.load()
+
+    @classmethod
+    def from_env(cls) -> "Cassette":
+        """Cassette configured by LLM_CASSETTE, LLM_CASSETTE_MODE and LLM_CASSETTE_LATENCY."""
+        return cls(
+            path=os.getenv("LLM_CASSETTE"),
+            mode=os.getenv("LLM_CASSETTE_MODE") or None,
+            latency=os.getenv("LLM_CASSETTE_LATENCY", "original")
+        )
+
+    def load(self):
+        """Read the cassette file(s)."""
+        paths = sorted(glob.glob(self.path.replace("{pid}", "*"))) if "{pid}" in self.path else [self.path]
+        if not paths:
+            raise FileNotFoundError(f"No cassette files match {self.path}")
+        entries = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("version") != CASSETTE_VERSION:
+                    raise ValueError(f"Unsupported cassette version in {path}: {header.get('version')}")
+                # A torn last line (interrupted recording) is skipped
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        with self._lock:
+            self.entries = entries
+            self._by_key = {}
+            self._cursor = {}
+            for entry in self.entries:
+                self._by_key.setdefault(entry["key"], []).append(entry)
+
+    def _append(self, entry: dict):
+        """Append one entry to the cassette file."""
+        line = json.dumps(entry) + "\n"
+        with self._write_lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def replay(self, key: str) -> dict:
+        """The next recorded entry for a key (raises CassetteMiss)."""
+        with self._lock:
+            entries = self._by_key.get(key)
+            if not entries:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"No recording for prompt {key[:12]} in {self.path}")
+            cursor = self._cursor.get(key, 0)
+            self._cursor[key] = cursor + 1
+            self.stats["replayed"] += 1
+            return entries[cursor % len(entries)]
+
+    def record(self, key: str, kind: str, model: str, prompt: str, response: Any, latency_ms: float) -> dict:
+        """Add an entry (call _append to write it)."""
+        entry = {
+            "key": key,
+            "kind": kind,
+            "model": model,
+            "prompt_preview": prompt[-200:],
+            "response": response,
+            "latency_ms": round(latency_ms, 3)
+        }
+        with self._lock:
+            self.entries.append(entry)
+            self._by_key.setdefault(key, []).append(entry)
+            self.stats["recorded"] += 1
+        return entry
+
+    async def call(self, kind: str, model: str, prompt: str, fetch: Callable[[], Awaitable[Any]], extra: str = "") -> Any:
+        """
+        Run a model call through the cassette.
+
+        Args:
+            kind: Call type, part of the key
+            model: Model ID, part of the key
+            prompt: Prompt text, part of the key
+            fetch: Performs the real call (not awaited on replay)
+            extra: Additional key material
+
+        Returns:
+            The live, recorded or replayed response (JSON-serializable)
+        """
+        if self.mode is None:
+            return await fetch()
+
+        key = prompt_key(kind, model, prompt, extra)
+        if self.mode == "replay":
+            entry = self.replay(key)
+            if self.latency == "original" and entry["latency_ms"]:
+                await asyncio.sleep(entry["latency_ms"] / 1000.0)
+            return copy.deepcopy(entry["response"])
+
+        start = time.perf_counter()
+        response = await fetch()
+        entry = self.record(key, kind, model, prompt, response, (time.perf_counter() - start) * 1000.0)
+        # One appended line per call, off the event loop
+        await asyncio.to_thread(self._append, entry)
+        return response
+
+
+# Global cassette (inactive unless LLM_CASSETTE_MODE is set)
+cassette = Cassette.from_env()
@@ -0,0 +1,381 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Notification dispatch for Agent Aura.
+Claims pending items from the notification outbox in batches, renders them
+and sends them over a pool of persistent SMTP connections with a
+concurrency limit and retries, recording the delivery state of each item.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.agent_core.outbox import NotificationOutbox, NotificationStatus, notification_outbox
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SMTPSettings:
+    """SMTP server and addressing settings."""
+    host: str = "localhost"
+    port: int = 25
+    username: Optional[str] = None
+    password: Optional[str] = None
+    starttls: bool = False
+    timeout: float = 30.0
+    sender: str = "noreply@agent-aura.local"
+    recipients: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_env(cls) -> "SMTPSettings":
+        """Settings from SMTP_* and NOTIFICATION_RECIPIENTS environment variables."""
+        recipients = os.getenv("NOTIFICATION_RECIPIENTS", "")
+        return cls(
+            host=os.getenv("SMTP_HOST", "localhost"),
+            port=int(os.getenv("SMTP_PORT", "25")),
+            username=os.getenv("SMTP_USERNAME") or None,
+            password=os.getenv("SMTP_PASSWORD") or None,
+            starttls=os.getenv("SMTP_STARTTLS", "false").lower() == "true",
+            timeout=float(os.getenv("SMTP_TIMEOUT", "30")),
+            sender=os.getenv("SMTP_FROM_EMAIL", "noreply@agent-aura.local"),
+            recipients=[r.strip() for r in recipients.split(",") if r.strip()]
+        )
+
+
+def connection_lost(error: Exception) -> bool:
+    """Whether an error left the connection unusable (SMTP errors subclass OSError)."""
+    return isinstance(error, smtplib.SMTPServerDisconnected) or (
+        isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+    )
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a send error is worth retrying (connection problems and 4xx replies)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return connection_lost(error)
+
+
+def render_message(record: dict, sender: str, recipients: List[str]) -> EmailMessage:
+    """
+    Render an outbox record as an email message.
+
+    Args:
+        record: Notification record (subject, body, priority, email_id)
+        sender: From address
+        recipients: To addresses
+
+    Returns:
+        EmailMessage ready to send
+    """
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = record.get("subject", "Agent Aura notification")
+    message["X-Agent-Aura-Email-Id"] = str(record.get("email_id", ""))
+    if record.get("priority") in ("URGENT", "HIGH"):
+        message["X-Priority"] = "1"
+    message.set_content(record.get("body", ""))
+    return message
+
+
+class SMTPConnectionPool:
+    """
+    Pool of persistent, logged-in SMTP connections.
+
+    Connections are opened lazily up to the pool size and reused across
+    messages; a connection that fails is discarded instead of returned.
+    """
+
+    def __init__(
+        self,
+        settings: SMTPSettings,
+        size: int = 4,
+        factory: Optional[Callable[..., smtplib.SMTP]] = None
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            settings: SMTP settings
+            size: Maximum number of open connections
+            factory: Callable(host, port, timeout=...) creating a connection
+                (default: smtplib.SMTP)
+        """
+        self.settings = settings
+        self.size = size
+        self.factory = factory or smtplib.SMTP
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+        self.discarded = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = self.factory(self.settings.host, self.settings.port, timeout=self.settings.timeout)
+        try:
+            if self.settings.starttls:
+                conn.starttls()
+            if self.settings.username:
+                conn.login(self.settings.username, self.settings.password or "")
+        except Exception:
+            self._close(conn)
+            raise
+        self.opened += 1
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def acquire(self) -> smtplib.SMTP:
+        """Take an idle connection, or open one if the pool is not full (blocks otherwise)."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: smtplib.SMTP, broken: bool = False):
+        """Return a connection to the pool, closing it if it failed."""
+        if broken:
+            self.discarded += 1
+            self._close(conn)
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    def close_all(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+
+class NotificationDispatcher:
+    """
+    Delivers outbox notifications in batches without blocking the event loop.
+
+    Each batch is claimed atomically, rendered, and sent from a thread pool
+    no larger than the connection pool; transient failures are retried with
+    exponential backoff before an item is marked FAILED.
+    """
+
+    def __init__(
+        self,
+        outbox: Optional[NotificationOutbox] = None,
+        settings: Optional[SMTPSettings] = None,
+        pool: Optional[SMTPConnectionPool] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff: float = 0.5,
+        interval: Optional[float] = None,
+        resolve_recipients: Optional[Callable[[dict], List[str]]] = None
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            outbox: Notification outbox (default: the global outbox)
+            settings: SMTP settings (default: from the environment)
+            pool: Connection pool (default: one sized to the concurrency)
+            batch_size: Items claimed per batch (default: NOTIFICATION_BATCH_SIZE env or 100)
+            concurrency: Parallel sends (default: NOTIFICATION_CONCURRENCY env or 8)
+            max_attempts: Tries per item (default: NOTIFICATION_MAX_ATTEMPTS env or 3)
+            backoff: Delay before the first retry in seconds, doubled per retry
+            interval: Poll interval when the outbox is empty (default:
+                NOTIFICATION_DISPATCH_INTERVAL env or 5)
+            resolve_recipients: Function(record) returning addresses (default: the
+                record's "to" list, else the configured recipients)
+        """
+        self.outbox = outbox
+        self.settings = settings or SMTPSettings.from_env()
+        self.concurrency = concurrency or int(os.getenv("NOTIFICATION_CONCURRENCY", "8"))
+        self.pool = pool or SMTPConnectionPool(self.settings, size=self.concurrency)
+        self.batch_size = batch_size or int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+        self.max_attempts = max_attempts or int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "3"))
+        self.backoff = backoff
+        self.interval = interval or float(os.getenv("NOTIFICATION_DISPATCH_INTERVAL", "5"))
+        self.resolve_recipients = resolve_recipients or self._default_recipients
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self.last_run: Optional[str] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _outbox(self) -> NotificationOutbox:
+        return self.outbox if self.outbox is not None else notification_outbox
+
+    def _default_recipients(self, record: dict) -> List[str]:
+        return list(record.get("to") or self.settings.recipients)
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    def _send(self, message: EmailMessage) -> Tuple[str, Optional[str], int]:
+        """Send one message with retries (runs in a worker thread)."""
+        error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                threading.Event().wait(self.backoff * 2 ** (attempt - 2))
+            try:
+                conn = self.pool.acquire()
+            except Exception as e:
+                error = e
+                if not is_transient(e):
+                    break
+                continue
+            try:
+                conn.send_message(message)
+            except Exception as e:
+                error = e
+                # Only a dropped connection is unusable; a rejected message leaves it open
+                self.pool.release(conn, broken=connection_lost(e))
+                if not is_transient(e):
+                    break
+                continue
+            self.pool.release(conn)
+            return NotificationStatus.SENT, None, attempt
+        return NotificationStatus.FAILED, f"{type(error).__name__}: {error}", attempt
+
+    async def dispatch_once(self) -> dict:
+        """
+        Claim, render and send one batch.
+
+        Returns:
+            Dict with the numbers of items claimed, sent and failed
+        """
+        loop = asyncio.get_running_loop()
+        outbox = self._outbox()
+        records = await loop.run_in_executor(None, outbox.claim, self.batch_size)
+        if not records:
+            return {"claimed": 0, "sent": 0, "failed": 0}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="smtp")
+
+        outcomes: Dict[Tuple[str, Optional[str], int], List[int]] = {}
+        pending = []
+        for record in records:
+            recipients = self.resolve_recipients(record)
+            if not recipients:
+                outcomes.setdefault((NotificationStatus.FAILED, "No recipients", 0), []).append(record["outbox_id"])
+                continue
+            message = render_message(record, self.settings.sender, recipients)
+            pending.append((record["outbox_id"], loop.run_in_executor(self._executor, self._send, message)))
+
+        for outbox_id, future in pending:
+            status, error, attempts = await future
+            # Counted here on the event loop, not in the worker threads
+            self.retries += attempts - 1
+            outcomes.setdefault((status, error, attempts), []).append(outbox_id)
+
+        # One UPDATE per outcome instead of one per message
+        for (status, error, attempts), ids in outcomes.items():
+            await loop.run_in_executor(None, lambda: outbox.mark(ids, status, error, attempt=attempts))
+
+        sent = sum(len(ids) for (status, _, _), ids in outcomes.items() if status == NotificationStatus.SENT)
+        failed = len(records) - sent
+        self.sent += sent
+        self.failed += failed
+        self.batches += 1
+        self.last_run = datetime.now().isoformat()
+        return {"claimed": len(records), "sent": sent, "failed": failed}
+
+    async def drain(self) -> dict:
+        """Dispatch batches until the outbox has no pending items."""
+        totals = {"claimed": 0, "sent": 0, "failed": 0}
+        while True:
+            result = await self.dispatch_once()
+            for key in totals:
+                totals[key] += result[key]
+            if result["claimed"] < self.batch_size:
+                return totals
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        Start on the running event loop.
+
+        Outbox records carry no addresses of their own, so with the default
+        recipient lookup the dispatcher refuses to start until
+        NOTIFICATION_RECIPIENTS is set, instead of failing every item.
+
+        Returns:
+            Whether the worker is running
+        """
+        if self.resolve_recipients == self._default_recipients and not self.settings.recipients:
+            logger.error("Notification dispatch not started: NOTIFICATION_RECIPIENTS is not set")
+            return False
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    def stop(self):
+        """Stop the worker and close pooled connections."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.pool.close_all()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        # Items claimed by a process that died mid-batch
+        await loop.run_in_executor(None, self._outbox().requeue_stale)
+        while True:
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Notification dispatch failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """Dispatcher statistics."""
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "batches": self.batches,
+            "connections_opened": self.pool.opened,
+            "connections_discarded": self.pool.discarded,
+            "last_run": self.last_run
+        }
+
+
+# Global dispatcher started with the API when SMTP is configured
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,127 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Time series downsampling for Agent Aura progress charts.
+Largest-Triangle-Three-Buckets (LTTB) and min/max bucketing over NumPy
+arrays. Risk level transitions are always kept so chart colors stay exact.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class DownsampleMethod:
+    """Downsampling methods."""
+    LTTB = "lttb"      # keeps the visual shape of the line
+    MINMAX = "minmax"  # keeps every bucket's extremes
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select n_out points with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x: Point positions (increasing)
+        y: Point values
+        n_out: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted indices of the kept points (always includes first and last)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # Bucket edges for the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average of every bucket (the "third point" for the previous bucket)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        cx, cy = avg_x[bucket + 1], avg_y[bucket + 1]
+        # Twice the triangle area formed with the previous pick and the next bucket's average
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keep the minimum and maximum of n_out // 2 equal buckets.
+
+    Args:
+        y: Point values
+        n_out: Number of points to keep (>= 2)
+
+    Returns:
+        Sorted unique indices of the kept points (always includes first and last)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    buckets = max(1, n_out // 2)
+    group = np.arange(n) * buckets // n
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    # Within each bucket, sort by value: the first row is the min, the last the max
+    order = np.lexsort((y, group))
+    ends = np.r_[starts[1:], n] - 1
+    kept = np.concatenate(([0, n - 1], order[starts], order[ends]))
+    return np.unique(kept)
+
+
+def downsample_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    levels: Optional[np.ndarray],
+    max_points: int,
+    method: str = DownsampleMethod.LTTB
+) -> np.ndarray:
+    """
+    Downsample a series while keeping every level transition exact.
+
+    Both points around a level change are kept; the remaining budget goes
+    to the sampler. If transitions alone exceed max_points, all of them are
+    still returned.
+
+    Args:
+        x: Point positions (increasing)
+        y: Point values
+        levels: Per-point category (e.g. risk level codes), or None
+        max_points: Target number of points
+        method: DownsampleMethod.LTTB or DownsampleMethod.MINMAX
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    transitions = np.zeros(0, dtype=np.int64)
+    if levels is not None and n > 1:
+        change = np.flatnonzero(levels[1:] != levels[:-1])
+        transitions = np.unique(np.concatenate((change, change + 1)))
+
+    budget = max(max_points - len(transitions), 3)
+    if method == DownsampleMethod.LTTB:
+        sampled = lttb_indices(x, y, budget)
+    elif method == DownsampleMethod.MINMAX:
+        sampled = minmax_indices(y, budget)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return np.union1d(sampled, transitions)
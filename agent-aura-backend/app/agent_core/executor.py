@@ -0,0 +1,189 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Bounded tool execution for Agent Aura.
+Dispatches tool calls off the event loop: I/O-bound tools run in a thread
+pool, CPU-bound tools in a process pool, each with an optional per-tool
+concurrency limit. Also provides an event-loop lag monitor.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Prometheus is only installed with the backend requirements
+try:
+    from prometheus_client import Histogram
+    EVENT_LOOP_LAG = Histogram(
+        'agent_aura_event_loop_lag_seconds',
+        'Delay between scheduled and actual event loop wake-ups',
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+    )
+except Exception:
+    EVENT_LOOP_LAG = None
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionKind:
+    """How a tool should be scheduled."""
+    IO = "io"
+    CPU = "cpu"
+    # Trivial lookups: run on the event loop, cheaper than any pool hand-off
+    INLINE = "inline"
+
+
+def _invoke(func: Callable, arguments: dict) -> Any:
+    """Call a tool function; module-level so it can be sent to worker processes."""
+    return func(**arguments)
+
+
+class ToolExecutor:
+    """
+    Runs tool functions on bounded pools instead of the event loop.
+
+    I/O-bound tools share a thread pool. CPU-bound tools go to a lazily
+    created process pool (or the thread pool when cpu_workers is 0).
+    Tools that need in-process state must be declared I/O-bound.
+    """
+
+    def __init__(self, io_workers: Optional[int] = None, cpu_workers: Optional[int] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            io_workers: Thread pool size (default: AGENT_IO_WORKERS or 8)
+            cpu_workers: Process pool size (default: AGENT_CPU_WORKERS or min(4, cpu count))
+        """
+        self.io_workers = io_workers or int(os.getenv("AGENT_IO_WORKERS", "8"))
+        if cpu_workers is None:
+            cpu_workers = int(os.getenv("AGENT_CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.cpu_workers = cpu_workers
+
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=self.io_workers,
+            thread_name_prefix="agent-tool"
+        )
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        # Semaphores are bound to a loop, so keep one set per running loop
+        self._limits: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _get_cpu_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.cpu_workers <= 0:
+            return None
+        if self._cpu_pool is None:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+        return self._cpu_pool
+
+    def _get_limit(self, tool_name: str, max_concurrency: Optional[int]) -> Optional[asyncio.Semaphore]:
+        if not max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        limits: Dict[str, asyncio.Semaphore] = self._limits.setdefault(loop, {})
+        if tool_name not in limits:
+            limits[tool_name] = asyncio.Semaphore(max_concurrency)
+        return limits[tool_name]
+
+    async def run(
+        self,
+        tool_name: str,
+        func: Callable,
+        arguments: dict,
+        kind: str = ExecutionKind.IO,
+        max_concurrency: Optional[int] = None
+    ) -> Any:
+        """
+        Execute a tool function without blocking the event loop.
+
+        Args:
+            tool_name: Tool name (used for the concurrency limit)
+            func: Tool function
+            arguments: Keyword arguments for the tool
+            kind: ExecutionKind.IO, ExecutionKind.CPU or ExecutionKind.INLINE
+            max_concurrency: Maximum simultaneous calls of this tool (None = unlimited)
+
+        Returns:
+            Tool result
+        """
+        if kind == ExecutionKind.INLINE:
+            return _invoke(func, arguments)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_cpu_pool() if kind == ExecutionKind.CPU else None
+        pool = pool or self._io_pool
+
+        limit = self._get_limit(tool_name, max_concurrency)
+        if limit is None:
+            return await loop.run_in_executor(pool, _invoke, func, arguments)
+        async with limit:
+            return await loop.run_in_executor(pool, _invoke, func, arguments)
+
+    def shutdown(self, wait: bool = True):
+        """Shut down both pools."""
+        self._io_pool.shutdown(wait=wait)
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=wait)
+            self._cpu_pool = None
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    Sustained lag means something is blocking the loop (e.g. a tool running
+    inline), which delays every connected client.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    def stop(self):
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def record(self, lag: float):
+        """Record one lag sample (seconds)."""
+        lag = max(lag, 0.0)
+        self.samples += 1
+        self.total_lag += lag
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        if EVENT_LOOP_LAG is not None:
+            EVENT_LOOP_LAG.observe(lag)
+
+    async def _sample(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(time.perf_counter() - expected)
+
+    def snapshot(self) -> dict:
+        """Return lag statistics in milliseconds."""
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 3) if self.samples else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 3)
+        }
+
+
+# Global instances
+tool_executor = ToolExecutor()
+event_loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,236 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Cohort risk trend forecasting for Agent Aura.
+Fits a per-student trend line (ordinary or exponentially weighted least
+squares) for the whole cohort in one vectorized NumPy pass over the
+progress store, and derives projections and confidence from the residuals.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.agent_core.progress_store import ProgressStore, progress_store
+
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+# Projected change (risk score points) treated as a real trend
+TREND_THRESHOLD = 0.05
+
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+class ForecastMethod:
+    """Trend fitting methods."""
+    LINEAR = "linear"  # ordinary least squares over the window
+    EWMA = "ewma"      # least squares with exponentially decaying weights
+
+
+def risk_level_for(score: float) -> str:
+    """Map a projected risk score to a risk level (same cut-offs as predict_risk_trends)."""
+    return "HIGH" if score >= 0.8 else "MODERATE" if score >= 0.6 else "LOW"
+
+
+@dataclass
+class CohortForecast:
+    """Per-student forecast arrays, all aligned with student_ids."""
+    student_ids: List[str]
+    sample_sizes: np.ndarray
+    current_scores: np.ndarray
+    slopes: np.ndarray            # risk score change per day
+    changes: np.ndarray           # fitted change over the horizon (slope * horizon)
+    projected_scores: np.ndarray
+    lower: np.ndarray             # ~95% projection interval
+    upper: np.ndarray
+    confidence: np.ndarray        # confidence that the trend direction is real (0-1)
+    horizon_days: int
+    method: str
+
+    def __len__(self) -> int:
+        return len(self.student_ids)
+
+    def to_dict(self, index: int) -> dict:
+        """Forecast of one student as a JSON-serializable dict."""
+        projected = float(self.projected_scores[index])
+        change = float(self.changes[index])
+        if change > TREND_THRESHOLD:
+            trend = "Increasing Risk"
+        elif change < -TREND_THRESHOLD:
+            trend = "Decreasing Risk"
+        else:
+            trend = "Stable"
+        return {
+            "student_id": self.student_ids[index],
+            "data_points": int(self.sample_sizes[index]),
+            "current_risk_score": round(float(self.current_scores[index]), 3),
+            "projected_risk_score": round(projected, 3),
+            "projected_change": round(projected - float(self.current_scores[index]), 3),
+            "projection_interval": [round(float(self.lower[index]), 3), round(float(self.upper[index]), 3)],
+            "slope_per_week": round(float(self.slopes[index]) * 7, 4),
+            "confidence_score": round(float(self.confidence[index]), 3),
+            "risk_level": risk_level_for(projected),
+            "trend": trend
+        }
+
+    def get(self, student_id: str) -> Optional[dict]:
+        """Forecast of one student, or None if it was not part of the cohort."""
+        try:
+            return self.to_dict(self.student_ids.index(student_id))
+        except ValueError:
+            return None
+
+    def worsening(self, limit: Optional[int] = None, min_confidence: float = 0.0) -> List[dict]:
+        """
+        Students whose projected risk rises by more than TREND_THRESHOLD.
+
+        Args:
+            limit: Maximum number of students to return (default: all)
+            min_confidence: Minimum trend confidence
+
+        Returns:
+            Forecast dicts ranked by fitted increase, largest first
+        """
+        change = self.changes
+        mask = (change > TREND_THRESHOLD) & (self.confidence >= min_confidence)
+        candidates = np.flatnonzero(mask)
+        ranked = candidates[np.argsort(-change[candidates], kind="stable")]
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.to_dict(i) for i in ranked]
+
+
+def fit_trends(
+    group: np.ndarray,
+    days: np.ndarray,
+    scores: np.ndarray,
+    n_groups: int,
+    weights: Optional[np.ndarray] = None,
+    horizon_days: float = 30
+):
+    """
+    Weighted least-squares trend per group, fully vectorized.
+
+    Args:
+        group: Group index of each point (0..n_groups-1)
+        days: Point time in days, relative to the group's latest point (<= 0)
+        scores: Risk scores
+        n_groups: Number of groups
+        weights: Point weights (default: 1)
+        horizon_days: Projection distance from the latest point (scalar or per group)
+
+    Returns:
+        Tuple (slope, projected, stderr, confidence, effective_n) of per-group arrays
+    """
+    if weights is None:
+        weights = np.ones_like(scores)
+
+    def total(values):
+        return np.bincount(group, weights=values, minlength=n_groups)
+
+    sw = total(weights)
+    mean_x = total(weights * days) / sw
+    mean_y = total(weights * scores) / sw
+    dx = days - mean_x[group]
+    dy = scores - mean_y[group]
+    sxx = total(weights * dx * dx)
+    sxy = total(weights * dx * dy)
+
+    flat = sxx <= 1e-12
+    slope = np.where(flat, 0.0, sxy / np.where(flat, 1.0, sxx))
+    intercept = mean_y - slope * mean_x
+    projected = intercept + slope * horizon_days
+
+    residuals = scores - (intercept[group] + slope[group] * days)
+    rss = total(weights * residuals * residuals)
+    effective_n = sw * sw / total(weights * weights)
+    dof = effective_n - 2
+    has_dof = (dof > 0) & ~flat
+    sigma2 = np.where(has_dof, rss / np.where(has_dof, dof, 1.0) * (effective_n / sw), 0.0)
+
+    # Standard error of the projected value and of the slope
+    safe_sxx = np.where(flat, 1.0, sxx)
+    stderr = np.sqrt(sigma2 * (1.0 + 1.0 / effective_n + (horizon_days - mean_x) ** 2 / safe_sxx))
+    slope_se = np.sqrt(sigma2 / safe_sxx)
+
+    # Two-sided normal confidence that the slope is non-zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.abs(slope) / slope_se
+    z = np.where(slope_se > 0, z, np.where(slope != 0, np.inf, 0.0))
+    confidence = np.where(has_dof, _erf(z / math.sqrt(2)).astype(float), 0.0)
+    return slope, projected, stderr, confidence, effective_n
+
+
+def forecast_cohort(
+    student_ids: Optional[Sequence[str]] = None,
+    method: str = ForecastMethod.LINEAR,
+    horizon_days: int = 30,
+    window: int = 10,
+    alpha: float = 0.3,
+    store: Optional[ProgressStore] = None
+) -> CohortForecast:
+    """
+    Forecast risk trends for many students at once.
+
+    Args:
+        student_ids: Students to forecast (default: every tracked student)
+        method: ForecastMethod.LINEAR or ForecastMethod.EWMA
+        horizon_days: Days ahead to project
+        window: Most recent entries per student used for the fit
+        alpha: Decay factor for the EWMA method
+        store: Progress store (default: the global store)
+
+    Returns:
+        CohortForecast for students with at least one entry
+    """
+    if store is None:
+        store = progress_store
+    ids, counts, timestamps, scores = store.cohort_columns(student_ids, window=window)
+    n_groups = len(ids)
+    if n_groups == 0:
+        empty = np.zeros(0)
+        return CohortForecast([], np.zeros(0, dtype=np.int64), empty, empty, empty, empty, empty, empty, empty,
+                              horizon_days, method)
+
+    group = np.repeat(np.arange(n_groups), counts)
+    ends = np.cumsum(counts)
+    last = ends - 1
+    from_end = last[group] - np.arange(len(scores))
+    days = (timestamps - timestamps[last][group]) / _MICROSECONDS_PER_DAY
+
+    # Histories recorded within a single day have no usable time axis;
+    # treat each entry as one step instead
+    span = -np.minimum.reduceat(days, ends - counts)
+    same_day = span < 1.0
+    if same_day.any():
+        days = np.where(same_day[group], -from_end.astype(float), days)
+        span = np.where(same_day, counts - 1.0, span)
+
+    weights = None
+    if method == ForecastMethod.EWMA:
+        weights = (1.0 - alpha) ** from_end
+    elif method != ForecastMethod.LINEAR:
+        raise ValueError(f"Unknown forecast method: {method}")
+
+    # Never extrapolate further ahead than the history reaches back
+    horizon = np.minimum(float(horizon_days), span)
+
+    slope, projected, stderr, confidence, _ = fit_trends(group, days, scores, n_groups, weights, horizon)
+    current = scores[last]
+    return CohortForecast(
+        student_ids=list(ids),
+        sample_sizes=counts,
+        current_scores=current,
+        slopes=slope,
+        changes=slope * horizon,
+        projected_scores=np.clip(projected, 0.0, 1.0),
+        lower=np.clip(projected - 1.96 * stderr, 0.0, 1.0),
+        upper=np.clip(projected + 1.96 * stderr, 0.0, 1.0),
+        confidence=confidence,
+        horizon_days=horizon_days,
+        method=method
+    )
@@ -0,0 +1,287 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Function-calling support for the Agent Aura reasoning engine.
+Builds typed function declarations from the tool registry and provides a
+tolerant JSON extractor for models that answer in free-form text.
+"""
+
+import inspect
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+
+# Python annotation -> JSON schema type
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array",
+}
+
+_ARG_LINE = re.compile(r"^\s+(\w+):\s*(.+)$")
+
+# Keys that identify an agent step among other JSON objects in a reply
+_STEP_KEYS = ("thought", "action", "actions", "final_response")
+
+# Properties of the dict arguments tools receive, by parameter name. Gemini
+# rejects object schemas without properties; other dict parameters are
+# declared as JSON strings and decoded by coerce_arguments.
+OBJECT_PROPERTIES = {
+    "student_data": {
+        "student_id": {"type": "string"},
+        "name": {"type": "string"},
+        "grade": {"type": "integer"},
+        "gpa": {"type": "number", "description": "Grade point average (0-4)"},
+        "attendance": {"type": "number", "description": "Attendance percentage (0-100)"},
+        "performance": {"type": "string", "description": "Overall performance label"},
+        "status": {"type": "string"}
+    },
+    "risk_analysis": {
+        "student_id": {"type": "string"},
+        "risk_level": {"type": "string", "description": "LOW, MODERATE, HIGH or CRITICAL"},
+        "risk_score": {"type": "number", "description": "Risk score (0-1)"},
+        "risk_factors": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+
+def _json_type(annotation: Any) -> str:
+    """Map a type annotation to a JSON schema type (defaults to string)."""
+    if get_origin(annotation) is Union:
+        annotation = next((a for a in get_args(annotation) if a is not type(None)), str)
+    annotation = get_origin(annotation) or annotation
+    return _JSON_TYPES.get(annotation, "string")
+
+
+def _docstring_args(func) -> Dict[str, str]:
+    """Parse the Google-style 'Args:' section of a tool docstring."""
+    descriptions = {}
+    in_args = False
+    for line in (inspect.getdoc(func) or "").splitlines():
+        stripped = line.strip()
+        if stripped == "Args:":
+            in_args = True
+            continue
+        if in_args:
+            if not stripped or stripped.endswith(":") and " " not in stripped:
+                break
+            match = _ARG_LINE.match("    " + line)
+            if match:
+                descriptions[match.group(1)] = match.group(2).strip()
+    return descriptions
+
+
+def build_function_declaration(name: str, func, description: str) -> dict:
+    """
+    Build a function declaration (JSON schema parameters) for one tool.
+
+    Args:
+        name: Tool name exposed to the model
+        func: Tool function
+        description: Tool description
+
+    Returns:
+        Declaration dict with name, description and parameters
+    """
+    try:
+        hints = get_type_hints(func)
+    except Exception:
+        hints = {}
+    arg_docs = _docstring_args(func)
+
+    properties = {}
+    required = []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        annotation = hints.get(param.name, str)
+        schema = {"type": _json_type(annotation)}
+        if schema["type"] == "array":
+            # Array schemas need an item type (Gemini rejects them otherwise)
+            item_args = [a for a in get_args(annotation) if a is not type(None)]
+            item = get_args(item_args[0]) if item_args and get_origin(annotation) is Union else item_args
+            schema["items"] = {"type": _json_type(item[0] if item else str)}
+        param_doc = arg_docs.get(param.name)
+        if schema["type"] == "object":
+            if param.name in OBJECT_PROPERTIES:
+                schema["properties"] = OBJECT_PROPERTIES[param.name]
+            else:
+                schema = {"type": "string"}
+                param_doc = f"{param_doc or param.name} (JSON object)"
+        if param_doc:
+            schema["description"] = param_doc
+        properties[param.name] = schema
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+
+    return {
+        "name": name,
+        "description": description,
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            "required": required
+        }
+    }
+
+
+@lru_cache(maxsize=32)
+def build_function_declarations(tool_names: Tuple[str, ...]) -> Tuple[dict, ...]:
+    """
+    Build (once per tool set) the declarations for the given registry tools.
+
+    Args:
+        tool_names: Names of enabled tools, as a tuple so the result can be cached
+
+    Returns:
+        Tuple of declaration dicts, in tool order
+    """
+    from app.agent_core.agent import TOOL_REGISTRY
+
+    return tuple(
+        build_function_declaration(name, TOOL_REGISTRY[name]["function"], TOOL_REGISTRY[name]["description"])
+        for name in tool_names
+    )
+
+
+@lru_cache(maxsize=64)
+def _json_string_params(func) -> Tuple[str, ...]:
+    """Dict parameters of a tool that are declared as JSON strings."""
+    try:
+        hints = get_type_hints(func)
+    except Exception:
+        return ()
+    return tuple(
+        name for name, annotation in hints.items()
+        if name != "return" and name not in OBJECT_PROPERTIES and _json_type(annotation) == "object"
+    )
+
+
+def coerce_arguments(func, arguments: dict) -> dict:
+    """
+    Decode the JSON string arguments of dict parameters declared as strings.
+
+    Args:
+        func: Tool function
+        arguments: Arguments from the model
+
+    Returns:
+        Arguments ready to pass to the tool
+    """
+    names = [n for n in _json_string_params(func) if isinstance(arguments.get(n), str)]
+    if not names:
+        return arguments
+    coerced = dict(arguments)
+    for name in names:
+        try:
+            coerced[name] = json.loads(coerced[name])
+        except json.JSONDecodeError:
+            pass
+    return coerced
+
+
+class JSONStreamExtractor:
+    """
+    Incrementally extracts top-level JSON objects from streamed text.
+
+    Anything outside balanced braces (prose, markdown code fences) is ignored,
+    so replies such as ```json {...} ``` still parse.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[dict]:
+        """
+        Consume more text.
+
+        Args:
+            text: Next chunk of model output
+
+        Returns:
+            JSON objects completed by this chunk
+        """
+        objects = []
+        start = 0 if self._depth else None
+        for i, ch in enumerate(text):
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._chunks.append(text[start:i + 1])
+                    candidate = "".join(self._chunks)
+                    self._chunks = []
+                    try:
+                        parsed = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(parsed, dict):
+                        objects.append(parsed)
+
+        if self._depth:
+            self._chunks.append(text[start:])
+        return objects
+
+
+def extract_json_object(text: str) -> Optional[dict]:
+    """
+    Find the agent step object in free-form model output.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        The first object containing a step key, else the first object, else None
+    """
+    objects = JSONStreamExtractor().feed(text)
+    for obj in objects:
+        if any(key in obj for key in _STEP_KEYS):
+            return obj
+    return objects[0] if objects else None
+
+
+# ============================================================================
+# Provider formats
+# ============================================================================
+
+def to_gemini_tools(declarations) -> list:
+    """Gemini: one Tool holding all function declarations."""
+    return [{"function_declarations": list(declarations)}]
+
+
+def to_openai_tools(declarations) -> list:
+    """OpenAI-compatible chat completions 'tools' parameter."""
+    return [{"type": "function", "function": decl} for decl in declarations]
+
+
+def to_anthropic_tools(declarations) -> list:
+    """Anthropic messages 'tools' parameter."""
+    return [
+        {"name": decl["name"], "description": decl["description"], "input_schema": decl["parameters"]}
+        for decl in declarations
+    ]
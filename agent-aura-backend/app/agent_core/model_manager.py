@@ -1,9 +1,13 @@
 import os
+import json
 import logging
 import asyncio
 from typing import Optional, Dict, List
 from dataclasses import dataclass
 
+from app.agent_core.cassette import cassette
+from app.agent_core.function_calling import to_gemini_tools, to_openai_tools, to_anthropic_tools
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -28,11 +32,15 @@ class ModelManager:
         "gpt-4o-mini": ModelConfig("openai", "gpt-4o-mini", "OPENAI_API_KEY"),
         "claude-3-5-sonnet-20241022": ModelConfig("anthropic", "claude-3-5-sonnet-20241022", "ANTHROPIC_API_KEY"),
         "llama-3.1-sonar-large-128k-online": ModelConfig("perplexity", "llama-3.1-sonar-large-128k-online", "PERPLEXITY_API_KEY"),
+        # Local stub provider for offline load testing (python -m app.agent_core.stub_llm)
+        "stub-openai": ModelConfig("stub", "stub-openai", "STUB_LLM_URL"),
+        "stub-gemini": ModelConfig("stub", "stub-gemini", "STUB_LLM_URL"),
     }
 
     def __init__(self):
         self.default_model = os.getenv("ORCHESTRATOR_MODEL", "gemini-3-pro-preview")
-        self._clients = {}
+        # Records or replays every call when LLM_CASSETTE_MODE is set
+        self.cassette = cassette
 
     def get_available_models(self) -> List[Dict[str, str]]:
         """Returns a list of available models and their providers."""
@@ -54,20 +62,72 @@ class ModelManager:
         config = self.AVAILABLE_MODELS[target_model]
         
         try:
-            if config.provider == "google":
-                return await self._call_gemini(config.model_name, prompt)
-            elif config.provider == "openai":
-                return await self._call_openai(config.model_name, prompt)
-            elif config.provider == "anthropic":
-                return await self._call_anthropic(config.model_name, prompt)
-            elif config.provider == "perplexity":
-                return await self._call_perplexity(config.model_name, prompt)
-            else:
-                raise ValueError(f"Unsupported provider: {config.provider}")
+            return await self.cassette.call(
+                "generate_content", target_model, prompt,
+                lambda: self._generate_content(config, prompt)
+            )
         except Exception as e:
             logger.error(f"Error calling {target_model}: {e}")
             raise e
 
+    async def _generate_content(self, config: ModelConfig, prompt: str) -> str:
+        if config.provider == "google":
+            return await self._call_gemini(config.model_name, prompt)
+        elif config.provider == "openai":
+            return await self._call_openai(config.model_name, prompt)
+        elif config.provider == "anthropic":
+            return await self._call_anthropic(config.model_name, prompt)
+        elif config.provider == "perplexity":
+            return await self._call_perplexity(config.model_name, prompt)
+        elif config.provider == "stub":
+            return (await self._call_stub(config.model_name, prompt))["text"]
+        else:
+            raise ValueError(f"Unsupported provider: {config.provider}")
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        tool_declarations,
+        model_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Generates content with native function calling.
+        
+        Returns a provider-independent dict:
+        {"text": str, "tool_calls": [{"name": str, "arguments": dict}, ...]}
+        Providers without function calling return their text and no tool calls.
+        """
+        target_model = model_id or self.default_model
+        
+        if target_model not in self.AVAILABLE_MODELS:
+            logger.warning(f"Model {target_model} not found, falling back to default {self.default_model}")
+            target_model = self.default_model
+
+        config = self.AVAILABLE_MODELS[target_model]
+        
+        try:
+            return await self.cassette.call(
+                "generate_with_tools", target_model, prompt,
+                lambda: self._generate_with_tools(config, prompt, tool_declarations),
+                extra=",".join(decl["name"] for decl in tool_declarations)
+            )
+        except Exception as e:
+            logger.error(f"Error calling {target_model} with tools: {e}")
+            raise e
+
+    async def _generate_with_tools(self, config: ModelConfig, prompt: str, tool_declarations) -> Dict:
+        if config.provider == "google":
+            return await self._call_gemini_tools(config.model_name, prompt, tool_declarations)
+        elif config.provider == "openai":
+            return await self._call_openai_tools(config.model_name, prompt, tool_declarations)
+        elif config.provider == "anthropic":
+            return await self._call_anthropic_tools(config.model_name, prompt, tool_declarations)
+        elif config.provider == "stub":
+            return await self._call_stub(config.model_name, prompt, tool_declarations)
+        else:
+            text = await self._generate_content(config, prompt)
+            return {"text": text, "tool_calls": []}
+
     async def _call_gemini(self, model_name: str, prompt: str) -> str:
         import google.generativeai as genai
         from app.config import get_settings
@@ -82,6 +142,29 @@ class ModelManager:
         response = await asyncio.to_thread(model.generate_content, prompt)
         return response.text
 
+    async def _call_gemini_tools(self, model_name: str, prompt: str, tool_declarations) -> Dict:
+        import google.generativeai as genai
+        from app.config import get_settings
+        settings = get_settings()
+        
+        api_key = settings.GEMINI_API_KEY
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not set")
+        
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name, tools=to_gemini_tools(tool_declarations))
+        response = await asyncio.to_thread(model.generate_content, prompt)
+        
+        text_parts = []
+        tool_calls = []
+        for part in response.candidates[0].content.parts:
+            if part.function_call and part.function_call.name:
+                call = type(part.function_call).to_dict(part.function_call)
+                tool_calls.append({"name": call["name"], "arguments": call.get("args") or {}})
+            elif part.text:
+                text_parts.append(part.text)
+        return {"text": "".join(text_parts), "tool_calls": tool_calls}
+
     async def _call_openai(self, model_name: str, prompt: str) -> str:
         from openai import AsyncOpenAI
         from app.config import get_settings
@@ -98,6 +181,28 @@ class ModelManager:
         )
         return response.choices[0].message.content
 
+    async def _call_openai_tools(self, model_name: str, prompt: str, tool_declarations) -> Dict:
+        from openai import AsyncOpenAI
+        from app.config import get_settings
+        settings = get_settings()
+        
+        api_key = settings.OPENAI_API_KEY
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not set")
+            
+        client = AsyncOpenAI(api_key=api_key)
+        response = await client.chat.completions.create(
+            model=model_name,
+            messages=[{"role": "user", "content": prompt}],
+            tools=to_openai_tools(tool_declarations)
+        )
+        message = response.choices[0].message
+        tool_calls = [
+            {"name": call.function.name, "arguments": json.loads(call.function.arguments or "{}")}
+            for call in (message.tool_calls or [])
+        ]
+        return {"text": message.content or "", "tool_calls": tool_calls}
+
     async def _call_anthropic(self, model_name: str, prompt: str) -> str:
         from anthropic import AsyncAnthropic
         from app.config import get_settings
@@ -115,6 +220,31 @@ class ModelManager:
         )
         return response.content[0].text
 
+    async def _call_anthropic_tools(self, model_name: str, prompt: str, tool_declarations) -> Dict:
+        from anthropic import AsyncAnthropic
+        from app.config import get_settings
+        settings = get_settings()
+        
+        api_key = settings.ANTHROPIC_API_KEY
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set")
+            
+        client = AsyncAnthropic(api_key=api_key)
+        response = await client.messages.create(
+            model=model_name,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": prompt}],
+            tools=to_anthropic_tools(tool_declarations)
+        )
+        text_parts = []
+        tool_calls = []
+        for block in response.content:
+            if block.type == "tool_use":
+                tool_calls.append({"name": block.name, "arguments": block.input or {}})
+            elif block.type == "text":
+                text_parts.append(block.text)
+        return {"text": "".join(text_parts), "tool_calls": tool_calls}
+
     async def _call_perplexity(self, model_name: str, prompt: str) -> str:
         from openai import AsyncOpenAI
         from app.config import get_settings
@@ -132,6 +262,80 @@ class ModelManager:
         )
         return response.choices[0].message.content
 
+    def _stub_client(self):
+        """
+        New HTTP client for the stub provider, closed by the caller after one call.
+        
+        A client cached across calls would be bound to the event loop that
+        created it and leak its connections when the loop changes.
+        """
+        import httpx
+
+        base_url = os.getenv("STUB_LLM_URL", "http://127.0.0.1:8090")
+        return httpx.AsyncClient(base_url=base_url, timeout=60.0)
+
+    async def _call_stub(self, model_name: str, prompt: str, tool_declarations=None) -> Dict:
+        """
+        Call the local stub provider in its OpenAI or Gemini request shape.
+        
+        Streams the reply token by token when STUB_LLM_STREAM=true.
+        Error and 429 responses raise httpx.HTTPStatusError.
+        """
+        stream = os.getenv("STUB_LLM_STREAM", "false").lower() == "true"
+        gemini = model_name.startswith("stub-gemini")
+        
+        if gemini:
+            body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+            if tool_declarations:
+                body["tools"] = to_gemini_tools(tool_declarations)
+            method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+            url = f"/v1beta/models/{model_name}:{method}"
+        else:
+            body = {"model": model_name, "messages": [{"role": "user", "content": prompt}], "stream": stream}
+            if tool_declarations:
+                body["tools"] = to_openai_tools(tool_declarations)
+            url = "/v1/chat/completions"
+        
+        async with self._stub_client() as client:
+            if not stream:
+                response = await client.post(url, json=body)
+                response.raise_for_status()
+                chunks = [response.json()]
+            else:
+                chunks = []
+                async with client.stream("POST", url, json=body) as response:
+                    if response.is_error:
+                        await response.aread()
+                        response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line.startswith("data: ") and line != "data: [DONE]":
+                            chunks.append(json.loads(line[6:]))
+        
+        text_parts = []
+        tool_calls = {}
+        for chunk in chunks:
+            if gemini:
+                for part in chunk["candidates"][0]["content"].get("parts", []):
+                    if "functionCall" in part:
+                        call = part["functionCall"]
+                        tool_calls[len(tool_calls)] = {"name": call["name"], "arguments": call.get("args") or {}}
+                    elif part.get("text"):
+                        text_parts.append(part["text"])
+                continue
+            choice = chunk["choices"][0]
+            message = choice.get("delta") if stream else choice["message"]
+            if message.get("content"):
+                text_parts.append(message["content"])
+            for index, call in enumerate(message.get("tool_calls") or []):
+                entry = tool_calls.setdefault(call.get("index", index), {"name": "", "arguments": ""})
+                entry["name"] += call["function"].get("name") or ""
+                entry["arguments"] += call["function"].get("arguments") or ""
+        
+        if not gemini:
+            for entry in tool_calls.values():
+                entry["arguments"] = json.loads(entry["arguments"] or "{}")
+        return {"text": "".join(text_parts), "tool_calls": [tool_calls[i] for i in sorted(tool_calls)]}
+
  
 # Global instance
 model_manager = ModelManager()
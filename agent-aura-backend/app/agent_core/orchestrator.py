@@ -21,6 +21,7 @@ from app.agent_core.tools import (
     predict_intervention_success
 )
 from app.agent_core.model_manager import model_manager
+from app.agent_core.prompts import compile_orchestrator_prompt
 
 
 @dataclass
@@ -124,7 +125,9 @@ class MultiAgentOrchestrator:
         executed_agents = []
 
         # Orchestrator initial thought
-        thought_prompt = f"I need to analyze student {student_id}. I will activate the following agents: {', '.join(self.enabled_agents)}. What is my plan?"
+        thought_prompt = compile_orchestrator_prompt(tuple(self.enabled_agents)).render(
+            f"Student ID: {student_id}\n"
+        )
         try:
             thought_content = await model_manager.generate_content(thought_prompt, self.model_override)
         except Exception as e:
@@ -0,0 +1,429 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Notification outbox for Agent Aura.
+Generated alert emails are stored durably in SQLite, indexed by student,
+grade, priority, status and time, with a bounded in-memory ring of the most
+recent items. A dedupe key suppresses repeated alerts within a time window.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email_id TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    grade TEXT,
+    priority TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    dedupe_key TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    payload TEXT NOT NULL,
+    change_seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_student ON notifications (student_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_status ON notifications (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_grade ON notifications (grade, status, risk_level, created_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_dedupe ON notifications (dedupe_key, created_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_email ON notifications (email_id);
+"""
+
+# Every insert and state change takes the next change sequence number, so
+# snapshots can checkpoint changes rather than only new items
+NEXT_CHANGE_SEQ = "(SELECT COALESCE(MAX(change_seq), 0) + 1 FROM notifications)"
+
+COLUMNS = "id, status, attempts, last_error, updated_at, payload"
+
+# UPDATE ... RETURNING needs SQLite 3.35; older libraries select, then update
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+class NotificationStatus:
+    """Delivery states of an outbox item."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+def _row_to_record(row) -> dict:
+    record = json.loads(row[5])
+    record.update({
+        "outbox_id": row[0],
+        "delivery_status": row[1],
+        "attempts": row[2],
+        "last_error": row[3],
+        "updated_at": row[4]
+    })
+    return record
+
+
+class NotificationOutbox:
+    """
+    Durable, indexed store of generated notifications.
+
+    Every item is written to SQLite; the most recent ones are also kept in
+    a bounded ring so "latest alerts" views never touch the database.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ring_size: int = 1000,
+        dedupe_window_hours: Optional[float] = None
+    ):
+        """
+        Initialize the outbox (the database is opened on first use).
+
+        Args:
+            path: SQLite file path, or ":memory:" (default: NOTIFICATION_OUTBOX_PATH
+                env or ./output/notification_outbox.db)
+            ring_size: Number of recent notifications kept in memory
+            dedupe_window_hours: Suppress alerts with the same dedupe key within
+                this many hours (default: NOTIFICATION_DEDUPE_HOURS env or 24)
+        """
+        self.path = path or os.getenv("NOTIFICATION_OUTBOX_PATH", "./output/notification_outbox.db")
+        if dedupe_window_hours is None:
+            dedupe_window_hours = float(os.getenv("NOTIFICATION_DEDUPE_HOURS", "24"))
+        self.dedupe_window = timedelta(hours=dedupe_window_hours)
+        self._ring: deque = deque(maxlen=ring_size)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            # Warm the ring with the latest stored items
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM notifications ORDER BY id DESC LIMIT ?", (self._ring.maxlen,)
+            ).fetchall()
+            self._ring.extend(_row_to_record(row) for row in reversed(rows))
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add the change sequence to older databases (numbered in creation order)."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(notifications)")}
+        if "change_seq" not in existing:
+            conn.execute("ALTER TABLE notifications ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0")
+            conn.execute("UPDATE notifications SET change_seq = id")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_change ON notifications (change_seq)")
+        conn.commit()
+
+    def close(self):
+        """Close the database connection and clear the ring."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._ring.clear()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, record: dict, dedupe_key: Optional[str] = None, grade=None) -> Tuple[dict, bool]:
+        """
+        Store a generated notification unless a duplicate is still recent.
+
+        Args:
+            record: Email record (needs email_id, student_id, priority, risk_level, timestamp)
+            dedupe_key: Items with the same key within the dedupe window are duplicates
+            grade: Student grade/class used for grouping queries
+
+        Returns:
+            Tuple (stored record, created); created is False for a duplicate,
+            in which case the earlier record is returned
+        """
+        return self.add_many([record], [dedupe_key], [grade])[0]
+
+    def add_many(
+        self,
+        records: List[dict],
+        dedupe_keys: Optional[List[Optional[str]]] = None,
+        grades: Optional[list] = None
+    ) -> List[Tuple[dict, bool]]:
+        """
+        Store several notifications in one transaction (see add).
+
+        Args:
+            records: Email records
+            dedupe_keys: Dedupe key per record (None entries are never deduplicated)
+            grades: Grade per record
+
+        Returns:
+            List of (stored record, created) tuples in input order
+        """
+        dedupe_keys = dedupe_keys or [None] * len(records)
+        grades = grades or [None] * len(records)
+        results = []
+        with self._lock:
+            conn = self.conn
+            # Take the write lock before the dedupe lookups, so workers sharing
+            # the file cannot both see "no duplicate" and insert
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record, dedupe_key, grade in zip(records, dedupe_keys, grades):
+                    created_at = record.get("timestamp") or datetime.now().isoformat()
+                    if dedupe_key is not None:
+                        # Also sees rows inserted earlier in this transaction
+                        since = (datetime.fromisoformat(created_at) - self.dedupe_window).isoformat()
+                        row = conn.execute(
+                            f"SELECT {COLUMNS} FROM notifications WHERE dedupe_key = ? AND created_at >= ? "
+                            "ORDER BY id DESC LIMIT 1",
+                            (dedupe_key, since)
+                        ).fetchone()
+                        if row is not None:
+                            results.append((_row_to_record(row), False))
+                            continue
+
+                    cursor = conn.execute(
+                        "INSERT INTO notifications (email_id, student_id, grade, priority, risk_level, status, "
+                        "dedupe_key, created_at, updated_at, payload, change_seq) "
+                        f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NEXT_CHANGE_SEQ})",
+                        (record["email_id"], record["student_id"], None if grade is None else str(grade),
+                         record["priority"], record["risk_level"], NotificationStatus.PENDING,
+                         dedupe_key, created_at, created_at, json.dumps(record, default=str))
+                    )
+                    stored = dict(record)
+                    stored.update({
+                        "outbox_id": cursor.lastrowid,
+                        "delivery_status": NotificationStatus.PENDING,
+                        "attempts": 0,
+                        "last_error": None,
+                        "updated_at": created_at
+                    })
+                    results.append((stored, True))
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            self._ring.extend(stored for stored, created in results if created)
+        return results
+
+    def mark(self, outbox_ids: List[int], status: str, error: Optional[str] = None, attempt: int = 0):
+        """
+        Update the delivery state of items.
+
+        Args:
+            outbox_ids: Items to update
+            status: New NotificationStatus
+            error: Last delivery error (cleared when None)
+            attempt: Number of delivery attempts to count (True counts one)
+        """
+        if not outbox_ids:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE notifications SET status = ?, last_error = ?, updated_at = ?, "
+                f"attempts = attempts + ?, change_seq = {NEXT_CHANGE_SEQ} WHERE id = ?",
+                [(status, error, now, int(attempt), outbox_id) for outbox_id in outbox_ids]
+            )
+            self.conn.commit()
+            ids = set(outbox_ids)
+            for item in self._ring:
+                if item["outbox_id"] in ids:
+                    item["delivery_status"] = status
+                    item["last_error"] = error
+                    item["updated_at"] = now
+                    item["attempts"] += int(attempt)
+
+    def claim(self, limit: int) -> List[dict]:
+        """
+        Move up to limit pending items (oldest first) to SENDING and return them.
+
+        Args:
+            limit: Maximum number of items
+
+        Returns:
+            Claimed records
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            # Select and update in one write transaction, so workers sharing
+            # the file never claim the same item
+            rows = self._update_returning(
+                "status = ?, updated_at = ?", (NotificationStatus.SENDING, now),
+                "id IN (SELECT id FROM notifications WHERE status = ? ORDER BY id LIMIT ?)",
+                (NotificationStatus.PENDING, limit)
+            )
+            records = sorted((_row_to_record(row) for row in rows), key=lambda r: r["outbox_id"])
+            ids = {record["outbox_id"] for record in records}
+            for item in self._ring:
+                if item["outbox_id"] in ids:
+                    item["delivery_status"] = NotificationStatus.SENDING
+                    item["updated_at"] = now
+        return records
+
+    def requeue_stale(self, older_than_seconds: float = 300) -> int:
+        """
+        Return items stuck in SENDING (e.g. after a crash) to PENDING.
+
+        Args:
+            older_than_seconds: Only items claimed at least this long ago
+
+        Returns:
+            Number of items requeued
+        """
+        cutoff = (datetime.now() - timedelta(seconds=older_than_seconds)).isoformat()
+        with self._lock:
+            rows = self._update_returning(
+                "status = ?", (NotificationStatus.PENDING,),
+                "status = ? AND updated_at <= ?", (NotificationStatus.SENDING, cutoff)
+            )
+            ids = {row[0] for row in rows}
+            for item in self._ring:
+                if item["outbox_id"] in ids:
+                    item["delivery_status"] = NotificationStatus.PENDING
+            return len(ids)
+
+    def _update_returning(self, assignments: str, values: tuple, where: str, params: tuple) -> list:
+        """
+        UPDATE the matching rows and return them (COLUMNS, after the update) in one transaction.
+
+        The rows also take the next change sequence number. Callers hold self._lock.
+        """
+        conn = self.conn
+        assignments += f", change_seq = {NEXT_CHANGE_SEQ}"
+        if SUPPORTS_RETURNING:
+            rows = conn.execute(
+                f"UPDATE notifications SET {assignments} WHERE {where} RETURNING {COLUMNS}", (*values, *params)
+            ).fetchall()
+            conn.commit()
+            return rows
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = [row[0] for row in conn.execute(f"SELECT id FROM notifications WHERE {where}", params)]
+            conn.executemany(
+                f"UPDATE notifications SET {assignments} WHERE id = ?", [(*values, outbox_id) for outbox_id in ids]
+            )
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM notifications WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            ).fetchall()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return rows
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Most recent notifications from the in-memory ring, newest first."""
+        with self._lock:
+            self.conn  # opening the database warms the ring
+            return list(self._ring)[::-1][:limit]
+
+    def get(self, outbox_id: int) -> Optional[dict]:
+        """Return one notification by outbox id."""
+        with self._lock:
+            row = self.conn.execute(f"SELECT {COLUMNS} FROM notifications WHERE id = ?", (outbox_id,)).fetchone()
+        return _row_to_record(row) if row else None
+
+    def query(
+        self,
+        student_id: Optional[str] = None,
+        grade=None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """
+        Indexed lookup of notifications, newest first.
+
+        Args:
+            student_id: Only this student
+            grade: Only this grade/class
+            status: Only this delivery status
+            priority: Only this priority (URGENT, HIGH, ...)
+            risk_level: Only this risk level
+            since: Created at or after this ISO timestamp
+            until: Created at or before this ISO timestamp
+            limit: Maximum number of results
+
+        Returns:
+            Matching notification records
+        """
+        clauses = []
+        params: list = []
+        for column, value in (("student_id", student_id), ("grade", grade), ("status", status),
+                              ("priority", priority), ("risk_level", risk_level)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS} FROM notifications {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [_row_to_record(row) for row in rows]
+
+    def status_counts(self) -> dict:
+        """Number of notifications per delivery status."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM notifications GROUP BY status").fetchall())
+
+    def max_change_seq(self) -> int:
+        """Sequence number of the most recent insert or state change (0 if empty)."""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(change_seq), 0) FROM notifications").fetchone()[0]
+
+    def iter_changes(self, after_seq: int = 0, up_to_seq: Optional[int] = None) -> Iterator[dict]:
+        """
+        Stream the current state of notifications inserted or changed in (after_seq, up_to_seq].
+
+        An item changed again after up_to_seq is left out; it is part of a later range.
+        """
+        query = f"SELECT {COLUMNS} FROM notifications WHERE change_seq > ?"
+        params = [after_seq]
+        if up_to_seq is not None:
+            query += " AND change_seq <= ?"
+            params.append(up_to_seq)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY change_seq, id", params).fetchall()
+        for row in rows:
+            yield _row_to_record(row)
+
+
+# Global outbox used by the notification tools
+notification_outbox = NotificationOutbox()
@@ -0,0 +1,846 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Durable progress history store for Agent Aura.
+Append-only SQLite log with a per-student index and an in-memory hot tier
+of recently used student histories. Safe to share between uvicorn workers
+(each worker catches up on rows appended by others when it reads).
+
+Each student row also carries running aggregates (first/last/min/max/sum,
+EWMA, level histogram) updated by every append, so summary statistics never
+rescan the history.
+
+Hot histories are columnar (epoch-microsecond timestamps, float32 scores,
+small-int risk levels, sparse interned notes); dict-shaped entries are
+materialized only when requested.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress_students (
+    student_id TEXT PRIMARY KEY,
+    student_name TEXT,
+    created_date TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    first_score REAL,
+    last_score REAL,
+    min_score REAL,
+    max_score REAL,
+    score_sum REAL NOT NULL DEFAULT 0,
+    ewma_score REAL,
+    level_counts TEXT NOT NULL DEFAULT '{}',
+    rollup_generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS progress_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    risk_score REAL NOT NULL,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_progress_entries_student ON progress_entries (student_id, id);
+CREATE INDEX IF NOT EXISTS idx_progress_entries_timestamp ON progress_entries (timestamp);
+CREATE TABLE IF NOT EXISTS progress_rollups (
+    student_id TEXT NOT NULL,
+    period TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    min_score REAL NOT NULL,
+    max_score REAL NOT NULL,
+    score_sum REAL NOT NULL,
+    last_timestamp TEXT NOT NULL,
+    last_level TEXT NOT NULL,
+    last_score REAL NOT NULL,
+    PRIMARY KEY (student_id, period, period_start)
+);
+"""
+
+ENTRY_COLUMNS = "id, date, timestamp, risk_level, risk_score, notes"
+
+# Running aggregate columns added to progress_students (migrated in place)
+AGGREGATE_COLUMNS = {
+    "first_score": "REAL",
+    "last_score": "REAL",
+    "min_score": "REAL",
+    "max_score": "REAL",
+    "score_sum": "REAL NOT NULL DEFAULT 0",
+    "ewma_score": "REAL",
+    "level_counts": "TEXT NOT NULL DEFAULT '{}'",
+}
+
+ROLLUP_UPSERT = (
+    "INSERT INTO progress_rollups (student_id, period, period_start, count, min_score, max_score, score_sum, "
+    "last_timestamp, last_level, last_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(student_id, period, period_start) DO UPDATE SET "
+    "count = count + excluded.count, "
+    "min_score = MIN(min_score, excluded.min_score), "
+    "max_score = MAX(max_score, excluded.max_score), "
+    "score_sum = score_sum + excluded.score_sum, "
+    "last_level = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_level ELSE last_level END, "
+    "last_score = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last_score ELSE last_score END, "
+    "last_timestamp = MAX(last_timestamp, excluded.last_timestamp)"
+)
+
+# Smoothing factor of the per-student exponentially weighted moving average
+EWMA_ALPHA = float(os.getenv("PROGRESS_EWMA_ALPHA", "0.3"))
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Risk level <-> small int code; unknown levels get the next free code
+RISK_LEVELS: List[str] = ["LOW", "MODERATE", "HIGH", "CRITICAL"]
+_LEVEL_CODES: Dict[str, int] = {level: code for code, level in enumerate(RISK_LEVELS)}
+
+
+def level_code(level: str) -> int:
+    """Return the small int code of a risk level."""
+    code = _LEVEL_CODES.get(level)
+    if code is None:
+        code = len(RISK_LEVELS)
+        RISK_LEVELS.append(level)
+        _LEVEL_CODES[level] = code
+    return code
+
+
+def to_epoch_us(timestamp: str) -> int:
+    """ISO timestamp -> microseconds since the epoch (naive times are kept as-is)."""
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> str:
+    """Microseconds since the epoch -> ISO timestamp."""
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def _range_bound(value: str, upper: bool) -> int:
+    """Convert an ISO date/timestamp bound; a bare date as upper bound covers the whole day."""
+    bound = to_epoch_us(value)
+    if upper and len(value) == 10:
+        bound += 86_400_000_000 - 1
+    return bound
+
+
+def _merge_buckets(rows, bucket_of) -> Dict[tuple, list]:
+    """
+    Fold (student_id, timestamp, level, score, count, min, max, sum) rows into buckets.
+
+    Returns:
+        (student_id, bucket) -> [count, min, max, sum, last_timestamp, last_level, last_score]
+    """
+    buckets: Dict[tuple, list] = {}
+    for student_id, timestamp, level, score, count, low, high, total in rows:
+        key = (student_id, bucket_of(timestamp))
+        agg = buckets.get(key)
+        if agg is None:
+            buckets[key] = [count, low, high, total, timestamp, level, score]
+            continue
+        agg[0] += count
+        agg[1] = min(agg[1], low)
+        agg[2] = max(agg[2], high)
+        agg[3] += total
+        if timestamp >= agg[4]:
+            agg[4], agg[5], agg[6] = timestamp, level, score
+    return buckets
+
+
+def week_start(date: str) -> str:
+    """Monday of the ISO week containing date (YYYY-MM-DD)."""
+    day = datetime.fromisoformat(date[:10])
+    return (day - timedelta(days=day.weekday())).date().isoformat()
+
+
+class CompactHistory:
+    """
+    Columnar history of one student.
+
+    Roughly 13 bytes per data point instead of a dict with several strings.
+    """
+    __slots__ = ("timestamps", "scores", "levels", "notes", "last_id", "generation")
+
+    def __init__(self, generation: int = 0):
+        self.timestamps = array("q")  # epoch microseconds
+        self.scores = array("f")      # float32 risk scores
+        self.levels = array("b")      # risk level codes
+        self.notes: Dict[int, str] = {}  # index -> note, only non-empty notes
+        self.last_id = 0
+        self.generation = generation  # rollup generation the points were loaded at
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: str, risk_score: float, risk_level: str, notes: str = ""):
+        """Append one data point."""
+        if notes:
+            self.notes[len(self.timestamps)] = sys.intern(notes)
+        self.timestamps.append(to_epoch_us(timestamp))
+        self.scores.append(risk_score)
+        self.levels.append(level_code(risk_level))
+
+    def score(self, index: int) -> float:
+        """Risk score at index, rounded back from float32."""
+        return round(self.scores[index], 6)
+
+    def entry(self, index: int) -> dict:
+        """Materialize one data point in the legacy dict shape."""
+        timestamp = from_epoch_us(self.timestamps[index])
+        return {
+            "date": timestamp[:10],
+            "timestamp": timestamp,
+            "risk_level": RISK_LEVELS[self.levels[index]],
+            "risk_score": self.score(index),
+            "notes": self.notes.get(index, "")
+        }
+
+    def index_range(self, start: Optional[str] = None, end: Optional[str] = None) -> range:
+        """Indices of points within [start, end] (ISO dates or timestamps)."""
+        lo = 0 if start is None else bisect_left(self.timestamps, _range_bound(start, upper=False))
+        hi = len(self) if end is None else bisect_right(self.timestamps, _range_bound(end, upper=True))
+        return range(lo, max(lo, hi))
+
+    def to_dicts(self, indices: Optional[range] = None) -> List[dict]:
+        """Materialize a range of points (default: all) as dicts."""
+        if indices is None:
+            indices = range(len(self))
+        return [self.entry(i) for i in indices]
+
+
+class ProgressStore:
+    """
+    Append-only progress history with a per-student index.
+
+    Writes are single-row appends (bulk loads use append_many). Reads load one student's history into
+    the hot tier (bounded LRU) and afterwards only fetch newer rows.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_hot_students: int = 1024):
+        """
+        Initialize the store (the database is opened on first use).
+
+        Args:
+            path: SQLite file path, or ":memory:" (default: PROGRESS_STORE_PATH
+                env or ./output/progress_store.db)
+            max_hot_students: Number of student histories kept in memory
+        """
+        self.path = path or os.getenv("PROGRESS_STORE_PATH", "./output/progress_store.db")
+        self.max_hot_students = max_hot_students
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._hot: "OrderedDict[str, CompactHistory]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add the aggregate columns to older databases and backfill them."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(progress_students)")}
+        if "rollup_generation" not in existing:
+            conn.execute("ALTER TABLE progress_students ADD COLUMN rollup_generation INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+        missing = [name for name in AGGREGATE_COLUMNS if name not in existing]
+        if not missing:
+            return
+        for name in missing:
+            conn.execute(f"ALTER TABLE progress_students ADD COLUMN {name} {AGGREGATE_COLUMNS[name]}")
+
+        aggregates: Dict[str, dict] = {}
+        for student_id, risk_level, risk_score in conn.execute(
+            "SELECT student_id, risk_level, risk_score FROM progress_entries ORDER BY id"
+        ):
+            agg = aggregates.get(student_id)
+            if agg is None:
+                agg = aggregates[student_id] = {
+                    "first": risk_score, "min": risk_score, "max": risk_score,
+                    "sum": 0.0, "ewma": risk_score, "levels": {}
+                }
+            else:
+                agg["min"] = min(agg["min"], risk_score)
+                agg["max"] = max(agg["max"], risk_score)
+                agg["ewma"] = EWMA_ALPHA * risk_score + (1 - EWMA_ALPHA) * agg["ewma"]
+            agg["last"] = risk_score
+            agg["sum"] += risk_score
+            agg["levels"][risk_level] = agg["levels"].get(risk_level, 0) + 1
+
+        conn.executemany(
+            "UPDATE progress_students SET first_score = ?, last_score = ?, min_score = ?, max_score = ?, "
+            "score_sum = ?, ewma_score = ?, level_counts = ? WHERE student_id = ?",
+            [
+                (a["first"], a["last"], a["min"], a["max"], a["sum"], a["ewma"], json.dumps(a["levels"]), student_id)
+                for student_id, a in aggregates.items()
+            ]
+        )
+        conn.commit()
+
+    def close(self):
+        """Close the database connection and drop the hot tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._hot.clear()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, student_id: str, entry: dict, student_name: str = "") -> int:
+        """
+        Append one progress entry.
+
+        Args:
+            student_id: Student identifier
+            entry: Dict with date, timestamp, risk_level, risk_score, notes
+            student_name: Student name (kept if a later append omits it)
+
+        Returns:
+            Row id of the new entry
+        """
+        risk_score = float(entry["risk_score"])
+        level_path = f'$."{entry["risk_level"]}"'
+        with self._lock:
+            conn = self.conn
+            cursor = conn.execute(
+                "INSERT INTO progress_entries (student_id, date, timestamp, risk_level, risk_score, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (student_id, entry["date"], entry["timestamp"], entry["risk_level"],
+                 risk_score, entry.get("notes", ""))
+            )
+            # Running aggregates are folded in by the upsert itself, so
+            # concurrent writers from other workers cannot lose updates
+            conn.execute(
+                "INSERT INTO progress_students (student_id, student_name, created_date, last_updated, entry_count, "
+                "first_score, last_score, min_score, max_score, score_sum, ewma_score, level_counts) "
+                "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, json_object(?, 1)) "
+                "ON CONFLICT(student_id) DO UPDATE SET "
+                "last_updated = excluded.last_updated, "
+                "entry_count = entry_count + 1, "
+                "student_name = COALESCE(NULLIF(excluded.student_name, ''), student_name), "
+                "last_score = excluded.last_score, "
+                "min_score = MIN(min_score, excluded.min_score), "
+                "max_score = MAX(max_score, excluded.max_score), "
+                "score_sum = score_sum + excluded.score_sum, "
+                "ewma_score = ? * excluded.ewma_score + (1 - ?) * ewma_score, "
+                "level_counts = json_set(level_counts, ?, COALESCE(json_extract(level_counts, ?), 0) + 1)",
+                (student_id, student_name, entry["timestamp"], entry["timestamp"],
+                 risk_score, risk_score, risk_score, risk_score, risk_score, risk_score, entry["risk_level"],
+                 EWMA_ALPHA, EWMA_ALPHA, level_path, level_path)
+            )
+            conn.commit()
+            if student_id in self._hot:
+                self._sync(student_id)
+            return cursor.lastrowid
+
+    def append_many(self, entries: Iterable[dict], batch_size: int = 10000) -> int:
+        """
+        Bulk-append progress entries (seeding, imports).
+
+        Entries of a student must be in chronological order. Each batch is
+        one transaction: the entries are inserted with executemany and the
+        per-student aggregates of the batch are folded in with one upsert per
+        student, giving the same aggregates as appending one entry at a time.
+
+        Args:
+            entries: Dicts with student_id, date, timestamp, risk_level,
+                risk_score and optionally notes and student_name
+            batch_size: Entries per transaction
+
+        Returns:
+            Number of entries appended
+        """
+        total = 0
+        batch: List[dict] = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                total += self._append_batch(batch)
+                batch = []
+        if batch:
+            total += self._append_batch(batch)
+        return total
+
+    def _append_batch(self, batch: List[dict]) -> int:
+        aggregates: Dict[str, dict] = {}
+        rows = []
+        for entry in batch:
+            student_id = entry["student_id"]
+            score = float(entry["risk_score"])
+            level = entry["risk_level"]
+            rows.append((student_id, entry["date"], entry["timestamp"], level, score, entry.get("notes") or ""))
+            agg = aggregates.get(student_id)
+            if agg is None:
+                agg = aggregates[student_id] = {
+                    "name": entry.get("student_name") or "", "count": 0, "first": score, "min": score,
+                    "max": score, "sum": 0.0, "decay": 1.0, "tail": 0.0, "levels": {},
+                    "created": entry["timestamp"]
+                }
+            agg["count"] += 1
+            agg["last"] = score
+            agg["min"] = min(agg["min"], score)
+            agg["max"] = max(agg["max"], score)
+            agg["sum"] += score
+            # EWMA over the batch as decay * previous + tail
+            agg["decay"] *= 1 - EWMA_ALPHA
+            agg["tail"] = (1 - EWMA_ALPHA) * agg["tail"] + EWMA_ALPHA * score
+            agg["levels"][level] = agg["levels"].get(level, 0) + 1
+            agg["updated"] = entry["timestamp"]
+
+        with self._lock:
+            conn = self.conn
+            try:
+                conn.executemany(
+                    "INSERT INTO progress_entries (student_id, date, timestamp, risk_level, risk_score, notes) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.executemany(
+                    "INSERT INTO progress_students (student_id, student_name, created_date, last_updated, entry_count, "
+                    "first_score, last_score, min_score, max_score, score_sum, ewma_score, level_counts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(student_id) DO UPDATE SET "
+                    "last_updated = excluded.last_updated, "
+                    "entry_count = entry_count + excluded.entry_count, "
+                    "student_name = COALESCE(NULLIF(excluded.student_name, ''), student_name), "
+                    "last_score = excluded.last_score, "
+                    "min_score = MIN(min_score, excluded.min_score), "
+                    "max_score = MAX(max_score, excluded.max_score), "
+                    "score_sum = score_sum + excluded.score_sum, "
+                    "ewma_score = ? * ewma_score + ?, "
+                    "level_counts = (SELECT json_group_object(key, total) FROM (SELECT key, SUM(value) AS total FROM ("
+                    "SELECT key, value FROM json_each(progress_students.level_counts) "
+                    "UNION ALL SELECT key, value FROM json_each(excluded.level_counts)) GROUP BY key))",
+                    [
+                        (student_id, a["name"], a["created"], a["updated"], a["count"], a["first"], a["last"],
+                         a["min"], a["max"], a["sum"],
+                         # A new student's EWMA starts at its first score
+                         a["decay"] * a["first"] + a["tail"],
+                         json.dumps(a["levels"]), a["decay"], a["tail"])
+                        for student_id, a in aggregates.items()
+                    ]
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            for student_id in aggregates:
+                if student_id in self._hot:
+                    self._sync(student_id)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def __contains__(self, student_id: str) -> bool:
+        return self.get_student(student_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM progress_students").fetchone()[0]
+
+    def get_student(self, student_id: str) -> Optional[dict]:
+        """Return student metadata (name, dates, entry count) or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT student_id, student_name, created_date, last_updated, entry_count "
+                "FROM progress_students WHERE student_id = ?",
+                (student_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "student_id": row[0],
+            "student_name": row[1],
+            "created_date": row[2],
+            "last_updated": row[3],
+            "entry_count": row[4]
+        }
+
+    def get_stats(self, student_id: str) -> Optional[dict]:
+        """
+        Return the running aggregates of a student (constant time).
+
+        Returns:
+            Dict with count, first/last/min/max/mean/ewma score, level_counts
+            and first/last timestamp, or None if the student is not tracked
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT entry_count, first_score, last_score, min_score, max_score, score_sum, "
+                "ewma_score, level_counts, created_date, last_updated "
+                "FROM progress_students WHERE student_id = ?",
+                (student_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        count = row[0]
+        return {
+            "count": count,
+            "first_score": row[1],
+            "last_score": row[2],
+            "min_score": row[3],
+            "max_score": row[4],
+            "mean_score": row[5] / count if count else 0.0,
+            "ewma_score": row[6],
+            "level_counts": json.loads(row[7]),
+            "first_timestamp": row[8],
+            "last_timestamp": row[9]
+        }
+
+    def student_ids(self) -> List[str]:
+        """All tracked student IDs."""
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT student_id FROM progress_students ORDER BY student_id")]
+
+    def _sync(self, student_id: str) -> CompactHistory:
+        """
+        Bring a student's hot history up to date (loads it if cold).
+
+        A history whose raw entries were rolled up since it was loaded, by
+        any process, is reloaded from scratch.
+        """
+        row = self.conn.execute(
+            "SELECT rollup_generation FROM progress_students WHERE student_id = ?", (student_id,)
+        ).fetchone()
+        generation = row[0] if row else 0
+        hot = self._hot.get(student_id)
+        if hot is None or hot.generation != generation:
+            hot = CompactHistory(generation)
+            self._hot[student_id] = hot
+            self._hot.move_to_end(student_id)
+            if len(self._hot) > self.max_hot_students:
+                self._hot.popitem(last=False)
+        else:
+            self._hot.move_to_end(student_id)
+
+        rows = self.conn.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM progress_entries WHERE student_id = ? AND id > ? ORDER BY id",
+            (student_id, hot.last_id)
+        ).fetchall()
+        for row in rows:
+            hot.append(row[2], row[4], row[3], row[5] or "")
+            hot.last_id = row[0]
+        return hot
+
+    def get_compact(self, student_id: str) -> CompactHistory:
+        """
+        Return the up-to-date columnar history of a student.
+
+        The returned object is shared with the hot tier; treat it as read-only.
+        """
+        with self._lock:
+            return self._sync(student_id)
+
+    def get_history(
+        self,
+        student_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        last: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Return a student's history, optionally restricted to a range.
+
+        Args:
+            student_id: Student identifier
+            start: Inclusive lower bound on the ISO timestamp (or date)
+            end: Inclusive upper bound on the ISO timestamp (or date)
+            last: Only the most recent N entries of the range
+
+        Returns:
+            List of entry dicts in chronological order
+        """
+        with self._lock:
+            history = self._sync(student_id)
+            indices = history.index_range(start, end)
+            if last is not None:
+                indices = indices[-last:] if last > 0 else range(0)
+            return history.to_dicts(indices)
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Stream every student record in the legacy progress_database shape.
+
+        Yields:
+            {"student_id", "student_name", "history", "created_date", "last_updated"}
+        """
+        for student_id in self.student_ids():
+            meta = self.get_student(student_id)
+            yield {
+                "student_id": student_id,
+                "student_name": meta["student_name"],
+                "history": self.get_history(student_id),
+                "created_date": meta["created_date"],
+                "last_updated": meta["last_updated"]
+            }
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def rollup_entries(self, before: str, batch_size: int = 1000) -> int:
+        """
+        Replace one batch of raw entries older than a cutoff with daily rollups.
+
+        Running aggregates and entry counts are left untouched; the students'
+        rollup generation is bumped so every process reloads their histories.
+        The batch is selected and rolled up in one write transaction, so
+        concurrent passes never roll up the same rows twice.
+
+        Args:
+            before: ISO timestamp; entries strictly older are rolled up
+            batch_size: Maximum entries processed in this call
+
+        Returns:
+            Number of entries rolled up (0 when nothing is left)
+        """
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, student_id, timestamp, risk_level, risk_score FROM progress_entries "
+                    "WHERE timestamp < ? ORDER BY id LIMIT ?",
+                    (before, batch_size)
+                ).fetchall()
+                if not rows:
+                    conn.rollback()
+                    return 0
+                buckets = _merge_buckets(
+                    ((r[1], r[2], r[3], r[4], 1, r[4], r[4], r[4]) for r in rows),
+                    lambda timestamp: timestamp[:10]
+                )
+                conn.executemany(ROLLUP_UPSERT, [
+                    (student_id, "day", day, *agg) for (student_id, day), agg in buckets.items()
+                ])
+                conn.executemany("DELETE FROM progress_entries WHERE id = ?", [(r[0],) for r in rows])
+                student_ids = {student_id for student_id, _ in buckets}
+                conn.executemany(
+                    "UPDATE progress_students SET rollup_generation = rollup_generation + 1 WHERE student_id = ?",
+                    [(student_id,) for student_id in student_ids]
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            for student_id in student_ids:
+                self._hot.pop(student_id, None)
+            return len(rows)
+
+    def coarsen_rollups(self, before: str, batch_size: int = 1000) -> int:
+        """
+        Merge one batch of daily rollups older than a cutoff into weekly rollups.
+
+        Args:
+            before: ISO date; daily rollups starting earlier are merged
+            batch_size: Maximum daily rollups processed in this call
+
+        Returns:
+            Number of daily rollups merged (0 when nothing is left)
+        """
+        with self._lock:
+            conn = self.conn
+            # Select and merge in one write transaction (see rollup_entries)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT student_id, period_start, last_timestamp, last_level, last_score, count, "
+                    "min_score, max_score, score_sum FROM progress_rollups "
+                    "WHERE period = 'day' AND period_start < ? LIMIT ?",
+                    (before, batch_size)
+                ).fetchall()
+                if not rows:
+                    conn.rollback()
+                    return 0
+                buckets = _merge_buckets(((r[0],) + r[2:] for r in rows), week_start)
+                conn.executemany(ROLLUP_UPSERT, [
+                    (student_id, "week", week, *agg) for (student_id, week), agg in buckets.items()
+                ])
+                conn.executemany(
+                    "DELETE FROM progress_rollups WHERE student_id = ? AND period = 'day' AND period_start = ?",
+                    [(r[0], r[1]) for r in rows]
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            return len(rows)
+
+    def get_rollups(self, student_id: str, start: Optional[str] = None, end: Optional[str] = None) -> List[dict]:
+        """
+        Return a student's rolled-up periods, oldest first.
+
+        Args:
+            student_id: Student identifier
+            start: Only periods starting on or after this ISO date
+            end: Only periods starting on or before this ISO date
+
+        Returns:
+            List of rollup dicts
+        """
+        query = (
+            "SELECT period, period_start, count, min_score, max_score, score_sum, last_level, last_score, "
+            "last_timestamp FROM progress_rollups WHERE student_id = ?"
+        )
+        params = [student_id]
+        if start is not None:
+            query += " AND period_start >= ?"
+            params.append(start[:10])
+        if end is not None:
+            query += " AND period_start <= ?"
+            params.append(end[:10])
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY period_start", params).fetchall()
+        return [
+            {
+                "period": row[0],
+                "period_start": row[1],
+                "count": row[2],
+                "min_risk_score": row[3],
+                "max_risk_score": row[4],
+                "average_risk_score": round(row[5] / row[2], 6),
+                "score_sum": row[5],
+                "last_risk_level": row[6],
+                "last_risk_score": row[7],
+                "last_timestamp": row[8]
+            }
+            for row in rows
+        ]
+
+    def max_entry_id(self) -> int:
+        """Id of the most recent entry (0 if empty)."""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM progress_entries").fetchone()[0]
+
+    def iter_entries(self, after_id: int = 0, up_to_id: Optional[int] = None) -> Iterator[dict]:
+        """
+        Stream raw entries in append order.
+
+        Args:
+            after_id: Only entries with a larger id
+            up_to_id: Only entries up to and including this id
+
+        Yields:
+            Entry dicts with id and student_id
+        """
+        query = f"SELECT student_id, {ENTRY_COLUMNS} FROM progress_entries WHERE id > ?"
+        params = [after_id]
+        if up_to_id is not None:
+            query += " AND id <= ?"
+            params.append(up_to_id)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY id", params).fetchall()
+        for row in rows:
+            yield {
+                "id": row[1],
+                "student_id": row[0],
+                "date": row[2],
+                "timestamp": row[3],
+                "risk_level": row[4],
+                "risk_score": row[5],
+                "notes": row[6] or ""
+            }
+
+    def cohort_columns(self, student_ids: Optional[List[str]] = None, window: Optional[int] = None):
+        """
+        Read many students' recent histories as flat NumPy columns in one query.
+
+        Args:
+            student_ids: Students to read (default: all)
+            window: Only the most recent N entries per student
+
+        Returns:
+            Tuple (ids, counts, timestamps, scores): ids and per-student entry
+            counts, then epoch-microsecond timestamps and scores grouped by
+            student in chronological order; each rollup period is one point
+        """
+        import numpy as np
+
+        where = ""
+        params: list = []
+        if student_ids is not None:
+            where = "WHERE student_id IN (SELECT value FROM json_each(?))"
+            params = [json.dumps(list(student_ids))] * 2
+
+        # Rolled-up periods count as one point each (their average), before the raw entries
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT student_id, last_timestamp, score_sum / count, 0 AS tier, period_start AS seq "
+                f"FROM progress_rollups {where} "
+                f"UNION ALL SELECT student_id, timestamp, risk_score, 1, id FROM progress_entries {where} "
+                f"ORDER BY student_id, tier, seq",
+                params
+            ).fetchall()
+        if not rows:
+            return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        row_ids, stamps, scores = zip(*(row[:3] for row in rows))
+        row_ids = np.array(row_ids, dtype=object)
+        starts = np.flatnonzero(np.r_[True, row_ids[1:] != row_ids[:-1]])
+        counts = np.diff(np.r_[starts, len(row_ids)])
+        timestamps = np.array(stamps, dtype="datetime64[us]").astype(np.int64)
+        scores = np.array(scores, dtype=np.float64)
+        ids = row_ids[starts].tolist()
+
+        # Windowing in NumPy is much cheaper than a SQL window function
+        if window is not None and counts.max() > window:
+            ends = np.cumsum(counts)
+            from_end = np.repeat(ends, counts) - 1 - np.arange(len(scores))
+            keep = from_end < window
+            timestamps, scores = timestamps[keep], scores[keep]
+            counts = np.minimum(counts, window)
+        return ids, counts, timestamps, scores
+
+    def latest_levels(self) -> Dict[str, str]:
+        """Most recent risk level of every tracked student (from its rollups if no raw entry is left)."""
+        with self._lock:
+            rolled_up = self.conn.execute(
+                "SELECT r.student_id, r.last_level FROM progress_rollups r "
+                "JOIN (SELECT student_id, MAX(last_timestamp) AS last_timestamp FROM progress_rollups "
+                "GROUP BY student_id) latest "
+                "ON r.student_id = latest.student_id AND r.last_timestamp = latest.last_timestamp"
+            ).fetchall()
+            rows = self.conn.execute(
+                "SELECT e.student_id, e.risk_level FROM progress_entries e "
+                "JOIN (SELECT student_id, MAX(id) AS last_id FROM progress_entries GROUP BY student_id) latest "
+                "ON e.id = latest.last_id"
+            ).fetchall()
+        # Raw entries are always newer than the rolled-up ones
+        levels = dict(rolled_up)
+        levels.update(rows)
+        return levels
+
+
+# Global store used by the progress tools
+progress_store = ProgressStore()
@@ -0,0 +1,209 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Prompt templates for Agent Aura.
+Static prompt text is compiled once per (template, tool set, version) into an
+immutable prefix. Dynamic content (history, goal, tool results) is appended
+after it, so provider-side prompt caching can reuse the prefix.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+# Prometheus is only installed with the backend requirements
+try:
+    from prometheus_client import Counter, Histogram
+    PROMPT_PREFIX_LOOKUPS = Counter(
+        'agent_aura_prompt_prefix_lookups_total',
+        'Compiled prompt prefix lookups',
+        ['template', 'result']
+    )
+    PROMPT_SIZE = Histogram(
+        'agent_aura_prompt_chars',
+        'Rendered prompt size in characters',
+        ['template'],
+        buckets=(500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+    )
+except Exception:
+    PROMPT_PREFIX_LOOKUPS = None
+    PROMPT_SIZE = None
+
+# Bump when any static prompt text changes
+PROMPT_VERSION = "2.1"
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """Immutable static prompt prefix."""
+    template: str
+    key: Tuple
+    prefix: str
+
+    def render(self, suffix: str) -> str:
+        """Append the dynamic suffix and record the prompt size."""
+        prompt = self.prefix + suffix
+        prompt_cache.record_render(self, len(prompt))
+        return prompt
+
+
+class PromptCache:
+    """Compiles prompt prefixes once and reports reuse and size statistics."""
+
+    def __init__(self):
+        self._compiled: Dict[Tuple, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.prompt_chars = 0
+        self.prefix_chars = 0
+
+    def get(self, template: str, key: Tuple, builder: Callable[[], str]) -> CompiledPrompt:
+        """
+        Return the compiled prefix for a template and key, building it on first use.
+
+        Args:
+            template: Template name (e.g. "agent", "orchestrator")
+            key: Hashable description of the static inputs (tool set, options)
+            builder: Function producing the prefix text
+
+        Returns:
+            CompiledPrompt
+        """
+        full_key = (template, PROMPT_VERSION) + tuple(key)
+        compiled = self._compiled.get(full_key)
+        if compiled is not None:
+            self.hits += 1
+            result = "hit"
+        else:
+            with self._lock:
+                compiled = self._compiled.get(full_key)
+                if compiled is None:
+                    compiled = CompiledPrompt(template=template, key=full_key, prefix=builder())
+                    self._compiled[full_key] = compiled
+            self.misses += 1
+            result = "miss"
+        if PROMPT_PREFIX_LOOKUPS is not None:
+            PROMPT_PREFIX_LOOKUPS.labels(template=template, result=result).inc()
+        return compiled
+
+    def record_render(self, compiled: CompiledPrompt, prompt_chars: int):
+        """Record one rendered prompt."""
+        self.renders += 1
+        self.prompt_chars += prompt_chars
+        self.prefix_chars += len(compiled.prefix)
+        if PROMPT_SIZE is not None:
+            PROMPT_SIZE.labels(template=compiled.template).observe(prompt_chars)
+
+    def stats(self) -> dict:
+        """Prefix hit rate and average prompt sizes."""
+        lookups = self.hits + self.misses
+        return {
+            "compiled_prefixes": len(self._compiled),
+            "lookups": lookups,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "renders": self.renders,
+            "avg_prompt_chars": round(self.prompt_chars / self.renders, 1) if self.renders else 0.0,
+            "avg_prefix_chars": round(self.prefix_chars / self.renders, 1) if self.renders else 0.0,
+            "prefix_share": round(self.prefix_chars / self.prompt_chars, 3) if self.prompt_chars else 0.0
+        }
+
+
+prompt_cache = PromptCache()
+
+
+# ============================================================================
+# Templates
+# ============================================================================
+
+AGENT_SYSTEM_PROMPT = """You are Agent Aura, an AI agent specialized in K-12 student intervention analysis.
+
+Your mission is to help identify at-risk students, generate interventions, and track outcomes.
+
+You think step-by-step and use tools to accomplish your goals. For each step:
+1. THINK about what you need to do next
+2. ACT by calling a tool if needed
+3. OBSERVE the result and continue
+
+Available Tools:
+"""
+
+AGENT_NATIVE_INSTRUCTIONS = """
+Use the provided functions. Call independent functions together in one step.
+When you have the final answer, reply with plain text."""
+
+AGENT_JSON_INSTRUCTIONS = """
+
+When you need to use a tool, respond in this format:
+{
+  "thought": "Your reasoning here",
+  "action": "tool_name",
+  "arguments": {...}
+}
+
+When several tool calls do not depend on each other, request them together in one step:
+{
+  "thought": "Your reasoning here",
+  "actions": [
+    {"action": "tool_name", "arguments": {...}},
+    {"action": "other_tool", "arguments": {...}}
+  ]
+}
+
+When you have the final answer, respond in this format:
+{
+  "thought": "Summary of findings",
+  "final_response": "Your detailed response"
+}"""
+
+
+def compile_agent_prompt(tool_declarations: Tuple[dict, ...], native_function_calling: bool) -> CompiledPrompt:
+    """
+    Static system prompt for the Think-Act-Observe Agent.
+
+    Args:
+        tool_declarations: Function declarations of the enabled tools
+        native_function_calling: Whether tools are sent as declarations
+
+    Returns:
+        CompiledPrompt whose prefix ends before the conversation history
+    """
+    key = (tuple(d["name"] for d in tool_declarations), native_function_calling)
+
+    def build() -> str:
+        parts = [AGENT_SYSTEM_PROMPT]
+        if native_function_calling:
+            # Tools are passed as typed function declarations, not in the prompt
+            parts.append(AGENT_NATIVE_INSTRUCTIONS)
+        else:
+            for declaration in tool_declarations:
+                parts.append(f"\n- {declaration['name']}: {declaration['description']}")
+                parts.append(f"\n  Parameters: {', '.join(declaration['parameters']['properties'])}")
+            parts.append(AGENT_JSON_INSTRUCTIONS)
+        parts.append("\n\n=== Conversation History ===\n")
+        return "".join(parts)
+
+    return prompt_cache.get("agent", key, build)
+
+
+def compile_orchestrator_prompt(agent_names: Tuple[str, ...]) -> CompiledPrompt:
+    """
+    Static planning prompt for the multi-agent orchestrator.
+
+    Args:
+        agent_names: Enabled agent names
+
+    Returns:
+        CompiledPrompt whose prefix ends before the student-specific request
+    """
+    def build() -> str:
+        return (
+            "You are the Agent Aura orchestrator. You coordinate specialized agents "
+            "to analyze K-12 students for academic risk.\n"
+            f"I will activate the following agents: {', '.join(agent_names)}.\n"
+            "Describe the plan for the analysis below.\n\n"
+        )
+
+    return prompt_cache.get("orchestrator", tuple(agent_names), build)
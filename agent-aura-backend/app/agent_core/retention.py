@@ -0,0 +1,186 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Progress history retention for Agent Aura.
+Keeps raw progress entries for a recent window, rolls older entries up into
+daily aggregates and older daily aggregates into weekly ones. Work is done
+in small batches within a time budget so it can run in the background.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.agent_core.progress_store import ProgressStore, progress_store
+from app.agent_core.snapshots import try_lock_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each resolution of progress history is kept."""
+    raw_days: int = 180           # raw entries newer than this are kept as-is
+    daily_days: int = 730         # daily rollups newer than this are kept; older become weekly
+    batch_size: int = 1000        # rows per transaction
+    time_budget: float = 0.2      # seconds of work per pass
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Policy from PROGRESS_RAW_RETENTION_DAYS / PROGRESS_DAILY_RETENTION_DAYS."""
+        return cls(
+            raw_days=int(os.getenv("PROGRESS_RAW_RETENTION_DAYS", "180")),
+            daily_days=int(os.getenv("PROGRESS_DAILY_RETENTION_DAYS", "730"))
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def apply_retention(
+    policy: RetentionPolicy,
+    store: Optional[ProgressStore] = None,
+    now: Optional[datetime] = None
+) -> dict:
+    """
+    Run one time-boxed retention pass.
+
+    Args:
+        policy: Retention policy
+        store: Progress store (default: the global store)
+        now: Reference time (default: now)
+
+    Returns:
+        Dict with entries rolled up, daily rollups merged and whether work remains
+    """
+    if store is None:
+        store = progress_store
+    now = now or datetime.now()
+    raw_cutoff = (now - timedelta(days=policy.raw_days)).isoformat()
+    daily_cutoff = (now - timedelta(days=policy.daily_days)).date().isoformat()
+    deadline = time.perf_counter() + policy.time_budget
+
+    result = {"entries_rolled_up": 0, "daily_rollups_merged": 0, "pending": True}
+    steps = [
+        ("entries_rolled_up", lambda: store.rollup_entries(raw_cutoff, policy.batch_size)),
+        ("daily_rollups_merged", lambda: store.coarsen_rollups(daily_cutoff, policy.batch_size))
+    ]
+    for key, step in steps:
+        while True:
+            count = step()
+            if count == 0:
+                break
+            result[key] += count
+            # At least one batch per pass, so every pass makes progress
+            if time.perf_counter() >= deadline:
+                return result
+
+    result["pending"] = False
+    return result
+
+
+class RetentionWorker:
+    """
+    Applies the retention policy periodically without blocking the event loop.
+
+    Each pass runs in a worker thread and stops at the policy's time budget;
+    while work remains, passes repeat with a short pause in between. When
+    several API workers share the database, only the one holding the
+    retention lock file runs passes; the others stand by.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetentionPolicy] = None,
+        interval: Optional[float] = None,
+        store: Optional[ProgressStore] = None,
+        lock_file: Optional[str] = None
+    ):
+        self.policy = policy or RetentionPolicy.from_env()
+        self.interval = interval or float(os.getenv("PROGRESS_RETENTION_INTERVAL", "3600"))
+        self.store = store
+        self.lock_path = lock_file or os.getenv("PROGRESS_RETENTION_LOCK")
+        self.passes = 0
+        self.entries_rolled_up = 0
+        self.daily_rollups_merged = 0
+        self.last_run: Optional[str] = None
+        self._lock_file = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _acquire_leadership(self) -> bool:
+        """Whether this process is (now) the one applying retention."""
+        if self._lock_file is not None:
+            return True
+        store = self.store or progress_store
+        if store.path == ":memory:" and not self.lock_path:
+            # A private in-memory store cannot be shared with other processes
+            return True
+        self._lock_file = try_lock_file(self.lock_path or f"{store.path}.retention.lock")
+        return self._lock_file is not None
+
+    def release(self):
+        """Give up the retention lock, so another process can take over."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def start(self):
+        """Start on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Stop the worker."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.release()
+
+    async def run_once(self) -> dict:
+        """
+        Run retention passes until no work remains.
+
+        Returns:
+            Result of the last pass, or {"status": "standby"} when another
+            process holds the retention lock
+        """
+        if not self._acquire_leadership():
+            return {"status": "standby"}
+        loop = asyncio.get_running_loop()
+        while True:
+            result = await loop.run_in_executor(None, apply_retention, self.policy, self.store)
+            self.passes += 1
+            self.entries_rolled_up += result["entries_rolled_up"]
+            self.daily_rollups_merged += result["daily_rollups_merged"]
+            self.last_run = datetime.now().isoformat()
+            if not result["pending"]:
+                return result
+            await asyncio.sleep(0.05)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Progress retention failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """Worker statistics."""
+        return {
+            "policy": self.policy.to_dict(),
+            "leader": self._lock_file is not None,
+            "passes": self.passes,
+            "entries_rolled_up": self.entries_rolled_up,
+            "daily_rollups_merged": self.daily_rollups_merged,
+            "last_run": self.last_run
+        }
+
+
+# Global worker started with the API
+retention_worker = RetentionWorker()
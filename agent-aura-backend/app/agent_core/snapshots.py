@@ -0,0 +1,233 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Incremental NDJSON snapshots for Agent Aura exports.
+A snapshot directory holds one base file plus delta segments, each written
+to a temporary file and atomically renamed into place, and a manifest that
+records them. Checkpoints only write records added since the last one;
+segments are periodically compacted into a new base.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _fsync_dir(directory: str):
+    """Persist a rename (no-op on platforms without directory fds)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, write: Callable):
+    """
+    Write a file via a temporary file and an atomic rename.
+
+    Args:
+        path: Destination path
+        write: Function receiving the open text file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def try_lock_file(path: str):
+    """
+    Take an exclusive, non-blocking lock on a lock file.
+
+    Used to elect the one process (e.g. API worker) that runs a background
+    job; the lock is released when the returned file is closed or the
+    process exits.
+
+    Args:
+        path: Lock file path (created if missing)
+
+    Returns:
+        The open, locked file, or None if another process holds the lock
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    f = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+class SnapshotLog:
+    """
+    Base snapshot plus delta segments of NDJSON records in one directory.
+
+    The manifest is replaced last, so a crash at any point leaves the
+    previous consistent snapshot readable.
+    """
+
+    def __init__(self, directory: str, compact_every: int = 16):
+        """
+        Initialize the snapshot log.
+
+        Args:
+            directory: Snapshot directory (created on first checkpoint)
+            compact_every: Compact into a new base once this many segments exist
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def read_manifest(self) -> dict:
+        """Current manifest (an empty one if no checkpoint exists yet)."""
+        try:
+            with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": MANIFEST_VERSION, "sequence": 0, "base": None, "segments": [], "cursor": None}
+
+    def _write_manifest(self, manifest: dict):
+        atomic_write(os.path.join(self.directory, MANIFEST), lambda f: json.dump(manifest, f, indent=2))
+
+    def _write_records(self, name: str, records: Iterable[dict]) -> int:
+        count = 0
+
+        def write(f):
+            nonlocal count
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), default=str))
+                f.write("\n")
+                count += 1
+
+        atomic_write(os.path.join(self.directory, name), write)
+        return count
+
+    # ------------------------------------------------------------------
+    # Checkpoint / compaction
+    # ------------------------------------------------------------------
+
+    def checkpoint(
+        self,
+        cursor: Callable[[Any], Any],
+        delta: Callable[[Any, Any], Iterable[dict]],
+        full: Optional[Callable[[Any], Iterable[dict]]] = None
+    ) -> dict:
+        """
+        Write the records added since the last checkpoint.
+
+        Args:
+            cursor: Function(previous cursor) returning the cursor to store
+            delta: Function(previous cursor, new cursor) returning the records between them
+            full: Function(new cursor) returning every record up to the cursor, used
+                as the new base when compacting (default: merge the existing files)
+
+        Returns:
+            Dict with records written, segment name (None if nothing changed)
+            and whether the snapshot was compacted
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = self.read_manifest()
+            previous = manifest["cursor"]
+            new_cursor = cursor(previous)
+
+            segment = None
+            written = 0
+            records = list(delta(previous, new_cursor))
+            if records:
+                manifest["sequence"] += 1
+                segment = f"delta-{manifest['sequence']:06d}.ndjson"
+                written = self._write_records(segment, records)
+                manifest["segments"].append({"file": segment, "records": written})
+            manifest["cursor"] = new_cursor
+            self._write_manifest(manifest)
+
+            compacted = False
+            if len(manifest["segments"]) >= self.compact_every:
+                self._compact(manifest, full)
+                compacted = True
+
+        return {"records_written": written, "segment": segment, "compacted": compacted}
+
+    def compact(self, full: Optional[Callable[[Any], Iterable[dict]]] = None):
+        """Fold all segments into a new base file."""
+        with self._lock:
+            manifest = self.read_manifest()
+            if manifest["cursor"] is not None:
+                self._compact(manifest, full)
+
+    def _compact(self, manifest: dict, full):
+        if full is not None:
+            records: Iterable[dict] = full(manifest["cursor"])
+        else:
+            records = self._replay(manifest)
+
+        old_files = [s["file"] for s in manifest["segments"]]
+        if manifest["base"]:
+            old_files.append(manifest["base"]["file"])
+
+        manifest["sequence"] += 1
+        base = f"base-{manifest['sequence']:06d}.ndjson"
+        count = self._write_records(base, records)
+        manifest["base"] = {"file": base, "records": count}
+        manifest["segments"] = []
+        self._write_manifest(manifest)
+
+        # Old files are unreferenced once the new manifest is in place
+        for name in old_files:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _replay(self, manifest: dict) -> Iterator[dict]:
+        files = ([manifest["base"]["file"]] if manifest["base"] else []) + [s["file"] for s in manifest["segments"]]
+        for name in files:
+            with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def replay(self) -> Iterator[dict]:
+        """Stream every record: the base first, then segments in order."""
+        return self._replay(self.read_manifest())
+
+    def files(self) -> List[str]:
+        """Data files referenced by the manifest."""
+        manifest = self.read_manifest()
+        return ([manifest["base"]["file"]] if manifest["base"] else []) + [s["file"] for s in manifest["segments"]]
@@ -0,0 +1,458 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Local stub LLM provider for offline load testing.
+Serves the OpenAI-compatible chat completions and Gemini generateContent
+request shapes with configurable latency, token streaming, injected errors
+and 429s, and scripted replies or tool calls. Select it with the
+"stub-openai" or "stub-gemini" ModelManager models.
+
+Usage:
+    python -m app.agent_core.stub_llm [--port 8090] [--latency lognormal:300,0.4]
+                                      [--token-interval 15] [--error-rate 0.01]
+                                      [--rate-limit-rate 0.05] [--script script.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+# Latency distributions and the meaning of their parameters (milliseconds)
+LATENCY_DISTRIBUTIONS = {
+    "fixed": ("value",),
+    "uniform": ("low", "high"),
+    "normal": ("mean", "std"),
+    "lognormal": ("median", "sigma"),
+    "exponential": ("mean",),
+}
+
+DEFAULT_TEXT = (
+    "The student's indicators were reviewed across attendance, grades and engagement. "
+    "Continue the current support plan and re-assess after the next grading period."
+)
+
+
+@dataclass
+class LatencyModel:
+    """Response latency distribution, in milliseconds."""
+    distribution: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """
+        Parse a latency spec such as "fixed:50", "uniform:100,400" or "lognormal:300,0.4".
+
+        Args:
+            spec: Distribution name, a colon and comma-separated parameters
+
+        Returns:
+            LatencyModel
+        """
+        name, _, values = spec.partition(":")
+        name = name.strip().lower()
+        if name not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {name}")
+        params = tuple(float(v) for v in values.split(",") if v.strip())
+        if len(params) != len(LATENCY_DISTRIBUTIONS[name]):
+            raise ValueError(f"{name} latency takes {', '.join(LATENCY_DISTRIBUTIONS[name])}")
+        return cls(name, params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency, in seconds (never negative)."""
+        p = self.params
+        if self.distribution == "uniform":
+            ms = rng.uniform(p[0], p[1])
+        elif self.distribution == "normal":
+            ms = rng.gauss(p[0], p[1])
+        elif self.distribution == "lognormal":
+            ms = rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        elif self.distribution == "exponential":
+            ms = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        else:
+            ms = p[0]
+        return max(ms, 0.0) / 1000.0
+
+
+@dataclass
+class ScriptRule:
+    """
+    One scripted reply.
+
+    A rule applies when its regex matches the last user message (or always,
+    without a pattern). Named groups can be used in tool call arguments,
+    e.g. {"student_id": "{student_id}"}.
+    """
+    match: Optional[str] = None
+    text: Optional[str] = None
+    tool_calls: List[dict] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._pattern = re.compile(self.match, re.DOTALL) if self.match else None
+
+    def apply(self, prompt: str) -> Optional[dict]:
+        """The reply for a prompt, or None if the rule does not match."""
+        groups = {}
+        if self._pattern is not None:
+            found = self._pattern.search(prompt)
+            if found is None:
+                return None
+            groups = found.groupdict()
+        tool_calls = [
+            {
+                "name": call["name"],
+                "arguments": {
+                    key: value.format(**groups) if isinstance(value, str) else value
+                    for key, value in (call.get("arguments") or {}).items()
+                }
+            }
+            for call in self.tool_calls
+        ]
+        return {"text": self.text, "tool_calls": tool_calls}
+
+
+@dataclass
+class StubConfig:
+    """Stub provider behaviour."""
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    token_interval_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    script: List[ScriptRule] = field(default_factory=list)
+    seed: Optional[int] = None
+
+
+def load_script(path: str) -> List[ScriptRule]:
+    """
+    Load scripted replies from a JSON file (a list of rules, first match wins).
+
+    Example:
+        [{"match": "Tool Result", "text": "{\\"final_response\\": \\"Done\\"}"},
+         {"match": "(?P<student_id>S\\\\d{3})",
+          "tool_calls": [{"name": "get_student_data", "arguments": {"student_id": "{student_id}"}}]}]
+    """
+    with open(path, encoding="utf-8") as f:
+        return [ScriptRule(**rule) for rule in json.load(f)]
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into word tokens that concatenate back to the text."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _reply_text(reply: dict, with_tools: bool) -> str:
+    """Text of a reply; tool calls become a JSON step when the request declared no tools."""
+    if reply["tool_calls"] and not with_tools:
+        return json.dumps({
+            "thought": reply["text"] or "Calling tools",
+            "actions": [{"action": c["name"], "arguments": c["arguments"]} for c in reply["tool_calls"]]
+        })
+    return reply["text"] or ""
+
+
+class StubLLM:
+    """
+    Provider-independent stub behaviour: fault injection, latency and replies.
+
+    Thread-safe; one instance backs every request of a stub server.
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "tool_calls": 0, "errors": 0, "rate_limited": 0}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def fault(self) -> Optional[int]:
+        """HTTP status to fail this request with (429 or 500), or None."""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+        if roll < self.config.rate_limit_rate:
+            self._count("rate_limited")
+            return 429
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            self._count("errors")
+            return 500
+        return None
+
+    def latency(self) -> float:
+        """Seconds to wait before the first token."""
+        with self._lock:
+            return self.config.latency.sample(self._rng)
+
+    def reply(self, prompt: str) -> dict:
+        """
+        The reply to a prompt: the first matching script rule, else a final JSON step.
+
+        Returns:
+            {"text": str or None, "tool_calls": [{"name": ..., "arguments": ...}]}
+        """
+        for rule in self.config.script:
+            reply = rule.apply(prompt)
+            if reply is not None:
+                self._count("tool_calls", len(reply["tool_calls"]))
+                return reply
+        return {"text": json.dumps({"thought": "Stub analysis complete", "final_response": DEFAULT_TEXT}), "tool_calls": []}
+
+
+# ============================================================================
+# Request and response shapes
+# ============================================================================
+
+def openai_prompt(body: dict) -> str:
+    """Last user message of a chat completions request."""
+    for message in reversed(body.get("messages") or []):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content or ""
+    return ""
+
+
+def gemini_prompt(body: dict) -> str:
+    """Last user turn of a generateContent request."""
+    for content in reversed(body.get("contents") or []):
+        if content.get("role", "user") == "user":
+            return "".join(part.get("text", "") for part in content.get("parts") or [])
+    return ""
+
+
+def _usage(prompt: str, text: str) -> Tuple[int, int]:
+    return len(_tokens(prompt)), len(_tokens(text))
+
+
+def openai_response(model: str, prompt: str, reply: dict, with_tools: bool) -> dict:
+    """Chat completions response body."""
+    text = _reply_text(reply, with_tools)
+    message = {"role": "assistant", "content": text or None}
+    if with_tools and reply["tool_calls"]:
+        message["tool_calls"] = [
+            {
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])}
+            }
+            for call in reply["tool_calls"]
+        ]
+    prompt_tokens, completion_tokens = _usage(prompt, text)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": "tool_calls" if "tool_calls" in message else "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+def openai_chunks(model: str, reply: dict, with_tools: bool) -> Iterator[dict]:
+    """Chat completions stream chunks: one per token, then tool calls and the finish reason."""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+
+    def chunk(delta: dict, finish_reason: Optional[str] = None) -> dict:
+        return {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+
+    yield chunk({"role": "assistant", "content": ""})
+    for token in _tokens(_reply_text(reply, with_tools)):
+        yield chunk({"content": token})
+    calls = reply["tool_calls"] if with_tools else []
+    for index, call in enumerate(calls):
+        yield chunk({"tool_calls": [{
+            "index": index,
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])}
+        }]})
+    yield chunk({}, "tool_calls" if calls else "stop")
+
+
+def _gemini_body(parts: List[dict], finish_reason: Optional[str], usage: Optional[Tuple[int, int]] = None) -> dict:
+    candidate = {"content": {"role": "model", "parts": parts}, "index": 0}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    body = {"candidates": [candidate]}
+    if usage is not None:
+        body["usageMetadata"] = {
+            "promptTokenCount": usage[0],
+            "candidatesTokenCount": usage[1],
+            "totalTokenCount": usage[0] + usage[1]
+        }
+    return body
+
+
+def gemini_response(prompt: str, reply: dict, with_tools: bool) -> dict:
+    """generateContent response body."""
+    text = _reply_text(reply, with_tools)
+    parts = [{"text": text}] if text else []
+    if with_tools:
+        parts += [{"functionCall": {"name": c["name"], "args": c["arguments"]}} for c in reply["tool_calls"]]
+    return _gemini_body(parts, "STOP", _usage(prompt, text))
+
+
+def gemini_chunks(prompt: str, reply: dict, with_tools: bool) -> Iterator[dict]:
+    """streamGenerateContent chunks: one per token, then the function calls."""
+    text = _reply_text(reply, with_tools)
+    for token in _tokens(text):
+        yield _gemini_body([{"text": token}], None)
+    calls = reply["tool_calls"] if with_tools else []
+    yield _gemini_body(
+        [{"functionCall": {"name": c["name"], "args": c["arguments"]}} for c in calls],
+        "STOP", _usage(prompt, text)
+    )
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+def create_app(stub: Optional[StubLLM] = None):
+    """
+    Build the stub provider ASGI app.
+
+    Routes:
+        POST /v1/chat/completions (OpenAI-compatible, "stream": true for SSE)
+        POST /v1beta/models/{model}:generateContent
+        POST /v1beta/models/{model}:streamGenerateContent (SSE)
+        GET /stats, GET /health
+
+    Args:
+        stub: Stub behaviour (default: StubLLM with a zero-latency config)
+
+    Returns:
+        FastAPI app
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    stub = stub or StubLLM()
+    app = FastAPI(title="Agent Aura Stub LLM")
+    app.state.stub = stub
+
+    def failure(status: int, shape: str) -> JSONResponse:
+        message = "Rate limit exceeded" if status == 429 else "Injected stub error"
+        if shape == "openai":
+            body = {"error": {"message": message, "type": "rate_limit_error" if status == 429 else "server_error"}}
+        else:
+            body = {"error": {"code": status, "message": message,
+                              "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+        headers = {"Retry-After": str(stub.config.retry_after)} if status == 429 else None
+        return JSONResponse(body, status_code=status, headers=headers)
+
+    def sse(chunks: Iterator[dict], done: bool) -> StreamingResponse:
+        async def events():
+            interval = stub.config.token_interval_ms / 1000.0
+            for i, chunk in enumerate(chunks):
+                if i and interval:
+                    await asyncio.sleep(interval)
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if done:
+                yield "data: [DONE]\n\n"
+        stub._count("streamed")
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        status = stub.fault()
+        await asyncio.sleep(stub.latency())
+        if status:
+            return failure(status, "openai")
+        prompt = openai_prompt(body)
+        reply = stub.reply(prompt)
+        model = body.get("model", "stub-openai")
+        with_tools = bool(body.get("tools"))
+        if body.get("stream"):
+            return sse(openai_chunks(model, reply, with_tools), done=True)
+        return openai_response(model, prompt, reply, with_tools)
+
+    @app.post("/v1beta/models/{target}")
+    async def generate_content(target: str, request: Request):
+        _, _, method = target.partition(":")
+        if method not in ("generateContent", "streamGenerateContent"):
+            return JSONResponse({"error": {"code": 404, "message": f"Unknown method: {method}"}}, status_code=404)
+        body = await request.json()
+        status = stub.fault()
+        await asyncio.sleep(stub.latency())
+        if status:
+            return failure(status, "gemini")
+        prompt = gemini_prompt(body)
+        reply = stub.reply(prompt)
+        with_tools = any(tool.get("function_declarations") or tool.get("functionDeclarations")
+                         for tool in body.get("tools") or [])
+        if method == "streamGenerateContent":
+            return sse(gemini_chunks(prompt, reply, with_tools), done=False)
+        return gemini_response(prompt, reply, with_tools)
+
+    @app.get("/stats")
+    async def stats():
+        return dict(stub.stats)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Local OpenAI/Gemini-compatible stub LLM for load testing")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8090, help="Port (ModelManager reads STUB_LLM_URL)")
+    parser.add_argument("--latency", default="fixed:0",
+                        help=f"Time to first token in ms: {', '.join(LATENCY_DISTRIBUTIONS)} (e.g. lognormal:300,0.4)")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="Milliseconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429 responses")
+    parser.add_argument("--script", default=None, help="JSON file of scripted replies and tool calls")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and fault injection")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    config = StubConfig(
+        latency=LatencyModel.parse(args.latency),
+        token_interval_ms=args.token_interval,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        script=load_script(args.script) if args.script else [],
+        seed=args.seed
+    )
+    print(f"🧪 Stub LLM on http://{args.host}:{args.port} (latency {args.latency})")
+    uvicorn.run(create_app(StubLLM(config)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,30 @@ import json
 import csv
 import os
 from datetime import datetime
+from typing import List
+import numpy as np
 import pandas as pd
 
+from app.agent_core.progress_store import progress_store, RISK_LEVELS, level_code, to_epoch_us
+from app.agent_core.forecasting import forecast_cohort
+from app.agent_core.snapshots import SnapshotLog
+from app.agent_core.downsampling import downsample_indices
+from app.agent_core.outbox import notification_outbox
 
-# Global progress tracking database
-progress_database = {}
-notification_log = []
+
+# Snapshot logs by directory
+_snapshot_logs = {}
+
+
+def _get_snapshot_log(filepath: str) -> SnapshotLog:
+    """Snapshot log for an export path ('./output/x.json' -> './output/x/')."""
+    directory = os.path.splitext(filepath)[0]
+    if directory not in _snapshot_logs:
+        _snapshot_logs[directory] = SnapshotLog(
+            directory,
+            compact_every=int(os.getenv("SNAPSHOT_COMPACT_EVERY", "16"))
+        )
+    return _snapshot_logs[directory]
 
 
 class RiskThresholds:
@@ -27,6 +45,273 @@ class RiskThresholds:
     LOW = 0.30
 
 
+# ============================================================================
+# CATALOGS - Read-only intervention plans and success predictions
+# ============================================================================
+
+# Bump when catalog content changes, so stored references can be checked
+CATALOG_VERSION = "2025.1"
+
+
+class _FrozenDict(dict):
+    """Read-only dict (still a dict for JSON encoding and isinstance checks)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only; copy them with dict() first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only list (still a list for JSON encoding and isinstance checks)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only; copy them with list() first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (_FrozenList, (list(self),))
+
+
+def _freeze(value):
+    """Recursively convert dicts and lists to their read-only variants."""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+INTERVENTION_PLAN_CATALOG = _freeze({
+    "CRITICAL": {
+        "type": "Emergency Intervention",
+        "priority": "URGENT",
+        "duration_weeks": 4,
+        "frequency": "Daily",
+        "actions": [
+            "Schedule immediate parent-student-teacher meeting",
+            "Assign dedicated academic mentor",
+            "Implement daily progress monitoring",
+            "Coordinate with school counselor for support",
+            "Consider specialized support services (tutoring, counseling)",
+            "Create individualized education plan (IEP) if needed",
+            "Weekly progress reports to all stakeholders"
+        ],
+        "resources": [
+            "One-on-one tutoring sessions",
+            "Study materials and resources",
+            "Counseling services",
+            "Parent engagement workshops"
+        ],
+        "success_metrics": [
+            "GPA improvement of 0.5+ points",
+            "Attendance improvement to 90%+",
+            "Completion of all assignments",
+            "Positive behavior reports"
+        ],
+        "estimated_cost": "High ($500-1000/student)",
+        "estimated_hours": "10-15 hours/week"
+    },
+    "HIGH": {
+        "type": "Targeted Intervention",
+        "priority": "HIGH",
+        "duration_weeks": 6,
+        "frequency": "3x per week",
+        "actions": [
+            "Schedule parent-teacher conference within 1 week",
+            "Create structured study plan with clear goals",
+            "Provide tutoring resources and peer support",
+            "Implement weekly check-ins with mentor",
+            "Monitor attendance and assignment completion",
+            "Bi-weekly progress reports"
+        ],
+        "resources": [
+            "Small group tutoring",
+            "Online learning resources",
+            "Study guides and materials",
+            "Mentorship program"
+        ],
+        "success_metrics": [
+            "GPA improvement of 0.3+ points",
+            "Attendance improvement to 92%+",
+            "80%+ assignment completion rate",
+            "Improved class participation"
+        ],
+        "estimated_cost": "Medium ($200-500/student)",
+        "estimated_hours": "5-8 hours/week"
+    },
+    "MODERATE": {
+        "type": "Preventive Intervention",
+        "priority": "MEDIUM",
+        "duration_weeks": 8,
+        "frequency": "Weekly",
+        "actions": [
+            "Regular academic check-ins with teacher",
+            "Encourage participation in study groups",
+            "Provide additional study resources",
+            "Foster positive learning environment",
+            "Maintain regular parent communication",
+            "Monthly progress reviews"
+        ],
+        "resources": [
+            "Study group access",
+            "Digital learning resources",
+            "After-school programs",
+            "Peer mentoring"
+        ],
+        "success_metrics": [
+            "Maintain or improve current GPA",
+            "Attendance at 95%+",
+            "Consistent assignment completion",
+            "Active class participation"
+        ],
+        "estimated_cost": "Low ($50-200/student)",
+        "estimated_hours": "2-4 hours/week"
+    },
+    "LOW": {
+        "type": "Monitoring & Enrichment",
+        "priority": "LOW",
+        "duration_weeks": 12,
+        "frequency": "Monthly",
+        "actions": [
+            "Continue standard academic monitoring",
+            "Celebrate academic successes and achievements",
+            "Encourage leadership roles and advanced learning",
+            "Support participation in enrichment activities",
+            "Maintain positive feedback loop",
+            "Quarterly progress reviews"
+        ],
+        "resources": [
+            "Advanced learning materials",
+            "Leadership opportunities",
+            "Enrichment programs",
+            "Recognition programs"
+        ],
+        "success_metrics": [
+            "Maintain high GPA (3.5+)",
+            "Perfect or near-perfect attendance",
+            "Leadership and mentorship roles",
+            "Academic excellence recognition"
+        ],
+        "estimated_cost": "Minimal ($0-50/student)",
+        "estimated_hours": "1-2 hours/week"
+    }
+})
+
+SUCCESS_PREDICTION_CATALOG = _freeze({
+    "CRITICAL": {
+        "base_success_rate": 75,
+        "confidence_level": 85,
+        "timeline_weeks": 4,
+        "expected_gpa_improvement": 0.5,
+        "expected_attendance_improvement": 15,
+        "factors_affecting_success": [
+            "Early intervention timing",
+            "Student engagement level",
+            "Family support availability",
+            "Resource allocation adequacy",
+            "Mentor-student relationship quality"
+        ],
+        "risk_of_failure": [
+            "Delayed intervention start",
+            "Lack of family engagement",
+            "Underlying unaddressed issues",
+            "Insufficient resources"
+        ]
+    },
+    "HIGH": {
+        "base_success_rate": 82,
+        "confidence_level": 85,
+        "timeline_weeks": 6,
+        "expected_gpa_improvement": 0.4,
+        "expected_attendance_improvement": 10,
+        "factors_affecting_success": [
+            "Consistent tutoring participation",
+            "Parent-teacher collaboration",
+            "Student motivation level",
+            "Peer support engagement"
+        ],
+        "risk_of_failure": [
+            "Inconsistent attendance at support sessions",
+            "Lack of study plan adherence",
+            "External stressors"
+        ]
+    },
+    "MODERATE": {
+        "base_success_rate": 88,
+        "confidence_level": 85,
+        "timeline_weeks": 8,
+        "expected_gpa_improvement": 0.3,
+        "expected_attendance_improvement": 5,
+        "factors_affecting_success": [
+            "Regular check-ins maintained",
+            "Study group participation",
+            "Positive reinforcement",
+            "Resource utilization"
+        ],
+        "risk_of_failure": [
+            "Inconsistent monitoring",
+            "Decreased motivation",
+            "Competing priorities"
+        ]
+    },
+    "LOW": {
+        "base_success_rate": 92,
+        "confidence_level": 85,
+        "timeline_weeks": 12,
+        "expected_gpa_improvement": 0.2,
+        "expected_attendance_improvement": 2,
+        "factors_affecting_success": [
+            "Continued encouragement",
+            "Leadership opportunities",
+            "Advanced learning access",
+            "Recognition and rewards"
+        ],
+        "risk_of_failure": [
+            "Complacency",
+            "Boredom from lack of challenge",
+            "External life changes"
+        ]
+    }
+})
+
+
+# Catalogs by the prefix used in catalog ids ("intervention_plan:HIGH")
+_CATALOGS = {
+    "intervention_plan": INTERVENTION_PLAN_CATALOG,
+    "success_prediction": SUCCESS_PREDICTION_CATALOG
+}
+
+
+def get_catalog_entry(catalog_id: str, catalog_version: str = None):
+    """
+    Resolve a catalog reference returned with by_reference=True.
+    
+    Args:
+        catalog_id: Catalog id (e.g. "intervention_plan:HIGH")
+        catalog_version: Version the reference was created with (optional)
+        
+    Returns:
+        The read-only catalog entry, or an error dictionary
+    """
+    if catalog_version is not None and catalog_version != CATALOG_VERSION:
+        return {
+            "error": f"Catalog version {catalog_version} is not available (current: {CATALOG_VERSION})",
+            "status": "error"
+        }
+    kind, _, level = catalog_id.partition(":")
+    catalog = _CATALOGS.get(kind)
+    if catalog is None or level not in catalog:
+        return {"error": f"Unknown catalog entry: {catalog_id}", "status": "error"}
+    return catalog[level]
+
+
 # ============================================================================
 # FOUNDATION TOOLS (1-4) - Core Functionality
 # ============================================================================
@@ -166,238 +451,54 @@ def analyze_student_risk(student_data: dict):
     }
 
 
-def generate_intervention_plan(risk_level: str):
+def generate_intervention_plan(risk_level: str, by_reference: bool = False):
     """
     Tool 3: Create personalized intervention strategy.
     
     Args:
         risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+        by_reference: Return only the catalog id and version instead of the full plan
         
     Returns:
         Dictionary with intervention plan details
     """
+    entry = risk_level if risk_level in INTERVENTION_PLAN_CATALOG else "LOW"
     
-    intervention_plans = {
-        "CRITICAL": {
-            "type": "Emergency Intervention",
-            "priority": "URGENT",
-            "duration_weeks": 4,
-            "frequency": "Daily",
-            "actions": [
-                "Schedule immediate parent-student-teacher meeting",
-                "Assign dedicated academic mentor",
-                "Implement daily progress monitoring",
-                "Coordinate with school counselor for support",
-                "Consider specialized support services (tutoring, counseling)",
-                "Create individualized education plan (IEP) if needed",
-                "Weekly progress reports to all stakeholders"
-            ],
-            "resources": [
-                "One-on-one tutoring sessions",
-                "Study materials and resources",
-                "Counseling services",
-                "Parent engagement workshops"
-            ],
-            "success_metrics": [
-                "GPA improvement of 0.5+ points",
-                "Attendance improvement to 90%+",
-                "Completion of all assignments",
-                "Positive behavior reports"
-            ],
-            "estimated_cost": "High ($500-1000/student)",
-            "estimated_hours": "10-15 hours/week"
-        },
-        "HIGH": {
-            "type": "Targeted Intervention",
-            "priority": "HIGH",
-            "duration_weeks": 6,
-            "frequency": "3x per week",
-            "actions": [
-                "Schedule parent-teacher conference within 1 week",
-                "Create structured study plan with clear goals",
-                "Provide tutoring resources and peer support",
-                "Implement weekly check-ins with mentor",
-                "Monitor attendance and assignment completion",
-                "Bi-weekly progress reports"
-            ],
-            "resources": [
-                "Small group tutoring",
-                "Online learning resources",
-                "Study guides and materials",
-                "Mentorship program"
-            ],
-            "success_metrics": [
-                "GPA improvement of 0.3+ points",
-                "Attendance improvement to 92%+",
-                "80%+ assignment completion rate",
-                "Improved class participation"
-            ],
-            "estimated_cost": "Medium ($200-500/student)",
-            "estimated_hours": "5-8 hours/week"
-        },
-        "MODERATE": {
-            "type": "Preventive Intervention",
-            "priority": "MEDIUM",
-            "duration_weeks": 8,
-            "frequency": "Weekly",
-            "actions": [
-                "Regular academic check-ins with teacher",
-                "Encourage participation in study groups",
-                "Provide additional study resources",
-                "Foster positive learning environment",
-                "Maintain regular parent communication",
-                "Monthly progress reviews"
-            ],
-            "resources": [
-                "Study group access",
-                "Digital learning resources",
-                "After-school programs",
-                "Peer mentoring"
-            ],
-            "success_metrics": [
-                "Maintain or improve current GPA",
-                "Attendance at 95%+",
-                "Consistent assignment completion",
-                "Active class participation"
-            ],
-            "estimated_cost": "Low ($50-200/student)",
-            "estimated_hours": "2-4 hours/week"
-        },
-        "LOW": {
-            "type": "Monitoring & Enrichment",
-            "priority": "LOW",
-            "duration_weeks": 12,
-            "frequency": "Monthly",
-            "actions": [
-                "Continue standard academic monitoring",
-                "Celebrate academic successes and achievements",
-                "Encourage leadership roles and advanced learning",
-                "Support participation in enrichment activities",
-                "Maintain positive feedback loop",
-                "Quarterly progress reviews"
-            ],
-            "resources": [
-                "Advanced learning materials",
-                "Leadership opportunities",
-                "Enrichment programs",
-                "Recognition programs"
-            ],
-            "success_metrics": [
-                "Maintain high GPA (3.5+)",
-                "Perfect or near-perfect attendance",
-                "Leadership and mentorship roles",
-                "Academic excellence recognition"
-            ],
-            "estimated_cost": "Minimal ($0-50/student)",
-            "estimated_hours": "1-2 hours/week"
-        }
+    # Per-call metadata; the catalog entry itself is shared and read-only
+    overlay = {
+        "catalog_id": f"intervention_plan:{entry}",
+        "catalog_version": CATALOG_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "risk_level": risk_level
     }
-    
-    plan = intervention_plans.get(risk_level, intervention_plans["LOW"])
-    
-    # Add timestamp and student context
-    plan["created_at"] = datetime.now().isoformat()
-    plan["risk_level"] = risk_level
-    
-    return plan
+    if by_reference:
+        return overlay
+    return {**INTERVENTION_PLAN_CATALOG[entry], **overlay}
 
 
-def predict_intervention_success(risk_level: str):
+def predict_intervention_success(risk_level: str, by_reference: bool = False):
     """
     Tool 4: Forecast intervention effectiveness and outcomes.
     
     Args:
         risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+        by_reference: Return only the catalog id and version instead of the full prediction
         
     Returns:
         Dictionary with success predictions and metrics
     """
+    entry = risk_level if risk_level in SUCCESS_PREDICTION_CATALOG else "LOW"
     
-    # Base success rates by risk level
-    success_predictions = {
-        "CRITICAL": {
-            "base_success_rate": 75,
-            "confidence_level": 85,
-            "timeline_weeks": 4,
-            "expected_gpa_improvement": 0.5,
-            "expected_attendance_improvement": 15,
-            "factors_affecting_success": [
-                "Early intervention timing",
-                "Student engagement level",
-                "Family support availability",
-                "Resource allocation adequacy",
-                "Mentor-student relationship quality"
-            ],
-            "risk_of_failure": [
-                "Delayed intervention start",
-                "Lack of family engagement",
-                "Underlying unaddressed issues",
-                "Insufficient resources"
-            ]
-        },
-        "HIGH": {
-            "base_success_rate": 82,
-            "confidence_level": 85,
-            "timeline_weeks": 6,
-            "expected_gpa_improvement": 0.4,
-            "expected_attendance_improvement": 10,
-            "factors_affecting_success": [
-                "Consistent tutoring participation",
-                "Parent-teacher collaboration",
-                "Student motivation level",
-                "Peer support engagement"
-            ],
-            "risk_of_failure": [
-                "Inconsistent attendance at support sessions",
-                "Lack of study plan adherence",
-                "External stressors"
-            ]
-        },
-        "MODERATE": {
-            "base_success_rate": 88,
-            "confidence_level": 85,
-            "timeline_weeks": 8,
-            "expected_gpa_improvement": 0.3,
-            "expected_attendance_improvement": 5,
-            "factors_affecting_success": [
-                "Regular check-ins maintained",
-                "Study group participation",
-                "Positive reinforcement",
-                "Resource utilization"
-            ],
-            "risk_of_failure": [
-                "Inconsistent monitoring",
-                "Decreased motivation",
-                "Competing priorities"
-            ]
-        },
-        "LOW": {
-            "base_success_rate": 92,
-            "confidence_level": 85,
-            "timeline_weeks": 12,
-            "expected_gpa_improvement": 0.2,
-            "expected_attendance_improvement": 2,
-            "factors_affecting_success": [
-                "Continued encouragement",
-                "Leadership opportunities",
-                "Advanced learning access",
-                "Recognition and rewards"
-            ],
-            "risk_of_failure": [
-                "Complacency",
-                "Boredom from lack of challenge",
-                "External life changes"
-            ]
-        }
+    # Per-call metadata; the catalog entry itself is shared and read-only
+    overlay = {
+        "catalog_id": f"success_prediction:{entry}",
+        "catalog_version": CATALOG_VERSION,
+        "risk_level": risk_level,
+        "prediction_timestamp": datetime.now().isoformat()
     }
-    
-    prediction = success_predictions.get(risk_level, success_predictions["LOW"])
-    
-    # Add metadata
-    prediction["risk_level"] = risk_level
-    prediction["prediction_timestamp"] = datetime.now().isoformat()
-    
-    return prediction
+    if by_reference:
+        return overlay
+    return {**SUCCESS_PREDICTION_CATALOG[entry], **overlay}
 
 
 # ============================================================================
@@ -445,8 +546,8 @@ def predict_risk_trends(student_id: str):
     Returns:
         Dictionary with risk prediction analysis
     """
-    # Mock prediction logic based on progress history
-    if student_id not in progress_database:
+    student_record = progress_store.get_student(student_id)
+    if student_record is None:
         return {
             "prediction": "Insufficient data for prediction",
             "confidence": "Low",
@@ -454,177 +555,256 @@ def predict_risk_trends(student_id: str):
             "status": "no_data"
         }
         
-    history = progress_database[student_id]["history"]
-    if len(history) < 2:
+    # Linear trend over the recent history (rolled-up periods count as one
+    # point each), projected one month ahead
+    forecast = None
+    if student_record["entry_count"] >= 2:
+        forecast = forecast_cohort([student_id], horizon_days=30, store=progress_store).get(student_id)
+    if forecast is None or forecast["data_points"] < 2:
         return {
             "prediction": "Need more data points for accurate prediction",
             "confidence": "Low",
             "trend": "Stable",
             "status": "insufficient_data"
         }
-        
-    # Simple trend analysis
-    recent_scores = [entry["risk_score"] for entry in history[-5:]]
-    avg_score = sum(recent_scores) / len(recent_scores)
     
-    if recent_scores[-1] > recent_scores[0]:
-        trend = "Increasing Risk"
+    if forecast["trend"] == "Increasing Risk":
         prediction = "Risk level likely to escalate if no intervention"
-    elif recent_scores[-1] < recent_scores[0]:
-        trend = "Decreasing Risk"
+    elif forecast["trend"] == "Decreasing Risk":
         prediction = "Student is responding well to interventions"
     else:
-        trend = "Stable"
         prediction = "Risk level remains constant"
         
     return {
         "student_id": student_id,
-        "predicted_trend": trend,
+        "predicted_trend": forecast["trend"],
         "prediction_summary": prediction,
-        "confidence_score": 0.85,
+        "confidence_score": forecast["confidence_score"],
         "next_month_projection": {
-            "projected_risk_score": round(avg_score, 3),
-            "risk_level": "HIGH" if avg_score >= 0.8 else "MODERATE" if avg_score >= 0.6 else "LOW"
+            "projected_risk_score": forecast["projected_risk_score"],
+            "projection_interval": forecast["projection_interval"],
+            "risk_level": forecast["risk_level"]
         },
+        "data_points": forecast["data_points"],
         "status": "success"
     }
 
-def generate_alert_email(student_data: dict, risk_analysis: dict):
+
+def predict_cohort_risk_trends(limit: int = 20, method: str = "linear", horizon_days: int = 30):
     """
-    Tool 5 (NEW): Generate professional email notifications for parents/teachers.
+    Tool 11 (NEW): Forecast risk trends for every tracked student and rank those getting worse.
     
     Args:
-        student_data: Dictionary containing student information.
-        risk_analysis: Dictionary with risk score, level, and contributing factors.
+        limit: Maximum number of worsening students to return
+        method: Trend method ('linear' or 'ewma')
+        horizon_days: Days ahead to project
         
     Returns:
-        Dictionary with email content and metadata
+        Dictionary with cohort totals and the ranked worsening students
     """
-    # Get student data and risk analysis from arguments
-    intervention_plan = generate_intervention_plan(risk_analysis.get("risk_level", "MODERATE"))
-    
-    risk_level = risk_analysis.get("risk_level", "MODERATE")
+    forecast = forecast_cohort(method=method, horizon_days=horizon_days, store=progress_store)
+    worsening = forecast.worsening()
     
-    # Email templates by risk level
-    email_templates = {
-        "CRITICAL": {
-            "priority": "URGENT",
-            "subject_template": "⚠️ URGENT: {name} - Immediate Academic Support Required",
-            "greeting": "Dear Parent/Guardian and Educational Team,",
-            "intro": "We are reaching out with urgent concerns about {name}'s academic performance that require immediate attention and collaborative action.",
-            "tone": "urgent and direct",
-            "call_to_action": "Please contact us IMMEDIATELY to schedule an emergency meeting."
-        },
-        "HIGH": {
-            "priority": "HIGH",
-            "subject_template": "📋 Action Required: {name} - Academic Support Recommended",
-            "greeting": "Dear Parent/Guardian and Educational Team,",
-            "intro": "We are writing regarding {name}'s current academic performance and would like to discuss strategies for improvement.",
-            "tone": "concerned but supportive",
-            "call_to_action": "Please schedule a meeting with us within the next week to discuss an action plan."
-        },
-        "MODERATE": {
-            "priority": "MEDIUM",
-            "subject_template": "📊 Notification: {name} - Academic Progress Update",
-            "greeting": "Dear Parent/Guardian,",
-            "intro": "We wanted to update you on {name}'s academic progress and share some recommendations for continued success.",
-            "tone": "supportive and proactive",
-            "call_to_action": "Please review the recommendations and feel free to reach out with any questions."
-        }
+    return {
+        "students_forecast": len(forecast),
+        "worsening_count": len(worsening),
+        "method": method,
+        "horizon_days": horizon_days,
+        "worsening_students": worsening[:limit],
+        "status": "success"
     }
-    
-    template = email_templates.get(risk_level, email_templates.get("MODERATE", {}))
-    
-    # Extract student information
-    student_name = student_data.get("name", "Student")
-    student_id = student_data.get("student_id", "N/A")
-    grade = student_data.get("grade", "N/A")
-    gpa = student_data.get("gpa", 0.0)
-    attendance = student_data.get("attendance", 0.0)
-    
-    # Identify specific concerns
-    concerns = []
-    risk_factors = risk_analysis.get("risk_factors", [])
-    
-    for factor in risk_factors:
-        concerns.append(factor)
-    
-    # Build email content
-    email_subject = template["subject_template"].format(name=student_name)
-    
-    email_body = f"""{template['greeting']}
 
-{template['intro'].format(name=student_name)}
 
-STUDENT INFORMATION:
-• Name: {student_name}
-• Student ID: {student_id}
-• Grade Level: {grade}
-• Current GPA: {gpa:.2f}
-• Attendance Rate: {attendance:.1f}%
+# Alert email templates by risk level (levels without one use MODERATE)
+EMAIL_TEMPLATES = {
+    "CRITICAL": {
+        "priority": "URGENT",
+        "subject_template": "⚠️ URGENT: {name} - Immediate Academic Support Required",
+        "greeting": "Dear Parent/Guardian and Educational Team,",
+        "intro": "We are reaching out with urgent concerns about {name}'s academic performance that require immediate attention and collaborative action.",
+        "tone": "urgent and direct",
+        "call_to_action": "Please contact us IMMEDIATELY to schedule an emergency meeting."
+    },
+    "HIGH": {
+        "priority": "HIGH",
+        "subject_template": "📋 Action Required: {name} - Academic Support Recommended",
+        "greeting": "Dear Parent/Guardian and Educational Team,",
+        "intro": "We are writing regarding {name}'s current academic performance and would like to discuss strategies for improvement.",
+        "tone": "concerned but supportive",
+        "call_to_action": "Please schedule a meeting with us within the next week to discuss an action plan."
+    },
+    "MODERATE": {
+        "priority": "MEDIUM",
+        "subject_template": "📊 Notification: {name} - Academic Progress Update",
+        "greeting": "Dear Parent/Guardian,",
+        "intro": "We wanted to update you on {name}'s academic progress and share some recommendations for continued success.",
+        "tone": "supportive and proactive",
+        "call_to_action": "Please review the recommendations and feel free to reach out with any questions."
+    }
+}
 
-AREAS OF CONCERN:
-"""
-    
-    for i, concern in enumerate(concerns, 1):
-        email_body += f"{i}. {concern}\n"
-    
-    email_body += f"""
-RISK ASSESSMENT:
-• Risk Level: {risk_level}
-• Risk Score: {risk_analysis.get('risk_score', 0.0):.3f}
-• Assessment Date: {datetime.now().strftime('%B %d, %Y')}
-"""
-    
-    # Add intervention plan if available
-    if intervention_plan:
-        email_body += f"""
+# Compiled alert emails by risk level, built on first use
+_compiled_email_templates = {}
+
+
+def _escape_format(text) -> str:
+    return str(text).replace("{", "{{").replace("}", "}}")
+
+
+def _compile_email_template(risk_level: str) -> dict:
+    """
+    Precompile the alert email for a risk level.
+
+    Everything that does not depend on the student (greeting, intervention
+    plan, closing) is baked into one format string, so rendering an email
+    is a single str.format call.
+
+    Args:
+        risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+
+    Returns:
+        Dict with priority, subject format string and body format string
+    """
+    compiled = _compiled_email_templates.get(risk_level)
+    if compiled is not None:
+        return compiled
+
+    template = EMAIL_TEMPLATES.get(risk_level, EMAIL_TEMPLATES["MODERATE"])
+    intervention = ""
+    plan = generate_intervention_plan(risk_level)
+    if plan:
+        actions = "".join(f"{i}. {action}\n" for i, action in enumerate(plan.get("actions", [])[:5], 1))
+        intervention = _escape_format(f"""
 RECOMMENDED INTERVENTION:
-• Type: {intervention_plan.get('type', 'N/A')}
-• Duration: {intervention_plan.get('duration_weeks', 'N/A')} weeks
-• Frequency: {intervention_plan.get('frequency', 'N/A')}
+• Type: {plan.get('type', 'N/A')}
+• Duration: {plan.get('duration_weeks', 'N/A')} weeks
+• Frequency: {plan.get('frequency', 'N/A')}
 
 KEY ACTIONS:
-"""
-        actions = intervention_plan.get('actions', [])
-        for i, action in enumerate(actions[:5], 1):  # Top 5 actions
-            email_body += f"{i}. {action}\n"
-    
-    email_body += f"""
-NEXT STEPS:
-{template['call_to_action']}
+{actions}""")
 
-We are committed to supporting {student_name}'s academic success and appreciate your partnership in this important work.
+    body = (
+        f"{_escape_format(template['greeting'])}\n\n"
+        f"{template['intro']}\n\n"
+        "STUDENT INFORMATION:\n"
+        "• Name: {name}\n"
+        "• Student ID: {student_id}\n"
+        "• Grade Level: {grade}\n"
+        "• Current GPA: {gpa:.2f}\n"
+        "• Attendance Rate: {attendance:.1f}%\n\n"
+        "AREAS OF CONCERN:\n"
+        "{concerns}\n"
+        "RISK ASSESSMENT:\n"
+        f"• Risk Level: {_escape_format(risk_level)}\n"
+        "• Risk Score: {risk_score:.3f}\n"
+        "• Assessment Date: {assessment_date}\n"
+        f"{intervention}\n"
+        "NEXT STEPS:\n"
+        f"{_escape_format(template['call_to_action'])}\n\n"
+        "We are committed to supporting {name}'s academic success and appreciate your partnership in this important work.\n\n"
+        "Sincerely,\n"
+        "Agent Aura Academic Support System\n\n"
+        "---\n"
+        "This is an automated notification generated by Agent Aura v2.0\n"
+        "For questions, please contact your school's academic support team.\n"
+    )
+    compiled = {"priority": template["priority"], "subject": template["subject_template"], "body": body}
+    _compiled_email_templates[risk_level] = compiled
+    return compiled
 
-Sincerely,
-Agent Aura Academic Support System
 
----
-This is an automated notification generated by Agent Aura v2.0
-For questions, please contact your school's academic support team.
-"""
-    
-    # Create email record
-    email_record = {
+def _render_alert_email(student_data: dict, risk_analysis: dict, now: datetime, assessment_date: str) -> dict:
+    """Render one alert email record from a compiled template."""
+    risk_level = risk_analysis.get("risk_level", "MODERATE")
+    compiled = _compile_email_template(risk_level)
+    student_name = student_data.get("name", "Student")
+    student_id = student_data.get("student_id", "N/A")
+    concerns = list(risk_analysis.get("risk_factors", []))
+
+    body = compiled["body"].format(
+        name=student_name,
+        student_id=student_id,
+        grade=student_data.get("grade", "N/A"),
+        gpa=student_data.get("gpa", 0.0),
+        attendance=student_data.get("attendance", 0.0),
+        concerns="".join(f"{i}. {concern}\n" for i, concern in enumerate(concerns, 1)),
+        risk_score=risk_analysis.get("risk_score", 0.0),
+        assessment_date=assessment_date
+    )
+    return {
         "email_generated": True,
-        "email_id": f"EMAIL-{student_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        "email_id": f"EMAIL-{student_id}-{now.strftime('%Y%m%d%H%M%S')}",
         "student_id": student_id,
         "student_name": student_name,
-        "priority": template["priority"],
-        "subject": email_subject,
-        "body": email_body,
+        "priority": compiled["priority"],
+        "subject": compiled["subject"].format(name=student_name),
+        "body": body,
         "recipients": ["parent/guardian", "teacher", "counselor"],
         "concerns_count": len(concerns),
         "concerns": concerns,
         "risk_level": risk_level,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "status": "generated"
     }
+
+
+def generate_alert_email(student_data: dict, risk_analysis: dict):
+    """
+    Tool 5 (NEW): Generate professional email notifications for parents/teachers.
+    
+    Args:
+        student_data: Dictionary containing student information.
+        risk_analysis: Dictionary with risk score, level, and contributing factors.
+        
+    Returns:
+        Dictionary with email content and metadata
+    """
+    now = datetime.now()
+    email_record = _render_alert_email(student_data, risk_analysis, now, now.strftime('%B %d, %Y'))
     
-    # Log notification
-    notification_log.append(email_record)
+    # Store in the outbox; a repeat alert for the same student and level
+    # within the dedupe window returns the earlier notification instead
+    stored, created = notification_outbox.add(
+        email_record,
+        dedupe_key=f"{email_record['student_id']}:{email_record['risk_level']}",
+        grade=student_data.get("grade")
+    )
+    if not created:
+        stored["deduplicated"] = True
     
-    return email_record
+    return stored
+
+
+def generate_alert_emails_batch(students: List[dict], risk_analyses: List[dict]):
+    """
+    Render alert emails for many students in one pass and store them in one transaction.
+    
+    Args:
+        students: Student records
+        risk_analyses: Matching risk analyses (as returned by analyze_student_risk)
+        
+    Returns:
+        List of email records in input order (duplicates marked as in generate_alert_email)
+    """
+    now = datetime.now()
+    assessment_date = now.strftime('%B %d, %Y')
+    emails = [
+        _render_alert_email(student_data, risk_analysis, now, assessment_date)
+        for student_data, risk_analysis in zip(students, risk_analyses)
+    ]
+    
+    results = notification_outbox.add_many(
+        emails,
+        dedupe_keys=[f"{email['student_id']}:{email['risk_level']}" for email in emails],
+        grades=[student_data.get("grade") for student_data in students]
+    )
+    stored_emails = []
+    for stored, created in results:
+        if not created:
+            stored["deduplicated"] = True
+        stored_emails.append(stored)
+    
+    return stored_emails
 
 
 def track_student_progress(
@@ -648,16 +828,6 @@ def track_student_progress(
         Dictionary with tracking status and progress metrics
     """
     
-    # Initialize student record if new
-    if student_id not in progress_database:
-        progress_database[student_id] = {
-            "student_id": student_id,
-            "student_name": student_name,
-            "history": [],
-            "created_date": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat()
-        }
-    
     # Create progress entry
     progress_entry = {
         "date": datetime.now().isoformat().split('T')[0],
@@ -667,18 +837,17 @@ def track_student_progress(
         "notes": notes
     }
     
-    # Add to history
-    progress_database[student_id]["history"].append(progress_entry)
-    progress_database[student_id]["last_updated"] = datetime.now().isoformat()
+    # Append to the durable progress store
+    progress_store.append(student_id, progress_entry, student_name)
     
-    # Calculate trend analysis
-    history = progress_database[student_id]["history"]
-    total_entries = len(history)
+    # Trend analysis from the running aggregates (constant time)
+    stats = progress_store.get_stats(student_id)
+    total_entries = stats["count"]
     
     if total_entries > 1:
         # Get first and last scores
-        first_score = history[0]["risk_score"]
-        current_score = history[-1]["risk_score"]
+        first_score = stats["first_score"]
+        current_score = stats["last_score"]
         
         # Calculate improvement
         score_change = first_score - current_score
@@ -696,8 +865,8 @@ def track_student_progress(
             trend_description = "Risk score remains relatively stable"
         
         # Calculate days since first entry
-        first_date = datetime.fromisoformat(history[0]["timestamp"])
-        current_date = datetime.fromisoformat(history[-1]["timestamp"])
+        first_date = datetime.fromisoformat(stats["first_timestamp"])
+        current_date = datetime.fromisoformat(stats["last_timestamp"])
         days_tracked = (current_date - first_date).days
     else:
         improvement_pct = 0
@@ -716,56 +885,77 @@ def track_student_progress(
         "improvement_percentage": round(improvement_pct, 1),
         "trend": trend,
         "trend_description": trend_description,
+        "ewma_risk_score": round(stats["ewma_score"], 3),
         "last_updated": datetime.now().isoformat(),
         "status": "success"
     }
 
 
-def get_student_progress_timeline(student_id: str):
+def get_student_progress_timeline(student_id: str, start_date: str = None, end_date: str = None):
     """
     Tool 7 (NEW): Retrieve historical progress data for a student.
     
     Args:
         student_id: Student identifier
+        start_date: Only include entries on or after this ISO date (optional)
+        end_date: Only include entries on or before this ISO date (optional)
         
     Returns:
-        Dictionary with complete progress history
+        Dictionary with progress history for the requested range
     """
     
-    if student_id not in progress_database:
+    student_record = progress_store.get_student(student_id)
+    if student_record is None:
         return {
             "error": f"No progress history found for student {student_id}",
             "status": "no_data"
         }
     
-    student_record = progress_database[student_id]
-    history = student_record["history"]
+    compact = progress_store.get_compact(student_id)
+    indices = compact.index_range(start_date, end_date)
+    # Older history is kept as daily/weekly rollups by the retention policy
+    rollups = progress_store.get_rollups(student_id, start_date, end_date)
+    history = _rollup_points(rollups) + compact.to_dicts(indices)
     
-    # Calculate statistics
-    if history:
-        risk_scores = [entry["risk_score"] for entry in history]
-        avg_risk_score = sum(risk_scores) / len(risk_scores)
-        min_risk_score = min(risk_scores)
-        max_risk_score = max(risk_scores)
+    if start_date is None and end_date is None:
+        # Whole history: use the running aggregates
+        stats = progress_store.get_stats(student_id)
+        avg_risk_score = stats["mean_score"]
+        min_risk_score = stats["min_score"]
+        max_risk_score = stats["max_score"]
+        level_counts = stats["level_counts"]
+    else:
+        # Range statistics over raw points plus rolled-up periods in the range
+        risk_scores = compact.scores[indices.start:indices.stop]
+        count = len(risk_scores)
+        total = sum(risk_scores)
+        min_risk_score = min(risk_scores) if count else None
+        max_risk_score = max(risk_scores) if count else None
         
         # Risk level distribution
-        risk_levels = [entry["risk_level"] for entry in history]
         level_counts = {}
-        for level in risk_levels:
+        for code in compact.levels[indices.start:indices.stop]:
+            level = RISK_LEVELS[code]
             level_counts[level] = level_counts.get(level, 0) + 1
-    else:
-        avg_risk_score = 0
-        min_risk_score = 0
-        max_risk_score = 0
-        level_counts = {}
+        
+        for rollup in rollups:
+            count += rollup["count"]
+            total += rollup["score_sum"]
+            min_risk_score = rollup["min_risk_score"] if min_risk_score is None else min(min_risk_score, rollup["min_risk_score"])
+            max_risk_score = rollup["max_risk_score"] if max_risk_score is None else max(max_risk_score, rollup["max_risk_score"])
+        
+        avg_risk_score = total / count if count else 0
+        min_risk_score = min_risk_score or 0
+        max_risk_score = max_risk_score or 0
     
     return {
         "student_id": student_id,
         "student_name": student_record.get("student_name"),
-        "total_records": len(history),
+        "total_records": len(indices) + sum(rollup["count"] for rollup in rollups),
         "created_date": student_record["created_date"],
         "last_updated": student_record["last_updated"],
         "progress_history": history,
+        "rollups": rollups,
         "statistics": {
             "average_risk_score": round(avg_risk_score, 3),
             "minimum_risk_score": round(min_risk_score, 3),
@@ -776,49 +966,79 @@ def get_student_progress_timeline(student_id: str):
     }
 
 
-def export_progress_visualization_data(student_id: str, format: str = "json"):
+# Color mapping for risk levels
+RISK_LEVEL_COLORS = {
+    "CRITICAL": "#FF0000",
+    "HIGH": "#FF6B6B",
+    "MODERATE": "#FFA500",
+    "LOW": "#4CAF50"
+}
+
+
+def _rollup_points(rollups: list) -> list:
+    """Rolled-up periods as timeline points: the period average, at the period's last entry."""
+    return [
+        {
+            "date": rollup["period_start"],
+            "timestamp": rollup["last_timestamp"],
+            "risk_level": rollup["last_risk_level"],
+            "risk_score": rollup["average_risk_score"],
+            "notes": f"{rollup['period']} rollup of {rollup['count']} entries",
+            "rollup": rollup["period"],
+            "count": rollup["count"]
+        }
+        for rollup in rollups
+    ]
+
+
+def _visualization_points(
+    student_id: str,
+    start_date: str = None,
+    end_date: str = None,
+    max_points: int = None,
+    method: str = "lttb"
+):
     """
-    Tool 8 (NEW): Export data formatted for visualization and reporting.
+    Timeline points of a student, downsampled to max_points if needed.
+    
+    Rolled-up periods come first, one point each, followed by raw entries.
     
-    Args:
-        student_id: Student identifier
-        format: Export format ('json', 'csv', 'chart_data')
-        
     Returns:
-        Dictionary with formatted visualization data
+        Tuple (timeline points, number of points in the range)
     """
+    compact = progress_store.get_compact(student_id)
+    indices = compact.index_range(start_date, end_date)
+    rollup_points = _rollup_points(progress_store.get_rollups(student_id, start_date, end_date))
+    n_rollups = len(rollup_points)
+    total = n_rollups + len(indices)
     
-    if student_id not in progress_database:
-        return {
-            "error": f"No data found for student {student_id}",
-            "status": "error"
-        }
-    
-    student_record = progress_database[student_id]
-    history = student_record["history"]
-    
-    # Color mapping for risk levels
-    color_map = {
-        "CRITICAL": "#FF0000",
-        "HIGH": "#FF6B6B",
-        "MODERATE": "#FFA500",
-        "LOW": "#4CAF50"
-    }
+    if max_points and total > max_points:
+        # Zero-copy views over the columnar history, after the few rollup points
+        timestamps = np.frombuffer(compact.timestamps, dtype=np.int64)[indices.start:indices.stop]
+        scores = np.frombuffer(compact.scores, dtype=np.float32)[indices.start:indices.stop]
+        levels = np.frombuffer(compact.levels, dtype=np.int8)[indices.start:indices.stop]
+        if n_rollups:
+            timestamps = np.concatenate([
+                np.array([to_epoch_us(p["timestamp"]) for p in rollup_points], dtype=np.int64), timestamps
+            ])
+            scores = np.concatenate([np.array([p["risk_score"] for p in rollup_points], dtype=np.float32), scores])
+            levels = np.concatenate([
+                np.array([level_code(p["risk_level"]) for p in rollup_points], dtype=np.int8), levels
+            ])
+        kept = downsample_indices(timestamps, scores, levels, max_points, method)
+        rollup_points = [rollup_points[i] for i in kept[kept < n_rollups]]
+        indices = (kept[kept >= n_rollups] - n_rollups + indices.start).tolist()
     
-    # Prepare timeline data
     timeline_points = []
-    for entry in history:
-        timeline_points.append({
-            "date": entry["date"],
-            "timestamp": entry["timestamp"],
-            "risk_score": entry["risk_score"],
-            "risk_level": entry["risk_level"],
-            "color": color_map.get(entry["risk_level"], "#999999"),
-            "notes": entry.get("notes", "")
-        })
-    
-    # Prepare chart-ready data
-    chart_data = {
+    for entry in rollup_points + compact.to_dicts(indices):
+        entry["color"] = RISK_LEVEL_COLORS.get(entry["risk_level"], "#999999")
+        timeline_points.append(entry)
+    return timeline_points, total
+
+
+def _chart_data(timeline_points: list) -> dict:
+    """Chart-ready series for timeline points."""
+    return {
         "labels": [point["date"] for point in timeline_points],
         "datasets": [
             {
@@ -832,6 +1052,42 @@ def export_progress_visualization_data(student_id: str, format: str = "json"):
         "risk_levels": [point["risk_level"] for point in timeline_points],
         "colors": [point["color"] for point in timeline_points]
     }
+
+
+def export_progress_visualization_data(
+    student_id: str,
+    format: str = "json",
+    start_date: str = None,
+    end_date: str = None,
+    max_points: int = None,
+    downsample_method: str = "lttb"
+):
+    """
+    Tool 8 (NEW): Export data formatted for visualization and reporting.
+    
+    Args:
+        student_id: Student identifier
+        format: Export format ('json', 'csv', 'chart_data')
+        start_date: Only include entries on or after this ISO date (optional)
+        end_date: Only include entries on or before this ISO date (optional)
+        max_points: Downsample longer timelines to about this many points (optional)
+        downsample_method: Downsampling method ('lttb' or 'minmax')
+        
+    Returns:
+        Dictionary with formatted visualization data
+    """
+    
+    student_record = progress_store.get_student(student_id)
+    if student_record is None:
+        return {
+            "error": f"No data found for student {student_id}",
+            "status": "error"
+        }
+    
+    # Prepare timeline data (risk level changes survive downsampling exactly)
+    timeline_points, total_entries = _visualization_points(
+        student_id, start_date, end_date, max_points, downsample_method
+    )
     
     export_data = {
         "student_id": student_id,
@@ -839,9 +1095,11 @@ def export_progress_visualization_data(student_id: str, format: str = "json"):
         "export_format": format,
         "export_timestamp": datetime.now().isoformat(),
         "timeline_data": timeline_points,
-        "chart_data": chart_data,
+        "chart_data": _chart_data(timeline_points),
         "summary": {
-            "total_entries": len(timeline_points),
+            "total_entries": total_entries,
+            "points_returned": len(timeline_points),
+            "downsampled": len(timeline_points) < total_entries,
             "date_range": {
                 "start": timeline_points[0]["date"] if timeline_points else None,
                 "end": timeline_points[-1]["date"] if timeline_points else None
@@ -857,20 +1115,103 @@ def export_progress_visualization_data(student_id: str, format: str = "json"):
     return export_data
 
 
+def export_progress_visualization_batch(
+    student_ids: List[str],
+    max_points: int = 200,
+    start_date: str = None,
+    end_date: str = None
+):
+    """
+    Tool 12 (NEW): Export chart data for many students in one call.
+    
+    Args:
+        student_ids: Student identifiers
+        max_points: Downsample each timeline to about this many points
+        start_date: Only include entries on or after this ISO date (optional)
+        end_date: Only include entries on or before this ISO date (optional)
+        
+    Returns:
+        Dictionary with chart data per student and the IDs without history
+    """
+    charts = {}
+    missing = []
+    for student_id in dict.fromkeys(student_ids):
+        if progress_store.get_student(student_id) is None:
+            missing.append(student_id)
+            continue
+        timeline_points, total_entries = _visualization_points(student_id, start_date, end_date, max_points)
+        charts[student_id] = {
+            "chart_data": _chart_data(timeline_points),
+            "total_entries": total_entries,
+            "points_returned": len(timeline_points)
+        }
+    
+    return {
+        "students": charts,
+        "missing": missing,
+        "max_points": max_points,
+        "status": "success"
+    }
+
+
+def query_notifications(
+    student_id: str = None,
+    grade: str = None,
+    status: str = None,
+    risk_level: str = None,
+    limit: int = 50
+):
+    """
+    Tool 13 (NEW): Look up generated notifications in the outbox.
+    
+    Args:
+        student_id: Only this student (optional)
+        grade: Only this grade/class (optional)
+        status: Delivery status ('pending', 'sending', 'sent', 'failed') (optional)
+        risk_level: Only this risk level (optional)
+        limit: Maximum number of notifications
+        
+    Returns:
+        Dictionary with matching notifications, newest first
+    """
+    notifications = notification_outbox.query(
+        student_id=student_id,
+        grade=grade,
+        status=status,
+        risk_level=risk_level,
+        limit=limit
+    )
+    return {
+        "count": len(notifications),
+        "notifications": notifications,
+        "status_counts": notification_outbox.status_counts(),
+        "status": "success"
+    }
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
 def save_notifications_to_file(filepath: str = "./output/notifications.json"):
-    """Save all generated notifications to a file."""
+    """
+    Checkpoint notifications generated or updated (e.g. sent) since the last save.
+    
+    Writes an NDJSON delta segment into the snapshot directory derived from
+    filepath ('./output/notifications.json' -> './output/notifications/').
+    """
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(notification_log, f, indent=2)
+        snapshot = _get_snapshot_log(filepath)
+        result = snapshot.checkpoint(
+            cursor=lambda previous: notification_outbox.max_change_seq(),
+            delta=lambda previous, current: notification_outbox.iter_changes(previous or 0, current),
+            full=lambda current: notification_outbox.iter_changes(0, current)
+        )
         return {
             "success": True,
-            "filepath": filepath,
-            "count": len(notification_log)
+            "filepath": snapshot.directory,
+            "count": len(notification_outbox),
+            **result
         }
     except Exception as e:
         return {
@@ -879,16 +1220,63 @@ def save_notifications_to_file(filepath: str = "./output/notifications.json"):
         }
 
 
+def load_notifications_from_file(filepath: str = "./output/notifications.json"):
+    """Replay a notifications snapshot into a list (latest state of each notification, in creation order)."""
+    latest = {}
+    for record in _get_snapshot_log(filepath).replay():
+        latest[record["outbox_id"]] = record
+    return [latest[outbox_id] for outbox_id in sorted(latest)]
+
+
+def _progress_snapshot_records(after_id: int, up_to_id: int):
+    """Snapshot records for entries in (after_id, up_to_id]: student metadata, then entries."""
+    entries = list(progress_store.iter_entries(after_id, up_to_id))
+    for student_id in dict.fromkeys(entry["student_id"] for entry in entries):
+        yield {"kind": "student", **progress_store.get_student(student_id)}
+    for entry in entries:
+        yield {"kind": "entry", **entry}
+
+
+def _compacted_progress_records(snapshot: SnapshotLog):
+    """
+    Every record of a progress snapshot, with one (latest) metadata record per student.
+    
+    Compaction folds the existing files instead of re-reading the store, so
+    entries that retention has since rolled up stay in the snapshot.
+    """
+    students = {}
+    for record in snapshot.replay():
+        if record["kind"] == "student":
+            students[record["student_id"]] = record
+    for record in snapshot.replay():
+        if record["kind"] == "student":
+            latest = students.pop(record["student_id"], None)
+            if latest is not None:
+                yield latest
+        else:
+            yield record
+
+
 def save_progress_database_to_file(filepath: str = "./output/progress_database.json"):
-    """Save the complete progress database to a file."""
+    """
+    Checkpoint progress entries appended since the last save.
+    
+    Writes an NDJSON delta segment into the snapshot directory derived from
+    filepath ('./output/progress_database.json' -> './output/progress_database/');
+    segments are periodically compacted into a base snapshot.
+    """
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(progress_database, f, indent=2)
+        snapshot = _get_snapshot_log(filepath)
+        result = snapshot.checkpoint(
+            cursor=lambda previous: progress_store.max_entry_id(),
+            delta=lambda previous, current: _progress_snapshot_records(previous or 0, current),
+            full=lambda current: _compacted_progress_records(snapshot)
+        )
         return {
             "success": True,
-            "filepath": filepath,
-            "students_tracked": len(progress_database)
+            "filepath": snapshot.directory,
+            "students_tracked": len(progress_store),
+            **result
         }
     except Exception as e:
         return {
@@ -897,20 +1285,44 @@ def save_progress_database_to_file(filepath: str = "./output/progress_database.j
         }
 
 
+def load_progress_database_from_file(filepath: str = "./output/progress_database.json"):
+    """
+    Replay a progress snapshot.
+    
+    Returns:
+        Dictionary of student_id -> {student_id, student_name, history, created_date, last_updated}
+    """
+    database = {}
+    for record in _get_snapshot_log(filepath).replay():
+        kind = record.pop("kind")
+        student_id = record["student_id"]
+        if kind == "student":
+            existing = database.get(student_id)
+            database[student_id] = {
+                "student_id": student_id,
+                "student_name": record["student_name"],
+                "history": existing["history"] if existing else [],
+                "created_date": record["created_date"],
+                "last_updated": record["last_updated"]
+            }
+        else:
+            del record["id"], record["student_id"]
+            database[student_id]["history"].append(record)
+    return database
+
+
 def export_summary_report(output_dir: str = "./output"):
     """Export comprehensive summary report in multiple formats."""
     try:
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate summary statistics
-        total_students = len(progress_database)
-        total_notifications = len(notification_log)
+        total_students = len(progress_store)
+        total_notifications = len(notification_outbox)
         
         risk_distribution = {}
-        for student_id, data in progress_database.items():
-            if data["history"]:
-                latest_level = data["history"][-1]["risk_level"]
-                risk_distribution[latest_level] = risk_distribution.get(latest_level, 0) + 1
+        for latest_level in progress_store.latest_levels().values():
+            risk_distribution[latest_level] = risk_distribution.get(latest_level, 0) + 1
         
         summary = {
             "generated_at": datetime.now().isoformat(),
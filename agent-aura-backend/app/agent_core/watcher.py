@@ -0,0 +1,225 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Student data file watcher for Agent Aura.
+Diffs the student data file against a snapshot of per-row hashes whenever
+it changes, re-scores only added or changed students, records them in the
+progress store and keeps the resulting risk transition events. The diff is
+the one of the agent_aura package (agent_aura.watch), scored with the
+backend's analyze_student_risk.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.agent_core import tools
+from app.agent_core.snapshots import atomic_write, try_lock_file
+
+# The agent_aura package sits next to the backend (copied into the image by the Dockerfile)
+_REPO_ROOT = Path(__file__).parent.parent.parent.parent
+try:
+    from agent_aura.watch import SNAPSHOT_VERSION, diff_data_file as _diff_data_file
+except ImportError:
+    sys.path.append(str(_REPO_ROOT))
+    from agent_aura.watch import SNAPSHOT_VERSION, diff_data_file as _diff_data_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_FILE = str(_REPO_ROOT / "data" / "student_data.csv")
+
+
+def diff_data_file(data_file: str, previous: Dict[str, list]) -> dict:
+    """agent_aura.watch.diff_data_file, scored with the backend risk model."""
+    return _diff_data_file(data_file, previous, assess=tools.analyze_student_risk)
+
+
+class DataFileWatcher:
+    """
+    Re-analyzes changed students in the background when the data file is updated.
+
+    The file is polled by size and modification time; a change triggers a
+    diff in a worker thread. The diff still reads and hashes the whole file
+    and rewrites the whole snapshot, but only changed rows are re-scored and
+    recorded. The first pass only records a baseline.
+
+    With several API workers, only the one holding the lock file next to
+    the snapshot checks the file; the others stand by and take over if it
+    exits.
+    """
+
+    def __init__(
+        self,
+        data_file: Optional[str] = None,
+        snapshot_file: Optional[str] = None,
+        interval: Optional[float] = None,
+        max_events: int = 1000
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            data_file: Student data CSV (default: STUDENT_DATA_FILE env or data/student_data.csv)
+            snapshot_file: Row hash snapshot (default: DATA_WATCH_SNAPSHOT env or
+                ./output/data_watch_snapshot.json)
+            interval: Seconds between polls (default: DATA_WATCH_INTERVAL env or 30)
+            max_events: Recent events kept in memory
+        """
+        self.data_file = data_file or os.getenv("STUDENT_DATA_FILE", DEFAULT_DATA_FILE)
+        self.snapshot_file = snapshot_file or os.getenv("DATA_WATCH_SNAPSHOT", "./output/data_watch_snapshot.json")
+        self.interval = interval or float(os.getenv("DATA_WATCH_INTERVAL", "30"))
+        self.events: deque = deque(maxlen=max_events)
+        self.checks = 0
+        self.updates = 0
+        self.rescored = 0
+        self.transitions = 0
+        self.last_run: Optional[str] = None
+        self.last_counts: Optional[dict] = None
+        self._snapshot: Optional[dict] = None
+        self._lock_file = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _acquire_leadership(self) -> bool:
+        """Whether this process is (now) the one watching the file."""
+        if self._lock_file is not None:
+            return True
+        self._lock_file = try_lock_file(f"{self.snapshot_file}.lock")
+        if self._lock_file is None:
+            return False
+        # Another process may have written the snapshot while this one stood by
+        self._snapshot = None
+        return True
+
+    def release(self):
+        """Give up watching, so another process can take over."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _load_snapshot(self) -> Optional[dict]:
+        if self._snapshot is None:
+            try:
+                with open(self.snapshot_file, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+            if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("data_file") != os.path.abspath(self.data_file):
+                return None
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def check(self, force: bool = False) -> dict:
+        """
+        Re-analyze the data file if it changed since the last snapshot (blocking).
+
+        Args:
+            force: Diff the file even if its size and modification time are unchanged
+
+        Returns:
+            Summary with status ("standby", "missing", "unchanged", "baseline" or
+            "updated"), counts and events
+        """
+        summary = {"status": "unchanged", "counts": {}, "events": []}
+        if not self._acquire_leadership():
+            summary["status"] = "standby"
+            return summary
+        self.checks += 1
+        if not os.path.exists(self.data_file):
+            summary["status"] = "missing"
+            return summary
+
+        stat = os.stat(self.data_file)
+        signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        snapshot = self._load_snapshot()
+        if snapshot is not None and not force and snapshot["signature"] == signature:
+            return summary
+
+        baseline = snapshot is None
+        diff = diff_data_file(self.data_file, {} if baseline else snapshot["students"])
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "data_file": os.path.abspath(self.data_file),
+            "signature": signature,
+            "updated_at": datetime.now().isoformat(),
+            "students": diff["students"]
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_file)), exist_ok=True)
+        atomic_write(self.snapshot_file, lambda f: json.dump(snapshot, f, separators=(",", ":")))
+        self._snapshot = snapshot
+
+        self.last_run = snapshot["updated_at"]
+        self.last_counts = diff["counts"]
+        summary["status"] = "baseline" if baseline else "updated"
+        summary["counts"] = diff["counts"]
+        if baseline:
+            return summary
+
+        for student in diff["rescored"]:
+            tools.track_student_progress(
+                student["student_id"], student["risk_level"], student["risk_score"],
+                student["name"], notes="Data file update"
+            )
+        for event in diff["events"]:
+            self.events.append(event)
+            if event["event"] == "risk_transition":
+                self.transitions += 1
+                logger.info(
+                    f"Risk transition {event['student_id']}: {event['from_level']} -> {event['to_level']}"
+                )
+        self.updates += 1
+        self.rescored += len(diff["rescored"])
+        summary["events"] = diff["events"]
+        return summary
+
+    def recent_events(self, limit: int = 50, event_type: Optional[str] = None) -> List[dict]:
+        """Most recent events first, optionally of one type."""
+        events = [e for e in reversed(self.events) if event_type is None or e["event"] == event_type]
+        return events[:limit]
+
+    def start(self):
+        """Start on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Stop the watcher."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.release()
+
+    async def run_once(self) -> dict:
+        """Check the data file in a worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.check)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Data file watch failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """Watcher statistics."""
+        return {
+            "data_file": self.data_file,
+            "watching": self._lock_file is not None,
+            "checks": self.checks,
+            "updates": self.updates,
+            "students_rescored": self.rescored,
+            "risk_transitions": self.transitions,
+            "last_counts": self.last_counts,
+            "last_run": self.last_run
+        }
+
+
+# Global watcher started with the API
+data_file_watcher = DataFileWatcher()
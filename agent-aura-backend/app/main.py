@@ -1048,6 +1048,59 @@ async def get_available_models(
     return {"models": model_manager.get_available_models()}
 
 
+@app.get("/api/v1/notifications")
+async def list_notifications(
+    student_id: Optional[str] = None,
+    grade: Optional[str] = None,
+    delivery_status: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    limit: int = 50,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Query the notification outbox (indexed by student, grade, status and risk level)."""
+    from app.agent_core.outbox import notification_outbox
+    notifications = await asyncio.to_thread(
+        notification_outbox.query,
+        student_id=student_id,
+        grade=grade,
+        status=delivery_status,
+        risk_level=risk_level,
+        limit=min(limit, 500)
+    )
+    return {"count": len(notifications), "notifications": notifications}
+
+
+@app.get("/api/v1/agent/risk-transitions")
+async def list_risk_transitions(
+    event_type: Optional[str] = None,
+    limit: int = 50,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Recent risk events from incremental re-analysis of the student data file."""
+    from app.agent_core.watcher import data_file_watcher
+    events = data_file_watcher.recent_events(limit=min(limit, 500), event_type=event_type)
+    return {"count": len(events), "events": events}
+
+
+@app.get("/api/v1/agent/runtime-stats")
+async def get_agent_runtime_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get prompt prefix reuse, event loop lag, retention, notification dispatch and data watch statistics."""
+    from app.agent_core.prompts import prompt_cache
+    from app.agent_core.executor import event_loop_monitor
+    from app.agent_core.retention import retention_worker
+    from app.agent_core.dispatch import notification_dispatcher
+    from app.agent_core.watcher import data_file_watcher
+    return {
+        "prompts": prompt_cache.stats(),
+        "event_loop": event_loop_monitor.snapshot(),
+        "retention": retention_worker.snapshot(),
+        "dispatch": notification_dispatcher.snapshot(),
+        "data_watch": data_file_watcher.snapshot()
+    }
+
+
 # ============================================================================
 # Startup Event
 # ============================================================================
@@ -1056,6 +1109,21 @@ async def get_available_models(
 async def startup_event():
     """Initialize database on startup."""
     print("🚀 Starting Agent Aura Backend...")
+    # Track event loop lag so blocking work shows up in /metrics
+    from app.agent_core.executor import event_loop_monitor
+    event_loop_monitor.start()
+    # Roll old progress history up into daily/weekly aggregates
+    if os.getenv("PROGRESS_RETENTION_ENABLED", "false").lower() == "true":
+        from app.agent_core.retention import retention_worker
+        retention_worker.start()
+    # Deliver outbox notifications when an SMTP server is configured
+    if os.getenv("SMTP_HOST"):
+        from app.agent_core.dispatch import notification_dispatcher
+        notification_dispatcher.start()
+    # Re-score only changed students when the student data file is updated
+    if os.getenv("DATA_WATCH_ENABLED", "true").lower() == "true":
+        from app.agent_core.watcher import data_file_watcher
+        data_file_watcher.start()
     try:
         init_database()
         print("✅ Database initialized")
@@ -1095,6 +1163,20 @@ async def startup_event():
     print("✅ Agent Aura Backend ready!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background monitors and release tool worker pools."""
+    from app.agent_core.executor import event_loop_monitor, tool_executor
+    from app.agent_core.retention import retention_worker
+    from app.agent_core.dispatch import notification_dispatcher
+    from app.agent_core.watcher import data_file_watcher
+    event_loop_monitor.stop()
+    retention_worker.stop()
+    notification_dispatcher.stop()
+    data_file_watcher.stop()
+    tool_executor.shutdown(wait=False)
+
+
 if __name__ == "__main__":
     import uvicorn
     host = "0.0.0.0" if os.getenv("BIND_ALL", "0") == "1" else "127.0.0.1"
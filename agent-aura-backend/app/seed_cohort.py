@@ -0,0 +1,176 @@
+"""
+Bulk-load a generated student cohort into the database.
+
+Companion to init_demo_data.py for scale testing: loads a cohort file from
+`python -m agent_aura.cli generate` (CSV, Parquet or Feather) with batched
+multi-row inserts instead of one ORM insert per row, and optionally its
+progress history into the progress store.
+
+Usage:
+    python -m app.seed_cohort --students cohort.csv [--history history.csv] [--batch-size 10000]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app.init_demo_data import calculate_risk_score, hash_password
+from app.models.database import (
+    Base, User, UserRole, Student, RiskAssessment, create_database_engine
+)
+
+# The agent_aura package sits next to the backend (copied into the image by the Dockerfile)
+try:
+    from agent_aura.synthetic import read_frames
+except ImportError:
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+    from agent_aura.synthetic import read_frames
+
+# Same mapping as init_demo_data
+PERFORMANCE_SCORES = {
+    'Excellent': 95.0,
+    'Above Average': 85.0,
+    'Average': 75.0,
+    'Below Average': 65.0
+}
+
+
+def _next_id(conn, table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def bulk_load_students(students_file: str, engine=None, batch_size: int = 10000, progress=None) -> dict:
+    """
+    Load students, their user accounts and an initial risk assessment in batches.
+
+    Primary keys are assigned up front so each batch is three executemany
+    inserts in one transaction. Students whose id already exists are skipped.
+
+    Args:
+        students_file: Cohort file (data/student_data.csv columns)
+        engine: SQLAlchemy engine (default: the configured database)
+        batch_size: Students per transaction
+        progress: Called with the running summary after every batch
+
+    Returns:
+        Summary with the numbers of students loaded and skipped
+    """
+    engine = engine or create_database_engine()
+    Base.metadata.create_all(bind=engine)
+    users, students, assessments = User.__table__, Student.__table__, RiskAssessment.__table__
+    # Every generated account shares the demo password; hash it once
+    password = hash_password("student123")
+    now = datetime.utcnow()
+    summary = {"loaded": 0, "skipped": 0}
+
+    for frame in read_frames(students_file, batch_size):
+        with engine.begin() as conn:
+            ids = frame["student_id"].astype(str).tolist()
+            existing = set(conn.execute(select(students.c.student_id).where(students.c.student_id.in_(ids))).scalars())
+            user_id, student_pk = _next_id(conn, users), _next_id(conn, students)
+            user_rows, student_rows, assessment_rows = [], [], []
+            for row in frame.itertuples(index=False):
+                student_id = str(row.student_id)
+                if student_id in existing:
+                    summary["skipped"] += 1
+                    continue
+                existing.add(student_id)
+                attendance = float(row.attendance_rate) * 100
+                risk_score, risk_level = calculate_risk_score(float(row.gpa), attendance, row.overall_performance)
+                user_rows.append({
+                    "id": user_id,
+                    "username": student_id,
+                    "email": f"{student_id.lower()}@student.agentura.com",
+                    "hashed_password": password,
+                    "role": UserRole.STUDENT,
+                    "is_active": True,
+                    "created_at": now
+                })
+                student_rows.append({
+                    "id": student_pk,
+                    "user_id": user_id,
+                    "student_id": student_id,
+                    "full_name": row.name,
+                    "grade": int(row.grade_level),
+                    "gpa": float(row.gpa),
+                    "attendance": attendance,
+                    "performance_score": PERFORMANCE_SCORES.get(row.overall_performance, 70.0),
+                    "parent_email": f"parent.{student_id.lower()}@parent.com",
+                    "parent_phone": f"555-{student_pk % 10000:04d}"
+                })
+                assessment_rows.append({
+                    "student_id": student_pk,
+                    "risk_level": risk_level,
+                    "risk_score": risk_score,
+                    "risk_factors": f"GPA: {row.gpa}, Attendance: {attendance:.0f}%, Performance: {row.overall_performance}",
+                    "assessed_at": now - timedelta(seconds=len(assessment_rows))
+                })
+                user_id += 1
+                student_pk += 1
+            if user_rows:
+                conn.execute(users.insert(), user_rows)
+                conn.execute(students.insert(), student_rows)
+                conn.execute(assessments.insert(), assessment_rows)
+            summary["loaded"] += len(user_rows)
+        if progress is not None:
+            progress(summary)
+    return summary
+
+
+def bulk_load_history(history_file: str, store=None, batch_size: int = 10000, progress=None) -> dict:
+    """
+    Load a generated progress history into the progress store.
+
+    Args:
+        history_file: History file (student_id, date, timestamp, risk_level, risk_score, notes)
+        store: Progress store (default: the global store)
+        batch_size: Entries per transaction
+        progress: Called with the running summary after every batch
+
+    Returns:
+        Summary with the number of entries loaded
+    """
+    if store is None:
+        from app.agent_core.progress_store import progress_store as store
+    summary = {"entries": 0}
+    for frame in read_frames(history_file, batch_size):
+        summary["entries"] += store.append_many(frame.to_dict("records"), batch_size=batch_size)
+        if progress is not None:
+            progress(summary)
+    return summary
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Bulk-load a generated cohort")
+    parser.add_argument("--students", help="Cohort file from `agent_aura.cli generate`")
+    parser.add_argument("--history", help="Progress history file from `agent_aura.cli generate --history-output`")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per transaction")
+    args = parser.parse_args(argv)
+    if not args.students and not args.history:
+        parser.error("nothing to load: pass --students and/or --history")
+
+    start = time.perf_counter()
+    if args.students:
+        print(f"📊 Loading students from {args.students}...")
+        result = bulk_load_students(
+            args.students, batch_size=args.batch_size,
+            progress=lambda s: print(f"\r   {s['loaded']:,} loaded, {s['skipped']:,} skipped", end="", flush=True)
+        )
+        print(f"\n✅ {result['loaded']:,} students loaded ({result['skipped']:,} already present)")
+    if args.history:
+        print(f"📈 Loading progress history from {args.history}...")
+        result = bulk_load_history(
+            args.history, batch_size=args.batch_size,
+            progress=lambda s: print(f"\r   {s['entries']:,} entries", end="", flush=True)
+        )
+        print(f"\n✅ {result['entries']:,} progress entries loaded")
+    print(f"⏱️  {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,6 +71,7 @@ export interface StreamEvent {
   result?: any;
   response?: string;
   success?: boolean;
+  cached?: boolean;
   timestamp: string;
   session_id?: string;
   goal?: string;
@@ -13,6 +13,13 @@ __version__ = "2.0.0"
 __author__ = "Zenshiro"
 __email__ = "zenshiro@example.com"
 
-from .agent import root_agent, orchestrator_agent
-
 __all__ = ["root_agent", "orchestrator_agent"]
+
+
+def __getattr__(name):
+    # Import the agents (and google-adk) on first use, so the tool modules
+    # can be used without the agent dependencies, e.g. by the backend
+    if name in __all__:
+        from . import agent
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
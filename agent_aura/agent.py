@@ -8,9 +8,9 @@ Coordinates all sub-agents for comprehensive student intervention analysis.
 
 import datetime
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 
 from .config import config
+from .tool_profiles import build_tools
 # model_manager import removed to avoid unused import warning
 from .sub_agents import (
     data_collection_agent,
@@ -126,7 +126,8 @@ orchestrator_agent = Agent(
     - LOW Risk (Score < 0.60): Maintain standard support
     
     MULTI-STUDENT ANALYSIS:
-    When analyzing multiple students:
+    Cohorts are normally run as one short session per student (agent_aura.runner),
+    so a session usually covers a single student. If a request names several:
     - Process systematically through the workflow for each student
     - Track aggregate statistics (risk distribution, notification count)
     - Prioritize CRITICAL/HIGH risk students in reporting
@@ -152,19 +153,22 @@ orchestrator_agent = Agent(
         intervention_planning_agent,
         outcome_prediction_agent
     ],
-    tools=[
-        FunctionTool(get_student_data),
-        FunctionTool(analyze_student_risk),
-        FunctionTool(generate_intervention_plan),
-        FunctionTool(predict_intervention_success),
-        FunctionTool(generate_alert_email),
-        FunctionTool(track_student_progress),
-        FunctionTool(get_student_progress_timeline),
-        FunctionTool(export_progress_visualization_data),
-        FunctionTool(save_notifications_to_file),
-        FunctionTool(save_progress_database_to_file),
-        FunctionTool(export_summary_report)
-    ],
+    tools=build_tools(
+        [
+            get_student_data,
+            analyze_student_risk,
+            generate_intervention_plan,
+            predict_intervention_success,
+            generate_alert_email,
+            track_student_progress,
+            get_student_progress_timeline,
+            export_progress_visualization_data,
+            save_notifications_to_file,
+            save_progress_database_to_file,
+            export_summary_report
+        ],
+        config.tool_profile_for("orchestrator_agent")
+    ),
     output_key="comprehensive_analysis"
 )
 
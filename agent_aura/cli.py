@@ -7,8 +7,11 @@ Provides easy access to all agent functionality from the terminal.
 """
 
 import argparse
+import asyncio
+import json
 import sys
 import os
+import time
 from typing import List
 
 # Add parent directory to path
@@ -20,10 +23,12 @@ from agent_aura.tools import (
     generate_intervention_plan,
     predict_intervention_success,
     generate_alert_email,
+    generate_alert_emails_batch,
     track_student_progress,
     save_notifications_to_file,
     save_progress_database_to_file,
-    export_summary_report
+    export_summary_report,
+    _assess_student_risk
 )
 from agent_aura.utils import (
     get_risk_level_emoji
@@ -111,7 +116,8 @@ def batch_analyze(student_ids: List[str], data_file: str = "./data/student_data.
     print(f"Analyzing {len(student_ids)} students...\n")
     
     results = []
-    notifications = 0
+    alert_students = []
+    alert_risks = []
     
     for i, student_id in enumerate(student_ids, 1):
         student_data = get_student_data(student_id, data_file)
@@ -120,13 +126,13 @@ def batch_analyze(student_ids: List[str], data_file: str = "./data/student_data.
             print(f"[{i:2d}/{len(student_ids)}] ❌ {student_id} - Error")
             continue
         
-        risk = analyze_student_risk(student_id)
+        risk = _assess_student_risk(student_data)
         emoji = get_risk_level_emoji(risk["risk_level"])
         
-        # Generate notification if needed
+        # Queue a notification if needed (rendered together after the loop)
         if risk["risk_level"] in ["CRITICAL", "HIGH"]:
-            generate_alert_email(student_id)
-            notifications += 1
+            alert_students.append(student_data)
+            alert_risks.append(risk)
             notif_icon = "📧"
         else:
             notif_icon = "  "
@@ -148,6 +154,8 @@ def batch_analyze(student_ids: List[str], data_file: str = "./data/student_data.
         
         print(f"[{i:2d}/{len(student_ids)}] {emoji} {student_data['name']:20s} | {risk['risk_level']:10s} | {risk['risk_score']:.3f} {notif_icon}")
     
+    notifications = len(generate_alert_emails_batch(alert_students, alert_risks))
+    
     # Summary statistics
     risk_dist = {}
     for r in results:
@@ -168,6 +176,168 @@ def batch_analyze(student_ids: List[str], data_file: str = "./data/student_data.
     print(('='*80) + "\n")
 
 
+def pipeline_batch_analyze(
+    data_file: str,
+    output_file: str,
+    student_ids: List[str] = None,
+    workers: int = None,
+    chunk_size: int = 500,
+    resume: bool = True
+):
+    """Stream a batch analysis of the data file to NDJSON with the staged pipeline."""
+    from agent_aura.pipeline import run_pipeline
+    
+    print("\n" + ('='*80))
+    print("AGENT AURA - STREAMING BATCH ANALYSIS")
+    print(('='*80) + "\n")
+    
+    def report(summary):
+        print(f"\r  {summary['resumed_from_row'] + summary['rows_processed']:,} students analyzed...", end="", flush=True)
+    
+    summary = run_pipeline(
+        data_file, output_file,
+        workers=workers, chunk_size=chunk_size, resume=resume,
+        student_ids=student_ids, progress=report
+    )
+    print()
+    if summary["resumed_from_row"]:
+        print(f"Resumed after {summary['resumed_from_row']:,} rows")
+    print(f"Analyzed: {summary['rows_processed']:,} ({summary['errors']} errors) with {summary['workers']} workers")
+    print(f"Throughput: {summary['rows_per_second']:,.0f} students/sec")
+    print(f"Notifications: {summary['alerts']:,}")
+    for level in ["CRITICAL", "HIGH", "MODERATE", "LOW"]:
+        print(f"  {get_risk_level_emoji(level)} {level:10s}: {summary['risk_distribution'].get(level, 0):,}")
+    print(f"[OK] Results written to {output_file}")
+    print(f"[OK] Alert emails written to {summary['emails_file']}")
+    print(f"[OK] Progress entries written to {summary['progress_file']}")
+    print(('='*80) + "\n")
+
+
+def agent_batch_analyze(student_ids: List[str], concurrency: int = None, output_file: str = None):
+    """Analyze students with the ADK agents, one concurrent session per student."""
+    from agent_aura.runner import CohortRunner
+    
+    runner = CohortRunner(max_concurrency=concurrency)
+    print("\n" + ('='*80))
+    print("AGENT AURA - AGENT BATCH ANALYSIS")
+    print(('='*80) + "\n")
+    print(f"Analyzing {len(student_ids)} students ({runner.max_concurrency} concurrent sessions)...\n")
+    
+    cohort = asyncio.run(runner.run_cohort(student_ids))
+    for i, result in enumerate(cohort.results, 1):
+        if result.status != "success":
+            print(f"[{i:2d}/{len(student_ids)}] ❌ {result.student_id} - {result.error}")
+            continue
+        emoji = get_risk_level_emoji(result.risk_level or "")
+        print(f"[{i:2d}/{len(student_ids)}] {emoji} {result.student_id:8s} | {str(result.risk_level):10s} | "
+              f"{result.tool_calls} tool calls | {result.elapsed_seconds:.1f}s")
+    
+    summary = cohort.to_dict()
+    print("\n" + ('='*80))
+    print(f"Completed {summary['succeeded']}/{summary['total_students']} in {summary['elapsed_seconds']:.1f}s")
+    print(f"Notifications: {summary['notifications']}")
+    print(f"Risk Distribution: {summary['risk_distribution']}")
+    print(('='*80) + "\n")
+    
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"[OK] Results saved to {output_file}")
+
+
+def watch_data_file(
+    data_file: str,
+    snapshot_file: str,
+    interval: float = 5.0,
+    once: bool = False,
+    events_file: str = None
+):
+    """Re-analyze only the students whose rows changed whenever the data file is updated."""
+    from agent_aura.watch import DataWatcher
+    
+    def emit(event):
+        if event["event"] == "risk_transition":
+            print(f"  {get_risk_level_emoji(event['to_level'])} {event['student_id']:8s} "
+                  f"{event['from_level']} -> {event['to_level']} ({event['direction']})")
+        if events_file:
+            with open(events_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+    
+    def report(summary):
+        counts = summary["counts"]
+        if summary["status"] == "baseline":
+            print(f"Baseline: {counts['rows']:,} students scored")
+        else:
+            print(f"Update: {counts['added']} added, {counts['changed']} changed, "
+                  f"{counts['removed']} removed, {counts['unchanged']:,} unchanged")
+    
+    watcher = DataWatcher(data_file, snapshot_file, on_event=emit)
+    print("\n" + ('='*80))
+    print("AGENT AURA - WATCH")
+    print(('='*80) + "\n")
+    
+    if once:
+        summary = watcher.check()
+        if summary["status"] == "missing":
+            print(f"❌ Data file not found: {data_file}")
+        elif summary["status"] == "unchanged":
+            print("No changes since the last snapshot")
+        else:
+            report(summary)
+        return
+    
+    print(f"Watching {data_file} every {interval:g}s (Ctrl+C to stop)...\n")
+    try:
+        watcher.watch(interval, on_check=report)
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+def generate_cohort(args):
+    """Generate a synthetic cohort (and optional progress history) for scale testing."""
+    from agent_aura.synthetic import CohortSpec, write_cohort
+    
+    def weights(text, key=str):
+        pairs = [item.split("=") for item in text.split(",") if item.strip()]
+        return {key(name.strip()): float(weight) for name, weight in pairs}
+    
+    spec = CohortSpec(
+        size=args.size,
+        seed=args.seed,
+        gpa_mean=args.gpa_mean,
+        gpa_std=args.gpa_std,
+        attendance_mean=args.attendance_mean,
+        attendance_std=args.attendance_std,
+        history_years=args.history_years,
+        history_interval_days=args.history_interval_days,
+        as_of=args.as_of
+    )
+    if args.performance:
+        spec.performance_distribution = weights(args.performance)
+    if args.grades:
+        spec.grade_distribution = weights(args.grades, int)
+    
+    print("\n" + ('='*80))
+    print("AGENT AURA - SYNTHETIC COHORT")
+    print(('='*80) + "\n")
+    
+    def report(summary):
+        print(f"\r  {summary['students']:,} students, {summary['history_entries']:,} history entries...", end="", flush=True)
+    
+    start = time.perf_counter()
+    summary = write_cohort(
+        spec, args.output, format=args.format, history_output=args.history_output,
+        chunk_size=args.chunk_size, progress=report
+    )
+    print(f"\nGenerated in {time.perf_counter() - start:.1f}s")
+    for level in ["CRITICAL", "HIGH", "MODERATE", "LOW"]:
+        print(f"  {get_risk_level_emoji(level)} {level:10s}: {summary['risk_distribution'].get(level, 0):,}")
+    print(f"[OK] Students written to {args.output}")
+    if summary["history_entries"]:
+        print(f"[OK] Progress history written to {args.history_output}")
+    print(('='*80) + "\n")
+
+
 def export_reports(output_dir: str = "./output", format: str = "all"):
     """Export comprehensive reports."""
     
@@ -215,6 +385,19 @@ Examples:
   # Batch analyze multiple students
   python -m agent_aura.cli batch --student-ids S001,S002,S003
   
+  # Stream every student to NDJSON with the parallel pipeline (resumable)
+  python -m agent_aura.cli batch --output ./output/batch.ndjson --workers 4
+  
+  # Analyze students with the ADK agents, one concurrent session each
+  python -m agent_aura.cli agent-batch --student-ids S001,S002,S003 --concurrency 4
+  
+  # Re-score only changed students whenever the data file is updated
+  python -m agent_aura.cli watch --interval 10 --events-file ./output/risk_events.ndjson
+  
+  # Generate a 1M-student cohort with three years of weekly progress history
+  python -m agent_aura.cli generate --size 1000000 --output ./output/cohort.csv \\
+      --history-years 3 --history-output ./output/history.csv
+  
   # Export reports
   python -m agent_aura.cli export --format all --output ./output
         """
@@ -230,8 +413,44 @@ Examples:
     
     # Batch command
     batch_parser = subparsers.add_parser("batch", help="Batch analyze multiple students")
-    batch_parser.add_argument("--student-ids", required=True, help="Comma-separated student IDs")
+    batch_parser.add_argument("--student-ids", help="Comma-separated student IDs (default with --output: all students)")
     batch_parser.add_argument("--data-file", default="./data/student_data.csv", help="Path to student data CSV")
+    batch_parser.add_argument("--output", help="Stream results to this NDJSON file with the parallel pipeline")
+    batch_parser.add_argument("--workers", type=int, default=None, help="Pipeline worker processes (default: CPU count)")
+    batch_parser.add_argument("--chunk-size", type=int, default=500, help="Pipeline rows per chunk/checkpoint")
+    batch_parser.add_argument("--no-resume", action="store_true", help="Ignore the checkpoint of an interrupted run")
+    
+    # Agent batch command (ADK sessions)
+    agent_parser = subparsers.add_parser("agent-batch", help="Analyze students with the ADK agents concurrently")
+    agent_parser.add_argument("--student-ids", required=True, help="Comma-separated student IDs")
+    agent_parser.add_argument("--concurrency", type=int, default=None, help="Concurrent sessions (default: AGENT_MAX_CONCURRENCY or 4)")
+    agent_parser.add_argument("--output-file", default=None, help="Write the aggregated results as JSON")
+    
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", help="Re-analyze changed students when the data file is updated")
+    watch_parser.add_argument("--data-file", default="./data/student_data.csv", help="Path to student data CSV")
+    watch_parser.add_argument("--snapshot", default="./output/watch_snapshot.json", help="Row hash snapshot file")
+    watch_parser.add_argument("--interval", type=float, default=5.0, help="Seconds between checks")
+    watch_parser.add_argument("--once", action="store_true", help="Check once and exit (e.g. from a nightly job)")
+    watch_parser.add_argument("--events-file", default=None, help="Append risk events to this NDJSON file")
+    
+    # Generate command
+    generate_parser = subparsers.add_parser("generate", help="Generate a synthetic cohort for scale testing")
+    generate_parser.add_argument("--size", type=int, default=10000, help="Number of students")
+    generate_parser.add_argument("--output", default="./output/cohort.csv", help="Student file")
+    generate_parser.add_argument("--format", choices=["csv", "parquet", "feather"], default="csv", help="Output format (parquet/feather need pyarrow)")
+    generate_parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    generate_parser.add_argument("--gpa-mean", type=float, default=2.9, help="Mean GPA")
+    generate_parser.add_argument("--gpa-std", type=float, default=0.6, help="GPA standard deviation")
+    generate_parser.add_argument("--attendance-mean", type=float, default=0.91, help="Mean attendance rate (0-1)")
+    generate_parser.add_argument("--attendance-std", type=float, default=0.06, help="Attendance rate standard deviation")
+    generate_parser.add_argument("--performance", default=None, help='Performance shares, e.g. "Below Average=0.25,Average=0.45,Above Average=0.3"')
+    generate_parser.add_argument("--grades", default=None, help='Grade weights, e.g. "9=1,10=1,11=1,12=1"')
+    generate_parser.add_argument("--history-years", type=float, default=0.0, help="Years of progress history per student (0 = none)")
+    generate_parser.add_argument("--history-interval-days", type=int, default=7, help="Days between history entries")
+    generate_parser.add_argument("--history-output", default="./output/history.csv", help="Progress history file")
+    generate_parser.add_argument("--as-of", default=None, help="Date of the last history entry (default: today)")
+    generate_parser.add_argument("--chunk-size", type=int, default=100000, help="Students generated per chunk")
     
     # Export command
     export_parser = subparsers.add_parser("export", help="Export reports")
@@ -243,8 +462,23 @@ Examples:
     if args.command == "analyze":
         analyze_student(args.student_id, args.data_file, args.verbose)
     elif args.command == "batch":
+        student_ids = [sid.strip() for sid in args.student_ids.split(",")] if args.student_ids else None
+        if args.output:
+            pipeline_batch_analyze(
+                args.data_file, args.output, student_ids,
+                args.workers, args.chunk_size, not args.no_resume
+            )
+        elif student_ids:
+            batch_analyze(student_ids, args.data_file)
+        else:
+            parser.error("batch requires --student-ids or --output")
+    elif args.command == "agent-batch":
         student_ids = [sid.strip() for sid in args.student_ids.split(",")]
-        batch_analyze(student_ids, args.data_file)
+        agent_batch_analyze(student_ids, args.concurrency, args.output_file)
+    elif args.command == "watch":
+        watch_data_file(args.data_file, args.snapshot, args.interval, args.once, args.events_file)
+    elif args.command == "generate":
+        generate_cohort(args)
     elif args.command == "export":
         export_reports(args.output, args.format)
     else:
@@ -46,6 +46,13 @@ class AgentAuraConfig:
     log_level: str = "INFO"
     log_file: str = "agent_aura.log"
     
+    # Tool output profile ("full" or "compact"); per-agent overrides come from
+    # TOOL_OUTPUT_PROFILE_<AGENT_NAME>, e.g. TOOL_OUTPUT_PROFILE_RISK_ANALYSIS_AGENT
+    tool_output_profile: str = "full"
+    
+    # Per-student ADK sessions run at once by agent_aura.runner
+    max_concurrent_sessions: int = 4
+    
     # Rate Limiting Configuration
     max_requests_per_minute: int = 10  # Conservative rate limit
     retry_delay_seconds: int = 2  # Delay between retries
@@ -64,6 +71,8 @@ class AgentAuraConfig:
         # Allow override from environment for models
         self.orchestrator_model = os.getenv("ORCHESTRATOR_MODEL", self.orchestrator_model)
         self.worker_model = os.getenv("WORKER_MODEL", self.worker_model)
+        self.tool_output_profile = os.getenv("TOOL_OUTPUT_PROFILE", self.tool_output_profile)
+        self.max_concurrent_sessions = int(os.getenv("AGENT_MAX_CONCURRENCY", self.max_concurrent_sessions))
         
         # Set up fallback model chain (try in order when primary fails)
         if self.fallback_models is None:
@@ -80,6 +89,11 @@ class AgentAuraConfig:
         os.makedirs(self.data_directory, exist_ok=True)
         os.makedirs(self.output_directory, exist_ok=True)
 
+    
+    def tool_profile_for(self, agent_name: str) -> str:
+        """Tool output profile for an agent (its env override, else the global profile)."""
+        return os.getenv(f"TOOL_OUTPUT_PROFILE_{agent_name.upper()}", self.tool_output_profile)
+
 
 # Global configuration instance
 config = AgentAuraConfig()
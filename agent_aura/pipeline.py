@@ -0,0 +1,366 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Streaming batch pipeline for Agent Aura.
+Students flow through staged generators (load -> score/plan/notify -> track
+-> write) connected by bounded queues. The CPU-bound middle stage runs on a
+process pool one chunk at a time, results stream out as NDJSON, and a
+checkpoint written after every chunk lets an interrupted run resume.
+Alert emails and progress entries go to append-only NDJSON files next to
+the output instead of the in-memory tool globals, and are checkpointed
+together with it.
+"""
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set
+
+import pandas as pd
+
+from . import tools
+
+# Risk levels that get an alert email
+ALERT_LEVELS = ("CRITICAL", "HIGH")
+
+_DONE = object()
+
+
+# ============================================================================
+# Stage plumbing
+# ============================================================================
+
+def prefetch(iterable: Iterable, maxsize: int) -> Iterator:
+    """
+    Run a generator stage in a background thread behind a bounded queue.
+
+    The producer blocks once maxsize items are waiting, so a fast stage can
+    never run ahead of a slow consumer. Exceptions are re-raised in the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put(_DONE)
+        except BaseException as e:
+            buffer.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True, name="pipeline-stage")
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def ordered_map(executor: Optional[Executor], fn: Callable, iterable: Iterable, max_in_flight: int) -> Iterator:
+    """
+    Apply fn on an executor with at most max_in_flight pending calls, yielding in input order.
+
+    Runs fn inline when executor is None.
+    """
+    if executor is None:
+        for item in iterable:
+            yield fn(item)
+        return
+    pending: deque = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ============================================================================
+# Stages
+# ============================================================================
+
+def load_chunks(
+    data_file: str,
+    chunk_size: int,
+    skip_rows: int = 0,
+    student_ids: Optional[Set[str]] = None
+) -> Iterator[List[dict]]:
+    """
+    Stage 1: read raw rows from the data file in chunks.
+
+    Args:
+        data_file: Student data CSV
+        chunk_size: Rows per chunk
+        skip_rows: Data rows already processed (resume)
+        student_ids: Only these students (default: all)
+
+    Yields:
+        Lists of row dicts
+    """
+    reader = pd.read_csv(
+        data_file,
+        chunksize=chunk_size,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        dtype={"student_id": str}
+    )
+    for frame in reader:
+        if student_ids is not None:
+            frame = frame[frame["student_id"].isin(student_ids)]
+        yield frame.to_dict("records")
+
+
+def analyze_chunk(rows: List[dict]) -> List[dict]:
+    """
+    Stage 2 (process pool): score, plan and render alerts for a chunk of rows.
+
+    Args:
+        rows: Raw data file rows
+
+    Returns:
+        One result per row; the alert email record, if any, is under "_email"
+    """
+    now = datetime.now()
+    assessment_date = now.strftime('%B %d, %Y')
+    results = []
+    for row in rows:
+        try:
+            student = tools._student_from_row(row)
+            risk = tools._assess_student_risk(student)
+            plan = tools.generate_intervention_plan(risk["risk_level"], by_reference=True)
+            result = {
+                "student_id": student["student_id"],
+                "name": student["name"],
+                "grade": student["grade"],
+                "risk_level": risk["risk_level"],
+                "risk_score": risk["risk_score"],
+                "risk_factors": risk["risk_factors"],
+                "plan": plan["catalog_id"],
+                "catalog_version": plan["catalog_version"],
+                "alert": None,
+                "status": "success"
+            }
+            if risk["risk_level"] in ALERT_LEVELS:
+                email = tools._render_alert_email(student, risk, now, assessment_date)
+                result["alert"] = email["email_id"]
+                result["_email"] = email
+        except Exception as e:
+            result = {"student_id": str(row.get("student_id")), "status": "error", "error": str(e)}
+        results.append(result)
+    return results
+
+
+def track_chunk(results: List[dict], emails: BinaryIO, progress: BinaryIO) -> List[dict]:
+    """
+    Stage 3 (main process): record progress and notifications.
+
+    Emails and progress entries are appended to their sink files; trends are
+    computed against the history already in tools.progress_database, which
+    is read but not modified.
+
+    Args:
+        results: Analyzed chunk
+        emails: Alert email sink (NDJSON)
+        progress: Progress entry sink (NDJSON)
+
+    Returns:
+        The results, with the progress trend of each analyzed student
+    """
+    now = datetime.now()
+    for result in results:
+        email = result.pop("_email", None)
+        if email is not None:
+            _write_line(emails, email)
+        if result["status"] == "success":
+            entry = {
+                "date": now.date().isoformat(),
+                "timestamp": now.isoformat(),
+                "risk_level": result["risk_level"],
+                "risk_score": float(result["risk_score"]),
+                "notes": ""
+            }
+            _write_line(progress, {"student_id": result["student_id"], "student_name": result["name"], **entry})
+            previous = tools.progress_database.get(result["student_id"], {}).get("history", [])
+            result["trend"] = tools._progress_trend(previous + [entry])[1]
+    return results
+
+
+def _write_line(f: BinaryIO, record: dict):
+    f.write(json.dumps(record, separators=(",", ":"), default=str).encode("utf-8"))
+    f.write(b"\n")
+
+
+# ============================================================================
+# Checkpointing
+# ============================================================================
+
+def _file_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _write_checkpoint(path: str, checkpoint: dict):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-checkpoint-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _read_checkpoint(path: str, data_file: str, output_file: str) -> Optional[dict]:
+    """The checkpoint if it belongs to this input/output pair and the input is unchanged."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if checkpoint.get("input") != _file_signature(data_file):
+        return None
+    if checkpoint.get("output") != os.path.abspath(output_file):
+        return None
+    if not all(os.path.exists(path) for path in [output_file, *sink_files(output_file).values()]):
+        return None
+    return checkpoint
+
+
+def sink_files(output_file: str) -> dict:
+    """Alert email and progress entry files written alongside a pipeline output."""
+    return {"emails": f"{output_file}.emails.ndjson", "progress": f"{output_file}.progress.ndjson"}
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+def run_pipeline(
+    data_file: str,
+    output_file: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    queue_size: int = 4,
+    resume: bool = True,
+    student_ids: Optional[List[str]] = None,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Analyze every student in a data file and stream the results as NDJSON.
+
+    Alert emails and progress entries are written to the files named by
+    sink_files(output_file).
+
+    Args:
+        data_file: Student data CSV
+        output_file: NDJSON output (one line per student)
+        workers: Processes for the analysis stage (default: CPU count; 1 runs inline)
+        chunk_size: Rows per chunk (the unit of parallelism and checkpointing)
+        queue_size: Chunks buffered between stages
+        resume: Continue from the checkpoint of an interrupted run
+        student_ids: Only these students (default: all)
+        progress: Called with the running summary after every chunk
+
+    Returns:
+        Summary dictionary
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint_file = f"{output_file}.checkpoint"
+    sinks = sink_files(output_file)
+    signature = _file_signature(data_file)
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+
+    checkpoint = _read_checkpoint(checkpoint_file, data_file, output_file) if resume else None
+    rows_done = checkpoint["rows_done"] if checkpoint else 0
+    output_bytes = checkpoint["output_bytes"] if checkpoint else 0
+    sink_bytes = checkpoint["sink_bytes"] if checkpoint else {name: 0 for name in sinks}
+
+    summary = {
+        "data_file": data_file,
+        "output_file": output_file,
+        "emails_file": sinks["emails"],
+        "progress_file": sinks["progress"],
+        "workers": workers,
+        "resumed_from_row": rows_done,
+        "rows_processed": 0,
+        "errors": 0,
+        "alerts": 0,
+        "risk_distribution": {},
+        "elapsed_seconds": 0.0,
+        "rows_per_second": 0.0
+    }
+
+    # Start the workers before any stage thread exists, so they fork from a single-threaded process
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    if executor is not None:
+        for future in [executor.submit(int) for _ in range(workers)]:
+            future.result()
+
+    start = time.perf_counter()
+    try:
+        mode = "r+b" if checkpoint else "wb"
+        with open(output_file, mode) as out, open(sinks["emails"], mode) as emails, \
+                open(sinks["progress"], mode) as progress_sink:
+            # Drop anything written after the last checkpoint, so a resumed
+            # chunk is neither output nor tracked twice
+            for f, offset in ((out, output_bytes), (emails, sink_bytes["emails"]),
+                              (progress_sink, sink_bytes["progress"])):
+                f.truncate(offset)
+                f.seek(offset)
+
+            wanted = set(student_ids) if student_ids else None
+            raw = prefetch(load_chunks(data_file, chunk_size, rows_done, wanted), queue_size)
+            analyzed = prefetch(ordered_map(executor, analyze_chunk, raw, max_in_flight=workers * 2), queue_size)
+            for results in analyzed:
+                for result in track_chunk(results, emails, progress_sink):
+                    _write_line(out, result)
+                    if result["status"] == "success":
+                        level = result["risk_level"]
+                        summary["risk_distribution"][level] = summary["risk_distribution"].get(level, 0) + 1
+                        summary["alerts"] += result["alert"] is not None
+                    else:
+                        summary["errors"] += 1
+                for f in (out, emails, progress_sink):
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # Every chunk but the last holds chunk_size data rows (before filtering), and
+                # the checkpoint is removed once the last one is written
+                rows_done += chunk_size
+                summary["rows_processed"] += len(results)
+                _write_checkpoint(checkpoint_file, {
+                    "input": signature,
+                    "output": os.path.abspath(output_file),
+                    "rows_done": rows_done,
+                    "output_bytes": out.tell(),
+                    "sink_bytes": {"emails": emails.tell(), "progress": progress_sink.tell()}
+                })
+                if progress is not None:
+                    progress(summary)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    # A completed run needs no checkpoint
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    summary["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    summary["rows_per_second"] = round(summary["rows_processed"] / max(summary["elapsed_seconds"], 1e-9), 1)
+    return summary
+
@@ -0,0 +1,200 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Concurrent cohort runner for Agent Aura.
+Analyzes each student in its own short ADK session instead of one growing
+multi-student conversation. All sessions share one Runner and one in-memory
+session service; a semaphore caps how many run at once, and results are
+aggregated locally from the tool responses.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from .config import config
+
+APP_NAME = "agent_aura"
+
+DEFAULT_PROMPT = (
+    "Analyze student {student_id}: retrieve their data, assess risk, generate an alert "
+    "if the risk is HIGH or CRITICAL, track progress, plan an intervention and predict "
+    "its outcome. Finish with a short summary."
+)
+
+
+@dataclass
+class StudentRunResult:
+    """Outcome of one student's session."""
+    student_id: str
+    status: str = "success"
+    risk_level: Optional[str] = None
+    risk_score: Optional[float] = None
+    notifications: int = 0
+    tool_calls: int = 0
+    response: str = ""
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class CohortRunResult:
+    """Aggregated outcome of a cohort run."""
+    results: List[StudentRunResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    max_concurrency: int = 1
+
+    def risk_distribution(self) -> dict:
+        """Number of students per risk level."""
+        distribution = {}
+        for result in self.results:
+            if result.risk_level:
+                distribution[result.risk_level] = distribution.get(result.risk_level, 0) + 1
+        return distribution
+
+    def to_dict(self) -> dict:
+        return {
+            "total_students": len(self.results),
+            "succeeded": sum(1 for r in self.results if r.status == "success"),
+            "failed": sum(1 for r in self.results if r.status != "success"),
+            "risk_distribution": self.risk_distribution(),
+            "notifications": sum(r.notifications for r in self.results),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "max_concurrency": self.max_concurrency,
+            "results": [r.to_dict() for r in self.results]
+        }
+
+
+def _record_tool_response(result: StudentRunResult, name: str, response: dict):
+    """Pick the fields the cohort summary needs from a tool response (full or compact profile)."""
+    result.tool_calls += 1
+    if not isinstance(response, dict):
+        return
+    if name == "analyze_student_risk":
+        result.risk_level = response.get("risk_level", response.get("lvl", result.risk_level))
+        result.risk_score = response.get("risk_score", response.get("score", result.risk_score))
+    elif name == "generate_alert_email" and "error" not in response and "err" not in response:
+        result.notifications += 1
+
+
+class CohortRunner:
+    """
+    Runs independent per-student ADK sessions concurrently.
+
+    One Runner and one InMemorySessionService are shared by every session;
+    each session is deleted once its student is done so memory stays flat.
+    """
+
+    def __init__(
+        self,
+        agent: Optional[BaseAgent] = None,
+        max_concurrency: Optional[int] = None,
+        prompt: str = DEFAULT_PROMPT,
+        user_id: str = "agent_aura"
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            agent: Root agent (default: the orchestrator agent)
+            max_concurrency: Sessions running at once (default: config.max_concurrent_sessions)
+            prompt: Per-student request; "{student_id}" is substituted
+            user_id: ADK user id for the sessions
+        """
+        if agent is None:
+            from .agent import root_agent
+            agent = root_agent
+        self.agent = agent
+        self.max_concurrency = max_concurrency or config.max_concurrent_sessions
+        self.prompt = prompt
+        self.user_id = user_id
+        self.session_service = InMemorySessionService()
+        self.runner = Runner(app_name=APP_NAME, agent=agent, session_service=self.session_service)
+
+    async def run_student(self, student_id: str) -> StudentRunResult:
+        """
+        Analyze one student in a fresh session.
+
+        Args:
+            student_id: Student identifier
+
+        Returns:
+            StudentRunResult (status "error" if the session failed)
+        """
+        result = StudentRunResult(student_id=student_id)
+        session_id = f"{student_id}-{uuid.uuid4().hex[:8]}"
+        start = time.perf_counter()
+        message = types.Content(role="user", parts=[types.Part(text=self.prompt.format(student_id=student_id))])
+        created = False
+        try:
+            await self.session_service.create_session(
+                app_name=APP_NAME, user_id=self.user_id, session_id=session_id
+            )
+            created = True
+            async for event in self.runner.run_async(
+                user_id=self.user_id, session_id=session_id, new_message=message
+            ):
+                for response in event.get_function_responses():
+                    _record_tool_response(result, response.name, response.response)
+                if event.is_final_response() and event.content and event.content.parts:
+                    result.response = "".join(part.text or "" for part in event.content.parts)
+        except Exception as e:
+            result.status = "error"
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            if created:
+                try:
+                    await self.session_service.delete_session(
+                        app_name=APP_NAME, user_id=self.user_id, session_id=session_id
+                    )
+                except Exception as e:
+                    # The analysis result stands; only report the cleanup failure
+                    if result.error is None:
+                        result.error = f"Session cleanup failed: {type(e).__name__}: {e}"
+            result.elapsed_seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    async def run_cohort(self, student_ids: List[str]) -> CohortRunResult:
+        """
+        Analyze students concurrently, at most max_concurrency at a time.
+
+        Args:
+            student_ids: Student identifiers
+
+        Returns:
+            CohortRunResult with per-student results in input order (failures
+            are reported as results with status "error")
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(student_id: str) -> StudentRunResult:
+            async with semaphore:
+                try:
+                    return await self.run_student(student_id)
+                except Exception as e:
+                    # One student's failure must not abort the whole cohort
+                    return StudentRunResult(student_id=student_id, status="error", error=f"{type(e).__name__}: {e}")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded(sid) for sid in student_ids))
+        return CohortRunResult(
+            results=list(results),
+            elapsed_seconds=time.perf_counter() - start,
+            max_concurrency=self.max_concurrency
+        )
+
+
+def run_cohort(student_ids: List[str], max_concurrency: Optional[int] = None) -> CohortRunResult:
+    """Synchronous entry point: analyze a cohort with the orchestrator agent."""
+    return asyncio.run(CohortRunner(max_concurrency=max_concurrency).run_cohort(student_ids))
@@ -6,10 +6,10 @@ Data Collection Agent - Specialized agent for retrieving student information.
 """
 
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 
 from ..config import config
 from ..tools import get_student_data
+from ..tool_profiles import build_tools
 from ..utils import suppress_output_callback
 
 
@@ -39,7 +39,7 @@ data_collection_agent = Agent(
     
     Be efficient and accurate in your data retrieval.
     """,
-    tools=[FunctionTool(get_student_data)],
+    tools=build_tools([get_student_data], config.tool_profile_for("data_collection_agent")),
     output_key="student_data",
     after_agent_callback=suppress_output_callback
 )
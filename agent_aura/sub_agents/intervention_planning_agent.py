@@ -6,10 +6,10 @@ Intervention Planning Agent - Specialized agent for creating intervention strate
 """
 
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 
 from ..config import config
 from ..tools import generate_intervention_plan
+from ..tool_profiles import build_tools
 from ..utils import suppress_output_callback
 
 
@@ -77,7 +77,7 @@ intervention_planning_agent = Agent(
     
     Your plans are essential for transforming risk assessments into action.
     """,
-    tools=[FunctionTool(generate_intervention_plan)],
+    tools=build_tools([generate_intervention_plan], config.tool_profile_for("intervention_planning_agent")),
     output_key="intervention_plan",
     after_agent_callback=suppress_output_callback
 )
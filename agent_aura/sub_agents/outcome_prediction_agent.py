@@ -6,10 +6,10 @@ Outcome Prediction Agent - Specialized agent for forecasting intervention succes
 """
 
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 
 from ..config import config
 from ..tools import predict_intervention_success, get_student_progress_timeline, export_progress_visualization_data
+from ..tool_profiles import build_tools
 from ..utils import suppress_output_callback
 
 
@@ -105,11 +105,14 @@ outcome_prediction_agent = Agent(
     Your predictions help stakeholders understand expected outcomes and
     allocate resources effectively.
     """,
-    tools=[
-        FunctionTool(predict_intervention_success),
-        FunctionTool(get_student_progress_timeline),
-        FunctionTool(export_progress_visualization_data)
-    ],
+    tools=build_tools(
+        [
+            predict_intervention_success,
+            get_student_progress_timeline,
+            export_progress_visualization_data
+        ],
+        config.tool_profile_for("outcome_prediction_agent")
+    ),
     output_key="outcome_prediction",
     after_agent_callback=suppress_output_callback
 )
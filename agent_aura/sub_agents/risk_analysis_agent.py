@@ -6,10 +6,10 @@ Risk Analysis Agent - Specialized agent for assessing student risk levels.
 """
 
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
 
 from ..config import config
 from ..tools import analyze_student_risk, generate_alert_email, track_student_progress
+from ..tool_profiles import build_tools
 from ..utils import suppress_output_callback
 
 
@@ -59,11 +59,14 @@ risk_analysis_agent = Agent(
     
     Your analysis is critical for early intervention success.
     """,
-    tools=[
-        FunctionTool(analyze_student_risk),
-        FunctionTool(generate_alert_email),
-        FunctionTool(track_student_progress)
-    ],
+    tools=build_tools(
+        [
+            analyze_student_risk,
+            generate_alert_email,
+            track_student_progress
+        ],
+        config.tool_profile_for("risk_analysis_agent")
+    ),
     output_key="risk_analysis",
     after_agent_callback=suppress_output_callback
 )
@@ -0,0 +1,295 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Synthetic cohort generator for Agent Aura.
+Produces reproducible student cohorts of any size (10k to 10M+) with
+controlled GPA, attendance, performance and grade distributions, and
+optional multi-year progress histories. Rows are generated and written in
+vectorized chunks, so memory stays flat regardless of cohort size.
+"""
+
+import csv
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from statistics import NormalDist
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .tools import RiskThresholds
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Performance categories from weakest to strongest
+PERFORMANCE_LEVELS = ["Below Average", "Average", "Above Average", "Excellent"]
+
+STUDENT_COLUMNS = ["student_id", "name", "grade_level", "gpa", "attendance_rate", "overall_performance"]
+HISTORY_COLUMNS = ["student_id", "date", "timestamp", "risk_level", "risk_score", "notes"]
+
+FORMATS = ("csv", "parquet", "feather")
+
+FIRST_NAMES = [
+    "Aarav", "Amelia", "Ana", "Ben", "Chen", "Chloe", "Daniel", "Diya", "Elena", "Ethan",
+    "Fatima", "Grace", "Hiro", "Isaac", "Isla", "Jamal", "Jia", "Kai", "Leila", "Liam",
+    "Lucas", "Maya", "Mateo", "Mia", "Noah", "Nora", "Omar", "Priya", "Rosa", "Sam",
+    "Sofia", "Tariq", "Uma", "Victor", "Wei", "Yara", "Yusuf", "Zara", "Zoe", "Arjun"
+]
+LAST_NAMES = [
+    "Adams", "Ahmed", "Brown", "Chen", "Costa", "Davis", "Diaz", "Evans", "Garcia", "Gupta",
+    "Hall", "Ito", "Johnson", "Khan", "Kim", "Lee", "Lopez", "Martin", "Moore", "Nguyen",
+    "Okafor", "Patel", "Reyes", "Rossi", "Sato", "Silva", "Singh", "Smith", "Taylor", "Wang"
+]
+
+
+@dataclass
+class CohortSpec:
+    """Size and statistical shape of a synthetic cohort."""
+    size: int = 10_000
+    seed: int = 42
+    id_prefix: str = "S"
+    gpa_mean: float = 2.9
+    gpa_std: float = 0.6
+    attendance_mean: float = 0.91            # fraction of days attended
+    attendance_std: float = 0.06
+    attendance_min: float = 0.5
+    gpa_attendance_correlation: float = 0.5
+    gpa_performance_correlation: float = 0.7
+    # Share of students per performance category (normalized)
+    performance_distribution: Dict[str, float] = field(default_factory=lambda: {
+        "Below Average": 0.25, "Average": 0.45, "Above Average": 0.30
+    })
+    # Relative weight of each grade level (normalized)
+    grade_distribution: Dict[int, float] = field(default_factory=lambda: {grade: 1.0 for grade in range(6, 13)})
+    history_years: float = 0.0               # 0 = no progress history
+    history_interval_days: int = 7
+    history_volatility: float = 0.04         # std of the risk score change per interval
+    as_of: Optional[str] = None              # last history date (default: today)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def risk_scores(gpa: np.ndarray, attendance_pct: np.ndarray, performance: np.ndarray) -> np.ndarray:
+    """Vectorized risk score, identical to tools.analyze_student_risk."""
+    score = np.select([gpa < 2.0, gpa < 2.5, gpa < 3.0], [0.40, 0.30, 0.15], 0.0)
+    score = score + np.select([attendance_pct < 80, attendance_pct < 90, attendance_pct < 95], [0.35, 0.25, 0.10], 0.0)
+    score = score + np.select([performance == "Below Average", performance == "Average"], [0.25, 0.10], 0.0)
+    return np.round(np.minimum(score, 1.0), 3)
+
+
+def risk_levels(scores: np.ndarray) -> np.ndarray:
+    """Risk level of each score (tools.RiskThresholds)."""
+    rounded = np.round(scores, 3)
+    return np.select(
+        [rounded >= RiskThresholds.CRITICAL, rounded >= RiskThresholds.HIGH, rounded >= RiskThresholds.MODERATE],
+        ["CRITICAL", "HIGH", "MODERATE"], "LOW"
+    )
+
+
+def _performance_cutpoints(spec: CohortSpec):
+    """Categories and latent-score cutpoints that reproduce the performance distribution."""
+    categories = [level for level in PERFORMANCE_LEVELS if spec.performance_distribution.get(level, 0) > 0]
+    categories += [level for level in spec.performance_distribution if level not in PERFORMANCE_LEVELS]
+    weights = np.array([spec.performance_distribution[level] for level in categories], dtype=float)
+    cumulative = np.cumsum(weights / weights.sum())[:-1]
+    normal = NormalDist()
+    return np.array(categories), np.array([normal.inv_cdf(min(max(p, 1e-12), 1 - 1e-12)) for p in cumulative])
+
+
+def generate_students(spec: CohortSpec, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Generate the cohort as data-file-shaped frames.
+
+    GPA, attendance and performance share a latent ability factor with the
+    configured correlations; performance categories are cut from it at the
+    quantiles of the configured distribution.
+
+    Args:
+        spec: Cohort specification
+        chunk_size: Students per frame
+
+    Yields:
+        DataFrames with STUDENT_COLUMNS
+    """
+    categories, cutpoints = _performance_cutpoints(spec)
+    grades = np.array(list(spec.grade_distribution), dtype=np.int64)
+    grade_weights = np.array(list(spec.grade_distribution.values()), dtype=float)
+    grade_weights /= grade_weights.sum()
+    width = max(3, len(str(spec.size)))
+    rho_a = spec.gpa_attendance_correlation
+    rho_p = spec.gpa_performance_correlation
+
+    for chunk_index, start in enumerate(range(0, spec.size, chunk_size)):
+        n = min(chunk_size, spec.size - start)
+        rng = np.random.default_rng([spec.seed, chunk_index])
+        ability = rng.standard_normal(n)
+        gpa = np.clip(spec.gpa_mean + spec.gpa_std * ability, 0.0, 4.0).round(2)
+        z_attendance = rho_a * ability + np.sqrt(1 - rho_a ** 2) * rng.standard_normal(n)
+        attendance = np.clip(
+            spec.attendance_mean + spec.attendance_std * z_attendance, spec.attendance_min, 1.0
+        ).round(3)
+        z_performance = rho_p * ability + np.sqrt(1 - rho_p ** 2) * rng.standard_normal(n)
+        performance = categories[np.searchsorted(cutpoints, z_performance)]
+
+        numbers = np.arange(start + 1, start + n + 1)
+        ids = pd.Series(numbers).map(lambda i: f"{spec.id_prefix}{i:0{width}d}")
+        names = (
+            pd.Series(np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), n)]) + " "
+            + pd.Series(np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), n)])
+        )
+        yield pd.DataFrame({
+            "student_id": ids,
+            "name": names,
+            "grade_level": rng.choice(grades, size=n, p=grade_weights),
+            "gpa": gpa,
+            "attendance_rate": attendance,
+            "overall_performance": performance
+        })
+
+
+def generate_history(spec: CohortSpec, students: pd.DataFrame, chunk_index: int = 0) -> pd.DataFrame:
+    """
+    Progress history for a frame of students.
+
+    Each student gets one entry per interval over spec.history_years: a
+    random walk of the risk score that ends at the student's current score.
+
+    Args:
+        spec: Cohort specification (history_years > 0)
+        students: Frame from generate_students
+        chunk_index: Index of the frame (seeds the walk)
+
+    Returns:
+        DataFrame with HISTORY_COLUMNS, oldest entry first per student
+    """
+    points = max(int(spec.history_years * 365 / spec.history_interval_days), 1)
+    end = datetime.fromisoformat(spec.as_of) if spec.as_of else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    times = [end - timedelta(days=spec.history_interval_days * (points - 1 - i)) for i in range(points)]
+
+    current = risk_scores(
+        students["gpa"].to_numpy(), students["attendance_rate"].to_numpy() * 100,
+        students["overall_performance"].to_numpy()
+    )
+    rng = np.random.default_rng([spec.seed, chunk_index, 1])
+    steps = rng.normal(0.0, spec.history_volatility, size=(len(students), points))
+    steps[:, -1] = 0.0
+    # Walk backwards from today's score
+    offsets = np.cumsum(steps[:, ::-1], axis=1)[:, ::-1]
+    scores = np.clip(current[:, None] + offsets, 0.0, 1.0).round(3).ravel()
+
+    return pd.DataFrame({
+        "student_id": np.repeat(students["student_id"].to_numpy(), points),
+        "date": np.tile([t.date().isoformat() for t in times], len(students)),
+        "timestamp": np.tile([t.isoformat() for t in times], len(students)),
+        "risk_level": risk_levels(scores),
+        "risk_score": scores,
+        "notes": ""
+    })
+
+
+class _FrameWriter:
+    """Appends frames to one output file in csv, parquet or feather format."""
+
+    def __init__(self, path: str, format: str):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format} (expected one of {', '.join(FORMATS)})")
+        if format != "csv" and not PYARROW_AVAILABLE:
+            raise ImportError(f"Writing {format} requires pyarrow: pip install pyarrow")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.format = format
+        self.rows = 0
+        self._writer = None
+        self._file = open(path, "w", newline="", encoding="utf-8") if format == "csv" else None
+
+    def write(self, frame: pd.DataFrame):
+        if self.format == "csv":
+            frame.to_csv(self._file, header=self.rows == 0, index=False, quoting=csv.QUOTE_MINIMAL)
+        else:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = (
+                    pq.ParquetWriter(self.path, table.schema) if self.format == "parquet"
+                    else pa.ipc.new_file(self.path, table.schema)
+                )
+            self._writer.write_table(table)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def write_cohort(
+    spec: CohortSpec,
+    output: str,
+    format: str = "csv",
+    history_output: Optional[str] = None,
+    chunk_size: int = 100_000,
+    progress=None
+) -> dict:
+    """
+    Generate a cohort and stream it to disk.
+
+    Args:
+        spec: Cohort specification
+        output: Student file (same columns as data/student_data.csv)
+        format: "csv", "parquet" or "feather" (the last two need pyarrow)
+        history_output: Progress history file, written when spec.history_years > 0
+        chunk_size: Students generated and written at a time
+        progress: Called with the running summary after every chunk
+
+    Returns:
+        Summary with row counts and the risk level distribution
+    """
+    students_writer = _FrameWriter(output, format)
+    history_writer = _FrameWriter(history_output, format) if history_output and spec.history_years > 0 else None
+    summary = {"students": 0, "history_entries": 0, "risk_distribution": {}, "spec": spec.to_dict()}
+    try:
+        for chunk_index, frame in enumerate(generate_students(spec, chunk_size)):
+            students_writer.write(frame)
+            scores = risk_scores(
+                frame["gpa"].to_numpy(), frame["attendance_rate"].to_numpy() * 100,
+                frame["overall_performance"].to_numpy()
+            )
+            levels, counts = np.unique(risk_levels(scores), return_counts=True)
+            for level, count in zip(levels, counts):
+                summary["risk_distribution"][str(level)] = summary["risk_distribution"].get(str(level), 0) + int(count)
+            if history_writer is not None:
+                history_writer.write(generate_history(spec, frame, chunk_index))
+            summary["students"] = students_writer.rows
+            summary["history_entries"] = history_writer.rows if history_writer else 0
+            if progress is not None:
+                progress(summary)
+    finally:
+        students_writer.close()
+        if history_writer is not None:
+            history_writer.close()
+    return summary
+
+
+def read_frames(path: str, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Read a generated file (csv, parquet or feather, by extension) in chunks."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".parquet", ".feather", ".arrow"):
+        if not PYARROW_AVAILABLE:
+            raise ImportError(f"Reading {extension} files requires pyarrow: pip install pyarrow")
+        if extension == ".parquet":
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            reader = pa.ipc.open_file(path)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+        return
+    yield from pd.read_csv(path, chunksize=chunk_size, dtype={"student_id": str}, keep_default_na=False)
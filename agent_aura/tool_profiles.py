@@ -0,0 +1,192 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Tool output profiles for Agent Aura.
+Every tool result is sent back into the model context, so the compact
+profile reduces each result to the few fields the agents act on, with short
+keys and catalog references instead of full plans and predictions.
+"""
+
+import functools
+from typing import Callable, Dict, List
+
+from google.adk.tools import FunctionTool
+
+from .tools import get_catalog_entry
+
+
+class OutputProfile:
+    """Tool output profiles."""
+    FULL = "full"        # tool results as returned by agent_aura.tools
+    COMPACT = "compact"  # minimal fields, short keys, catalog ids
+
+
+def _error(result: dict) -> dict:
+    return {"err": result.get("error", "unknown error"), "status": result.get("status", "error")}
+
+
+def _compact_student(result: dict) -> dict:
+    return {
+        "id": result.get("student_id"),
+        "name": result.get("name"),
+        "grade": result.get("grade"),
+        "gpa": result.get("gpa"),
+        "att": round(float(result.get("attendance", 0.0)), 1),
+        "perf": result.get("performance")
+    }
+
+
+def _compact_risk(result: dict) -> dict:
+    return {
+        "id": result.get("student_id"),
+        "lvl": result.get("risk_level"),
+        "score": result.get("risk_score"),
+        "factors": result.get("risk_factors", [])
+    }
+
+
+def _compact_plan(result: dict) -> dict:
+    return {
+        "ref": result.get("catalog_id"),
+        "v": result.get("catalog_version"),
+        "lvl": result.get("risk_level"),
+        "type": result.get("type"),
+        "weeks": result.get("duration_weeks"),
+        "freq": result.get("frequency")
+    }
+
+
+def _compact_prediction(result: dict) -> dict:
+    return {
+        "ref": result.get("catalog_id"),
+        "v": result.get("catalog_version"),
+        "lvl": result.get("risk_level"),
+        "success": result.get("base_success_rate"),
+        "conf": result.get("confidence_level"),
+        "weeks": result.get("timeline_weeks")
+    }
+
+
+def _compact_email(result: dict) -> dict:
+    return {
+        "email_id": result.get("email_id"),
+        "priority": result.get("priority"),
+        "lvl": result.get("risk_level"),
+        "concerns": result.get("concerns_count")
+    }
+
+
+def _compact_progress(result: dict) -> dict:
+    return {
+        "id": result.get("student_id"),
+        "lvl": result.get("current_risk_level"),
+        "score": result.get("current_risk_score"),
+        "n": result.get("total_entries"),
+        "trend": result.get("trend"),
+        "improve_pct": result.get("improvement_percentage")
+    }
+
+
+def _compact_timeline(result: dict) -> dict:
+    stats = result.get("statistics", {})
+    history = result.get("progress_history", [])
+    return {
+        "id": result.get("student_id"),
+        "n": result.get("total_records"),
+        "avg": stats.get("average_risk_score"),
+        "min": stats.get("minimum_risk_score"),
+        "max": stats.get("maximum_risk_score"),
+        "levels": stats.get("risk_level_distribution"),
+        "last": history[-1].get("risk_score") if history else None
+    }
+
+
+def _compact_visualization(result: dict) -> dict:
+    summary = result.get("summary", {})
+    return {
+        "id": result.get("student_id"),
+        "points": summary.get("total_entries"),
+        "range": [summary.get("date_range", {}).get("start"), summary.get("date_range", {}).get("end")],
+        "current": summary.get("current_status", {}).get("risk_level")
+    }
+
+
+def _compact_file_result(result: dict) -> dict:
+    compact = {"ok": result.get("success")}
+    for key in ("filepath", "json_report", "count", "students_tracked"):
+        if key in result:
+            compact[key] = result[key]
+    return compact
+
+
+# Compact projection of each tool's result, by tool name
+COMPACT_VIEWS: Dict[str, Callable[[dict], dict]] = {
+    "get_student_data": _compact_student,
+    "analyze_student_risk": _compact_risk,
+    "generate_intervention_plan": _compact_plan,
+    "predict_intervention_success": _compact_prediction,
+    "generate_alert_email": _compact_email,
+    "track_student_progress": _compact_progress,
+    "get_student_progress_timeline": _compact_timeline,
+    "export_progress_visualization_data": _compact_visualization,
+    "save_notifications_to_file": _compact_file_result,
+    "save_progress_database_to_file": _compact_file_result,
+    "export_summary_report": _compact_file_result
+}
+
+
+# Tools whose compact view carries a catalog reference ("ref", "v") instead of the entry
+CATALOG_REFERENCE_TOOLS = frozenset({"generate_intervention_plan", "predict_intervention_success"})
+
+
+def compact_result(tool_name: str, result):
+    """
+    Project a tool result onto its compact view.
+
+    Args:
+        tool_name: Tool function name
+        result: Result returned by the tool
+
+    Returns:
+        Compact result (errors keep only the message; unknown tools are unchanged)
+    """
+    view = COMPACT_VIEWS.get(tool_name)
+    if view is None or not isinstance(result, dict):
+        return result
+    if "error" in result:
+        return _error(result)
+    return view(result)
+
+
+def compact_tool(func: Callable) -> Callable:
+    """Wrap a tool so it returns its compact view (name, signature and docstring are kept)."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return compact_result(func.__name__, func(*args, **kwargs))
+    return wrapper
+
+
+def build_tools(functions: List[Callable], profile: str = OutputProfile.FULL) -> List[FunctionTool]:
+    """
+    Create the FunctionTools of an agent for an output profile.
+
+    With the compact profile, agents that receive catalog references also
+    get get_catalog_entry, so they can expand a reference when they need
+    the full plan or prediction.
+
+    Args:
+        functions: Tool functions from agent_aura.tools
+        profile: OutputProfile.FULL or OutputProfile.COMPACT
+
+    Returns:
+        List of FunctionTool instances
+    """
+    if profile == OutputProfile.FULL:
+        return [FunctionTool(func) for func in functions]
+    if profile == OutputProfile.COMPACT:
+        tools = [FunctionTool(compact_tool(func)) for func in functions]
+        if get_catalog_entry not in functions and any(func.__name__ in CATALOG_REFERENCE_TOOLS for func in functions):
+            tools.append(FunctionTool(get_catalog_entry))
+        return tools
+    raise ValueError(f"Unknown tool output profile: {profile}")
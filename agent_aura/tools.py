@@ -11,6 +11,7 @@ import json
 import csv
 import os
 from datetime import datetime
+from typing import List
 import pandas as pd
 
 
@@ -27,6 +28,273 @@ class RiskThresholds:
     LOW = 0.30
 
 
+# ============================================================================
+# CATALOGS - Read-only intervention plans and success predictions
+# ============================================================================
+
+# Bump when catalog content changes, so stored references can be checked
+CATALOG_VERSION = "2025.1"
+
+
+class _FrozenDict(dict):
+    """Read-only dict (still a dict for JSON encoding and isinstance checks)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only; copy them with dict() first")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only list (still a list for JSON encoding and isinstance checks)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog entries are read-only; copy them with list() first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (_FrozenList, (list(self),))
+
+
+def _freeze(value):
+    """Recursively convert dicts and lists to their read-only variants."""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+INTERVENTION_PLAN_CATALOG = _freeze({
+    "CRITICAL": {
+        "type": "Emergency Intervention",
+        "priority": "URGENT",
+        "duration_weeks": 4,
+        "frequency": "Daily",
+        "actions": [
+            "Schedule immediate parent-student-teacher meeting",
+            "Assign dedicated academic mentor",
+            "Implement daily progress monitoring",
+            "Coordinate with school counselor for support",
+            "Consider specialized support services (tutoring, counseling)",
+            "Create individualized education plan (IEP) if needed",
+            "Weekly progress reports to all stakeholders"
+        ],
+        "resources": [
+            "One-on-one tutoring sessions",
+            "Study materials and resources",
+            "Counseling services",
+            "Parent engagement workshops"
+        ],
+        "success_metrics": [
+            "GPA improvement of 0.5+ points",
+            "Attendance improvement to 90%+",
+            "Completion of all assignments",
+            "Positive behavior reports"
+        ],
+        "estimated_cost": "High ($500-1000/student)",
+        "estimated_hours": "10-15 hours/week"
+    },
+    "HIGH": {
+        "type": "Targeted Intervention",
+        "priority": "HIGH",
+        "duration_weeks": 6,
+        "frequency": "3x per week",
+        "actions": [
+            "Schedule parent-teacher conference within 1 week",
+            "Create structured study plan with clear goals",
+            "Provide tutoring resources and peer support",
+            "Implement weekly check-ins with mentor",
+            "Monitor attendance and assignment completion",
+            "Bi-weekly progress reports"
+        ],
+        "resources": [
+            "Small group tutoring",
+            "Online learning resources",
+            "Study guides and materials",
+            "Mentorship program"
+        ],
+        "success_metrics": [
+            "GPA improvement of 0.3+ points",
+            "Attendance improvement to 92%+",
+            "80%+ assignment completion rate",
+            "Improved class participation"
+        ],
+        "estimated_cost": "Medium ($200-500/student)",
+        "estimated_hours": "5-8 hours/week"
+    },
+    "MODERATE": {
+        "type": "Preventive Intervention",
+        "priority": "MEDIUM",
+        "duration_weeks": 8,
+        "frequency": "Weekly",
+        "actions": [
+            "Regular academic check-ins with teacher",
+            "Encourage participation in study groups",
+            "Provide additional study resources",
+            "Foster positive learning environment",
+            "Maintain regular parent communication",
+            "Monthly progress reviews"
+        ],
+        "resources": [
+            "Study group access",
+            "Digital learning resources",
+            "After-school programs",
+            "Peer mentoring"
+        ],
+        "success_metrics": [
+            "Maintain or improve current GPA",
+            "Attendance at 95%+",
+            "Consistent assignment completion",
+            "Active class participation"
+        ],
+        "estimated_cost": "Low ($50-200/student)",
+        "estimated_hours": "2-4 hours/week"
+    },
+    "LOW": {
+        "type": "Monitoring & Enrichment",
+        "priority": "LOW",
+        "duration_weeks": 12,
+        "frequency": "Monthly",
+        "actions": [
+            "Continue standard academic monitoring",
+            "Celebrate academic successes and achievements",
+            "Encourage leadership roles and advanced learning",
+            "Support participation in enrichment activities",
+            "Maintain positive feedback loop",
+            "Quarterly progress reviews"
+        ],
+        "resources": [
+            "Advanced learning materials",
+            "Leadership opportunities",
+            "Enrichment programs",
+            "Recognition programs"
+        ],
+        "success_metrics": [
+            "Maintain high GPA (3.5+)",
+            "Perfect or near-perfect attendance",
+            "Leadership and mentorship roles",
+            "Academic excellence recognition"
+        ],
+        "estimated_cost": "Minimal ($0-50/student)",
+        "estimated_hours": "1-2 hours/week"
+    }
+})
+
+SUCCESS_PREDICTION_CATALOG = _freeze({
+    "CRITICAL": {
+        "base_success_rate": 75,
+        "confidence_level": 85,
+        "timeline_weeks": 4,
+        "expected_gpa_improvement": 0.5,
+        "expected_attendance_improvement": 15,
+        "factors_affecting_success": [
+            "Early intervention timing",
+            "Student engagement level",
+            "Family support availability",
+            "Resource allocation adequacy",
+            "Mentor-student relationship quality"
+        ],
+        "risk_of_failure": [
+            "Delayed intervention start",
+            "Lack of family engagement",
+            "Underlying unaddressed issues",
+            "Insufficient resources"
+        ]
+    },
+    "HIGH": {
+        "base_success_rate": 82,
+        "confidence_level": 85,
+        "timeline_weeks": 6,
+        "expected_gpa_improvement": 0.4,
+        "expected_attendance_improvement": 10,
+        "factors_affecting_success": [
+            "Consistent tutoring participation",
+            "Parent-teacher collaboration",
+            "Student motivation level",
+            "Peer support engagement"
+        ],
+        "risk_of_failure": [
+            "Inconsistent attendance at support sessions",
+            "Lack of study plan adherence",
+            "External stressors"
+        ]
+    },
+    "MODERATE": {
+        "base_success_rate": 88,
+        "confidence_level": 85,
+        "timeline_weeks": 8,
+        "expected_gpa_improvement": 0.3,
+        "expected_attendance_improvement": 5,
+        "factors_affecting_success": [
+            "Regular check-ins maintained",
+            "Study group participation",
+            "Positive reinforcement",
+            "Resource utilization"
+        ],
+        "risk_of_failure": [
+            "Inconsistent monitoring",
+            "Decreased motivation",
+            "Competing priorities"
+        ]
+    },
+    "LOW": {
+        "base_success_rate": 92,
+        "confidence_level": 85,
+        "timeline_weeks": 12,
+        "expected_gpa_improvement": 0.2,
+        "expected_attendance_improvement": 2,
+        "factors_affecting_success": [
+            "Continued encouragement",
+            "Leadership opportunities",
+            "Advanced learning access",
+            "Recognition and rewards"
+        ],
+        "risk_of_failure": [
+            "Complacency",
+            "Boredom from lack of challenge",
+            "External life changes"
+        ]
+    }
+})
+
+
+# Catalogs by the prefix used in catalog ids ("intervention_plan:HIGH")
+_CATALOGS = {
+    "intervention_plan": INTERVENTION_PLAN_CATALOG,
+    "success_prediction": SUCCESS_PREDICTION_CATALOG
+}
+
+
+def get_catalog_entry(catalog_id: str, catalog_version: str = None):
+    """
+    Resolve a catalog reference returned with by_reference=True or by a compact tool result.
+    
+    Args:
+        catalog_id: Catalog id, the "ref" of compact results (e.g. "intervention_plan:HIGH")
+        catalog_version: Version the reference was created with, the "v" of compact results (optional)
+        
+    Returns:
+        The read-only catalog entry, or an error dictionary
+    """
+    if catalog_version is not None and catalog_version != CATALOG_VERSION:
+        return {
+            "error": f"Catalog version {catalog_version} is not available (current: {CATALOG_VERSION})",
+            "status": "error"
+        }
+    kind, _, level = catalog_id.partition(":")
+    catalog = _CATALOGS.get(kind)
+    if catalog is None or level not in catalog:
+        return {"error": f"Unknown catalog entry: {catalog_id}", "status": "error"}
+    return catalog[level]
+
+
 # ============================================================================
 # FOUNDATION TOOLS (1-4) - Core Functionality
 # ============================================================================
@@ -69,17 +337,7 @@ def get_student_data(student_id: str, data_source: str = None):
             }
         
         # Extract student data
-        student = records.iloc[0]
-        return {
-            "student_id": str(student.get('student_id', 'N/A')),
-            "name": str(student.get('name', 'Unknown')),
-            "grade": int(student.get('grade_level', 0)),
-            "gpa": float(student.get('gpa', 2.5)),
-            "attendance": float(student.get('attendance_rate', 0.9)) * 100,
-            "performance": str(student.get('overall_performance', 'Average')),
-            "timestamp": datetime.now().isoformat(),
-            "status": "success"
-        }
+        return _student_from_row(records.iloc[0])
     except Exception as e:
         return {
             "error": f"Error retrieving student data: {str(e)}",
@@ -87,6 +345,20 @@ def get_student_data(student_id: str, data_source: str = None):
         }
 
 
+def _student_from_row(student) -> dict:
+    """Student profile from a data file row (pandas Series or dict)."""
+    return {
+        "student_id": str(student.get('student_id', 'N/A')),
+        "name": str(student.get('name', 'Unknown')),
+        "grade": int(student.get('grade_level', 0)),
+        "gpa": float(student.get('gpa', 2.5)),
+        "attendance": float(student.get('attendance_rate', 0.9)) * 100,
+        "performance": str(student.get('overall_performance', 'Average')),
+        "timestamp": datetime.now().isoformat(),
+        "status": "success"
+    }
+
+
 def analyze_student_risk(student_id: str):
     """
     Tool 2: Calculate risk score and categorize risk level for a student.
@@ -97,9 +369,11 @@ def analyze_student_risk(student_id: str):
     Returns:
         Dictionary with risk score, level, and contributing factors
     """
-    # First get the student data
-    student_data = get_student_data(student_id)
-    
+    return _assess_student_risk(get_student_data(student_id))
+
+
+def _assess_student_risk(student_data: dict):
+    """Score an already loaded student record (see analyze_student_risk)."""
     if student_data.get("status") == "error":
         return {
             "error": "Invalid student data provided",
@@ -168,376 +442,209 @@ def analyze_student_risk(student_id: str):
     }
 
 
-def generate_intervention_plan(risk_level: str):
+def generate_intervention_plan(risk_level: str, by_reference: bool = False):
     """
     Tool 3: Create personalized intervention strategy.
     
     Args:
         risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+        by_reference: Return only the catalog id and version instead of the full plan
         
     Returns:
         Dictionary with intervention plan details
     """
-    
-    intervention_plans = {
-        "CRITICAL": {
-            "type": "Emergency Intervention",
-            "priority": "URGENT",
-            "duration_weeks": 4,
-            "frequency": "Daily",
-            "actions": [
-                "Schedule immediate parent-student-teacher meeting",
-                "Assign dedicated academic mentor",
-                "Implement daily progress monitoring",
-                "Coordinate with school counselor for support",
-                "Consider specialized support services (tutoring, counseling)",
-                "Create individualized education plan (IEP) if needed",
-                "Weekly progress reports to all stakeholders"
-            ],
-            "resources": [
-                "One-on-one tutoring sessions",
-                "Study materials and resources",
-                "Counseling services",
-                "Parent engagement workshops"
-            ],
-            "success_metrics": [
-                "GPA improvement of 0.5+ points",
-                "Attendance improvement to 90%+",
-                "Completion of all assignments",
-                "Positive behavior reports"
-            ],
-            "estimated_cost": "High ($500-1000/student)",
-            "estimated_hours": "10-15 hours/week"
-        },
-        "HIGH": {
-            "type": "Targeted Intervention",
-            "priority": "HIGH",
-            "duration_weeks": 6,
-            "frequency": "3x per week",
-            "actions": [
-                "Schedule parent-teacher conference within 1 week",
-                "Create structured study plan with clear goals",
-                "Provide tutoring resources and peer support",
-                "Implement weekly check-ins with mentor",
-                "Monitor attendance and assignment completion",
-                "Bi-weekly progress reports"
-            ],
-            "resources": [
-                "Small group tutoring",
-                "Online learning resources",
-                "Study guides and materials",
-                "Mentorship program"
-            ],
-            "success_metrics": [
-                "GPA improvement of 0.3+ points",
-                "Attendance improvement to 92%+",
-                "80%+ assignment completion rate",
-                "Improved class participation"
-            ],
-            "estimated_cost": "Medium ($200-500/student)",
-            "estimated_hours": "5-8 hours/week"
-        },
-        "MODERATE": {
-            "type": "Preventive Intervention",
-            "priority": "MEDIUM",
-            "duration_weeks": 8,
-            "frequency": "Weekly",
-            "actions": [
-                "Regular academic check-ins with teacher",
-                "Encourage participation in study groups",
-                "Provide additional study resources",
-                "Foster positive learning environment",
-                "Maintain regular parent communication",
-                "Monthly progress reviews"
-            ],
-            "resources": [
-                "Study group access",
-                "Digital learning resources",
-                "After-school programs",
-                "Peer mentoring"
-            ],
-            "success_metrics": [
-                "Maintain or improve current GPA",
-                "Attendance at 95%+",
-                "Consistent assignment completion",
-                "Active class participation"
-            ],
-            "estimated_cost": "Low ($50-200/student)",
-            "estimated_hours": "2-4 hours/week"
-        },
-        "LOW": {
-            "type": "Monitoring & Enrichment",
-            "priority": "LOW",
-            "duration_weeks": 12,
-            "frequency": "Monthly",
-            "actions": [
-                "Continue standard academic monitoring",
-                "Celebrate academic successes and achievements",
-                "Encourage leadership roles and advanced learning",
-                "Support participation in enrichment activities",
-                "Maintain positive feedback loop",
-                "Quarterly progress reviews"
-            ],
-            "resources": [
-                "Advanced learning materials",
-                "Leadership opportunities",
-                "Enrichment programs",
-                "Recognition programs"
-            ],
-            "success_metrics": [
-                "Maintain high GPA (3.5+)",
-                "Perfect or near-perfect attendance",
-                "Leadership and mentorship roles",
-                "Academic excellence recognition"
-            ],
-            "estimated_cost": "Minimal ($0-50/student)",
-            "estimated_hours": "1-2 hours/week"
-        }
+    entry = risk_level if risk_level in INTERVENTION_PLAN_CATALOG else "LOW"
+    
+    # Per-call metadata; the catalog entry itself is shared and read-only
+    overlay = {
+        "catalog_id": f"intervention_plan:{entry}",
+        "catalog_version": CATALOG_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "risk_level": risk_level
     }
-    
-    plan = intervention_plans.get(risk_level, intervention_plans["LOW"])
-    
-    # Add timestamp and student context
-    plan["created_at"] = datetime.now().isoformat()
-    plan["risk_level"] = risk_level
-    
-    return plan
+    if by_reference:
+        return overlay
+    return {**INTERVENTION_PLAN_CATALOG[entry], **overlay}
 
 
-def predict_intervention_success(risk_level: str):
+def predict_intervention_success(risk_level: str, by_reference: bool = False):
     """
     Tool 4: Forecast intervention effectiveness and outcomes.
     
     Args:
         risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+        by_reference: Return only the catalog id and version instead of the full prediction
         
     Returns:
         Dictionary with success predictions and metrics
     """
+    entry = risk_level if risk_level in SUCCESS_PREDICTION_CATALOG else "LOW"
     
-    # Base success rates by risk level
-    success_predictions = {
-        "CRITICAL": {
-            "base_success_rate": 75,
-            "confidence_level": 85,
-            "timeline_weeks": 4,
-            "expected_gpa_improvement": 0.5,
-            "expected_attendance_improvement": 15,
-            "factors_affecting_success": [
-                "Early intervention timing",
-                "Student engagement level",
-                "Family support availability",
-                "Resource allocation adequacy",
-                "Mentor-student relationship quality"
-            ],
-            "risk_of_failure": [
-                "Delayed intervention start",
-                "Lack of family engagement",
-                "Underlying unaddressed issues",
-                "Insufficient resources"
-            ]
-        },
-        "HIGH": {
-            "base_success_rate": 82,
-            "confidence_level": 85,
-            "timeline_weeks": 6,
-            "expected_gpa_improvement": 0.4,
-            "expected_attendance_improvement": 10,
-            "factors_affecting_success": [
-                "Consistent tutoring participation",
-                "Parent-teacher collaboration",
-                "Student motivation level",
-                "Peer support engagement"
-            ],
-            "risk_of_failure": [
-                "Inconsistent attendance at support sessions",
-                "Lack of study plan adherence",
-                "External stressors"
-            ]
-        },
-        "MODERATE": {
-            "base_success_rate": 88,
-            "confidence_level": 85,
-            "timeline_weeks": 8,
-            "expected_gpa_improvement": 0.3,
-            "expected_attendance_improvement": 5,
-            "factors_affecting_success": [
-                "Regular check-ins maintained",
-                "Study group participation",
-                "Positive reinforcement",
-                "Resource utilization"
-            ],
-            "risk_of_failure": [
-                "Inconsistent monitoring",
-                "Decreased motivation",
-                "Competing priorities"
-            ]
-        },
-        "LOW": {
-            "base_success_rate": 92,
-            "confidence_level": 85,
-            "timeline_weeks": 12,
-            "expected_gpa_improvement": 0.2,
-            "expected_attendance_improvement": 2,
-            "factors_affecting_success": [
-                "Continued encouragement",
-                "Leadership opportunities",
-                "Advanced learning access",
-                "Recognition and rewards"
-            ],
-            "risk_of_failure": [
-                "Complacency",
-                "Boredom from lack of challenge",
-                "External life changes"
-            ]
-        }
+    # Per-call metadata; the catalog entry itself is shared and read-only
+    overlay = {
+        "catalog_id": f"success_prediction:{entry}",
+        "catalog_version": CATALOG_VERSION,
+        "risk_level": risk_level,
+        "prediction_timestamp": datetime.now().isoformat()
     }
-    
-    prediction = success_predictions.get(risk_level, success_predictions["LOW"])
-    
-    # Add metadata
-    prediction["risk_level"] = risk_level
-    prediction["prediction_timestamp"] = datetime.now().isoformat()
-    
-    return prediction
+    if by_reference:
+        return overlay
+    return {**SUCCESS_PREDICTION_CATALOG[entry], **overlay}
 
 
 # ============================================================================
 # ENHANCED TOOLS (5-8) - NEW Functionality
 # ============================================================================
 
-def generate_alert_email(student_id: str):
-    """
-    Tool 5 (NEW): Generate professional email notifications for parents/teachers.
-    
-    Args:
-        student_id: The unique identifier of the student (e.g., "S001")
-        
-    Returns:
-        Dictionary with email content and metadata
-    """
-    # Get student data and risk analysis
-    student_data = get_student_data(student_id)
-    risk_analysis = analyze_student_risk(student_id)
-    intervention_plan = generate_intervention_plan(risk_analysis.get("risk_level", "MODERATE"))
-    
-    risk_level = risk_analysis.get("risk_level", "MODERATE")
-    
-    # Email templates by risk level
-    email_templates = {
-        "CRITICAL": {
-            "priority": "URGENT",
-            "subject_template": "⚠️ URGENT: {name} - Immediate Academic Support Required",
-            "greeting": "Dear Parent/Guardian and Educational Team,",
-            "intro": "We are reaching out with urgent concerns about {name}'s academic performance that require immediate attention and collaborative action.",
-            "tone": "urgent and direct",
-            "call_to_action": "Please contact us IMMEDIATELY to schedule an emergency meeting."
-        },
-        "HIGH": {
-            "priority": "HIGH",
-            "subject_template": "📋 Action Required: {name} - Academic Support Recommended",
-            "greeting": "Dear Parent/Guardian and Educational Team,",
-            "intro": "We are writing regarding {name}'s current academic performance and would like to discuss strategies for improvement.",
-            "tone": "concerned but supportive",
-            "call_to_action": "Please schedule a meeting with us within the next week to discuss an action plan."
-        },
-        "MODERATE": {
-            "priority": "MEDIUM",
-            "subject_template": "📊 Notification: {name} - Academic Progress Update",
-            "greeting": "Dear Parent/Guardian,",
-            "intro": "We wanted to update you on {name}'s academic progress and share some recommendations for continued success.",
-            "tone": "supportive and proactive",
-            "call_to_action": "Please review the recommendations and feel free to reach out with any questions."
-        }
+# Alert email templates by risk level (levels without one use MODERATE)
+EMAIL_TEMPLATES = {
+    "CRITICAL": {
+        "priority": "URGENT",
+        "subject_template": "⚠️ URGENT: {name} - Immediate Academic Support Required",
+        "greeting": "Dear Parent/Guardian and Educational Team,",
+        "intro": "We are reaching out with urgent concerns about {name}'s academic performance that require immediate attention and collaborative action.",
+        "tone": "urgent and direct",
+        "call_to_action": "Please contact us IMMEDIATELY to schedule an emergency meeting."
+    },
+    "HIGH": {
+        "priority": "HIGH",
+        "subject_template": "📋 Action Required: {name} - Academic Support Recommended",
+        "greeting": "Dear Parent/Guardian and Educational Team,",
+        "intro": "We are writing regarding {name}'s current academic performance and would like to discuss strategies for improvement.",
+        "tone": "concerned but supportive",
+        "call_to_action": "Please schedule a meeting with us within the next week to discuss an action plan."
+    },
+    "MODERATE": {
+        "priority": "MEDIUM",
+        "subject_template": "📊 Notification: {name} - Academic Progress Update",
+        "greeting": "Dear Parent/Guardian,",
+        "intro": "We wanted to update you on {name}'s academic progress and share some recommendations for continued success.",
+        "tone": "supportive and proactive",
+        "call_to_action": "Please review the recommendations and feel free to reach out with any questions."
     }
-    
-    template = email_templates.get(risk_level, email_templates.get("MODERATE", {}))
-    
-    # Extract student information
-    student_name = student_data.get("name", "Student")
-    student_id = student_data.get("student_id", "N/A")
-    grade = student_data.get("grade", "N/A")
-    gpa = student_data.get("gpa", 0.0)
-    attendance = student_data.get("attendance", 0.0)
-    
-    # Identify specific concerns
-    concerns = []
-    risk_factors = risk_analysis.get("risk_factors", [])
-    
-    for factor in risk_factors:
-        concerns.append(factor)
-    
-    # Build email content
-    email_subject = template["subject_template"].format(name=student_name)
-    
-    email_body = f"""{template['greeting']}
+}
 
-{template['intro'].format(name=student_name)}
+# Compiled alert emails by risk level, built on first use
+_compiled_email_templates = {}
 
-STUDENT INFORMATION:
-• Name: {student_name}
-• Student ID: {student_id}
-• Grade Level: {grade}
-• Current GPA: {gpa:.2f}
-• Attendance Rate: {attendance:.1f}%
 
-AREAS OF CONCERN:
-"""
-    
-    for i, concern in enumerate(concerns, 1):
-        email_body += f"{i}. {concern}\n"
-    
-    email_body += f"""
-RISK ASSESSMENT:
-• Risk Level: {risk_level}
-• Risk Score: {risk_analysis.get('risk_score', 0.0):.3f}
-• Assessment Date: {datetime.now().strftime('%B %d, %Y')}
-"""
-    
-    # Add intervention plan if available
-    if intervention_plan:
-        email_body += f"""
-RECOMMENDED INTERVENTION:
-• Type: {intervention_plan.get('type', 'N/A')}
-• Duration: {intervention_plan.get('duration_weeks', 'N/A')} weeks
-• Frequency: {intervention_plan.get('frequency', 'N/A')}
+def _escape_format(text) -> str:
+    return str(text).replace("{", "{{").replace("}", "}}")
 
-KEY ACTIONS:
-"""
-        actions = intervention_plan.get('actions', [])
-        for i, action in enumerate(actions[:5], 1):  # Top 5 actions
-            email_body += f"{i}. {action}\n"
-    
-    email_body += f"""
-NEXT STEPS:
-{template['call_to_action']}
 
-We are committed to supporting {student_name}'s academic success and appreciate your partnership in this important work.
+def _compile_email_template(risk_level: str) -> dict:
+    """
+    Precompile the alert email for a risk level.
 
-Sincerely,
-Agent Aura Academic Support System
+    Everything that does not depend on the student (greeting, intervention
+    plan, closing) is baked into one format string, so rendering an email
+    is a single str.format call.
 
----
-This is an automated notification generated by Agent Aura v2.0
-For questions, please contact your school's academic support team.
-"""
-    
-    # Create email record
-    email_record = {
+    Args:
+        risk_level: Risk level (CRITICAL, HIGH, MODERATE, LOW)
+
+    Returns:
+        Dict with priority, subject format string and body format string
+    """
+    compiled = _compiled_email_templates.get(risk_level)
+    if compiled is not None:
+        return compiled
+
+    template = EMAIL_TEMPLATES.get(risk_level, EMAIL_TEMPLATES["MODERATE"])
+    intervention = ""
+    plan = generate_intervention_plan(risk_level)
+    if plan:
+        actions = "".join(f"{i}. {action}\n" for i, action in enumerate(plan.get("actions", [])[:5], 1))
+        intervention = _escape_format(f"""
+RECOMMENDED INTERVENTION:
+• Type: {plan.get('type', 'N/A')}
+• Duration: {plan.get('duration_weeks', 'N/A')} weeks
+• Frequency: {plan.get('frequency', 'N/A')}
+
+KEY ACTIONS:
+{actions}""")
+
+    body = (
+        f"{_escape_format(template['greeting'])}\n\n"
+        f"{template['intro']}\n\n"
+        "STUDENT INFORMATION:\n"
+        "• Name: {name}\n"
+        "• Student ID: {student_id}\n"
+        "• Grade Level: {grade}\n"
+        "• Current GPA: {gpa:.2f}\n"
+        "• Attendance Rate: {attendance:.1f}%\n\n"
+        "AREAS OF CONCERN:\n"
+        "{concerns}\n"
+        "RISK ASSESSMENT:\n"
+        f"• Risk Level: {_escape_format(risk_level)}\n"
+        "• Risk Score: {risk_score:.3f}\n"
+        "• Assessment Date: {assessment_date}\n"
+        f"{intervention}\n"
+        "NEXT STEPS:\n"
+        f"{_escape_format(template['call_to_action'])}\n\n"
+        "We are committed to supporting {name}'s academic success and appreciate your partnership in this important work.\n\n"
+        "Sincerely,\n"
+        "Agent Aura Academic Support System\n\n"
+        "---\n"
+        "This is an automated notification generated by Agent Aura v2.0\n"
+        "For questions, please contact your school's academic support team.\n"
+    )
+    compiled = {"priority": template["priority"], "subject": template["subject_template"], "body": body}
+    _compiled_email_templates[risk_level] = compiled
+    return compiled
+
+
+def _render_alert_email(student_data: dict, risk_analysis: dict, now: datetime, assessment_date: str) -> dict:
+    """Render one alert email record from a compiled template."""
+    risk_level = risk_analysis.get("risk_level", "MODERATE")
+    compiled = _compile_email_template(risk_level)
+    student_name = student_data.get("name", "Student")
+    student_id = student_data.get("student_id", "N/A")
+    concerns = list(risk_analysis.get("risk_factors", []))
+
+    body = compiled["body"].format(
+        name=student_name,
+        student_id=student_id,
+        grade=student_data.get("grade", "N/A"),
+        gpa=student_data.get("gpa", 0.0),
+        attendance=student_data.get("attendance", 0.0),
+        concerns="".join(f"{i}. {concern}\n" for i, concern in enumerate(concerns, 1)),
+        risk_score=risk_analysis.get("risk_score", 0.0),
+        assessment_date=assessment_date
+    )
+    return {
         "email_generated": True,
-        "email_id": f"EMAIL-{student_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        "email_id": f"EMAIL-{student_id}-{now.strftime('%Y%m%d%H%M%S')}",
         "student_id": student_id,
         "student_name": student_name,
-        "priority": template["priority"],
-        "subject": email_subject,
-        "body": email_body,
+        "priority": compiled["priority"],
+        "subject": compiled["subject"].format(name=student_name),
+        "body": body,
         "recipients": ["parent/guardian", "teacher", "counselor"],
         "concerns_count": len(concerns),
         "concerns": concerns,
         "risk_level": risk_level,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "status": "generated"
     }
+
+
+def generate_alert_email(student_id: str):
+    """
+    Tool 5 (NEW): Generate professional email notifications for parents/teachers.
+    
+    Args:
+        student_id: The unique identifier of the student (e.g., "S001")
+        
+    Returns:
+        Dictionary with email content and metadata
+    """
+    # Read the student record once and score it directly
+    student_data = get_student_data(student_id)
+    risk_analysis = _assess_student_risk(student_data)
+    
+    now = datetime.now()
+    email_record = _render_alert_email(student_data, risk_analysis, now, now.strftime('%B %d, %Y'))
     
     # Log notification
     notification_log.append(email_record)
@@ -545,6 +652,30 @@ For questions, please contact your school's academic support team.
     return email_record
 
 
+def generate_alert_emails_batch(students: List[dict], risk_analyses: List[dict]):
+    """
+    Render alert emails for many students in one pass.
+    
+    Args:
+        students: Student records (as returned by get_student_data)
+        risk_analyses: Matching risk analyses (as returned by analyze_student_risk)
+        
+    Returns:
+        List of email records in input order
+    """
+    now = datetime.now()
+    assessment_date = now.strftime('%B %d, %Y')
+    emails = [
+        _render_alert_email(student_data, risk_analysis, now, assessment_date)
+        for student_data, risk_analysis in zip(students, risk_analyses)
+    ]
+    
+    # Log notifications
+    notification_log.extend(emails)
+    
+    return emails
+
+
 from typing import Union, Dict, Any
 
 
@@ -598,11 +729,33 @@ def track_student_progress(
     progress_database[student_id]["history"].append(progress_entry)
     progress_database[student_id]["last_updated"] = datetime.now().isoformat()
     
-    # Calculate trend analysis
     history = progress_database[student_id]["history"]
-    total_entries = len(history)
+    improvement_pct, trend, trend_description, days_tracked = _progress_trend(history)
+    
+    return {
+        "tracking_success": True,
+        "student_id": student_id,
+        "student_name": student_name,
+        "current_risk_level": risk_level,
+        "current_risk_score": numeric_score,
+        "total_entries": len(history),
+        "days_tracked": days_tracked,
+        "improvement_percentage": round(improvement_pct, 1),
+        "trend": trend,
+        "trend_description": trend_description,
+        "last_updated": datetime.now().isoformat(),
+        "status": "success"
+    }
+
+
+def _progress_trend(history: List[Dict[str, Any]]):
+    """
+    Trend of a progress history, from its first to its latest entry.
     
-    if total_entries > 1:
+    Returns:
+        Tuple (improvement percentage, trend, trend description, days tracked)
+    """
+    if len(history) > 1:
         # Get first and last scores
         first_score = float(history[0]["risk_score"]) if history[0]["risk_score"] is not None else 0.0
         current_score = float(history[-1]["risk_score"]) if history[-1]["risk_score"] is not None else 0.0
@@ -631,21 +784,7 @@ def track_student_progress(
         trend = "→ NEW ENTRY"
         trend_description = "First progress entry recorded"
         days_tracked = 0
-    
-    return {
-        "tracking_success": True,
-        "student_id": student_id,
-        "student_name": student_name,
-        "current_risk_level": risk_level,
-        "current_risk_score": numeric_score,
-        "total_entries": total_entries,
-        "days_tracked": days_tracked,
-        "improvement_percentage": round(improvement_pct, 1),
-        "trend": trend,
-        "trend_description": trend_description,
-        "last_updated": datetime.now().isoformat(),
-        "status": "success"
-    }
+    return improvement_pct, trend, trend_description, days_tracked
 
 
 def get_student_progress_timeline(student_id: str):
@@ -0,0 +1,260 @@
+# Copyright 2025 Zenshiro
+# Licensed under the Apache License, Version 2.0
+
+"""
+Incremental re-analysis for Agent Aura.
+Keeps a snapshot of a per-row hash and the last risk assessment of every
+student in the data file. When the file changes it is diffed against the
+snapshot, only added or changed students are re-scored, and risk level
+transitions are emitted as events.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from . import tools
+
+SNAPSHOT_VERSION = 1
+
+# Risk levels from least to most severe
+RISK_ORDER = {"LOW": 0, "MODERATE": 1, "HIGH": 2, "CRITICAL": 3}
+
+
+def row_hash(values: List[str]) -> str:
+    """Stable hash of a data file row's raw field values."""
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _file_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _transition_event(student_id: str, name: str, before: list, level: str, score: float, timestamp: str) -> dict:
+    direction = "escalated" if RISK_ORDER.get(level, 0) > RISK_ORDER.get(before[1], 0) else "improved"
+    return {
+        "event": "risk_transition",
+        "student_id": student_id,
+        "name": name,
+        "from_level": before[1],
+        "to_level": level,
+        "from_score": before[2],
+        "to_score": score,
+        "direction": direction,
+        "timestamp": timestamp
+    }
+
+
+def diff_data_file(
+    data_file: str,
+    previous: Dict[str, list],
+    assess: Optional[Callable[[dict], dict]] = None
+) -> dict:
+    """
+    Diff a data file against a snapshot and re-score the students whose rows changed.
+
+    Args:
+        data_file: Student data CSV
+        previous: Snapshot entries by student id ([row hash, risk level, risk score])
+        assess: Scores a student profile (default: the tools risk model)
+
+    Returns:
+        Dict with the new snapshot entries ("students"), the re-scored students
+        ("rescored": student id, name and risk), the events and the counts
+    """
+    assess = assess or tools._assess_student_risk
+    students: Dict[str, list] = {}
+    rescored = []
+    events = []
+    counts = {"rows": 0, "added": 0, "changed": 0, "unchanged": 0, "removed": 0, "errors": 0}
+    timestamp = datetime.now().isoformat()
+
+    with open(data_file, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        for values in reader:
+            if not values:
+                continue
+            row = dict(zip(header, values))
+            student_id = str(row.get("student_id", "N/A"))
+            # The first row of a student wins, as in get_student_data
+            if student_id in students:
+                continue
+            counts["rows"] += 1
+            digest = row_hash(values)
+            before = previous.get(student_id)
+            if before is not None and before[0] == digest:
+                students[student_id] = before
+                counts["unchanged"] += 1
+                continue
+
+            counts["added" if before is None else "changed"] += 1
+            try:
+                student = tools._student_from_row(row)
+                risk = assess(student)
+            except (TypeError, ValueError) as e:
+                # Keep the hash so a malformed row is only retried once it changes
+                students[student_id] = [digest, None, None]
+                counts["errors"] += 1
+                events.append({"event": "score_error", "student_id": student_id, "error": str(e), "timestamp": timestamp})
+                continue
+
+            level, score = risk["risk_level"], risk["risk_score"]
+            students[student_id] = [digest, level, score]
+            rescored.append({"student_id": student_id, "name": student["name"], "risk_level": level, "risk_score": score})
+            if before is None:
+                events.append({
+                    "event": "student_added",
+                    "student_id": student_id,
+                    "name": student["name"],
+                    "to_level": level,
+                    "to_score": score,
+                    "timestamp": timestamp
+                })
+            elif before[1] != level:
+                events.append(_transition_event(student_id, student["name"], before, level, score, timestamp))
+
+    for student_id, before in previous.items():
+        if student_id not in students:
+            counts["removed"] += 1
+            events.append({
+                "event": "student_removed",
+                "student_id": student_id,
+                "from_level": before[1],
+                "from_score": before[2],
+                "timestamp": timestamp
+            })
+
+    return {"students": students, "rescored": rescored, "events": events, "counts": counts}
+
+
+class DataWatcher:
+    """
+    Watches a student data file and re-analyzes only what changed.
+
+    The snapshot (row hashes and last assessments) is persisted next to the
+    outputs, so a nightly run after a small edit costs time proportional to
+    the number of changed rows rather than the size of the file.
+    """
+
+    def __init__(
+        self,
+        data_file: str,
+        snapshot_file: str = "./output/watch_snapshot.json",
+        track_progress: bool = True,
+        on_event: Optional[Callable[[dict], None]] = None
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            data_file: Student data CSV
+            snapshot_file: Where the row hashes and last assessments are kept
+            track_progress: Record re-scored students in the progress database
+            on_event: Called with every emitted event
+        """
+        self.data_file = data_file
+        self.snapshot_file = snapshot_file
+        self.track_progress = track_progress
+        self.on_event = on_event
+        self._snapshot: Optional[dict] = None
+
+    def load_snapshot(self) -> Optional[dict]:
+        """The persisted snapshot, if it exists and belongs to this data file."""
+        if self._snapshot is None:
+            try:
+                with open(self.snapshot_file, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+            if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("data_file") != os.path.abspath(self.data_file):
+                return None
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def _save_snapshot(self, snapshot: dict):
+        directory = os.path.dirname(os.path.abspath(self.snapshot_file))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-watch-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, self.snapshot_file)
+        self._snapshot = snapshot
+
+    def check(self, force: bool = False) -> dict:
+        """
+        Re-analyze the data file if it changed since the last snapshot.
+
+        The first check only records a baseline (every student is scored, no
+        events are emitted).
+
+        Args:
+            force: Diff the file even if its size and modification time are unchanged
+
+        Returns:
+            Summary with status ("missing", "unchanged", "baseline" or "updated"),
+            counts and events
+        """
+        summary = {"data_file": self.data_file, "status": "unchanged", "counts": {}, "events": []}
+        if not os.path.exists(self.data_file):
+            summary["status"] = "missing"
+            return summary
+
+        signature = _file_signature(self.data_file)
+        snapshot = self.load_snapshot()
+        if snapshot is not None and not force and snapshot["signature"] == signature:
+            return summary
+
+        baseline = snapshot is None
+        diff = diff_data_file(self.data_file, {} if baseline else snapshot["students"])
+        self._save_snapshot({
+            "version": SNAPSHOT_VERSION,
+            "data_file": os.path.abspath(self.data_file),
+            "signature": signature,
+            "updated_at": datetime.now().isoformat(),
+            "students": diff["students"]
+        })
+
+        summary["status"] = "baseline" if baseline else "updated"
+        summary["counts"] = diff["counts"]
+        if baseline:
+            return summary
+
+        if self.track_progress:
+            for student in diff["rescored"]:
+                tools.track_student_progress(
+                    student["student_id"], student["risk_level"], student["risk_score"],
+                    student["name"], notes="Data file update"
+                )
+        summary["events"] = diff["events"]
+        if self.on_event is not None:
+            for event in diff["events"]:
+                self.on_event(event)
+        return summary
+
+    def watch(
+        self,
+        interval: float = 5.0,
+        stop: Optional[threading.Event] = None,
+        on_check: Optional[Callable[[dict], None]] = None
+    ):
+        """
+        Poll the data file until stopped.
+
+        Args:
+            interval: Seconds between checks
+            stop: Event that ends the loop (default: run until interrupted)
+            on_check: Called with the summary of every check that re-analyzed the file
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            summary = self.check()
+            if on_check is not None and summary["status"] in ("baseline", "updated"):
+                on_check(summary)
+            stop.wait(interval)
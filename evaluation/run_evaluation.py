@@ -1,77 +1,287 @@
-import time
+"""
+Evaluation harness.
+
+Times the per-student analysis stages (data, risk, plan, predict, track)
+with perf_counter_ns after a warmup, in serial, threaded and multiprocess
+modes, over the real data file or synthetic cohorts of configurable size.
+Reports p50/p95/p99 per stage and writes machine-readable JSON that can be
+compared between commits.
+
+Usage:
+    python evaluation/run_evaluation.py [--sizes 1000,10000] [--modes serial,thread,process]
+                                        [--workers N] [--warmup N] [--data-file PATH]
+                                        [--output PATH] [--compare PREVIOUS.json]
+"""
+
+import argparse
 import json
 import os
-from agent_aura.tools import (
-    analyze_student_risk,
-    track_student_progress,
-)
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agent_aura import tools  # noqa: E402
+from agent_aura.synthetic import CohortSpec, generate_students  # noqa: E402
 
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "student_data.csv")
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+SCHEMA_VERSION = 1
+STAGES = ["data", "risk", "plan", "predict", "track"]
+MODES = ["serial", "thread", "process"]
 
-def load_student_ids(path):
-    ids = []
-    with open(path, "r", encoding="utf-8") as f:
-        next(f)
-        for line in f:
-            sid = line.split(",")[0].strip()
-            if sid:
-                ids.append(sid)
-    return ids
 
+# ============================================================================
+# Cohorts
+# ============================================================================
 
-def main():
-    student_ids = load_student_ids(DATA_PATH)
-    latencies = []
-    improvements = []
-    total_start = time.time()
-
-    for sid in student_ids:
-        # Measure analysis latency
-        start = time.time()
-        risk = analyze_student_risk(sid)
-        latency = time.time() - start
-        latencies.append(latency)
-
-        # Simulate intervention improvement (naive)
-        pre = float(risk.get("risk_score", 0.0) or 0.0)
-        improved = max(pre - 0.15, 0.0)
-        track_student_progress(sid, risk.get("risk_level", "LOW"), pre, risk.get("student_name", ""))
-        track_student_progress(sid, risk.get("risk_level", "LOW"), improved, risk.get("student_name", ""), notes="Simulated intervention")
-
-        if pre > 0.0:
-            improvements.append((pre - improved) / pre * 100.0)
-        else:
-            improvements.append(0.0)
-
-    total_time = time.time() - total_start
-    throughput_spm = len(student_ids) / (total_time / 60.0) if total_time > 0 else 0.0
-
-    results_latency = {
-        "total_students": len(student_ids),
-        "avg_latency_sec": sum(latencies) / len(latencies) if latencies else 0.0,
-        "min_latency_sec": min(latencies) if latencies else 0.0,
-        "max_latency_sec": max(latencies) if latencies else 0.0,
-        "throughput_students_per_min": throughput_spm,
-        "total_time_sec": total_time,
+def synthetic_rows(size: int, seed: int = 42) -> List[dict]:
+    """Raw data file rows for a reproducible synthetic cohort."""
+    import pandas as pd
+    frames = generate_students(CohortSpec(size=size, seed=seed))
+    return pd.concat(frames, ignore_index=True).to_dict("records")
+
+
+def file_rows(path: str) -> List[dict]:
+    """Raw rows of a student data CSV (loaded once, outside the timed region)."""
+    import pandas as pd
+    return pd.read_csv(path, dtype={"student_id": str}).to_dict("records")
+
+
+# ============================================================================
+# Timed analysis
+# ============================================================================
+
+def analyze_timed(row: dict) -> Dict[str, int]:
+    """Run one student through every stage; nanoseconds per stage."""
+    clock = time.perf_counter_ns
+    t0 = clock()
+    student = tools._student_from_row(row)
+    t1 = clock()
+    risk = tools._assess_student_risk(student)
+    t2 = clock()
+    tools.generate_intervention_plan(risk["risk_level"])
+    t3 = clock()
+    tools.predict_intervention_success(risk["risk_level"])
+    t4 = clock()
+    tools.track_student_progress(student["student_id"], risk["risk_level"], risk["risk_score"], student["name"])
+    t5 = clock()
+    return {"data": t1 - t0, "risk": t2 - t1, "plan": t3 - t2, "predict": t4 - t3, "track": t5 - t4, "total": t5 - t0}
+
+
+def analyze_chunk_timed(rows: List[dict]) -> List[Dict[str, int]]:
+    """analyze_timed over a chunk (one process pool task)."""
+    return [analyze_timed(row) for row in rows]
+
+
+def _chunks(rows: List[dict], size: int) -> List[List[dict]]:
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def run_mode(mode: str, rows: List[dict], workers: int, warmup: int, chunk_size: int) -> dict:
+    """
+    Time one cohort in one execution mode.
+
+    Args:
+        mode: "serial", "thread" or "process"
+        rows: Raw student rows
+        workers: Threads or processes (ignored in serial mode)
+        warmup: Untimed analyses run first (per worker in process mode)
+        chunk_size: Rows per process pool task
+
+    Returns:
+        Result with wall time, throughput and per-stage latency statistics
+    """
+    warm = rows[:warmup]
+    if mode == "serial":
+        workers = 1
+        analyze_chunk_timed(warm)
+        start = time.perf_counter_ns()
+        timings = analyze_chunk_timed(rows)
+        wall = time.perf_counter_ns() - start
+    elif mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(analyze_timed, warm))
+            start = time.perf_counter_ns()
+            timings = list(executor.map(analyze_timed, rows))
+            wall = time.perf_counter_ns() - start
+    elif mode == "process":
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Start every worker and warm its imports and caches before timing
+            for future in [executor.submit(analyze_chunk_timed, warm) for _ in range(workers)]:
+                future.result()
+            start = time.perf_counter_ns()
+            timings = [t for chunk in executor.map(analyze_chunk_timed, _chunks(rows, chunk_size)) for t in chunk]
+            wall = time.perf_counter_ns() - start
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    wall_seconds = wall / 1e9
+    return {
+        "mode": mode,
+        "size": len(rows),
+        "workers": workers,
+        "wall_seconds": round(wall_seconds, 4),
+        "throughput_per_sec": round(len(rows) / wall_seconds, 1) if wall_seconds else 0.0,
+        "stages": {stage: summarize([t[stage] for t in timings]) for stage in STAGES + ["total"]}
     }
 
-    results_improvement = {
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+def percentile(sorted_values: List[int], pct: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-pct * len(sorted_values) // 100)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(values_ns: List[int]) -> dict:
+    """Latency statistics in microseconds."""
+    values = sorted(values_ns)
+    count = len(values)
+    micro = lambda ns: round(ns / 1000, 3)  # noqa: E731
+    return {
+        "count": count,
+        "mean_us": micro(sum(values) / count) if count else 0.0,
+        "min_us": micro(values[0]) if count else 0.0,
+        "p50_us": micro(percentile(values, 50)),
+        "p95_us": micro(percentile(values, 95)),
+        "p99_us": micro(percentile(values, 99)),
+        "max_us": micro(values[-1]) if count else 0.0
+    }
+
+
+def compare(current: dict, previous: dict) -> List[dict]:
+    """Per mode and size, the ratio of current to previous p50/p95/p99 and throughput."""
+    before = {(r["mode"], r["size"]): r for r in previous.get("results", [])}
+    rows = []
+    for result in current["results"]:
+        old = before.get((result["mode"], result["size"]))
+        if old is None:
+            continue
+        row = {"mode": result["mode"], "size": result["size"]}
+        for key in ("p50_us", "p95_us", "p99_us"):
+            old_value = old["stages"]["total"][key]
+            row[key] = round(result["stages"]["total"][key] / old_value, 3) if old_value else None
+        row["throughput"] = round(result["throughput_per_sec"] / old["throughput_per_sec"], 3) if old["throughput_per_sec"] else None
+        rows.append(row)
+    return rows
+
+
+def improvement_summary(rows: List[dict], reduction: float = 0.15) -> dict:
+    """Risk score improvement after a simulated intervention (score reduced by a fixed amount)."""
+    improvements = []
+    for row in rows:
+        pre = float(tools._assess_student_risk(tools._student_from_row(row))["risk_score"])
+        post = max(pre - reduction, 0.0)
+        improvements.append((pre - post) / pre * 100.0 if pre > 0.0 else 0.0)
+    return {
         "avg_improvement_pct": sum(improvements) / len(improvements) if improvements else 0.0,
         "min_improvement_pct": min(improvements) if improvements else 0.0,
-        "max_improvement_pct": max(improvements) if improvements else 0.0,
+        "max_improvement_pct": max(improvements) if improvements else 0.0
     }
 
-    with open(os.path.join(OUTPUT_DIR, "evaluation_latency.json"), "w", encoding="utf-8") as f:
-        json.dump(results_latency, f, indent=2)
 
-    with open(os.path.join(OUTPUT_DIR, "evaluation_improvement.json"), "w", encoding="utf-8") as f:
-        json.dump(results_improvement, f, indent=2)
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10
+        ).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+# ============================================================================
+# Entry point
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles of the student analysis")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated synthetic cohort sizes")
+    parser.add_argument("--data-file", nargs="?", const=DATA_PATH, default=None,
+                        help="Benchmark a student CSV instead of synthetic cohorts (default: data/student_data.csv)")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes: serial, thread, process")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Threads/processes for parallel modes")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed analyses before each measurement")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per process pool task")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic cohort seed")
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "evaluation_benchmark.json"), help="Result JSON")
+    parser.add_argument("--compare", default=None, help="Previous result JSON to compare against")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if args.data_file:
+        cohorts = {os.path.basename(args.data_file): file_rows(args.data_file)}
+    else:
+        cohorts = {f"synthetic-{n}": synthetic_rows(n, args.seed) for n in (int(s) for s in args.sizes.split(","))}
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "modes": modes,
+            "workers": args.workers,
+            "warmup": args.warmup,
+            "chunk_size": args.chunk_size,
+            "seed": args.seed,
+            "cohorts": list(cohorts)
+        },
+        "results": []
+    }
+
+    print(f"{'Cohort':20s} {'Mode':8s} {'Workers':>7s} {'Students/s':>11s} {'p50 us':>8s} {'p95 us':>8s} {'p99 us':>8s}")
+    for name, rows in cohorts.items():
+        for mode in modes:
+            tools.progress_database.clear()
+            result = run_mode(mode, rows, args.workers, args.warmup, args.chunk_size)
+            result["cohort"] = name
+            report["results"].append(result)
+            total = result["stages"]["total"]
+            print(f"{name:20s} {mode:8s} {result['workers']:7d} {result['throughput_per_sec']:11,.0f} "
+                  f"{total['p50_us']:8.1f} {total['p95_us']:8.1f} {total['p99_us']:8.1f}")
+
+    print("\nPer-stage p50/p95/p99 (us), serial:")
+    for result in report["results"]:
+        if result["mode"] != "serial":
+            continue
+        stages = "  ".join(
+            f"{stage} {s['p50_us']:.1f}/{s['p95_us']:.1f}/{s['p99_us']:.1f}"
+            for stage, s in result["stages"].items() if stage != "total"
+        )
+        print(f"  {result['cohort']:20s} {stages}")
+
+    report["improvement"] = improvement_summary(next(iter(cohorts.values())))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        report["comparison"] = {"against": previous.get("commit"), "ratios": compare(report, previous)}
+        print(f"\nCurrent / {previous.get('commit')} (total latency; throughput >1 is faster):")
+        for row in report["comparison"]["ratios"]:
+            print(f"  {row['mode']:8s} {row['size']:>9,d}  p50 x{row['p50_us']}  p95 x{row['p95_us']}  "
+                  f"p99 x{row['p99_us']}  throughput x{row['throughput']}")
 
-    print("Latency:", json.dumps(results_latency, indent=2))
-    print("Improvement:", json.dumps(results_improvement, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(os.path.dirname(os.path.abspath(args.output)), "evaluation_improvement.json"), "w", encoding="utf-8") as f:
+        json.dump(report["improvement"], f, indent=2)
+    print(f"\nResults written to {args.output}")
 
 
 if __name__ == "__main__":
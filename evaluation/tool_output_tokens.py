@@ -0,0 +1,133 @@
+"""
+Tool output token benchmark.
+
+Runs the tool sequence of one orchestrated student analysis and measures
+how many tokens the tool results add to the model context under the full
+and compact output profiles.
+
+Usage:
+    python evaluation/tool_output_tokens.py [--students N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agent_aura import tools  # noqa: E402
+from agent_aura.tool_profiles import OutputProfile, compact_result  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "student_data.csv")
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+    TOKENIZER = "tiktoken cl100k_base"
+except ImportError:
+    def count_tokens(text: str) -> int:
+        # Rough estimate for JSON payloads when no tokenizer is installed
+        return max(1, len(text) // 4)
+
+    TOKENIZER = "estimate (4 characters per token)"
+
+
+def load_students(count: int) -> list:
+    """Student records from the data file, or synthetic ones if it is missing."""
+    if os.path.exists(DATA_PATH):
+        import pandas as pd
+        ids = pd.read_csv(DATA_PATH)["student_id"].astype(str).tolist()[:count]
+        return [tools.get_student_data(sid, DATA_PATH) for sid in ids]
+
+    rng = random.Random(42)
+    return [
+        {
+            "student_id": f"S{i:03d}",
+            "name": f"Student {i}",
+            "grade": rng.randint(6, 12),
+            "gpa": round(rng.uniform(1.5, 4.0), 2),
+            "attendance": round(rng.uniform(70, 100), 1),
+            "performance": rng.choice(["Below Average", "Average", "Above Average"]),
+            "status": "success"
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def orchestrated_calls(student: dict) -> list:
+    """(tool name, result) pairs produced by one full analysis of a student."""
+    sid = student["student_id"]
+    risk = tools._assess_student_risk(student)
+    level = risk["risk_level"]
+    calls = [("get_student_data", student), ("analyze_student_risk", risk)]
+    if level in ("CRITICAL", "HIGH"):
+        calls.append(("generate_alert_email", tools.generate_alert_emails_batch([student], [risk])[0]))
+    calls.append(("track_student_progress", tools.track_student_progress(sid, level, risk["risk_score"], student["name"])))
+    # Follow-up entry so the timeline and chart tools have a history to return
+    followup = max(float(risk["risk_score"]) - 0.15, 0.0)
+    tools.track_student_progress(sid, level, followup, student["name"], notes="Follow-up")
+    calls.extend([
+        ("generate_intervention_plan", tools.generate_intervention_plan(level)),
+        ("predict_intervention_success", tools.predict_intervention_success(level)),
+        ("get_student_progress_timeline", tools.get_student_progress_timeline(sid)),
+        ("export_progress_visualization_data", tools.export_progress_visualization_data(sid))
+    ])
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokens per orchestrated analysis by tool output profile")
+    parser.add_argument("--students", type=int, default=20, help="Number of students to analyze")
+    args = parser.parse_args()
+
+    students = load_students(args.students)
+    per_tool = {}
+    totals = {OutputProfile.FULL: 0, OutputProfile.COMPACT: 0}
+    for student in students:
+        for name, result in orchestrated_calls(student):
+            full = count_tokens(json.dumps(result, default=str))
+            compact = count_tokens(json.dumps(compact_result(name, result), default=str))
+            stats = per_tool.setdefault(name, {"calls": 0, OutputProfile.FULL: 0, OutputProfile.COMPACT: 0})
+            stats["calls"] += 1
+            stats[OutputProfile.FULL] += full
+            stats[OutputProfile.COMPACT] += compact
+            totals[OutputProfile.FULL] += full
+            totals[OutputProfile.COMPACT] += compact
+
+    n = max(len(students), 1)
+    report = {
+        "students": len(students),
+        "tokenizer": TOKENIZER,
+        "tokens_per_analysis": {profile: round(total / n, 1) for profile, total in totals.items()},
+        "reduction_percent": round(100 * (1 - totals[OutputProfile.COMPACT] / max(totals[OutputProfile.FULL], 1)), 1),
+        "per_tool": {
+            name: {
+                "calls": stats["calls"],
+                "full_tokens_per_call": round(stats[OutputProfile.FULL] / stats["calls"], 1),
+                "compact_tokens_per_call": round(stats[OutputProfile.COMPACT] / stats["calls"], 1)
+            }
+            for name, stats in per_tool.items()
+        }
+    }
+
+    print(f"{'Tool':38s} {'Full':>8s} {'Compact':>8s}")
+    for name, stats in report["per_tool"].items():
+        print(f"{name:38s} {stats['full_tokens_per_call']:8.1f} {stats['compact_tokens_per_call']:8.1f}")
+    per_analysis = report["tokens_per_analysis"]
+    print(f"\nTokens per analysis: full {per_analysis['full']}, compact {per_analysis['compact']} "
+          f"({report['reduction_percent']}% fewer, {TOKENIZER})")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(os.path.join(OUTPUT_DIR, "evaluation_tool_tokens.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
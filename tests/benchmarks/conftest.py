@@ -0,0 +1,84 @@
+"""
+Benchmark suite fixtures (requires pytest-benchmark; skipped without it).
+
+Run the suite:
+    python -m pytest tests/benchmarks --benchmark-only
+
+Compare against the stored baseline and fail on regressions:
+    python -m pytest tests/benchmarks --benchmark-only \
+        --benchmark-storage=tests/benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=median:50%
+
+Refresh the baseline after an intended change:
+    python -m pytest tests/benchmarks --benchmark-only \
+        --benchmark-storage=tests/benchmarks/baselines --benchmark-save=baseline
+
+The committed baseline (baselines/Linux-CPython-3.11-64bit/0001_baseline.json)
+was recorded on a developer machine and is a local reference only: CI does
+not run the benchmarks, and comparisons are only meaningful against a
+baseline saved on the same machine. Save your own before comparing.
+
+Every benchmark also has an absolute median budget (BUDGETS) that catches
+gross hot-path slowdowns. Budgets are only enforced in dedicated benchmark
+runs (--benchmark-only, or BENCHMARK_ENFORCE_BUDGETS=true), not when the
+benchmarks run as part of the regular test suite; scale them with
+BENCHMARK_BUDGET_SCALE on slow runners.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+COHORT_SIZE = 5_000
+HISTORY_LENGTH = 10_000
+
+# Median budget per benchmark, in seconds (roughly 10x the baseline median)
+BUDGETS = {
+    "test_get_student_data": 0.1,
+    "test_analyze_student_risk_scalar": 0.0002,
+    "test_analyze_student_risk_tool": 0.1,
+    "test_analyze_student_risk_batch": 0.2,
+    "test_track_student_progress_long_history": 0.001,
+    "test_track_student_progress_store_long_history": 0.01,
+    "test_export_progress_visualization_data": 0.1,
+    "test_generate_alert_email": 0.1,
+    "test_orchestrator_run": 0.05,
+    "test_agent_run": 0.05,
+    "test_list_students_endpoint": 2.0,
+    "test_agent_invoke_endpoint": 0.5,
+}
+
+
+@pytest.fixture(autouse=True)
+def median_budget(request):
+    """Fail a benchmark whose median exceeds its budget (dedicated benchmark runs only)."""
+    yield
+    enforce = request.config.getoption("benchmark_only", False) or \
+        os.getenv("BENCHMARK_ENFORCE_BUDGETS", "false").lower() == "true"
+    benchmark = request.node.funcargs.get("benchmark")
+    budget = BUDGETS.get(request.node.originalname)
+    if not enforce or benchmark is None or budget is None or benchmark.stats is None:
+        return
+    budget *= float(os.getenv("BENCHMARK_BUDGET_SCALE", "1"))
+    median = benchmark.stats.stats.median
+    assert median <= budget, f"median {median * 1000:.3f} ms exceeds the {budget * 1000:.3f} ms budget"
+
+
+@pytest.fixture(scope="session")
+def cohort_file(tmp_path_factory):
+    """A generated cohort in the data file format."""
+    from agent_aura.synthetic import CohortSpec, write_cohort
+    path = tmp_path_factory.mktemp("cohort") / "students.csv"
+    write_cohort(CohortSpec(size=COHORT_SIZE, seed=7), str(path))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def cohort_rows(cohort_file):
+    """Raw rows of the generated cohort."""
+    import pandas as pd
+    return pd.read_csv(cohort_file, dtype={"student_id": str}).to_dict("records")
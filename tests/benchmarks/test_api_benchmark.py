@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import os
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+httpx = pytest.importorskip("httpx")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.agent_core import dispatch as dispatch_module  # noqa: E402
+from app.agent_core import forecasting as forecasting_module  # noqa: E402
+from app.agent_core import orchestrator as orchestrator_module  # noqa: E402
+from app.agent_core import outbox as outbox_module  # noqa: E402
+from app.agent_core import progress_store as progress_store_module  # noqa: E402
+from app.agent_core import retention as retention_module  # noqa: E402
+from app.agent_core import tools as backend_tools  # noqa: E402
+from app.agent_core.agent import Agent  # noqa: E402
+from app.agent_core.cassette import Cassette  # noqa: E402
+from app.agent_core.model_manager import model_manager  # noqa: E402
+from app.agent_core.orchestrator import MultiAgentOrchestrator  # noqa: E402
+from app.agent_core.outbox import NotificationOutbox  # noqa: E402
+from app.agent_core.progress_store import ProgressStore  # noqa: E402
+from app.agent_core.stub_llm import ScriptRule, StubConfig, StubLLM  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.database import User, UserRole, get_db  # noqa: E402
+from app.seed_cohort import bulk_load_students  # noqa: E402
+from app.services.auth import get_current_active_user  # noqa: E402
+
+API_STUDENTS = 500
+STUDENT_ID = "S250"
+AGENT_GOAL = "Build intervention plans for HIGH risk students"
+
+# The agent plans once, reads the tool result and answers
+AGENT_SCRIPT = [
+    ScriptRule(match="Tool Result", text='{"thought": "Plans ready", "final_response": "Intervention plans reviewed"}'),
+    ScriptRule(match=r"(?P<level>HIGH) risk", tool_calls=[
+        {"name": "generate_intervention_plan", "arguments": {"risk_level": "{level}"}}
+    ]),
+]
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.fixture
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, tmp_path):
+    """
+    Orchestrator and agent replaying recorded model calls, without pacing
+    delays, a repo data file or the shared progress store and outbox.
+
+    Replays BENCHMARK_LLM_CASSETTE when set (e.g. recorded from a real
+    provider with LLM_CASSETTE_MODE=record), otherwise a cassette recorded
+    here from the local stub provider.
+    """
+    from agent_aura.synthetic import CohortSpec, write_cohort
+
+    data_file = str(tmp_path / "students.csv")
+    write_cohort(CohortSpec(size=API_STUDENTS, seed=7), data_file)
+
+    # Runs record progress and alerts; keep them out of ./output and out of later rounds
+    store = ProgressStore(str(tmp_path / "progress_store.db"))
+    outbox = NotificationOutbox(str(tmp_path / "notification_outbox.db"))
+    for module in (progress_store_module, backend_tools, retention_module, forecasting_module):
+        monkeypatch.setattr(module, "progress_store", store)
+    for module in (outbox_module, dispatch_module, backend_tools):
+        monkeypatch.setattr(module, "notification_outbox", outbox)
+
+    real_sleep = asyncio.sleep
+
+    async def no_delay(delay, result=None):
+        return await real_sleep(0, result)
+
+    # The orchestrator and agent pace their events for the UI; only the work is measured
+    monkeypatch.setattr(orchestrator_module.asyncio, "sleep", no_delay)
+    monkeypatch.setattr(orchestrator_module, "get_student_data",
+                        functools.partial(backend_tools.get_student_data, data_source=data_file))
+
+    cassette_file = os.getenv("BENCHMARK_LLM_CASSETTE")
+    if not cassette_file:
+        cassette_file = str(tmp_path / "llm_cassette.ndjson")
+        stub = StubLLM(StubConfig(script=AGENT_SCRIPT))
+
+        async def stub_content(config, prompt):
+            return stub.reply(prompt)["text"]
+
+        async def stub_tools(config, prompt, tool_declarations):
+            return stub.reply(prompt)
+
+        monkeypatch.setattr(model_manager, "default_model", "stub-gemini")
+        monkeypatch.setattr(model_manager, "_generate_content", stub_content)
+        monkeypatch.setattr(model_manager, "_generate_with_tools", stub_tools)
+        monkeypatch.setattr(model_manager, "cassette", Cassette(cassette_file, "record"))
+        asyncio.run(collect(MultiAgentOrchestrator().run(STUDENT_ID)))
+        asyncio.run(collect(Agent(native_function_calling=True).run(AGENT_GOAL)))
+
+    monkeypatch.setattr(model_manager, "cassette", Cassette(cassette_file, "replay", latency="none"))
+    yield data_file
+    store.close()
+    outbox.close()
+    assert model_manager.cassette.stats["misses"] == 0, "model calls missing from the cassette"
+
+
+@pytest.fixture
+def client(stub_llm, tmp_path, event_loop_runner):
+    """In-process ASGI client with a seeded database and an authenticated teacher."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    bulk_load_students(stub_llm, engine=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    teacher = User(id=1, username="bench_teacher", email="bench@agentura.com", hashed_password="",
+                   role=UserRole.TEACHER, is_active=True)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_active_user] = lambda: teacher
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    yield client
+    event_loop_runner(client.aclose())
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_orchestrator_run(benchmark, stub_llm, event_loop_runner):
+    events = benchmark(lambda: event_loop_runner(collect(MultiAgentOrchestrator().run(STUDENT_ID))))
+    assert events[-1]["type"] == "final_report" and events[-1]["risk_analysis"]["status"] == "success"
+
+
+def test_agent_run(benchmark, stub_llm, event_loop_runner):
+    events = benchmark(lambda: event_loop_runner(collect(Agent(native_function_calling=True).run(AGENT_GOAL))))
+    assert [e["tool_name"] for e in events if e["type"] == "action"] == ["generate_intervention_plan"]
+    assert events[-1]["type"] == "response"
+
+
+def test_list_students_endpoint(benchmark, client, event_loop_runner):
+    response = benchmark(lambda: event_loop_runner(client.get("/api/v1/students")))
+    assert response.status_code == 200
+    assert len(response.json()["students"]) == API_STUDENTS
+
+
+def test_agent_invoke_endpoint(benchmark, client, event_loop_runner):
+    async def invoke():
+        response = await client.post(
+            "/api/v1/agent/invoke", json={"goal": f"Analyze student {STUDENT_ID}", "student_id": STUDENT_ID}
+        )
+        return response, response.text.splitlines()
+
+    response, lines = benchmark(lambda: event_loop_runner(invoke()))
+    assert response.status_code == 200
+    assert '"session_start"' in lines[0] and len(lines) > 5
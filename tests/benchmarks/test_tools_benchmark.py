@@ -0,0 +1,104 @@
+import functools
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_aura import tools
+from agent_aura.pipeline import analyze_chunk
+
+from conftest import HISTORY_LENGTH
+
+STUDENT_ID = "S2500"
+
+
+@pytest.fixture
+def cohort_tools(cohort_file, monkeypatch):
+    """Point the id-based tools at the generated cohort."""
+    monkeypatch.setattr(tools, "get_student_data", functools.partial(tools.get_student_data, data_source=cohort_file))
+    monkeypatch.setattr(tools, "notification_log", [])
+
+
+@pytest.fixture
+def long_history(monkeypatch):
+    """A student with HISTORY_LENGTH progress entries."""
+    start = datetime(2020, 1, 1)
+    history = [
+        {
+            "date": (start + timedelta(days=i)).date().isoformat(),
+            "timestamp": (start + timedelta(days=i)).isoformat(),
+            "risk_level": "HIGH" if i % 5 else "MODERATE",
+            "risk_score": round(0.6 + (i % 30) / 100, 3),
+            "notes": ""
+        }
+        for i in range(HISTORY_LENGTH)
+    ]
+    monkeypatch.setattr(tools, "progress_database", {
+        STUDENT_ID: {
+            "student_id": STUDENT_ID,
+            "student_name": "Benchmark Student",
+            "created_date": history[0]["timestamp"],
+            "last_updated": history[-1]["timestamp"],
+            "history": history
+        }
+    })
+    return STUDENT_ID
+
+
+def test_get_student_data(benchmark, cohort_file):
+    result = benchmark(tools.get_student_data, STUDENT_ID, cohort_file)
+    assert result["status"] == "success"
+
+
+def test_analyze_student_risk_scalar(benchmark, cohort_rows):
+    student = tools._student_from_row(cohort_rows[0])
+    result = benchmark(tools._assess_student_risk, student)
+    assert result["status"] == "success"
+
+
+def test_analyze_student_risk_tool(benchmark, cohort_tools):
+    result = benchmark(tools.analyze_student_risk, STUDENT_ID)
+    assert result["status"] == "success"
+
+
+def test_analyze_student_risk_batch(benchmark, cohort_rows, monkeypatch):
+    rows = cohort_rows[:1000]
+    results = benchmark(analyze_chunk, rows)
+    assert len(results) == 1000 and all(r["status"] == "success" for r in results)
+
+
+def test_track_student_progress_long_history(benchmark, long_history):
+    result = benchmark(tools.track_student_progress, long_history, "HIGH", 0.8, "Benchmark Student")
+    assert result["total_entries"] > HISTORY_LENGTH
+
+
+def test_track_student_progress_store_long_history(benchmark, tmp_path, monkeypatch):
+    from app.agent_core import tools as backend_tools
+    from app.agent_core.progress_store import ProgressStore
+
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(backend_tools, "progress_store", store)
+    start = datetime(2020, 1, 1)
+    store.append_many(
+        {
+            "student_id": STUDENT_ID,
+            "date": (start + timedelta(hours=i)).date().isoformat(),
+            "timestamp": (start + timedelta(hours=i)).isoformat(),
+            "risk_level": "HIGH",
+            "risk_score": 0.8,
+            "notes": ""
+        }
+        for i in range(HISTORY_LENGTH)
+    )
+    result = benchmark(backend_tools.track_student_progress, STUDENT_ID, "HIGH", 0.8, "Benchmark Student")
+    assert result["total_entries"] > HISTORY_LENGTH
+    store.close()
+
+
+def test_export_progress_visualization_data(benchmark, long_history):
+    result = benchmark(tools.export_progress_visualization_data, long_history)
+    assert result["summary"]["total_entries"] == HISTORY_LENGTH
+
+
+def test_generate_alert_email(benchmark, cohort_tools):
+    result = benchmark(tools.generate_alert_email, STUDENT_ID)
+    assert result["student_id"] == STUDENT_ID
@@ -0,0 +1,262 @@
+import asyncio
+
+import pytest
+
+from app.agent_core.agent import Agent
+
+
+class ScriptedAgent(Agent):
+    """Agent whose LLM replies are replayed from a fixed script."""
+
+    def __init__(self, steps, **kwargs):
+        super().__init__(**kwargs)
+        self.steps = list(steps)
+        self.llm_calls = 0
+
+    async def _simulate_llm_call(self, context: str) -> dict:
+        self.llm_calls += 1
+        return self.steps.pop(0)
+
+
+def run_agent(agent, goal="Analyze risk levels"):
+    async def collect():
+        return [event async for event in agent.run(goal)]
+    return asyncio.run(collect())
+
+
+def test_multiple_actions_run_in_one_step():
+    agent = ScriptedAgent([
+        {
+            "thought": "Fetch plans for two levels at once",
+            "actions": [
+                {"action": "generate_intervention_plan", "arguments": {"risk_level": "HIGH"}},
+                {"action": "predict_intervention_success", "arguments": {"risk_level": "LOW"}},
+            ],
+        },
+        {"thought": "Done", "final_response": "Summary"},
+    ])
+
+    events = run_agent(agent)
+    types = [event["type"] for event in events]
+
+    assert agent.llm_calls == 2
+    assert types == ["thought", "action", "action", "observation", "observation", "thought", "response"]
+    assert [e["tool_name"] for e in events if e["type"] == "action"] == [
+        "generate_intervention_plan",
+        "predict_intervention_success",
+    ]
+    observations = [e for e in events if e["type"] == "observation"]
+    assert all(o["success"] for o in observations)
+    assert "Targeted Intervention" in observations[0]["content"]
+    assert "base_success_rate" in observations[1]["content"]
+
+
+def test_single_action_format_still_supported():
+    agent = ScriptedAgent([
+        {"thought": "Plan", "action": "generate_intervention_plan", "arguments": {"risk_level": "LOW"}},
+        {"thought": "Done", "final_response": "Summary"},
+    ])
+
+    events = run_agent(agent)
+
+    assert [e["type"] for e in events].count("action") == 1
+    assert events[-1]["type"] == "response"
+    assert events[-1]["content"] == "Summary"
+
+
+@pytest.mark.parametrize("parsed,expected", [
+    ({"action": "a", "arguments": {"x": 1}}, [{"action": "a", "arguments": {"x": 1}}]),
+    ({"actions": [{"action": "a"}, {"arguments": {}}, {"action": "b", "arguments": {"y": 2}}]},
+     [{"action": "a", "arguments": {}}, {"action": "b", "arguments": {"y": 2}}]),
+    ({"thought": "nothing to do"}, []),
+])
+def test_extract_actions(parsed, expected):
+    assert Agent()._extract_actions(parsed) == expected
+
+
+def test_tool_executor_respects_concurrency_limit():
+    import threading
+    import time
+
+    from app.agent_core.executor import ToolExecutor
+
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_tool(n):
+        with lock:
+            active.append(n)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(n)
+        return n
+
+    executor = ToolExecutor(io_workers=4, cpu_workers=0)
+
+    async def main():
+        return await asyncio.gather(*[
+            executor.run("slow_tool", slow_tool, {"n": i}, max_concurrency=2)
+            for i in range(6)
+        ])
+
+    try:
+        assert asyncio.run(main()) == list(range(6))
+    finally:
+        executor.shutdown()
+    assert max(peak) <= 2
+
+
+def test_inline_tools_run_on_the_event_loop_thread():
+    import threading
+
+    from app.agent_core.agent import TOOL_REGISTRY
+    from app.agent_core.executor import ExecutionKind, ToolExecutor
+
+    executor = ToolExecutor(io_workers=1, cpu_workers=1)
+
+    async def main():
+        return await executor.run("whoami", threading.get_ident, {}, kind=ExecutionKind.INLINE)
+
+    try:
+        assert asyncio.run(main()) == threading.get_ident()
+        assert executor._cpu_pool is None
+    finally:
+        executor.shutdown()
+    assert TOOL_REGISTRY["generate_intervention_plan"]["execution"] == ExecutionKind.INLINE
+    assert TOOL_REGISTRY["analyze_student_risk"]["execution"] == ExecutionKind.CPU
+
+
+def test_event_loop_lag_monitor_snapshot():
+    from app.agent_core.executor import EventLoopLagMonitor
+
+    monitor = EventLoopLagMonitor()
+    monitor.record(0.002)
+    monitor.record(0.010)
+
+    snapshot = monitor.snapshot()
+    assert snapshot["samples"] == 2
+    assert snapshot["max_lag_ms"] == 10.0
+    assert snapshot["avg_lag_ms"] == 6.0
+
+
+def test_function_declarations_are_typed_from_signatures():
+    from app.agent_core.function_calling import build_function_declarations
+
+    declarations = {d["name"]: d for d in build_function_declarations(("track_student_progress", "analyze_student_risk"))}
+
+    track = declarations["track_student_progress"]["parameters"]
+    assert track["properties"]["risk_score"]["type"] == "number"
+    assert track["properties"]["risk_level"]["description"] == "Current risk level"
+    assert track["required"] == ["student_id", "risk_level", "risk_score"]
+    assert declarations["analyze_student_risk"]["parameters"]["properties"]["student_data"]["type"] == "object"
+
+
+def test_declarations_keep_the_tool_description():
+    from app.agent_core.agent import TOOL_REGISTRY
+    from app.agent_core.function_calling import build_function_declarations
+
+    for declaration in build_function_declarations(tuple(TOOL_REGISTRY)):
+        assert declaration["description"] == TOOL_REGISTRY[declaration["name"]]["description"]
+
+
+def test_object_parameters_have_properties_or_are_json_strings():
+    from app.agent_core.function_calling import build_function_declaration, build_function_declarations, coerce_arguments
+
+    declarations = {d["name"]: d for d in build_function_declarations(("analyze_student_risk", "generate_alert_email"))}
+    for declaration in declarations.values():
+        for schema in declaration["parameters"]["properties"].values():
+            assert schema["type"] != "object" or schema["properties"]
+    assert "gpa" in declarations["analyze_student_risk"]["parameters"]["properties"]["student_data"]["properties"]
+
+    def tool(options: dict, name: str = ""):
+        """Tool with an undeclared object.
+
+        Args:
+            options: Free-form options
+        """
+        return options
+
+    schema = build_function_declaration("tool", tool, "t")["parameters"]["properties"]["options"]
+    assert schema == {"type": "string", "description": "Free-form options (JSON object)"}
+    assert coerce_arguments(tool, {"options": '{"a": 1}', "name": "x"}) == {"options": {"a": 1}, "name": "x"}
+
+
+@pytest.mark.parametrize("reply", [
+    '```json\n{"thought": "t", "action": "a", "arguments": {"x": "}"}}\n```',
+    'Sure! Here is my step: {"thought": "t", "action": "a", "arguments": {"x": "}"}} Hope it helps.',
+])
+def test_parse_llm_response_tolerates_fences_and_prose(reply):
+    parsed = Agent()._parse_llm_response(reply)
+    assert parsed == {"thought": "t", "action": "a", "arguments": {"x": "}"}}
+
+
+def test_json_stream_extractor_handles_split_chunks():
+    from app.agent_core.function_calling import JSONStreamExtractor
+
+    extractor = JSONStreamExtractor()
+    assert extractor.feed('noise {"thought": "a", "nested": {"k"') == []
+    assert extractor.feed(': 1}} {"final_response": "b"}') == [
+        {"thought": "a", "nested": {"k": 1}},
+        {"final_response": "b"},
+    ]
+
+
+def test_native_tool_calls_become_actions():
+    step = Agent()._parse_tool_reply({
+        "text": "",
+        "tool_calls": [{"name": "get_student_data", "arguments": {"student_id": "S001"}}],
+    })
+    assert step["actions"] == [{"action": "get_student_data", "arguments": {"student_id": "S001"}}]
+    assert "final_response" not in step
+
+    assert Agent()._parse_tool_reply({"text": "All done", "tool_calls": []})["final_response"] == "All done"
+
+
+def test_prompt_prefix_compiled_once_per_tool_set():
+    from app.agent_core.prompts import prompt_cache
+
+    agent = Agent(tools=["get_student_data", "analyze_student_risk"], native_function_calling=False)
+    before = prompt_cache.stats()
+
+    first = agent._prepare_context("Analyze S001", [])
+    second = agent._prepare_context("Analyze S002", [{"user": "hi", "agent": "hello"}])
+    after = prompt_cache.stats()
+
+    prefix = first[:first.index("=== Conversation History ===")]
+    assert second.startswith(prefix)
+    assert "- get_student_data:" in prefix
+    assert after["lookups"] - before["lookups"] == 2
+    assert after["compiled_prefixes"] - before["compiled_prefixes"] <= 1
+    assert after["renders"] - before["renders"] == 2
+
+
+def test_pure_tool_results_are_memoized_per_session(monkeypatch):
+    from app.agent_core import tools
+    from app.agent_core.progress_store import ProgressStore
+
+    monkeypatch.setattr(tools, "progress_store", ProgressStore(":memory:"))
+    plan_call = {"thought": "Plan", "action": "generate_intervention_plan", "arguments": {"risk_level": "HIGH"}}
+    agent = ScriptedAgent([
+        plan_call,
+        plan_call,
+        {"thought": "Track", "action": "track_student_progress",
+         "arguments": {"student_id": "S-MEMO", "risk_level": "HIGH", "risk_score": 0.8}},
+        plan_call,
+        {"thought": "Done", "final_response": "Summary"},
+    ])
+
+    events = run_agent(agent)
+    observations = [e for e in events if e["type"] == "observation"]
+
+    assert [o["cached"] for o in observations] == [False, True, False, False]
+    assert observations[0]["content"] == observations[1]["content"]
+
+
+def test_cache_key_normalizes_default_arguments():
+    agent = Agent()
+    assert agent._cache_key("get_student_data", {"student_id": "S001"}) == \
+        agent._cache_key("get_student_data", {"student_id": "S001", "data_source": None})
+    assert agent._cache_key("track_student_progress", {"student_id": "S001"}) is None
+    assert agent._cache_key("get_student_data", {"unknown": 1}) is None
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from app.agent_core import agent as agent_module
+from app.agent_core import tools
+from app.agent_core.agent import Agent
+from app.agent_core.cassette import Cassette, CassetteMiss, prompt_key
+from app.agent_core.model_manager import ModelManager
+from app.agent_core.outbox import NotificationOutbox
+
+
+class FakeProvider:
+    """Provider dispatch that answers with a numbered reply after a delay."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+
+    async def content(self, config, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"reply {self.calls} to {prompt}"
+
+
+def manager_with(cassette, provider=None):
+    manager = ModelManager()
+    manager.cassette = cassette
+    manager._generate_content = (provider or FakeProvider()).content
+    return manager
+
+
+def offline(config, prompt, *args):
+    raise AssertionError("replay must not call the provider")
+
+
+def test_record_then_replay_without_provider(tmp_path):
+    path = str(tmp_path / "cassette.ndjson")
+    provider = FakeProvider()
+    recorder = manager_with(Cassette(path, "record"), provider)
+
+    async def record():
+        return [await recorder.generate_content(p, "gpt-4o") for p in ("a", "b", "a")]
+    recorded = asyncio.run(record())
+
+    with open(path, encoding="utf-8") as f:
+        header, *entries = [json.loads(line) for line in f]
+    assert header["version"] == 2
+    assert [e["response"] for e in entries] == recorded
+    assert all(e["latency_ms"] >= 15 for e in entries)
+
+    replayer = ModelManager()
+    replayer.cassette = Cassette(path, "replay", latency="none")
+    replayer._generate_content = offline
+
+    async def replay():
+        return [await replayer.generate_content(p, "gpt-4o") for p in ("a", "b", "a", "a")]
+    # Repeated prompts come back in recording order, wrapping around
+    assert asyncio.run(replay()) == recorded + [recorded[0]]
+    assert replayer.cassette.stats == {"recorded": 0, "replayed": 4, "misses": 0}
+
+
+def test_replay_latency_original_and_none(tmp_path):
+    path = str(tmp_path / "cassette.ndjson")
+    asyncio.run(manager_with(Cassette(path, "record"), FakeProvider(delay=0.05)).generate_content("slow"))
+
+    for latency, low, high in (("original", 0.045, 1.0), ("none", 0.0, 0.03)):
+        manager = manager_with(Cassette(path, "replay", latency=latency))
+        manager._generate_content = offline
+        start = time.perf_counter()
+        asyncio.run(manager.generate_content("slow"))
+        assert low <= time.perf_counter() - start <= high
+
+
+def test_unrecorded_prompt_misses(tmp_path):
+    path = str(tmp_path / "cassette.ndjson")
+    asyncio.run(manager_with(Cassette(path, "record")).generate_content("known", "gpt-4o"))
+    manager = manager_with(Cassette(path, "replay"))
+
+    with pytest.raises(CassetteMiss):
+        asyncio.run(manager.generate_content("unknown", "gpt-4o"))
+    # The model is part of the key
+    with pytest.raises(CassetteMiss):
+        asyncio.run(manager.generate_content("known", "gpt-4o-mini"))
+    assert manager.cassette.stats["misses"] == 2
+
+
+def test_prompt_key_ignores_timestamps():
+    first = prompt_key("agent", "m", 'Tool Result: {"timestamp": "2025-01-02T10:11:12.123456"}')
+    second = prompt_key("agent", "m", 'Tool Result: {"timestamp": "2026-03-04T05:06:07.000001"}')
+    assert first == second
+    assert first != prompt_key("agent", "m", 'Tool Result: {"risk": "HIGH"}')
+
+
+@pytest.mark.parametrize("mode,latency", [("play", "original"), ("replay", "slow"), ("record", "original")])
+def test_invalid_configuration(mode, latency):
+    with pytest.raises(ValueError):
+        Cassette(None, mode, latency)
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_agent_run_replays_deterministically(monkeypatch, tmp_path, native):
+    path = str(tmp_path / "cassette.ndjson")
+    steps = [
+        {"text": "", "tool_calls": [{"name": "generate_intervention_plan", "arguments": {"risk_level": "HIGH"}}]},
+        {"text": '{"thought": "Done", "final_response": "Plan reviewed"}', "tool_calls": []},
+    ]
+
+    async def scripted_tools(config, prompt, tool_declarations):
+        return steps[prompt.count("Tool Result")]
+
+    async def scripted_text(self, context):
+        step = steps[context.count("Tool Result")]
+        if step["tool_calls"]:
+            call = step["tool_calls"][0]
+            return json.dumps({"thought": "Plan", "action": call["name"], "arguments": call["arguments"]})
+        return step["text"]
+
+    def run(cassette):
+        manager = ModelManager()
+        manager.cassette = cassette
+        manager._generate_with_tools = scripted_tools if cassette.mode == "record" else offline
+        monkeypatch.setattr(agent_module, "model_manager", manager)
+
+        async def collect():
+            agent = Agent(model_id="gpt-4o", native_function_calling=native)
+            return [event async for event in agent.run("Review the HIGH risk students")]
+        return asyncio.run(collect())
+
+    monkeypatch.setattr(Agent, "_call_gemini", scripted_text)
+    recorded = run(Cassette(path, "record"))
+    monkeypatch.setattr(Agent, "_call_gemini", offline)
+    replayed = run(Cassette(path, "replay", latency="none"))
+
+    strip = lambda events: [{k: v for k, v in e.items() if k != "timestamp"} for e in events]  # noqa: E731
+    assert [e["type"] for e in replayed] == [e["type"] for e in recorded]
+    assert strip(replayed)[-1] == strip(recorded)[-1] == {"type": "response", "content": "Plan reviewed"}
+
+
+def test_replay_matches_alert_emails_generated_at_another_time(monkeypatch, tmp_path):
+    path = str(tmp_path / "cassette.ndjson")
+    outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+    monkeypatch.setattr(tools, "notification_outbox", outbox)
+    alert = {
+        "student_data": {"student_id": "S001", "name": "Alice", "grade": 9, "gpa": 1.8, "attendance": 70.0},
+        "risk_analysis": {"risk_level": "HIGH", "risk_score": 0.85, "risk_factors": ["Low GPA"]},
+    }
+    steps = [
+        {"text": "", "tool_calls": [{"name": "generate_alert_email", "arguments": alert}]},
+        {"text": '{"thought": "Done", "final_response": "Alert sent"}', "tool_calls": []},
+    ]
+    prompts = []
+
+    async def scripted_tools(config, prompt, tool_declarations):
+        prompts.append(prompt)
+        return steps[prompt.count("Tool Result")]
+
+    def run_at(now, cassette):
+        class Clock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now
+        monkeypatch.setattr(tools, "datetime", Clock)
+        manager = ModelManager()
+        manager.cassette = cassette
+        manager._generate_with_tools = scripted_tools if cassette.mode == "record" else offline
+        monkeypatch.setattr(agent_module, "model_manager", manager)
+
+        async def collect():
+            agent = Agent(model_id="gpt-4o", native_function_calling=True)
+            return [event async for event in agent.run("Alert the parents of HIGH risk students")]
+        return asyncio.run(collect())
+
+    run_at(datetime(2025, 6, 30, 12, 0, 0), Cassette(path, "record"))
+    # Two days later: a new email id, assessment date and outbox record
+    replayed = run_at(datetime(2025, 7, 2, 8, 30, 15), Cassette(path, "replay", latency="none"))
+
+    assert "EMAIL-S001-20250630120000" in prompts[-1]
+    assert len(outbox) == 2
+    assert replayed[-1]["content"] == "Alert sent"
+    outbox.close()
+
+
+def test_workers_record_to_their_own_files(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette-{pid}.ndjson")
+    for pid, prompt in ((101, "a"), (202, "b")):
+        monkeypatch.setattr(os, "getpid", lambda pid=pid: pid)
+        asyncio.run(manager_with(Cassette(path, "record")).generate_content(prompt, "gpt-4o"))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cassette-101.ndjson", "cassette-202.ndjson"]
+    # A torn line from an interrupted recording is ignored
+    with open(tmp_path / "cassette-202.ndjson", "a", encoding="utf-8") as f:
+        f.write('{"key": "trunc')
+
+    manager = manager_with(Cassette(path, "replay", latency="none"))
+    manager._generate_content = offline
+
+    async def replay():
+        return [await manager.generate_content(p, "gpt-4o") for p in ("a", "b")]
+    assert asyncio.run(replay()) == ["reply 1 to a", "reply 1 to b"]
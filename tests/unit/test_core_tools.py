@@ -9,6 +9,8 @@ from agent_aura.tools import (
     get_student_progress_timeline,
     export_progress_visualization_data,
     RiskThresholds,
+    get_catalog_entry,
+    CATALOG_VERSION,
 )
 
 DATA_PATH = "./data/student_data.csv"
@@ -67,6 +69,25 @@ def test_generate_intervention_plan(level, expected_type):
     assert isinstance(plan["actions"], list) and len(plan["actions"]) >= 4
 
 
+def test_catalog_entries_are_shared_and_read_only():
+    first = generate_intervention_plan("HIGH")
+    second = generate_intervention_plan("HIGH")
+    # Per-call metadata lives in a fresh top-level dict; catalog content is shared
+    first["notes"] = "local"
+    assert "notes" not in second
+    assert first["actions"] is second["actions"]
+    with pytest.raises(TypeError):
+        first["actions"].append("Extra action")
+
+    reference = predict_intervention_success("UNKNOWN", by_reference=True)
+    assert reference["catalog_id"] == "success_prediction:LOW"
+    assert reference["catalog_version"] == CATALOG_VERSION
+    assert "base_success_rate" not in reference
+    entry = get_catalog_entry(reference["catalog_id"], reference["catalog_version"])
+    assert entry["base_success_rate"] == predict_intervention_success("LOW")["base_success_rate"]
+    assert get_catalog_entry(reference["catalog_id"], "0")["status"] == "error"
+
+
 def test_generate_alert_email_structure():
     # Choose a high-risk student to ensure email generation includes concerns
     email = generate_alert_email("S011")
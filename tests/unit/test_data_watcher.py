@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.progress_store import ProgressStore
+from app.agent_core.watcher import DataFileWatcher
+
+
+def write_students(path, at_risk):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "name", "grade_level", "gpa", "attendance_rate", "overall_performance"])
+        for i in range(10):
+            row = (1.8, 0.75, "Below Average") if i in at_risk else (3.6, 0.97, "Above Average")
+            writer.writerow([f"S{i:03d}", f"Student {i}", 9, *row])
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    yield store
+    store.close()
+
+
+def test_watcher_records_only_changed_students(store, tmp_path):
+    data_file = str(tmp_path / "students.csv")
+    write_students(data_file, at_risk={1})
+    watcher = DataFileWatcher(data_file, str(tmp_path / "snapshot.json"), interval=1)
+    assert watcher.check()["status"] == "baseline"
+
+    write_students(data_file, at_risk={2})
+    summary = watcher.check(force=True)
+
+    assert summary["counts"]["changed"] == 2 and summary["counts"]["unchanged"] == 8
+    transitions = watcher.recent_events(event_type="risk_transition")
+    assert sorted((e["student_id"], e["direction"]) for e in transitions) == [("S001", "improved"), ("S002", "escalated")]
+    assert store.get_stats("S002")["count"] == 1 and store.get_stats("S003") is None
+    assert watcher.snapshot()["risk_transitions"] == 2
+
+
+def test_only_one_worker_watches(store, tmp_path):
+    data_file = str(tmp_path / "students.csv")
+    snapshot_file = str(tmp_path / "snapshot.json")
+    write_students(data_file, at_risk={1})
+    leader = DataFileWatcher(data_file, snapshot_file, interval=1)
+    follower = DataFileWatcher(data_file, snapshot_file, interval=1)
+
+    assert leader.check()["status"] == "baseline"
+    assert follower.check()["status"] == "standby"
+
+    write_students(data_file, at_risk={2})
+    assert leader.check(force=True)["status"] == "updated"
+    assert follower.check(force=True)["status"] == "standby"
+    # Each change is recorded once, by the leader
+    assert store.get_stats("S002")["count"] == 1
+
+    # The follower takes over from the leader's snapshot once it stops
+    leader.stop()
+    assert follower.check()["status"] == "unchanged"
+    assert follower.snapshot()["watching"]
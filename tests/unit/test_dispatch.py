@@ -0,0 +1,161 @@
+import asyncio
+import smtplib
+import socket
+
+import pytest
+
+from app.agent_core.dispatch import NotificationDispatcher, SMTPConnectionPool, SMTPSettings
+from app.agent_core.outbox import NotificationOutbox, NotificationStatus
+
+
+class FakeSMTP:
+    """Records sent messages; scripted errors are raised on the next sends."""
+    instances = []
+    errors = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def send_message(self, message):
+        if FakeSMTP.errors:
+            raise FakeSMTP.errors.pop(0)
+        self.sent.append(message)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    FakeSMTP.instances = []
+    FakeSMTP.errors = []
+    outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+    yield outbox
+    outbox.close()
+
+
+def dispatcher_for(outbox, settings=None, factory=FakeSMTP, **kwargs):
+    settings = settings or SMTPSettings(recipients=["counselor@example.com"])
+    kwargs.setdefault("batch_size", 10)
+    kwargs.setdefault("concurrency", 2)
+    pool = SMTPConnectionPool(settings, size=kwargs["concurrency"], factory=factory)
+    return NotificationDispatcher(outbox, settings=settings, pool=pool, backoff=0, **kwargs)
+
+
+def add_emails(outbox, count):
+    for i in range(count):
+        outbox.add({
+            "email_id": f"EMAIL-S{i:03d}",
+            "student_id": f"S{i:03d}",
+            "priority": "HIGH",
+            "risk_level": "HIGH",
+            "subject": f"Alert {i}",
+            "body": "Body",
+            "timestamp": f"2025-01-01T09:{i % 60:02d}:00"
+        })
+
+
+def test_batches_reuse_pooled_connections(outbox):
+    add_emails(outbox, 25)
+    dispatcher = dispatcher_for(outbox)
+
+    totals = asyncio.run(dispatcher.drain())
+
+    assert totals == {"claimed": 25, "sent": 25, "failed": 0}
+    assert dispatcher.batches == 3
+    assert len(FakeSMTP.instances) <= 2
+    assert sum(len(conn.sent) for conn in FakeSMTP.instances) == 25
+    assert outbox.status_counts() == {NotificationStatus.SENT: 25}
+    record = outbox.get(1)
+    assert record["attempts"] == 1 and record["last_error"] is None
+
+
+def test_retries_after_disconnect_and_fails_permanent_errors(outbox):
+    add_emails(outbox, 2)
+    FakeSMTP.errors = [
+        smtplib.SMTPServerDisconnected("gone"),
+        smtplib.SMTPDataError(550, b"mailbox unavailable")
+    ]
+    dispatcher = dispatcher_for(outbox, concurrency=1)
+
+    result = asyncio.run(dispatcher.dispatch_once())
+
+    assert result["sent"] == 1 and result["failed"] == 1
+    assert dispatcher.retries == 1
+    assert dispatcher.pool.discarded == 1
+    failed = outbox.query(status=NotificationStatus.FAILED)
+    assert len(failed) == 1 and "SMTPDataError" in failed[0]["last_error"]
+    # The stored attempt counts are the real ones, retry included
+    assert failed[0]["attempts"] == 2
+    assert outbox.query(status=NotificationStatus.SENT)[0]["attempts"] == 1
+
+
+def test_items_without_recipients_fail(outbox):
+    add_emails(outbox, 1)
+    dispatcher = dispatcher_for(outbox, settings=SMTPSettings())
+
+    asyncio.run(dispatcher.dispatch_once())
+
+    assert outbox.get(1)["last_error"] == "No recipients"
+
+
+def test_does_not_start_without_recipients(outbox):
+    add_emails(outbox, 1)
+
+    async def start(dispatcher):
+        started = dispatcher.start()
+        await asyncio.sleep(0.05)
+        dispatcher.stop()
+        return started
+
+    assert asyncio.run(start(dispatcher_for(outbox, settings=SMTPSettings()))) is False
+    # The item waits for a configured dispatcher instead of failing
+    assert outbox.status_counts() == {NotificationStatus.PENDING: 1}
+    assert asyncio.run(start(dispatcher_for(outbox, interval=60))) is True
+    assert outbox.status_counts() == {NotificationStatus.SENT: 1}
+
+
+def test_requeue_stale_claims(outbox):
+    add_emails(outbox, 3)
+    claimed = outbox.claim(2)
+
+    assert [r["outbox_id"] for r in claimed] == [1, 2]
+    assert outbox.claim(5)[0]["outbox_id"] == 3
+    assert outbox.requeue_stale(older_than_seconds=3600) == 0
+    assert outbox.requeue_stale(older_than_seconds=0) == 3
+    assert outbox.status_counts() == {NotificationStatus.PENDING: 3}
+
+
+def test_delivers_to_local_smtp_server(outbox):
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+
+    received = []
+
+    class Handler(Sink):
+        async def handle_DATA(self, server, session, envelope):
+            received.append(envelope)
+            return "250 OK"
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    controller = controller_module.Controller(Handler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        add_emails(outbox, 20)
+        settings = SMTPSettings(host="127.0.0.1", port=port, recipients=["counselor@example.com"])
+        dispatcher = NotificationDispatcher(outbox, settings=settings, concurrency=4, batch_size=8, backoff=0)
+        totals = asyncio.run(dispatcher.drain())
+        dispatcher.stop()
+    finally:
+        controller.stop()
+
+    assert totals["sent"] == 20
+    assert len(received) == 20
+    assert dispatcher.pool.opened <= 4
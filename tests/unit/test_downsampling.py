@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.downsampling import downsample_indices, lttb_indices, minmax_indices
+from app.agent_core.progress_store import ProgressStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    yield store
+    store.close()
+
+
+def level_for(score):
+    return "HIGH" if score >= 0.8 else "MODERATE" if score >= 0.6 else "LOW"
+
+
+def add_series(store, student_id, scores):
+    start = datetime(2024, 1, 1, 9)
+    for i, score in enumerate(scores):
+        ts = start + timedelta(hours=6 * i)
+        store.append(student_id, {
+            "date": ts.date().isoformat(),
+            "timestamp": ts.isoformat(),
+            "risk_level": level_for(score),
+            "risk_score": float(score),
+            "notes": "",
+        })
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 1.0
+
+    kept = lttb_indices(x, y, 50)
+
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 437 in kept
+    assert (np.diff(kept) > 0).all()
+
+
+def test_minmax_keeps_bucket_extremes():
+    y = np.sin(np.linspace(0, 20, 500))
+    kept = minmax_indices(y, 40)
+
+    assert len(kept) <= 42
+    assert y[kept].min() == y.min() and y[kept].max() == y.max()
+
+
+def test_level_transitions_survive_downsampling():
+    rng = np.random.default_rng(1)
+    y = np.clip(np.cumsum(rng.normal(0, 0.02, 5000)) + 0.6, 0, 1)
+    levels = np.digitize(y, [0.6, 0.8])
+
+    kept = downsample_indices(np.arange(5000), y, levels, 300)
+    change = np.flatnonzero(levels[1:] != levels[:-1])
+
+    assert len(kept) <= max(300, 2 * len(change))
+    assert set(change) <= set(kept) and set(change + 1) <= set(kept)
+    # Every level change of the downsampled series is a real, adjacent one
+    kept_levels = levels[kept]
+    for i in np.flatnonzero(kept_levels[1:] != kept_levels[:-1]):
+        assert kept[i + 1] == kept[i] + 1
+
+
+def test_export_with_max_points(store):
+    scores = np.clip(0.5 + 0.4 * np.sin(np.linspace(0, 6, 2000)), 0, 1).round(3)
+    add_series(store, "S001", scores)
+
+    full = tools.export_progress_visualization_data("S001")
+    small = tools.export_progress_visualization_data("S001", max_points=100)
+
+    assert full["summary"]["points_returned"] == 2000 and not full["summary"]["downsampled"]
+    assert small["summary"]["total_entries"] == 2000
+    assert small["summary"]["points_returned"] <= 100 and small["summary"]["downsampled"]
+    assert small["summary"]["current_status"] == full["summary"]["current_status"]
+    assert len(small["chart_data"]["labels"]) == len(small["chart_data"]["colors"]) == small["summary"]["points_returned"]
+
+    # Level runs (and so chart colors) are identical after downsampling
+    def runs(levels):
+        return [level for i, level in enumerate(levels) if i == 0 or levels[i - 1] != level]
+    assert runs(small["chart_data"]["risk_levels"]) == runs(full["chart_data"]["risk_levels"])
+
+
+def test_batch_export(store):
+    add_series(store, "S001", np.linspace(0.2, 0.9, 500))
+    add_series(store, "S002", [0.5, 0.7])
+
+    result = tools.export_progress_visualization_batch(["S001", "S002", "S999"], max_points=50)
+
+    assert result["missing"] == ["S999"]
+    assert result["students"]["S001"]["points_returned"] <= 50
+    assert result["students"]["S002"]["chart_data"]["datasets"][0]["data"] == [0.5, 0.7]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.forecasting import ForecastMethod, fit_trends, forecast_cohort
+from app.agent_core.progress_store import ProgressStore
+
+
+def add_series(store, student_id, scores):
+    for day, score in enumerate(scores, start=1):
+        store.append(student_id, {
+            "date": f"2025-01-{day:02d}",
+            "timestamp": f"2025-01-{day:02d}T09:00:00",
+            "risk_level": "HIGH" if score >= 0.8 else "MODERATE" if score >= 0.6 else "LOW",
+            "risk_score": score,
+            "notes": "",
+        })
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    yield store
+    store.close()
+
+
+def test_fit_matches_numpy_polyfit_per_student():
+    rng = np.random.default_rng(0)
+    group = np.repeat(np.arange(3), [5, 8, 4])
+    days = np.concatenate([np.arange(-4, 1), np.arange(-7, 1), np.arange(-3, 1)]).astype(float)
+    scores = rng.uniform(0, 1, len(days))
+
+    slope, projected, _, confidence, _ = fit_trends(group, days, scores, 3, horizon_days=10)
+
+    for g in range(3):
+        expected_slope, expected_intercept = np.polyfit(days[group == g], scores[group == g], 1)
+        assert slope[g] == pytest.approx(expected_slope)
+        assert projected[g] == pytest.approx(expected_intercept + expected_slope * 10)
+    assert ((confidence >= 0) & (confidence <= 1)).all()
+
+
+def test_cohort_ranks_worsening_students(store):
+    add_series(store, "S001", [0.30, 0.35, 0.41, 0.44, 0.50])   # steadily worse
+    add_series(store, "S002", [0.50, 0.80, 0.40, 0.90, 0.45])   # noisy, no real trend
+    add_series(store, "S003", [0.90, 0.80, 0.72, 0.60, 0.52])   # improving
+    add_series(store, "S004", [0.20, 0.40, 0.60, 0.80, 0.95])   # rapidly worse
+
+    forecast = forecast_cohort(horizon_days=7, store=store)
+    ranked = [entry["student_id"] for entry in forecast.worsening()]
+
+    assert ranked == ["S004", "S001"]
+    assert forecast.get("S003")["trend"] == "Decreasing Risk"
+    assert forecast.get("S001")["confidence_score"] > forecast.get("S002")["confidence_score"]
+    assert forecast.get("S004")["projected_risk_score"] == 1.0
+
+
+def test_window_and_ewma_favour_recent_points(store):
+    add_series(store, "S001", [0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.3, 0.4, 0.5, 0.6])
+
+    recent = forecast_cohort(["S001"], window=4, horizon_days=1, store=store).get("S001")
+    ewma = forecast_cohort(["S001"], method=ForecastMethod.EWMA, alpha=0.6, horizon_days=1, store=store).get("S001")
+    everything = forecast_cohort(["S001"], window=None, horizon_days=1, store=store).get("S001")
+
+    assert recent["data_points"] == 4
+    assert recent["slope_per_week"] == pytest.approx(0.7)
+    assert recent["projected_risk_score"] > ewma["projected_risk_score"] > everything["projected_risk_score"]
+
+
+def test_predict_risk_trends_uses_the_forecast(store):
+    add_series(store, "S001", [0.40, 0.48, 0.55, 0.61, 0.70])
+
+    result = tools.predict_risk_trends("S001")
+
+    assert result["predicted_trend"] == "Increasing Risk"
+    assert 0.9 < result["confidence_score"] <= 1.0
+    assert result["next_month_projection"]["risk_level"] == "HIGH"
+    assert tools.predict_cohort_risk_trends(limit=5)["worsening_students"][0]["student_id"] == "S001"
@@ -0,0 +1,129 @@
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.outbox import NotificationOutbox, NotificationStatus
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    outbox = NotificationOutbox(str(tmp_path / "outbox.db"), ring_size=3)
+    monkeypatch.setattr(tools, "notification_outbox", outbox)
+    yield outbox
+    outbox.close()
+
+
+def email(student_id, level, timestamp, priority="HIGH"):
+    return {
+        "email_id": f"EMAIL-{student_id}-{timestamp}",
+        "student_id": student_id,
+        "priority": priority,
+        "risk_level": level,
+        "timestamp": timestamp,
+    }
+
+
+def test_dedupe_window(outbox):
+    first, created = outbox.add(email("S001", "HIGH", "2025-01-01T09:00:00"), dedupe_key="S001:HIGH")
+    again, created_again = outbox.add(email("S001", "HIGH", "2025-01-01T15:00:00"), dedupe_key="S001:HIGH")
+    later, created_later = outbox.add(email("S001", "HIGH", "2025-01-02T10:00:00"), dedupe_key="S001:HIGH")
+
+    assert created and not created_again and created_later
+    assert again["outbox_id"] == first["outbox_id"]
+    assert len(outbox) == 2
+
+
+def test_indexed_queries_and_bounded_ring(outbox):
+    outbox.add(email("S001", "CRITICAL", "2025-01-01T09:00:00", "URGENT"), grade=9)
+    outbox.add(email("S002", "CRITICAL", "2025-01-01T10:00:00", "URGENT"), grade=10)
+    outbox.add(email("S003", "HIGH", "2025-01-01T11:00:00"), grade=9)
+    sent, _ = outbox.add(email("S004", "CRITICAL", "2025-01-01T12:00:00", "URGENT"), grade=9)
+    outbox.mark([sent["outbox_id"]], NotificationStatus.SENT, attempt=True)
+
+    pending = outbox.query(grade=9, status=NotificationStatus.PENDING, risk_level="CRITICAL")
+    assert [n["student_id"] for n in pending] == ["S001"]
+    assert outbox.query(student_id="S004")[0]["attempts"] == 1
+    assert outbox.status_counts() == {"pending": 3, "sent": 1}
+
+    recent = outbox.recent()
+    assert [n["student_id"] for n in recent] == ["S004", "S003", "S002"]
+    assert recent[0]["delivery_status"] == NotificationStatus.SENT
+
+
+def test_ring_is_warmed_after_restart(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    outbox = NotificationOutbox(path)
+    for hour in range(5):
+        outbox.add(email(f"S00{hour}", "HIGH", f"2025-01-01T0{hour}:00:00"))
+    outbox.close()
+
+    reopened = NotificationOutbox(path, ring_size=2)
+    assert [n["student_id"] for n in reopened.recent()] == ["S004", "S003"]
+    reopened.close()
+
+
+def test_alert_email_goes_through_the_outbox(outbox):
+    student = {"student_id": "S001", "name": "Alice", "grade": 9, "gpa": 1.8, "attendance": 70.0}
+    risk = {"risk_level": "CRITICAL", "risk_score": 0.95, "risk_factors": []}
+
+    first = tools.generate_alert_email(student, risk)
+    repeat = tools.generate_alert_email(student, risk)
+
+    assert first["delivery_status"] == NotificationStatus.PENDING
+    assert repeat["deduplicated"] and repeat["outbox_id"] == first["outbox_id"]
+    assert tools.query_notifications(grade="9", risk_level="CRITICAL")["count"] == 1
+
+
+def test_alert_email_batch_matches_single_render(outbox):
+    students = [
+        {"student_id": f"S00{i}", "name": f"Student {i}", "grade": 10, "gpa": 2.2, "attendance": 85.0}
+        for i in range(3)
+    ]
+    risks = [{"risk_level": "HIGH", "risk_score": 0.82, "risk_factors": ["Low GPA: 2.20 (Below 2.5)"]}] * 3
+    # The last student appears twice; the second copy is a duplicate
+    emails = tools.generate_alert_emails_batch(students + students[-1:], risks + risks[-1:])
+    single = tools.generate_alert_email({**students[0], "student_id": "S100"}, risks[0])
+
+    assert [e["student_id"] for e in emails] == ["S000", "S001", "S002", "S002"]
+    assert emails[-1]["deduplicated"] and emails[-1]["outbox_id"] == emails[2]["outbox_id"]
+    assert len(outbox) == 4
+    assert emails[0]["subject"] == "📋 Action Required: Student 0 - Academic Support Recommended"
+    assert "1. Low GPA: 2.20 (Below 2.5)\n" in emails[0]["body"]
+    assert emails[0]["body"].replace("S000", "S100") == single["body"]
+
+
+def test_dedupe_holds_across_connections(tmp_path):
+    import threading
+
+    path = str(tmp_path / "shared.db")
+    workers = [NotificationOutbox(path) for _ in range(4)]
+    results = []
+    barrier = threading.Barrier(len(workers))
+
+    def add(worker, i):
+        barrier.wait()
+        results.append(worker.add(email("S001", "HIGH", f"2025-01-01T09:00:0{i}"), dedupe_key="S001:HIGH")[1])
+
+    threads = [threading.Thread(target=add, args=(worker, i)) for i, worker in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False, False, False, True]
+    assert len(workers[0]) == 1
+    for worker in workers:
+        worker.close()
+
+
+def test_claim_without_update_returning(outbox, monkeypatch):
+    from app.agent_core import outbox as outbox_module
+
+    monkeypatch.setattr(outbox_module, "SUPPORTS_RETURNING", False)
+    for i in range(3):
+        outbox.add(email(f"S00{i}", "HIGH", f"2025-01-01T09:00:0{i}"))
+
+    claimed = outbox.claim(2)
+    assert [r["outbox_id"] for r in claimed] == [1, 2]
+    assert all(r["delivery_status"] == NotificationStatus.SENDING for r in claimed)
+    assert outbox.requeue_stale(older_than_seconds=0) == 2
+    assert outbox.status_counts() == {NotificationStatus.PENDING: 3}
@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pytest
+
+from agent_aura import tools
+from agent_aura.pipeline import run_pipeline, sink_files
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "progress_database", {})
+    monkeypatch.setattr(tools, "notification_log", [])
+    path = tmp_path / "students.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "name", "grade_level", "gpa", "attendance_rate", "overall_performance"])
+        for i in range(10):
+            gpa, attendance, performance = (1.8, 0.75, "Below Average") if i % 3 == 0 else (3.6, 0.97, "Above Average")
+            writer.writerow([f"S{i:03d}", f"Student {i}", 9, gpa, attendance, performance])
+        writer.writerow(["S999", "Broken", "n/a", 3.0, 0.9, "Average"])
+    return str(path)
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_streams_ndjson(data_file, tmp_path, workers):
+    output = str(tmp_path / "results.ndjson")
+
+    summary = run_pipeline(data_file, output, workers=workers, chunk_size=4)
+
+    rows = read_ndjson(output)
+    assert [r["student_id"] for r in rows] == [f"S{i:03d}" for i in range(10)] + ["S999"]
+    assert summary["rows_processed"] == 11 and summary["errors"] == 1
+    assert summary["risk_distribution"] == {"CRITICAL": 4, "LOW": 6}
+    assert summary["alerts"] == 4 and len(read_ndjson(summary["emails_file"])) == 4
+    assert [p["student_id"] for p in read_ndjson(summary["progress_file"])] == [f"S{i:03d}" for i in range(10)]
+    # The in-memory tool globals are left alone
+    assert tools.notification_log == [] and tools.progress_database == {}
+    assert rows[0]["plan"] == "intervention_plan:CRITICAL" and rows[0]["alert"].startswith("EMAIL-S000")
+    assert rows[0]["trend"] == "→ NEW ENTRY"
+    assert rows[-1]["status"] == "error"
+    assert not (tmp_path / "results.ndjson.checkpoint").exists()
+
+
+def test_pipeline_resumes_after_interruption(data_file, tmp_path):
+    output = str(tmp_path / "results.ndjson")
+    chunks = []
+
+    def interrupt(summary):
+        chunks.append(summary["rows_processed"])
+        if len(chunks) == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_pipeline(data_file, output, workers=1, chunk_size=3, progress=interrupt)
+    assert len(read_ndjson(output)) == 6
+
+    summary = run_pipeline(data_file, output, workers=1, chunk_size=3)
+
+    assert summary["resumed_from_row"] == 6 and summary["rows_processed"] == 5
+    assert [r["student_id"] for r in read_ndjson(output)] == [f"S{i:03d}" for i in range(10)] + ["S999"]
+    # Students of the interrupted chunk are tracked once
+    sinks = sink_files(output)
+    assert [p["student_id"] for p in read_ndjson(sinks["progress"])] == [f"S{i:03d}" for i in range(10)]
+    assert [e["student_id"] for e in read_ndjson(sinks["emails"])] == ["S000", "S003", "S006", "S009"]
+
+    # Without resume the run starts over
+    assert run_pipeline(data_file, output, workers=1, chunk_size=3, resume=False)["rows_processed"] == 11
+    assert len(read_ndjson(output)) == 11
+
+
+def test_pipeline_trend_uses_loaded_history(data_file, tmp_path):
+    tools.progress_database["S001"] = {"history": [{"timestamp": "2025-01-01T09:00:00", "risk_score": 0.9}]}
+
+    run_pipeline(data_file, str(tmp_path / "results.ndjson"), workers=1, chunk_size=4)
+
+    rows = read_ndjson(str(tmp_path / "results.ndjson"))
+    assert rows[1]["trend"] == "↓ IMPROVING" and rows[2]["trend"] == "→ NEW ENTRY"
+    assert len(tools.progress_database["S001"]["history"]) == 1
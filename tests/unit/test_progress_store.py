@@ -0,0 +1,164 @@
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.progress_store import ProgressStore
+
+
+def make_entry(day, score, level="HIGH", notes=""):
+    return {
+        "date": f"2025-01-{day:02d}",
+        "timestamp": f"2025-01-{day:02d}T09:00:00",
+        "risk_level": level,
+        "risk_score": score,
+        "notes": notes,
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    yield store
+    store.close()
+
+
+def test_history_survives_restart(tmp_path):
+    path = str(tmp_path / "progress.db")
+    first = ProgressStore(path)
+    first.append("S001", make_entry(1, 0.9), "Alice")
+    first.append("S001", make_entry(2, 0.8))
+    first.close()
+
+    reopened = ProgressStore(path)
+    assert reopened.get_student("S001")["student_name"] == "Alice"
+    assert [e["risk_score"] for e in reopened.get_history("S001")] == [0.9, 0.8]
+    reopened.close()
+
+
+def test_workers_sharing_a_file_see_each_others_appends(tmp_path):
+    path = str(tmp_path / "progress.db")
+    worker_a, worker_b = ProgressStore(path), ProgressStore(path)
+
+    worker_a.append("S001", make_entry(1, 0.9))
+    assert len(worker_b.get_history("S001")) == 1
+
+    worker_a.append("S001", make_entry(2, 0.7))
+    assert [e["risk_score"] for e in worker_b.get_history("S001")] == [0.9, 0.7]
+    worker_a.close()
+    worker_b.close()
+
+
+def test_range_reads(store):
+    for day in range(1, 11):
+        store.append("S001", make_entry(day, day / 10))
+
+    assert len(store.get_history("S001", start="2025-01-04", end="2025-01-06")) == 3
+    assert [e["risk_score"] for e in store.get_history("S001", last=2)] == [0.9, 1.0]
+    assert store.get_history("S999") == []
+
+
+def test_progress_tools_use_the_store(store):
+    tools.track_student_progress("S001", "HIGH", 0.85, "Alice")
+    result = tools.track_student_progress("S001", "MODERATE", 0.65, notes="Tutoring")
+
+    assert result["total_entries"] == 2
+    assert result["trend"] == "↓ IMPROVING"
+
+    timeline = tools.get_student_progress_timeline("S001")
+    assert timeline["student_name"] == "Alice"
+    assert timeline["total_records"] == 2
+    assert timeline["statistics"]["risk_level_distribution"] == {"HIGH": 1, "MODERATE": 1}
+
+    export = tools.export_progress_visualization_data("S001")
+    assert export["chart_data"]["datasets"][0]["data"] == [0.85, 0.65]
+
+    assert tools.predict_risk_trends("S001")["predicted_trend"] == "Decreasing Risk"
+    assert tools.get_student_progress_timeline("S404")["status"] == "no_data"
+
+
+def test_compact_history_round_trips_entries():
+    from app.agent_core.progress_store import CompactHistory
+
+    history = CompactHistory()
+    history.append("2025-03-01T08:30:15.123456", 0.875, "HIGH", "Parent meeting")
+    history.append("2025-03-02T08:30:15", 0.6, "MODERATE")
+
+    assert history.to_dicts() == [
+        {"date": "2025-03-01", "timestamp": "2025-03-01T08:30:15.123456",
+         "risk_level": "HIGH", "risk_score": 0.875, "notes": "Parent meeting"},
+        {"date": "2025-03-02", "timestamp": "2025-03-02T08:30:15",
+         "risk_level": "MODERATE", "risk_score": 0.6, "notes": ""},
+    ]
+    assert history.timestamps.itemsize == 8 and history.scores.itemsize == 4 and history.levels.itemsize == 1
+    assert list(history.index_range(end="2025-03-01")) == [0]
+    assert list(history.index_range(start="2025-03-02")) == [1]
+
+
+def test_running_aggregates_match_history(tmp_path):
+    path = str(tmp_path / "progress.db")
+    worker_a, worker_b = ProgressStore(path), ProgressStore(path)
+    scores = [0.9, 0.4, 0.7, 0.6]
+    for day, score in enumerate(scores, start=1):
+        (worker_a if day % 2 else worker_b).append("S001", make_entry(day, score, "HIGH" if score > 0.65 else "MODERATE"))
+
+    stats = worker_a.get_stats("S001")
+    ewma = scores[0]
+    for score in scores[1:]:
+        ewma = 0.3 * score + 0.7 * ewma
+    assert stats["count"] == 4
+    assert (stats["first_score"], stats["last_score"]) == (0.9, 0.6)
+    assert (stats["min_score"], stats["max_score"]) == (0.4, 0.9)
+    assert stats["mean_score"] == pytest.approx(sum(scores) / 4)
+    assert stats["ewma_score"] == pytest.approx(ewma)
+    assert stats["level_counts"] == {"HIGH": 2, "MODERATE": 2}
+    assert stats["last_timestamp"] == "2025-01-04T09:00:00"
+    assert worker_a.get_stats("S999") is None
+    worker_a.close()
+    worker_b.close()
+
+
+def test_aggregates_are_backfilled_for_older_databases(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path)
+    store.append("S001", make_entry(1, 0.9))
+    store.append("S001", make_entry(2, 0.5, "MODERATE"))
+    store.close()
+    # Recreate the original table layout without the aggregate columns
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE old AS SELECT student_id, student_name, created_date, last_updated, entry_count FROM progress_students;"
+        "DROP TABLE progress_students; ALTER TABLE old RENAME TO progress_students;"
+    )
+    conn.close()
+
+    reopened = ProgressStore(path)
+    stats = reopened.get_stats("S001")
+    assert (stats["first_score"], stats["last_score"], stats["min_score"]) == (0.9, 0.5, 0.5)
+    assert stats["level_counts"] == {"HIGH": 1, "MODERATE": 1}
+    reopened.close()
+
+
+def test_append_many_matches_single_appends(tmp_path):
+    single = ProgressStore(str(tmp_path / "single.db"))
+    bulk = ProgressStore(str(tmp_path / "bulk.db"))
+    entries = []
+    for day in range(1, 21):
+        for student_id in ("S001", "S002"):
+            entry = make_entry(day, round(0.3 + (day * 7 % 11) / 20, 3), "HIGH" if day % 3 else "LOW")
+            single.append(student_id, entry, "Alice")
+            entries.append({**entry, "student_id": student_id, "student_name": "Alice"})
+    # S001 already has an entry, so its batches fold into existing aggregates
+    bulk.append("S001", entries[0], "Alice")
+
+    assert bulk.append_many(entries[1:], batch_size=7) == 39
+
+    for student_id in ("S001", "S002"):
+        expected, actual = single.get_stats(student_id), bulk.get_stats(student_id)
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value) if isinstance(value, float) else actual[key] == value
+        assert bulk.get_history(student_id) == single.get_history(student_id)
+    single.close()
+    bulk.close()
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.progress_store import ProgressStore
+from app.agent_core.retention import RetentionPolicy, RetentionWorker, apply_retention
+
+NOW = datetime(2025, 6, 30, 12, 0, 0)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    yield store
+    store.close()
+
+
+def add_days(store, student_id, days_ago, per_day=2):
+    # Oldest first, as entries are recorded
+    for ago in sorted(days_ago, reverse=True):
+        for i in reversed(range(per_day)):
+            ts = NOW - timedelta(days=ago, hours=i)
+            score = round(0.3 + (ago % 7) / 10 + i / 100, 2)
+            store.append(student_id, {
+                "date": ts.date().isoformat(),
+                "timestamp": ts.isoformat(),
+                "risk_level": "HIGH" if score >= 0.8 else "MODERATE" if score >= 0.6 else "LOW",
+                "risk_score": score,
+                "notes": "",
+            }, "Alice")
+
+
+def test_retention_rolls_up_old_history_without_changing_statistics(store):
+    add_days(store, "S001", range(0, 120, 3))
+    before = tools.get_student_progress_timeline("S001")
+
+    result = apply_retention(RetentionPolicy(raw_days=31, daily_days=60), store=store, now=NOW)
+    after = tools.get_student_progress_timeline("S001")
+
+    assert result["pending"] is False
+    assert result["entries_rolled_up"] == 58
+    assert after["statistics"] == before["statistics"]
+    assert after["total_records"] == 80
+    raw = [entry for entry in after["progress_history"] if "rollup" not in entry]
+    assert len(raw) == 22
+    assert all(entry["timestamp"] >= (NOW - timedelta(days=31)).isoformat() for entry in raw)
+    # Rolled-up periods lead the series, one point each
+    assert len(after["progress_history"]) == 22 + len(after["rollups"])
+    periods = {rollup["period"] for rollup in after["rollups"]}
+    assert periods == {"day", "week"}
+    assert sum(rollup["count"] for rollup in after["rollups"]) == 58
+    assert store.get_stats("S001")["count"] == 80
+
+
+def test_ranged_statistics_include_rollups(store):
+    add_days(store, "S001", range(40, 50))
+    start, end = (NOW - timedelta(days=48)).date().isoformat(), (NOW - timedelta(days=42)).date().isoformat()
+    before = tools.get_student_progress_timeline("S001", start, end)["statistics"]
+
+    apply_retention(RetentionPolicy(raw_days=30, daily_days=365), store=store, now=NOW)
+    after = tools.get_student_progress_timeline("S001", start, end)
+
+    assert [entry["rollup"] for entry in after["progress_history"]] == ["day"] * 7
+    assert len(after["rollups"]) == 7
+    # The last level of a day is its latest entry (hour 0 of each day)
+    assert after["rollups"][0]["last_risk_score"] == 0.9
+    for key in ("average_risk_score", "minimum_risk_score", "maximum_risk_score"):
+        assert after["statistics"][key] == pytest.approx(before[key])
+
+
+def test_retention_respects_time_budget(store):
+    add_days(store, "S001", range(40, 60), per_day=5)
+
+    policy = RetentionPolicy(raw_days=30, batch_size=10, time_budget=0)
+
+    # A zero budget still processes one batch per pass
+    first = apply_retention(policy, store=store, now=NOW)
+    assert first == {"entries_rolled_up": 10, "daily_rollups_merged": 0, "pending": True}
+
+    passes = 1
+    while apply_retention(policy, store=store, now=NOW)["pending"]:
+        passes += 1
+    assert passes == 10
+    assert len(store.get_history("S001")) == 0
+    assert sum(r["count"] for r in store.get_rollups("S001")) == 100
+
+
+def test_reads_after_retention_use_rollups(store):
+    add_days(store, "S001", range(390, 410))
+    apply_retention(RetentionPolicy(), store=store, now=NOW)
+    assert store.get_history("S001") == []
+
+    trends = tools.predict_risk_trends("S001")
+    assert trends["status"] == "success"
+
+    points, total = tools._visualization_points("S001")
+    assert total == len(points) == len(store.get_rollups("S001"))
+    downsampled, _ = tools._visualization_points("S001", max_points=total - 1, method="minmax")
+    assert 0 < len(downsampled) < total
+    assert all("rollup" in point for point in downsampled)
+
+
+def test_trends_without_enough_points_report_insufficient_data(store):
+    add_days(store, "S001", [400], per_day=1)
+    apply_retention(RetentionPolicy(), store=store, now=NOW)
+
+    assert tools.predict_risk_trends("S001")["status"] == "insufficient_data"
+
+
+def test_snapshot_compaction_keeps_rolled_up_entries(store, tmp_path, monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_COMPACT_EVERY", "2")
+    monkeypatch.setattr(tools, "_snapshot_logs", {})
+    path = str(tmp_path / "progress_database.json")
+
+    add_days(store, "S001", range(400, 410))
+    tools.save_progress_database_to_file(path)
+    apply_retention(RetentionPolicy(), store=store, now=NOW)
+    add_days(store, "S001", [0], per_day=1)
+    tools.save_progress_database_to_file(path)
+    add_days(store, "S002", [0], per_day=1)
+    tools.save_progress_database_to_file(path)
+
+    monkeypatch.setattr(tools, "_snapshot_logs", {})
+    restored = tools.load_progress_database_from_file(path)
+    assert len(restored["S001"]["history"]) == 21
+    assert len(restored["S002"]["history"]) == 1
+
+
+def test_rollups_invalidate_other_workers_hot_histories(store, tmp_path):
+    other = ProgressStore(str(tmp_path / "progress.db"))
+    add_days(store, "S001", range(0, 120, 3))
+    assert len(other.get_compact("S001")) == 80
+
+    apply_retention(RetentionPolicy(raw_days=31, daily_days=60), store=store, now=NOW)
+
+    # The other worker drops the rolled-up raw points from its hot tier
+    assert len(other.get_compact("S001")) == 22
+    assert len(other.get_history("S001")) == 22
+    assert sum(rollup["count"] for rollup in other.get_rollups("S001")) == 58
+    other.close()
+
+
+def test_latest_levels_include_fully_rolled_up_students(store):
+    add_days(store, "S001", range(400, 410))
+    add_days(store, "S002", [0], per_day=1)
+    expected = store.latest_levels()
+
+    apply_retention(RetentionPolicy(), store=store, now=NOW)
+
+    assert store.get_history("S001") == []
+    assert store.latest_levels() == expected
+
+
+def test_concurrent_passes_roll_up_each_entry_once(store, tmp_path):
+    for i in range(5):
+        add_days(store, f"S{i:03d}", range(200, 260))
+    stores = [ProgressStore(str(tmp_path / "progress.db")) for _ in range(4)]
+    policy = RetentionPolicy(batch_size=7)
+
+    threads = [
+        threading.Thread(target=apply_retention, args=(policy, other, NOW))
+        for other in stores
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i in range(5):
+        rollups = store.get_rollups(f"S{i:03d}")
+        assert sum(rollup["count"] for rollup in rollups) == 120
+    for other in stores:
+        other.close()
+
+
+def test_only_one_worker_applies_retention(store, tmp_path):
+    add_days(store, "S001", range(400, 410))
+    leader = RetentionWorker(RetentionPolicy(), interval=1, store=store)
+    follower = RetentionWorker(RetentionPolicy(), interval=1, store=store)
+
+    async def run():
+        first = await leader.run_once()
+        second = await follower.run_once()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["pending"] is False
+    assert second == {"status": "standby"}
+    assert leader.snapshot()["leader"] and not follower.snapshot()["leader"]
+
+    # The follower takes over once the leader stops
+    leader.stop()
+    assert asyncio.run(follower.run_once())["pending"] is False
+    follower.stop()
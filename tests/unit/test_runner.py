@@ -0,0 +1,93 @@
+import asyncio
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai import types
+
+from agent_aura.runner import CohortRunner
+
+
+class ScriptedAgent(BaseAgent):
+    """Answers like the orchestrator without calling a model; tracks concurrent sessions."""
+    active: int = 0
+    peak: int = 0
+
+    async def _run_async_impl(self, ctx):
+        ScriptedAgent.active += 1
+        ScriptedAgent.peak = max(ScriptedAgent.peak, ScriptedAgent.active)
+        try:
+            text = ctx.user_content.parts[0].text
+            student_id = text.split()[2].rstrip(":")
+            if student_id == "S404":
+                raise RuntimeError("student not found")
+            level = "HIGH" if student_id.endswith(("1", "3")) else "LOW"
+            responses = [types.Part(function_response=types.FunctionResponse(
+                name="analyze_student_risk", response={"lvl": level, "score": 0.8}
+            ))]
+            if level == "HIGH":
+                responses.append(types.Part(function_response=types.FunctionResponse(
+                    name="generate_alert_email", response={"email_id": f"EMAIL-{student_id}"}
+                )))
+            yield Event(author=self.name, invocation_id=ctx.invocation_id, content=types.Content(role="user", parts=responses))
+            await asyncio.sleep(0.02)
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                content=types.Content(role="model", parts=[types.Part(text=f"{student_id} done")])
+            )
+        finally:
+            ScriptedAgent.active -= 1
+
+
+def test_cohort_runs_concurrently_with_a_cap():
+    ScriptedAgent.active = ScriptedAgent.peak = 0
+    runner = CohortRunner(agent=ScriptedAgent(name="scripted"), max_concurrency=3)
+    student_ids = [f"S00{i}" for i in range(1, 9)] + ["S404"]
+
+    cohort = asyncio.run(runner.run_cohort(student_ids))
+    summary = cohort.to_dict()
+
+    assert [r.student_id for r in cohort.results] == student_ids
+    assert 1 < ScriptedAgent.peak <= 3
+    assert summary["succeeded"] == 8 and summary["failed"] == 1
+    assert cohort.results[-1].error == "RuntimeError: student not found"
+    assert summary["risk_distribution"] == {"HIGH": 2, "LOW": 6}
+    assert summary["notifications"] == 2
+    assert cohort.results[0].response == "S001 done"
+    # Sessions are dropped once each student is done
+    sessions = asyncio.run(runner.session_service.list_sessions(app_name="agent_aura", user_id="agent_aura"))
+    assert sessions.sessions == []
+
+
+def test_failures_are_reported_per_student():
+    runner = CohortRunner(agent=ScriptedAgent(name="scripted"), max_concurrency=2)
+    service = runner.session_service
+    create_session, deleted = service.create_session, []
+
+    async def flaky_create(**kwargs):
+        if kwargs["session_id"].startswith("S002"):
+            raise ConnectionError("session store unavailable")
+        return await create_session(**kwargs)
+
+    async def failing_delete(**kwargs):
+        deleted.append(kwargs["session_id"])
+        raise ConnectionError("session store unavailable")
+
+    service.create_session = flaky_create
+    service.delete_session = failing_delete
+    original_run_student = runner.run_student
+
+    async def crashing_run_student(student_id):
+        if student_id == "S003":
+            raise RuntimeError("worker crashed")
+        return await original_run_student(student_id)
+
+    runner.run_student = crashing_run_student
+    cohort = asyncio.run(runner.run_cohort(["S001", "S002", "S003"]))
+
+    assert [r.status for r in cohort.results] == ["success", "error", "error"]
+    assert cohort.results[0].error == "Session cleanup failed: ConnectionError: session store unavailable"
+    assert cohort.results[1].error == "ConnectionError: session store unavailable"
+    assert cohort.results[2].error == "RuntimeError: worker crashed"
+    # Only the session that was created is deleted
+    assert [session_id.split("-")[0] for session_id in deleted] == ["S001"]
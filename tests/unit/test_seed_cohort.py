@@ -0,0 +1,24 @@
+from sqlalchemy import create_engine, func, select
+
+from agent_aura.synthetic import CohortSpec, write_cohort
+from app.agent_core.progress_store import ProgressStore
+from app.models.database import RiskAssessment, Student, User
+from app.seed_cohort import bulk_load_history, bulk_load_students
+
+
+def test_bulk_load_cohort(tmp_path):
+    spec = CohortSpec(size=250, history_years=0.5, history_interval_days=14, as_of="2025-06-30")
+    write_cohort(spec, str(tmp_path / "cohort.csv"), history_output=str(tmp_path / "history.csv"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    assert bulk_load_students(str(tmp_path / "cohort.csv"), engine=engine, batch_size=100) == {"loaded": 250, "skipped": 0}
+    assert bulk_load_students(str(tmp_path / "cohort.csv"), engine=engine) == {"loaded": 0, "skipped": 250}
+    with engine.connect() as conn:
+        for model in (User, Student, RiskAssessment):
+            assert conn.execute(select(func.count()).select_from(model.__table__)).scalar() == 250
+
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    assert bulk_load_history(str(tmp_path / "history.csv"), store=store, batch_size=1000) == {"entries": 250 * 13}
+    stats = store.get_stats("S001")
+    assert stats["count"] == 13 and stats["last_timestamp"] == "2025-06-30T00:00:00"
+    store.close()
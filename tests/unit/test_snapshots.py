@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from app.agent_core import tools
+from app.agent_core.outbox import NotificationOutbox, NotificationStatus
+from app.agent_core.progress_store import ProgressStore
+from app.agent_core.snapshots import SnapshotLog
+
+
+def make_entry(day, score, level="HIGH"):
+    return {
+        "date": f"2025-01-{day:02d}",
+        "timestamp": f"2025-01-{day:02d}T09:00:00",
+        "risk_level": level,
+        "risk_score": score,
+        "notes": "",
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    monkeypatch.setattr(tools, "progress_store", store)
+    monkeypatch.setattr(tools, "_snapshot_logs", {})
+    yield store
+    store.close()
+
+
+def test_checkpoints_only_write_new_entries(store, tmp_path):
+    path = str(tmp_path / "out" / "progress_database.json")
+    store.append("S001", make_entry(1, 0.9), "Alice")
+    store.append("S002", make_entry(1, 0.5, "LOW"), "Bob")
+
+    first = tools.save_progress_database_to_file(path)
+    store.append("S001", make_entry(2, 0.7, "MODERATE"))
+    second = tools.save_progress_database_to_file(path)
+    unchanged = tools.save_progress_database_to_file(path)
+
+    assert first["records_written"] == 4   # two students + two entries
+    assert second["records_written"] == 2  # one student + one entry
+    assert unchanged["records_written"] == 0 and unchanged["segment"] is None
+
+    database = tools.load_progress_database_from_file(path)
+    assert database == {record["student_id"]: record for record in store.iter_records()}
+
+
+def test_compaction_folds_segments_into_base(store, tmp_path, monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_COMPACT_EVERY", "3")
+    path = str(tmp_path / "progress_database.json")
+    for day in range(1, 8):
+        store.append("S001", make_entry(day, day / 10), "Alice")
+        result = tools.save_progress_database_to_file(path)
+
+    snapshot = tools._get_snapshot_log(path)
+    assert result["compacted"] is False
+    assert snapshot.files() == ["base-000008.ndjson", "delta-000009.ndjson"]
+    assert sorted(os.listdir(snapshot.directory)) == ["base-000008.ndjson", "delta-000009.ndjson", "manifest.json"]
+    history = tools.load_progress_database_from_file(path)["S001"]["history"]
+    assert [entry["risk_score"] for entry in history] == [day / 10 for day in range(1, 8)]
+
+
+def test_notification_checkpoints_follow_the_outbox(tmp_path, monkeypatch):
+    path = str(tmp_path / "notifications.json")
+    outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+    monkeypatch.setattr(tools, "_snapshot_logs", {})
+    monkeypatch.setattr(tools, "notification_outbox", outbox)
+
+    def add(email_id):
+        outbox.add({"email_id": email_id, "student_id": "S001", "priority": "HIGH", "risk_level": "HIGH"})
+
+    add("E1")
+    add("E2")
+    tools.save_notifications_to_file(path)
+    add("E3")
+    result = tools.save_notifications_to_file(path)
+
+    assert result["records_written"] == 1
+    assert [n["email_id"] for n in tools.load_notifications_from_file(path)] == ["E1", "E2", "E3"]
+
+    # Delivery state changes reach the next delta, and the latest state wins on load
+    first = outbox.claim(1)
+    outbox.mark([first[0]["outbox_id"]], NotificationStatus.SENT, attempt=True)
+    result = tools.save_notifications_to_file(path)
+
+    assert result["records_written"] == 1
+    loaded = tools.load_notifications_from_file(path)
+    assert [n["email_id"] for n in loaded] == ["E1", "E2", "E3"]
+    assert [n["delivery_status"] for n in loaded] == ["sent", "pending", "pending"]
+    assert loaded[0]["attempts"] == 1
+    assert tools.save_notifications_to_file(path)["records_written"] == 0
+    outbox.close()
+
+
+def test_failed_write_keeps_previous_snapshot(tmp_path):
+    snapshot = SnapshotLog(str(tmp_path / "snap"))
+    snapshot.checkpoint(lambda previous: 1, lambda previous, current: [{"n": 1}])
+
+    def broken(previous, current):
+        yield {"n": 2}
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        snapshot.checkpoint(lambda previous: 2, broken)
+
+    assert list(snapshot.replay()) == [{"n": 1}]
+    assert snapshot.read_manifest()["cursor"] == 1
+    assert not [name for name in os.listdir(snapshot.directory) if name.startswith(".tmp-")]
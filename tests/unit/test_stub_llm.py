@@ -0,0 +1,116 @@
+import asyncio
+import random
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from app.agent_core.agent import Agent  # noqa: E402
+from app.agent_core.model_manager import ModelManager  # noqa: E402
+from app.agent_core.stub_llm import LatencyModel, ScriptRule, StubConfig, StubLLM, create_app  # noqa: E402
+
+DECLARATIONS = [{
+    "name": "generate_intervention_plan",
+    "description": "Intervention plan for a risk level",
+    "parameters": {"type": "object", "properties": {"risk_level": {"type": "string"}}, "required": ["risk_level"]}
+}]
+
+SCRIPT = [
+    ScriptRule(match="Tool Result", text='{"thought": "Done", "final_response": "Plan reviewed"}'),
+    ScriptRule(
+        match=r"(?P<level>HIGH|LOW) risk",
+        tool_calls=[{"name": "generate_intervention_plan", "arguments": {"risk_level": "{level}"}}]
+    ),
+]
+
+
+def stub_manager(stub):
+    """ModelManager whose stub provider client talks to the app in process."""
+    manager = ModelManager()
+    transport = httpx.ASGITransport(app=create_app(stub))
+    manager.stub_clients = []
+
+    def client():
+        manager.stub_clients.append(httpx.AsyncClient(transport=transport, base_url="http://stub"))
+        return manager.stub_clients[-1]
+
+    manager._stub_client = client
+    return manager
+
+
+@pytest.mark.parametrize("spec,low,high", [
+    ("fixed:50", 0.05, 0.05),
+    ("uniform:10,20", 0.01, 0.02),
+    ("lognormal:100,0.5", 0.0, 10.0),
+    ("exponential:5", 0.0, 10.0),
+])
+def test_latency_samples(spec, low, high):
+    model = LatencyModel.parse(spec)
+    samples = [model.sample(random.Random(i)) for i in range(50)]
+    assert all(low <= s <= high for s in samples)
+
+
+@pytest.mark.parametrize("spec", ["gamma:1", "uniform:10", "fixed"])
+def test_latency_spec_rejected(spec):
+    with pytest.raises(ValueError):
+        LatencyModel.parse(spec)
+
+
+@pytest.mark.parametrize("model_id", ["stub-openai", "stub-gemini"])
+@pytest.mark.parametrize("stream", [False, True])
+def test_scripted_tool_calls(monkeypatch, model_id, stream):
+    monkeypatch.setenv("STUB_LLM_STREAM", str(stream).lower())
+    manager = stub_manager(StubLLM(StubConfig(script=SCRIPT)))
+
+    reply = asyncio.run(manager.generate_with_tools("Student is at HIGH risk", DECLARATIONS, model_id))
+    assert reply["tool_calls"] == [{"name": "generate_intervention_plan", "arguments": {"risk_level": "HIGH"}}]
+
+    reply = asyncio.run(manager.generate_with_tools("Tool Result (x): ok", DECLARATIONS, model_id))
+    assert reply == {"text": '{"thought": "Done", "final_response": "Plan reviewed"}', "tool_calls": []}
+
+
+def test_tool_calls_become_json_step_without_tools():
+    manager = stub_manager(StubLLM(StubConfig(script=SCRIPT)))
+
+    text = asyncio.run(manager.generate_content("LOW risk", "stub-openai"))
+
+    assert '"actions": [{"action": "generate_intervention_plan", "arguments": {"risk_level": "LOW"}}]' in text
+
+
+@pytest.mark.parametrize("model_id", ["stub-openai", "stub-gemini"])
+def test_rate_limit_injection(model_id):
+    stub = StubLLM(StubConfig(rate_limit_rate=1.0, retry_after=7))
+    manager = stub_manager(stub)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(manager.generate_content("hello", model_id))
+
+    assert error.value.response.status_code == 429
+    assert error.value.response.headers["Retry-After"] == "7"
+    assert stub.stats["rate_limited"] == 1
+
+
+def test_error_injection_rate():
+    stub = StubLLM(StubConfig(error_rate=0.3, seed=1))
+    statuses = [stub.fault() for _ in range(1000)]
+    assert 200 < statuses.count(500) < 400
+    assert statuses.count(429) == 0
+
+
+def test_agent_loop_runs_offline(monkeypatch):
+    stub = StubLLM(StubConfig(script=SCRIPT))
+    manager = stub_manager(stub)
+    monkeypatch.setattr("app.agent_core.agent.model_manager", manager)
+    agent = Agent(model_id="stub-gemini", native_function_calling=True)
+
+    async def collect():
+        return [event async for event in agent.run("Review the HIGH risk students")]
+    events = asyncio.run(collect())
+
+    assert [e["tool_name"] for e in events if e["type"] == "action"] == ["generate_intervention_plan"]
+    assert events[-1]["type"] == "response"
+    assert events[-1]["content"] == "Plan reviewed"
+    assert stub.stats["requests"] == 2
+    # Every call closes its client
+    assert len(manager.stub_clients) == 2 and all(client.is_closed for client in manager.stub_clients)
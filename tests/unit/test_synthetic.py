@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_aura import tools
+from agent_aura.synthetic import CohortSpec, generate_students, risk_levels, risk_scores, write_cohort
+
+
+def test_cohort_is_reproducible_and_follows_the_spec():
+    spec = CohortSpec(
+        size=20_000, seed=7, gpa_mean=3.1, gpa_std=0.4,
+        performance_distribution={"Below Average": 0.2, "Average": 0.5, "Above Average": 0.3},
+        grade_distribution={9: 1, 10: 3}
+    )
+    frames = list(generate_students(spec, chunk_size=6_000))
+    cohort = pd.concat(frames, ignore_index=True)
+
+    assert len(frames) == 4 and len(cohort) == 20_000 and cohort["student_id"].is_unique
+    assert cohort.equals(pd.concat(generate_students(spec, chunk_size=6_000), ignore_index=True))
+    assert cohort["gpa"].mean() == pytest.approx(3.1, abs=0.02)
+    assert cohort["gpa"].between(0, 4).all() and cohort["attendance_rate"].between(0.5, 1.0).all()
+    shares = cohort["overall_performance"].value_counts(normalize=True)
+    assert shares["Average"] == pytest.approx(0.5, abs=0.02) and shares["Below Average"] == pytest.approx(0.2, abs=0.02)
+    assert cohort["grade_level"].value_counts(normalize=True)[10] == pytest.approx(0.75, abs=0.02)
+    # Weaker students are weaker across the board
+    assert np.corrcoef(cohort["gpa"], cohort["attendance_rate"])[0, 1] > 0.3
+
+
+def test_vectorized_risk_matches_the_tools():
+    cohort = next(generate_students(CohortSpec(size=2_000)))
+    scores = risk_scores(
+        cohort["gpa"].to_numpy(), cohort["attendance_rate"].to_numpy() * 100, cohort["overall_performance"].to_numpy()
+    )
+    expected = [tools._assess_student_risk(tools._student_from_row(row)) for row in cohort.to_dict("records")]
+
+    assert scores.tolist() == [r["risk_score"] for r in expected]
+    assert risk_levels(scores).tolist() == [r["risk_level"] for r in expected]
+
+
+def test_write_cohort_with_history(tmp_path):
+    spec = CohortSpec(size=500, history_years=1, history_interval_days=30, as_of="2025-06-30")
+    output, history_output = tmp_path / "cohort.csv", tmp_path / "history.csv"
+
+    summary = write_cohort(spec, str(output), history_output=str(history_output), chunk_size=200)
+
+    cohort = pd.read_csv(output, dtype={"student_id": str})
+    history = pd.read_csv(history_output, dtype={"student_id": str})
+    assert summary["students"] == len(cohort) == 500
+    assert summary["history_entries"] == len(history) == 500 * 12
+    assert sum(summary["risk_distribution"].values()) == 500
+    last = history.groupby("student_id").tail(1).set_index("student_id")
+    assert (last["date"] == "2025-06-30").all()
+    first = cohort.iloc[0]
+    assessed = tools._assess_student_risk(tools._student_from_row(first))
+    assert last.loc[first["student_id"], "risk_score"] == assessed["risk_score"]
+    # Same columns as the demo data file, so every tool and the pipeline can read it
+    assert tools.get_student_data(first["student_id"], str(output))["gpa"] == first["gpa"]
+
+
+def test_parquet_output(tmp_path):
+    pytest.importorskip("pyarrow")
+    from agent_aura.synthetic import read_frames
+
+    write_cohort(CohortSpec(size=300), str(tmp_path / "cohort.parquet"), format="parquet", chunk_size=100)
+    assert sum(len(frame) for frame in read_frames(str(tmp_path / "cohort.parquet"))) == 300
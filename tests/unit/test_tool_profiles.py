@@ -0,0 +1,71 @@
+import inspect
+
+import pytest
+
+from agent_aura.config import config
+from agent_aura.tool_profiles import OutputProfile, build_tools, compact_result, compact_tool
+from agent_aura.tools import generate_intervention_plan, predict_intervention_success
+
+
+def test_compact_plan_references_catalog():
+    full = generate_intervention_plan("CRITICAL")
+    compact = compact_result("generate_intervention_plan", full)
+
+    assert compact["ref"] == "intervention_plan:CRITICAL"
+    assert compact["v"] == full["catalog_version"]
+    assert "actions" not in compact and len(str(compact)) < len(str(full)) / 4
+
+
+def test_compact_errors_and_unknown_tools():
+    assert compact_result("get_student_data", {"error": "Student S999 not found", "status": "error"}) == {
+        "err": "Student S999 not found", "status": "error"
+    }
+    assert compact_result("custom_tool", {"a": 1}) == {"a": 1}
+
+
+def test_compact_tool_keeps_signature_for_adk():
+    wrapped = compact_tool(predict_intervention_success)
+
+    assert wrapped.__name__ == "predict_intervention_success"
+    assert inspect.signature(wrapped) == inspect.signature(predict_intervention_success)
+    assert wrapped("HIGH")["success"] == predict_intervention_success("HIGH")["base_success_rate"]
+
+    tools = build_tools([predict_intervention_success], OutputProfile.COMPACT)
+    assert tools[0].name == "predict_intervention_success"
+    with pytest.raises(ValueError):
+        build_tools([predict_intervention_success], "verbose")
+
+
+def test_profile_selectable_per_agent(monkeypatch):
+    monkeypatch.setattr(config, "tool_output_profile", OutputProfile.FULL)
+    monkeypatch.setenv("TOOL_OUTPUT_PROFILE_RISK_ANALYSIS_AGENT", OutputProfile.COMPACT)
+
+    assert config.tool_profile_for("risk_analysis_agent") == OutputProfile.COMPACT
+    assert config.tool_profile_for("intervention_planning_agent") == OutputProfile.FULL
+
+
+def test_compact_agents_can_resolve_catalog_references():
+    import asyncio
+
+    from agent_aura.tools import get_student_data
+
+    tools = {tool.name: tool for tool in build_tools([generate_intervention_plan], OutputProfile.COMPACT)}
+    assert set(tools) == {"generate_intervention_plan", "get_catalog_entry"}
+    assert [t.name for t in build_tools([get_student_data], OutputProfile.COMPACT)] == ["get_student_data"]
+    assert [t.name for t in build_tools([generate_intervention_plan], OutputProfile.FULL)] == [
+        "generate_intervention_plan"
+    ]
+
+    async def answer():
+        # The agent plans, gets a reference back, then expands it to write its answer
+        compact = await tools["generate_intervention_plan"].run_async(args={"risk_level": "HIGH"}, tool_context=None)
+        entry = await tools["get_catalog_entry"].run_async(
+            args={"catalog_id": compact["ref"], "catalog_version": compact["v"]}, tool_context=None
+        )
+        return compact, entry
+
+    compact, entry = asyncio.run(answer())
+    full = generate_intervention_plan("HIGH")
+    assert "actions" not in compact
+    assert entry["actions"] == full["actions"]
+    assert entry["type"] == compact["type"] == full["type"]
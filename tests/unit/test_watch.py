@@ -0,0 +1,84 @@
+import csv
+import itertools
+import os
+
+import pytest
+
+from agent_aura import tools
+from agent_aura.watch import DataWatcher
+
+HEADER = ["student_id", "name", "grade_level", "gpa", "attendance_rate", "overall_performance"]
+AT_RISK = (1.8, 0.75, "Below Average")
+ON_TRACK = (3.6, 0.97, "Above Average")
+
+
+def write_students(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for student_id, (gpa, attendance, performance) in rows.items():
+            writer.writerow([student_id, f"Student {student_id}", 9, gpa, attendance, performance])
+    # Make every rewrite visible to the size/mtime check, however fast the test runs
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + next(REWRITES) * 1_000_000_000))
+
+
+REWRITES = itertools.count(1)
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "progress_database", {})
+    path = tmp_path / "students.csv"
+    write_students(path, {f"S{i:03d}": ON_TRACK for i in range(20)})
+    events = []
+    watcher = DataWatcher(str(path), str(tmp_path / "snapshot.json"), on_event=events.append)
+    watcher.events = events
+    return watcher
+
+
+def test_baseline_then_only_changed_rows_are_rescored(watcher, monkeypatch):
+    baseline = watcher.check()
+    assert baseline["status"] == "baseline" and baseline["counts"]["rows"] == 20
+    assert watcher.events == [] and tools.progress_database == {}
+    assert watcher.check()["status"] == "unchanged"
+
+    scored = []
+    assess = tools._assess_student_risk
+    monkeypatch.setattr(tools, "_assess_student_risk", lambda s: scored.append(s["student_id"]) or assess(s))
+
+    rows = {f"S{i:03d}": ON_TRACK for i in range(1, 20)}
+    rows["S005"] = AT_RISK
+    rows["S100"] = ON_TRACK
+    write_students(watcher.data_file, rows)
+    summary = watcher.check()
+
+    assert summary["status"] == "updated"
+    assert summary["counts"] == {"rows": 20, "added": 1, "changed": 1, "unchanged": 18, "removed": 1, "errors": 0}
+    assert sorted(scored) == ["S005", "S100"]
+    by_type = {e["event"]: e for e in watcher.events}
+    assert set(by_type) == {"risk_transition", "student_added", "student_removed"}
+    transition = by_type["risk_transition"]
+    assert (transition["student_id"], transition["from_level"], transition["to_level"]) == ("S005", "LOW", "CRITICAL")
+    assert transition["direction"] == "escalated"
+    assert by_type["student_removed"]["student_id"] == "S000"
+    assert set(tools.progress_database) == {"S005", "S100"}
+
+
+def test_snapshot_persists_across_watchers(watcher, tmp_path):
+    watcher.check()
+    rows = {f"S{i:03d}": ON_TRACK for i in range(20)}
+    rows["S003"] = AT_RISK
+    write_students(watcher.data_file, rows)
+
+    events = []
+    restarted = DataWatcher(watcher.data_file, watcher.snapshot_file, on_event=events.append)
+    summary = restarted.check()
+
+    assert summary["counts"]["changed"] == 1 and summary["counts"]["unchanged"] == 19
+    assert [(e["student_id"], e["to_level"]) for e in events] == [("S003", "CRITICAL")]
+
+
+def test_missing_data_file(tmp_path):
+    watcher = DataWatcher(str(tmp_path / "missing.csv"), str(tmp_path / "snapshot.json"))
+    assert watcher.check()["status"] == "missing"